@@ -99,7 +99,7 @@ start_worker() {
     GPU_COUNT=$( (command -v nvidia-smi >/dev/null 2>&1 && nvidia-smi --query-gpu=name --format=csv,noheader | wc -l) || echo 0 )
     echo "[RUN_ALL] Detected GPUs: ${GPU_COUNT}"
     nohup env PYTHONPATH="$PYTHONPATH" REDIS_HOST="$REDIS_HOST" REDIS_PORT="$REDIS_PORT" \
-      celery -A workers.celery_app:celery_app worker -l info \
+      celery -A workers.celery_app:celery_app worker -l info -Q segmentation,postprocess,celery \
       > "$LOG_DIR/worker.out" 2>&1 &
   else
     echo "[RUN_ALL] ERROR: celery not found in PATH. Install with: pip install celery"
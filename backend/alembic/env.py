@@ -13,6 +13,8 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from backend.core.database import Base
+from backend.models.batch import Batch
+from backend.models.blob import Blob
 from backend.models.job import Job
 from backend.models.metric import Metric
 
@@ -0,0 +1,42 @@
+"""Add content-addressed blob store for uploads
+
+Revision ID: 20261019_090000
+Revises: 20251107_023649
+Create Date: 2026-10-19 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_090000'
+down_revision = '20251107_023649'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create blobs table and link jobs to their upload blob."""
+    op.create_table(
+        'blobs',
+        sa.Column('digest', sa.String(length=64), primary_key=True),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('storage_path', sa.Text(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_referenced_at', sa.DateTime(), nullable=True),
+    )
+
+    # Existing jobs keep blob_digest NULL and are cleaned up by file path
+    op.add_column('jobs', sa.Column('blob_digest', sa.String(length=64), nullable=True))
+    op.create_index('ix_jobs_blob_digest', 'jobs', ['blob_digest'])
+    op.create_foreign_key('fk_jobs_blob_digest', 'jobs', 'blobs', ['blob_digest'], ['digest'])
+
+
+def downgrade():
+    """Drop blob store tables and columns."""
+    op.drop_constraint('fk_jobs_blob_digest', 'jobs', type_='foreignkey')
+    op.drop_index('ix_jobs_blob_digest', table_name='jobs')
+    op.drop_column('jobs', 'blob_digest')
+    op.drop_table('blobs')
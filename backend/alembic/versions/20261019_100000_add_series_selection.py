@@ -0,0 +1,28 @@
+"""Record the DICOM series selected from study archives
+
+Revision ID: 20261019_100000
+Revises: 20261019_090000
+Create Date: 2026-10-19 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_100000'
+down_revision = '20261019_090000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add selected series columns to jobs."""
+    op.add_column('jobs', sa.Column('series_instance_uid', sa.String(length=128), nullable=True))
+    op.add_column('jobs', sa.Column('series_description', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    """Remove selected series columns from jobs."""
+    op.drop_column('jobs', 'series_description')
+    op.drop_column('jobs', 'series_instance_uid')
@@ -0,0 +1,40 @@
+"""Add batches for multi-scan submissions
+
+Revision ID: 20261019_110000
+Revises: 20261019_100000
+Create Date: 2026-10-19 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_110000'
+down_revision = '20261019_100000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create batches table and link jobs to their batch."""
+    op.create_table(
+        'batches',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('job_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+    )
+
+    op.add_column('jobs', sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.create_index('ix_jobs_batch_id', 'jobs', ['batch_id'])
+    op.create_foreign_key('fk_jobs_batch_id', 'jobs', 'batches', ['batch_id'], ['id'])
+
+
+def downgrade():
+    """Drop batches table and job link."""
+    op.drop_constraint('fk_jobs_batch_id', 'jobs', type_='foreignkey')
+    op.drop_index('ix_jobs_batch_id', table_name='jobs')
+    op.drop_column('jobs', 'batch_id')
+    op.drop_table('batches')
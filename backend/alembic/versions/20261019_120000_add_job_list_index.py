@@ -0,0 +1,25 @@
+"""Add composite index for keyset pagination of jobs
+
+Revision ID: 20261019_120000
+Revises: 20261019_110000
+Create Date: 2026-10-19 12:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_120000'
+down_revision = '20261019_110000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index jobs on (created_at, id) for cursor pagination."""
+    op.create_index('ix_jobs_created_at_id', 'jobs', ['created_at', 'id'])
+
+
+def downgrade():
+    """Drop the pagination index."""
+    op.drop_index('ix_jobs_created_at_id', table_name='jobs')
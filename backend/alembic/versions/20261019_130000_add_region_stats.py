@@ -0,0 +1,61 @@
+"""Add materialized per-region cohort statistics
+
+Revision ID: 20261019_130000
+Revises: 20261019_120000
+Create Date: 2026-10-19 13:00:00
+
+"""
+from collections import defaultdict
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_130000'
+down_revision = '20261019_120000'
+branch_labels = None
+depends_on = None
+
+# Must match backend.models.region_stats
+HISTOGRAM_LOW = -1.0
+HISTOGRAM_BINS = 2000
+BIN_WIDTH = 2.0 / HISTOGRAM_BINS
+
+
+def upgrade():
+    """Create region_stats and fill it from the existing metrics."""
+    region_stats = op.create_table(
+        'region_stats',
+        sa.Column('region', sa.String(length=100), primary_key=True),
+        sa.Column('count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('mean', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('m2', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('histogram', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+    )
+
+    # Welford pass over existing metrics
+    stats = defaultdict(lambda: {"count": 0, "mean": 0.0, "m2": 0.0, "histogram": defaultdict(int)})
+    rows = op.get_bind().execute(sa.text("SELECT region, asymmetry_index FROM metrics"))
+    for region, value in rows:
+        entry = stats[region]
+        entry["count"] += 1
+        delta = value - entry["mean"]
+        entry["mean"] += delta / entry["count"]
+        entry["m2"] += delta * (value - entry["mean"])
+        index = min(max(int((value - HISTOGRAM_LOW) / BIN_WIDTH), 0), HISTOGRAM_BINS - 1)
+        entry["histogram"][str(index)] += 1
+
+    if stats:
+        now = datetime.utcnow()
+        op.bulk_insert(region_stats, [
+            {**entry, "region": region, "histogram": dict(entry["histogram"]), "updated_at": now}
+            for region, entry in stats.items()
+        ])
+
+
+def downgrade():
+    """Drop region_stats."""
+    op.drop_table('region_stats')
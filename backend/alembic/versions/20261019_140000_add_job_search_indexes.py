@@ -0,0 +1,53 @@
+"""Add job search indexes (filename trigram, completed_at)
+
+Revision ID: 20261019_140000
+Revises: 20261019_130000
+Create Date: 2026-10-19 14:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_140000'
+down_revision = '20261019_130000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Index filenames for substring search and jobs by completion time."""
+    op.create_index('ix_jobs_completed_at', 'jobs', ['completed_at'])
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute("CREATE INDEX IF NOT EXISTS ix_jobs_filename_trgm ON jobs USING gin (filename gin_trgm_ops)")
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(job_id UNINDEXED, filename, tokenize='trigram')")
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN "
+            "INSERT INTO jobs_fts(job_id, filename) VALUES (new.id, new.filename); END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN "
+            "DELETE FROM jobs_fts WHERE job_id = old.id; END"
+        )
+        op.execute(
+            "CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF filename ON jobs BEGIN "
+            "UPDATE jobs_fts SET filename = new.filename WHERE job_id = old.id; END"
+        )
+        op.execute("INSERT INTO jobs_fts(job_id, filename) SELECT id, filename FROM jobs")
+
+
+def downgrade():
+    """Drop the search indexes."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_jobs_filename_trgm")
+    elif dialect == 'sqlite':
+        for trigger in ('jobs_fts_insert', 'jobs_fts_delete', 'jobs_fts_update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS jobs_fts")
+
+    op.drop_index('ix_jobs_completed_at', table_name='jobs')
@@ -0,0 +1,63 @@
+"""Review job and metric indexes
+
+Revision ID: 20261019_150000
+Revises: 20261019_140000
+Create Date: 2026-10-19 15:00:00
+
+Adds composite indexes for the filtered queries:
+
+- jobs (status, created_at, id): job list filtered by status, newest
+  first, and the admission queue of pending/running jobs
+- jobs (status, completed_at): retention cleanup of completed and
+  failed jobs
+- metrics (region, job_id), on PostgreSQL including asymmetry_index:
+  metrics by region, cohort and region statistics
+
+and drops the indexes they make redundant: the single-column status
+and created_at indexes (left prefixes of the new and keyset indexes)
+and the extra indexes on the primary keys. These were created by
+``create_all`` before migrations existed, hence IF EXISTS.
+
+Measured with scripts/benchmark_index_plan.py.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20261019_150000'
+down_revision = '20261019_140000'
+branch_labels = None
+depends_on = None
+
+REDUNDANT_INDEXES = ('ix_jobs_status', 'ix_jobs_created_at', 'ix_jobs_id', 'ix_metrics_id')
+
+
+def upgrade():
+    """Create the composite indexes and drop the redundant ones."""
+    op.create_index('ix_jobs_status_created_at_id', 'jobs', ['status', 'created_at', 'id'])
+    op.create_index('ix_jobs_status_completed_at', 'jobs', ['status', 'completed_at'])
+    op.create_index(
+        'ix_metrics_region_job_id',
+        'metrics',
+        ['region', 'job_id'],
+        postgresql_include=['asymmetry_index'],
+    )
+
+    for name in REDUNDANT_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # Refresh planner statistics for the new indexes
+    op.execute("ANALYZE jobs")
+    op.execute("ANALYZE metrics")
+
+
+def downgrade():
+    """Restore the single-column indexes."""
+    op.create_index('ix_metrics_id', 'metrics', ['id'])
+    op.create_index('ix_jobs_id', 'jobs', ['id'])
+    op.create_index('ix_jobs_created_at', 'jobs', ['created_at'])
+    op.create_index('ix_jobs_status', 'jobs', ['status'])
+
+    op.drop_index('ix_metrics_region_job_id', table_name='metrics')
+    op.drop_index('ix_jobs_status_completed_at', table_name='jobs')
+    op.drop_index('ix_jobs_status_created_at_id', table_name='jobs')
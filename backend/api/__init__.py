@@ -1,10 +1,11 @@
 """API routes for NeuroInsight application."""
 
+from .batches import router as batches_router
 from .cleanup import router as cleanup_router
 from .jobs import router as jobs_router
 from .metrics import router as metrics_router
 from .upload import router as upload_router
 from .visualizations import router as visualizations_router
 
-__all__ = ["cleanup_router", "jobs_router", "metrics_router", "upload_router", "visualizations_router"]
+__all__ = ["batches_router", "cleanup_router", "jobs_router", "metrics_router", "upload_router", "visualizations_router"]
 
@@ -0,0 +1,212 @@
+"""
+API routes for batch submission.
+
+Accepts many scans in one request (a multipart list and/or zip/tar
+archives of scans), creates all jobs in one transaction and enqueues
+their processing as a Celery group.
+"""
+
+import tarfile
+import uuid
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from sqlalchemy.orm import Session
+
+from backend.api.upload import admit_upload, validate_scan_filename
+from backend.core.database import get_db
+from backend.core.logging import get_logger
+from backend.schemas import BatchResponse, JobCreate
+from backend.services import AdmissionService, BatchService, BlobService, StorageService
+from backend.services.job_registry import job_registry
+from pipeline.utils.series_discovery import is_archive, is_ignored_member
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/batches", tags=["batches"])
+
+
+def _iter_archive_members(upload: UploadFile) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Stream the members of an uploaded zip/tar archive.
+
+    Dotfiles and ``__MACOSX/`` metadata are skipped, as in series
+    discovery.
+
+    Args:
+        upload: Uploaded archive
+
+    Yields:
+        Tuples of (member file name, readable stream)
+    """
+    upload.file.seek(0)
+    if upload.filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(upload.file) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or is_ignored_member(info.filename):
+                    continue
+                with zf.open(info) as member:
+                    yield PurePosixPath(info.filename).name, member
+    else:
+        with tarfile.open(fileobj=upload.file, mode="r|*") as tf:
+            for info in tf:
+                if not info.isfile() or is_ignored_member(info.name):
+                    continue
+                member = tf.extractfile(info)
+                if member is not None:
+                    yield PurePosixPath(info.name).name, member
+
+
+def _iter_scans(files: List[UploadFile], expand_archives: bool) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yield every scan in the submission as (filename, stream).
+
+    Args:
+        files: Uploaded files
+        expand_archives: Treat uploaded archives as collections of scans
+
+    Yields:
+        Tuples of (original filename, readable stream)
+    """
+    for upload in files:
+        if not upload.filename:
+            continue
+        if expand_archives and is_archive(Path(upload.filename)):
+            yield from _iter_archive_members(upload)
+        else:
+            upload.file.seek(0)
+            yield upload.filename, upload.file
+
+
+def _enqueue_batch(job_ids: List[UUID]) -> None:
+    """Enqueue the processing chains of all batch jobs as one Celery group."""
+    try:
+        from celery import group
+        from workers.tasks.processing import first_task_id, processing_chain
+
+        result = group(processing_chain(str(job_id)) for job_id in job_ids).apply_async()
+        for job_id, chain_result in zip(job_ids, result.results):
+            job_registry.register(job_id, task_id=first_task_id(chain_result))
+    except Exception as celery_error:
+        # Jobs are created; they can be re-triggered like single uploads
+        logger.error(
+            "batch_enqueue_failed",
+            job_count=len(job_ids),
+            error=str(celery_error),
+            error_type=type(celery_error).__name__,
+        )
+
+
+@router.post("/", response_model=BatchResponse, status_code=201)
+def submit_batch(
+    files: List[UploadFile] = File(..., description="MRI scans and/or zip/tar archives of scans"),
+    name: Optional[str] = Form(None, description="Optional batch label"),
+    expand_archives: bool = Form(
+        True,
+        description="Treat archives as collections of scans (false: each archive is one DICOM study)",
+    ),
+    db: Session = Depends(get_db),
+):
+    """Submit many MRI scans for processing in one request.
+
+    - Each scan is streamed into the blob store
+    - Invalid entries (wrong extension, no "T1" in name) are skipped and reported
+    - All jobs are inserted in one transaction and enqueued as a Celery group
+    - Admission control applies as for single uploads (429 or deferred)
+
+    A plain function on purpose: decompression, hashing and copying, the
+    DB transactions and the Celery publish all block, so FastAPI runs the
+    route in its threadpool instead of on the event loop.
+    """
+    admission = admit_upload(db)
+    storage_service = StorageService()
+    stored: List[Tuple[str, str, str]] = []  # (filename, storage path, digest)
+    skipped: List[str] = []
+
+    try:
+        for filename, stream in _iter_scans(files, expand_archives):
+            validation_error = validate_scan_filename(filename)
+            if validation_error:
+                skipped.append(filename)
+                continue
+
+            unique_filename = f"{uuid.uuid4()}_{filename}"
+            storage_path, digest = storage_service.save_upload_deduplicated(db, stream, unique_filename)
+            stored.append((filename, storage_path, digest))
+
+        if not stored:
+            raise HTTPException(status_code=400, detail="No valid scans found in submission")
+
+        batch, job_ids = BatchService.create_batch(
+            db,
+            [
+                JobCreate(filename=filename, file_path=storage_path, blob_digest=digest)
+                for filename, storage_path, digest in stored
+            ],
+            name=name,
+        )
+    except Exception as e:
+        # Undo stored files and blob references; no jobs were committed
+        db.rollback()
+        for _, storage_path, digest in stored:
+            Path(storage_path).unlink(missing_ok=True)
+            try:
+                BlobService.release(db, digest)
+            except Exception as cleanup_error:
+                logger.warning("batch_cleanup_failed", digest=digest, error=str(cleanup_error))
+        try:
+            db.commit()
+        except Exception as cleanup_error:
+            db.rollback()
+            logger.warning("batch_cleanup_commit_failed", error=str(cleanup_error))
+
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, (zipfile.BadZipFile, tarfile.TarError)):
+            raise HTTPException(status_code=400, detail=f"Invalid archive: {e}")
+
+        logger.error("batch_submission_failed", error=str(e), error_type=type(e).__name__, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Batch submission failed: {str(e)}")
+
+    if admission.deferred:
+        AdmissionService.defer_jobs(db, job_ids)
+    else:
+        _enqueue_batch(job_ids)
+
+    logger.info(
+        "batch_submitted",
+        batch_id=str(batch.id),
+        job_count=len(job_ids),
+        skipped_count=len(skipped),
+        deferred=admission.deferred,
+    )
+
+    status = BatchService.get_batch_status(db, batch.id)
+    status["skipped"] = skipped
+    return status
+
+
+@router.get("/{batch_id}", response_model=BatchResponse)
+def get_batch(batch_id: UUID, db: Session = Depends(get_db)):
+    """
+    Get aggregate progress and per-job status of a batch.
+
+    Args:
+        batch_id: Batch identifier
+        db: Database session dependency
+
+    Returns:
+        Batch status with per-job details
+
+    Raises:
+        HTTPException: If batch not found
+    """
+    status = BatchService.get_batch_status(db, batch_id)
+
+    if not status:
+        raise HTTPException(status_code=404, detail="Batch not found")
+
+    return status
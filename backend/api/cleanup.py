@@ -19,15 +19,19 @@ router = APIRouter(prefix="/cleanup", tags=["cleanup"])
 
 
 @router.get("/stats")
-def get_storage_stats():
+def get_storage_stats(db: Session = Depends(get_db)):
     """
     Get storage usage statistics.
     
+    Args:
+        db: Database session
+    
     Returns:
-        Dictionary with storage statistics (uploads, outputs, total size)
+        Dictionary with storage statistics (uploads, outputs, total size,
+        dedup ratio and storage saved by the blob store)
     """
     cleanup_service = CleanupService()
-    stats = cleanup_service.get_storage_stats()
+    stats = cleanup_service.get_storage_stats(db)
     return stats
 
 
@@ -104,9 +108,9 @@ def run_cleanup(
     
     # Get storage stats after cleanup
     if not dry_run:
-        results["storage_stats"] = cleanup_service.get_storage_stats()
+        results["storage_stats"] = cleanup_service.get_storage_stats(db)
     else:
-        results["storage_stats"] = cleanup_service.get_storage_stats()
+        results["storage_stats"] = cleanup_service.get_storage_stats(db)
     
     logger.info("manual_cleanup_run", **results)
     
@@ -5,51 +5,148 @@ Provides endpoints for retrieving, updating, and deleting
 MRI processing jobs.
 """
 
-from typing import List, Optional
+import asyncio
+from datetime import datetime
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.core.database import get_db
+from backend.core.config import get_settings
+from backend.core.database import get_async_db, get_db
 from backend.core.logging import get_logger
-from backend.schemas import JobResponse, JobStatus
-from backend.services import JobService
+from backend.schemas import JobEta, JobResponse, JobStatus
+from backend.services import AdmissionService, AsyncJobService, JobService
+from backend.services.job_events import format_sse, is_final, job_events, job_state
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
 @router.get("/", response_model=List[JobResponse])
-def list_jobs(
-    skip: int = Query(0, ge=0, description="Number of records to skip"),
+async def list_jobs(
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
     status: Optional[JobStatus] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_metrics: bool = Query(True, description="Include metrics of each job"),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
-    Retrieve a list of processing jobs.
+    Retrieve a list of processing jobs, newest first.
     
-    Supports pagination and filtering by status.
+    Without ``skip`` the list is paginated by cursor: pass the
+    ``X-Next-Cursor`` response header back as ``cursor`` to get the next
+    page (the header is absent on the last page). ``X-Total-Count``
+    carries the (periodically refreshed) total.
     
     Args:
-        skip: Number of records to skip (for pagination)
+        response: Response (for pagination headers)
+        skip: Number of records to skip (offset pagination)
         limit: Maximum number of records to return
         status: Optional status filter
-        db: Database session dependency
+        cursor: Keyset cursor of the next page
+        include_metrics: Load metrics; pass false for a lighter listing
+        db: Async database session dependency
     
     Returns:
         List of job records
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    if skip and not cursor:
+        jobs = await AsyncJobService.get_jobs(
+            db, skip=skip, limit=limit, status=status, include_metrics=include_metrics
+        )
+    else:
+        try:
+            jobs, next_cursor = await AsyncJobService.get_jobs_page(
+                db, limit=limit, cursor=cursor, status=status, include_metrics=include_metrics
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+    
+    response.headers["X-Total-Count"] = str(await AsyncJobService.count_jobs(db, status=status))
+    return jobs
+
+
+@router.get("/search", response_model=List[JobResponse])
+async def search_jobs(
+    response: Response,
+    q: Optional[str] = Query(None, min_length=1, max_length=255, description="Filename fragment (case-insensitive)"),
+    match: str = Query("substring", pattern="^(substring|prefix)$", description="substring or prefix"),
+    status: Optional[JobStatus] = Query(None, description="Filter by status"),
+    created_after: Optional[datetime] = Query(None, description="Created at or after"),
+    created_before: Optional[datetime] = Query(None, description="Created before"),
+    completed_after: Optional[datetime] = Query(None, description="Completed at or after"),
+    completed_before: Optional[datetime] = Query(None, description="Completed before"),
+    limit: int = Query(50, ge=1, le=500, description="Maximum records to return"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    include_metrics: bool = Query(False, description="Include metrics of each job"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Search jobs by filename, status and date ranges, newest first.
+    
+    Filename matching uses a trigram index (PostgreSQL) or an FTS5
+    trigram table (SQLite). Pages are chained with the
+    ``X-Next-Cursor`` header as in the job list.
+    
+    Args:
+        response: Response (for pagination headers)
+        q: Filename fragment
+        match: Match q anywhere ("substring") or at the start ("prefix")
+        status: Optional status filter
+        created_after: Optional lower bound on creation time
+        created_before: Optional upper bound on creation time
+        completed_after: Optional lower bound on completion time
+        completed_before: Optional upper bound on completion time
+        limit: Maximum number of records to return
+        cursor: Keyset cursor of the next page
+        include_metrics: Load metrics of each job
+        db: Async database session dependency
+    
+    Returns:
+        List of matching job records
+    
+    Raises:
+        HTTPException: If the cursor is malformed
     """
-    jobs = JobService.get_jobs(db, skip=skip, limit=limit, status=status)
+    try:
+        jobs, next_cursor = await AsyncJobService.search_jobs(
+            db,
+            q=q,
+            prefix=match == "prefix",
+            status=status,
+            created_after=created_after,
+            created_before=created_before,
+            completed_after=completed_after,
+            completed_before=completed_before,
+            limit=limit,
+            cursor=cursor,
+            include_metrics=include_metrics,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return jobs
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(
+async def get_job(
     job_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve a specific job by ID.
@@ -59,17 +156,21 @@ def get_job(
         db: Database session dependency
     
     Returns:
-        Job record with associated metrics
+        Job record with associated metrics, and the ETA of an active job
     
     Raises:
         HTTPException: If job not found
     """
-    job = JobService.get_job(db, job_id)
+    job = await AsyncJobService.get_job(db, job_id, with_metrics=True)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job
+    if not job.is_active:
+        return job
+    
+    eta = await db.run_sync(AdmissionService.job_eta, job)
+    return JobResponse.model_validate(job).model_copy(update={"eta": JobEta(**eta) if eta else None})
 
 
 @router.delete("/{job_id}", status_code=204)
@@ -102,9 +203,9 @@ def delete_job(
 
 
 @router.get("/{job_id}/status", response_model=dict)
-def get_job_status(
+async def get_job_status(
     job_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get the current status of a job.
@@ -121,7 +222,7 @@ def get_job_status(
     Raises:
         HTTPException: If job not found
     """
-    job = JobService.get_job(db, job_id)
+    job = await AsyncJobService.get_job(db, job_id)
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
@@ -135,3 +236,160 @@ def get_job_status(
         "error_message": job.error_message,
     }
 
+
+async def _current_state(db: AsyncSession, job_id: UUID) -> Optional[Dict]:
+    """
+    Get the state to replay to a new subscriber.
+    
+    Uses the broker's latest state when it has seen a status event for
+    the job; otherwise reads the job once (terminal jobs come from the
+    job cache). The session is closed afterwards so long-lived streams
+    do not hold a database connection.
+    """
+    replay = job_events.snapshot(job_id)
+    if replay and "status" in replay:
+        return replay
+    
+    try:
+        job = await AsyncJobService.get_job(db, job_id)
+        if not job:
+            return None
+        state = job_state(job)
+    finally:
+        await db.close()
+    
+    # Progress seen since the row was written is newer than the row
+    state.update(replay or {})
+    return state
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Stream a job's progress as server-sent events.
+    
+    The first event (``snapshot``) carries the current state; ``progress``
+    and ``status`` events follow as the worker reports them. The stream
+    ends after the job reaches a final state, so late subscribers to a
+    finished job get the final state and an immediate close. Comment
+    lines are sent as keepalives while nothing happens.
+    
+    Args:
+        job_id: Job identifier
+        request: Incoming request (for disconnect detection)
+        db: Async database session (used once, for the initial state)
+    
+    Returns:
+        text/event-stream response
+    
+    Raises:
+        HTTPException: If job not found
+    """
+    # Subscribe before reading the state so no event falls in between
+    subscription = job_events.subscribe([job_id])
+    try:
+        state = await _current_state(db, job_id)
+    except Exception:
+        job_events.unsubscribe(subscription)
+        raise
+    
+    if state is None:
+        job_events.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        try:
+            yield format_sse("snapshot", state)
+            if is_final(state):
+                return
+            
+            while True:
+                event = await subscription.get(timeout=settings.job_events_keepalive_seconds)
+                if event is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield format_sse(event["type"], event)
+                if is_final(event):
+                    return
+        finally:
+            job_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/events")
+async def job_events_websocket(
+    websocket: WebSocket,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Push events for many jobs over one WebSocket.
+    
+    The client sends ``{"subscribe": [job ids]}`` and
+    ``{"unsubscribe": [job ids]}`` messages. Each subscribed job first
+    gets a ``snapshot`` message with its current state, then its
+    ``progress``/``status`` events; jobs are dropped from the
+    subscription once they reach a final state.
+    
+    Args:
+        websocket: WebSocket connection
+        db: Async database session (used once per subscribed job)
+    """
+    await websocket.accept()
+    subscription = job_events.subscribe()
+    
+    async def receive():
+        while True:
+            message = await websocket.receive_json()
+            for raw_id in message.get("unsubscribe", []):
+                subscription.job_ids.discard(str(raw_id))
+            for raw_id in message.get("subscribe", []):
+                try:
+                    job_id = UUID(str(raw_id))
+                except ValueError:
+                    subscription.push({"type": "error", "job_id": str(raw_id), "detail": "Invalid job id"})
+                    continue
+                subscription.job_ids.add(str(job_id))
+                state = await _current_state(db, job_id)
+                if state is None:
+                    subscription.job_ids.discard(str(job_id))
+                    subscription.push({"type": "error", "job_id": str(job_id), "detail": "Job not found"})
+                else:
+                    subscription.push({"type": "snapshot", **state})
+    
+    receiver = asyncio.create_task(receive())
+    try:
+        while True:
+            getter = asyncio.create_task(subscription.queue.get())
+            done, _ = await asyncio.wait(
+                {receiver, getter},
+                timeout=settings.job_events_keepalive_seconds,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if getter not in done:
+                getter.cancel()
+            if receiver in done:
+                break
+            
+            event = getter.result() if getter in done else {"type": "keepalive"}
+            await websocket.send_json(event)
+            if is_final(event):
+                subscription.job_ids.discard(event["job_id"])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        job_events.unsubscribe(subscription)
+        receiver.cancel()
+        if receiver.done() and not receiver.cancelled() and not isinstance(receiver.exception(), WebSocketDisconnect):
+            logger.warning("job_events_websocket_error", error=str(receiver.exception()))
@@ -5,26 +5,31 @@ Provides endpoints for retrieving volumetric measurements
 and asymmetry indices.
 """
 
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.database import get_db
+from backend.core.config import get_settings
+from backend.core.database import get_async_db
 from backend.core.logging import get_logger
-from backend.schemas import MetricResponse
-from backend.services import MetricService
+from backend.schemas import CohortStatsResponse, JobStatus, MetricRankResponse, MetricResponse
+from backend.services import AsyncMetricService, CohortDatasetService, CohortStatsService
+from backend.services.cohort_dataset_service import EXPORT_FORMATS
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
 
 @router.get("/", response_model=List[MetricResponse])
-def list_metrics(
+async def list_metrics(
     job_id: UUID = Query(..., description="Job identifier"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve all metrics for a specific job.
@@ -36,14 +41,109 @@ def list_metrics(
     Returns:
         List of hippocampal metrics
     """
-    metrics = MetricService.get_metrics_by_job(db, job_id)
+    metrics = await AsyncMetricService.get_metrics_by_job(db, job_id)
     return metrics
 
 
+@router.get("/ranks", response_model=List[MetricRankResponse])
+async def get_job_ranks(
+    job_id: UUID = Query(..., description="Job identifier"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Place a job's asymmetry within the cohort of each region.
+    
+    Returns the percentile rank and z-score of every metric of the job
+    against all stored metrics of the same region, from the
+    materialized region statistics.
+    
+    Args:
+        job_id: Job identifier
+        db: Database session dependency
+    
+    Returns:
+        One entry per region measured for the job
+    """
+    return await AsyncMetricService.get_job_ranks(db, job_id)
+
+
+@router.get("/stats", response_model=CohortStatsResponse)
+async def get_cohort_stats(
+    region: Optional[str] = Query(None, description="Hippocampal subregion name"),
+    status: Optional[JobStatus] = Query(None, description="Filter by job status"),
+    start: Optional[datetime] = Query(None, description="Jobs created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Jobs created before this time"),
+    bins: int = Query(20, ge=1, le=200, description="Number of histogram bins"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Compute cohort statistics of asymmetry and volumes.
+    
+    Returns count, mean, standard deviation, percentiles and a
+    histogram of asymmetry_index, left_volume and right_volume over all
+    matching metrics, computed server-side instead of shipping every
+    row to the client.
+    
+    Args:
+        region: Optional region filter
+        status: Optional job status filter
+        start: Optional lower bound on job creation time
+        end: Optional upper bound on job creation time
+        bins: Number of histogram bins
+        db: Database session dependency
+    
+    Returns:
+        Cohort statistics
+    """
+    return await CohortStatsService.get_stats(db, region=region, status=status, start=start, end=end, bins=bins)
+
+
+@router.get("/export")
+async def export_cohort(
+    format: str = Query("csv", description="csv, parquet or arrow (IPC stream)"),
+    region: Optional[str] = Query(None, description="Hippocampal subregion name"),
+    start: Optional[datetime] = Query(None, description="Jobs created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Jobs created before this time"),
+):
+    """
+    Stream metrics of completed jobs from the cohort dataset.
+    
+    Reads the month-partitioned Parquet dataset rather than the
+    database and streams the encoded rows as they are read, so exports
+    of any size use bounded memory.
+    
+    Args:
+        format: Output format
+        region: Optional region filter
+        start: Optional lower bound on job creation time
+        end: Optional upper bound on job creation time
+    
+    Returns:
+        Streaming CSV, Parquet or Arrow response
+    
+    Raises:
+        HTTPException: If the format is unknown or the dataset is disabled
+    """
+    if not settings.cohort_dataset_enabled:
+        raise HTTPException(status_code=404, detail="Cohort dataset is disabled")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported format '{format}'. Use one of: {', '.join(EXPORT_FORMATS)}",
+        )
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        CohortDatasetService.export(format, region=region, start=start, end=end),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="cohort_metrics.{extension}"'},
+    )
+
+
 @router.get("/{metric_id}", response_model=MetricResponse)
-def get_metric(
+async def get_metric(
     metric_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve a specific metric by ID.
@@ -58,7 +158,7 @@ def get_metric(
     Raises:
         HTTPException: If metric not found
     """
-    metric = MetricService.get_metric(db, metric_id)
+    metric = await AsyncMetricService.get_metric(db, metric_id)
     
     if not metric:
         raise HTTPException(status_code=404, detail="Metric not found")
@@ -67,14 +167,15 @@ def get_metric(
 
 
 @router.get("/region/{region}", response_model=List[MetricResponse])
-def get_metrics_by_region(
+async def get_metrics_by_region(
     region: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Retrieve all metrics for a specific hippocampal region.
     
-    Useful for comparing asymmetry across multiple subjects.
+    Useful for comparing asymmetry across multiple subjects. For
+    summary statistics use /metrics/stats instead of fetching every row.
     
     Args:
         region: Hippocampal subregion name (e.g., 'CA1', 'CA3')
@@ -83,6 +184,6 @@ def get_metrics_by_region(
     Returns:
         List of metrics for the specified region
     """
-    metrics = MetricService.get_metrics_by_region(db, region)
+    metrics = await AsyncMetricService.get_metrics_by_region(db, region)
     return metrics
 
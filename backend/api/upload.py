@@ -2,26 +2,149 @@
 API routes for file upload.
 
 Handles MRI file uploads (DICOM/NIfTI) and triggers
-processing pipeline.
+processing pipeline. Uploads pass admission control first, and the
+response includes the job's estimated completion.
 """
 
 import uuid
 from pathlib import Path
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from backend.core.config import get_settings
 from backend.core.database import get_db
 from backend.core.logging import get_logger
-from backend.schemas import JobCreate, JobResponse
-from backend.services import JobService, StorageService
+from backend.schemas import JobCreate, JobEta, JobResponse
+from backend.services import AdmissionService, BlobService, JobService, StorageService
+from pipeline.utils.series_discovery import ARCHIVE_SUFFIXES, is_archive
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 router = APIRouter(prefix="/upload", tags=["upload"])
 
+VALID_EXTENSIONS = [".nii", ".nii.gz", ".dcm", ".dicom", *ARCHIVE_SUFFIXES]
+
+
+def validate_scan_filename(filename: str) -> Optional[str]:
+    """
+    Validate the extension and T1 naming of an uploaded scan.
+    
+    Study archives are exempt from the "T1" naming rule because the
+    worker selects the T1 series from the DICOM headers.
+    
+    Args:
+        filename: Original filename
+    
+    Returns:
+        Error message if invalid, None otherwise
+    """
+    filename_lower = filename.lower()
+    
+    if not any(filename_lower.endswith(ext) for ext in VALID_EXTENSIONS):
+        return f"Invalid file type. Supported: {', '.join(VALID_EXTENSIONS)}"
+    
+    # Simple T1 validation: require "T1" in filename (case-insensitive)
+    if "t1" not in filename_lower and not is_archive(Path(filename)):
+        return 'Filename must contain "T1" (case-insensitive). Example: patient_001_T1w.nii.gz'
+    
+    return None
+
+
+def _store_upload(db: Session, file: UploadFile, unique_filename: str) -> Tuple[str, str]:
+    """
+    Stream an upload into the blob store (blocking; run in the threadpool).
+    
+    Returns:
+        Tuple of (storage path, blob digest)
+    """
+    # Stream the upload into the content-addressed blob store; re-uploads
+    # of the same scan resolve to a hard link to the existing blob
+    file.file.seek(0)
+    storage_service = StorageService()
+    return storage_service.save_upload_deduplicated(db, file.file, unique_filename)
+
+
+def _create_and_enqueue_job(db: Session, job_data: JobCreate, deferred: bool = False):
+    """
+    Create the job record and enqueue processing (blocking; run in the threadpool).
+    
+    Args:
+        db: Database session
+        job_data: Job creation data
+        deferred: Admission deferred the job; it is enqueued once the queue drains
+    
+    Returns:
+        Created job instance
+    """
+    job = JobService.create_job(db, job_data)
+    
+    if deferred:
+        AdmissionService.defer_jobs(db, [job.id])
+        return job
+    
+    # Trigger processing asynchronously
+    try:
+        from workers.tasks.processing import enqueue_processing
+        enqueue_processing(job.id)
+    except Exception as celery_error:
+        # If Celery task enqueueing fails, log but don't fail the upload
+        # The job is already created, so it can be manually triggered later
+        logger.error(
+            "celery_task_enqueue_failed",
+            job_id=str(job.id),
+            error=str(celery_error),
+            error_type=type(celery_error).__name__,
+        )
+        # Don't raise - job is created successfully, just needs manual trigger
+    
+    return job
+
+
+def admit_upload(db: Session):
+    """
+    Run admission control for a submission (blocking; run in the threadpool).
+    
+    Returns:
+        AdmissionDecision of an admitted submission
+    
+    Raises:
+        HTTPException: 429 with Retry-After if the queue or disk is full
+    """
+    decision = AdmissionService.admit(db)
+    if not decision.admitted:
+        raise HTTPException(
+            status_code=429,
+            detail=decision.reason,
+            headers={"Retry-After": str(decision.retry_after)},
+        )
+    return decision
+
+
+def _job_response(db: Session, job) -> JobResponse:
+    """Response for a new job, with its ETA (best effort: the job exists already)."""
+    try:
+        eta = AdmissionService.job_eta(db, job)
+    except Exception as e:
+        logger.warning("job_eta_failed", job_id=str(job.id), error=str(e))
+        eta = None
+    return JobResponse.model_validate(job).model_copy(update={"eta": JobEta(**eta) if eta else None})
+
+
+def _cleanup_failed_upload(db: Session, unique_filename: str, blob_digest: Optional[str]) -> None:
+    """Delete the stored file and release the blob of a failed upload."""
+    upload_path = Path(settings.upload_dir) / unique_filename
+    if upload_path.exists():
+        upload_path.unlink()
+        logger.info("cleanup_failed_upload_file", filename=unique_filename)
+    if blob_digest:
+        db.rollback()
+        BlobService.release(db, blob_digest)
+        db.commit()
+
 
 @router.post("/", response_model=JobResponse, status_code=201)
 async def upload_mri(
@@ -30,9 +153,14 @@ async def upload_mri(
 ):
     """Upload an MRI scan for processing (T1-only).
 
-    - Accepts DICOM series or NIfTI files (.nii, .nii.gz)
+    - Accepts DICOM series, NIfTI files (.nii, .nii.gz) or whole-study
+      DICOM archives (.zip, .tar, .tar.gz, .tgz)
     - Simple validation: file size, extension, and "T1" in filename
+      (archives are exempt; the T1 series is selected from the headers)
     - Creates a new job and enqueues background processing task
+    - Refused with 429 and Retry-After when the projected queue wait or
+      disk usage is past its threshold (or deferred, if so configured)
+    - The response includes the job's estimated start and completion
     """
     # Validate file
     if not file.filename:
@@ -55,23 +183,10 @@ async def upload_mri(
     if file_size > MAX_UPLOAD_BYTES:
         raise HTTPException(status_code=400, detail="File is too large (limit 1 GB)")
     
-    # Validate file extension
-    valid_extensions = [".nii", ".nii.gz", ".dcm", ".dicom"]
-    file_path = Path(file.filename)
-    
-    if not any(file.filename.endswith(ext) for ext in valid_extensions):
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Supported: {', '.join(valid_extensions)}"
-        )
-    
-    # Simple T1 validation: require "T1" in filename (case-insensitive)
-    filename_lower = file.filename.lower()
-    if "t1" not in filename_lower:
-        raise HTTPException(
-            status_code=400,
-            detail='Filename must contain "T1" (case-insensitive). Example: patient_001_T1w.nii.gz'
-        )
+    # Validate file extension and T1 naming
+    validation_error = validate_scan_filename(file.filename)
+    if validation_error:
+        raise HTTPException(status_code=400, detail=validation_error)
     
     logger.info(
         "upload_received",
@@ -80,52 +195,39 @@ async def upload_mri(
         size_bytes=file_size,
     )
     
+    # Refuse before anything is stored
+    admission = await run_in_threadpool(admit_upload, db)
+    
     # Generate unique filename early for cleanup on failure
     unique_filename = None
+    blob_digest = None
     try:
-        # Read file content once for saving (no complex validation)
-        file_data = await file.read()
-
         # Generate unique filename
         unique_filename = f"{uuid.uuid4()}_{file.filename}"
         
-        # Save file using storage service: persist locally first, mirror to S3
-        # Use BytesIO to create a file-like object from the cached file data
-        from io import BytesIO
-        file_obj = BytesIO(file_data)
-        storage_service = StorageService()
-        storage_path = storage_service.save_upload_local_then_s3(file_obj, unique_filename)
+        # Hashing, copying, the DB transactions and the Celery publish all
+        # block, so keep them off the event loop
+        storage_path, blob_digest = await run_in_threadpool(
+            _store_upload, db, file, unique_filename
+        )
         
         # Create job record
         job_data = JobCreate(
             filename=file.filename,
             file_path=storage_path,
+            blob_digest=blob_digest,
         )
-        job = JobService.create_job(db, job_data)
-        
-        # Trigger processing asynchronously
-        try:
-            from workers.tasks.processing import process_mri_task
-            process_mri_task.delay(str(job.id))
-        except Exception as celery_error:
-            # If Celery task enqueueing fails, log but don't fail the upload
-            # The job is already created, so it can be manually triggered later
-            logger.error(
-                "celery_task_enqueue_failed",
-                job_id=str(job.id),
-                error=str(celery_error),
-                error_type=type(celery_error).__name__,
-            )
-            # Don't raise - job is created successfully, just needs manual trigger
+        job = await run_in_threadpool(_create_and_enqueue_job, db, job_data, admission.deferred)
         
         logger.info(
             "upload_successful",
             job_id=str(job.id),
             filename=file.filename,
             storage_path=storage_path,
+            deferred=admission.deferred,
         )
         
-        return job
+        return await run_in_threadpool(_job_response, db, job)
     
     except HTTPException as http_exc:
         # Log validation error details before re-raising
@@ -151,13 +253,7 @@ async def upload_mri(
         # Cleanup: Delete uploaded file if it was saved but job creation failed
         if unique_filename:
             try:
-                # Path is already imported at the top of the file
-                from backend.core.config import get_settings
-                settings = get_settings()
-                upload_path = Path(settings.upload_dir) / unique_filename
-                if upload_path.exists():
-                    upload_path.unlink()
-                    logger.info("cleanup_failed_upload_file", filename=unique_filename)
+                await run_in_threadpool(_cleanup_failed_upload, db, unique_filename, blob_digest)
             except Exception as cleanup_error:
                 logger.warning("cleanup_failed_upload_file_error", error=str(cleanup_error))
         
@@ -2,20 +2,35 @@
 API routes for serving segmentation visualizations.
 
 Provides endpoints to retrieve NIfTI files and images for web viewers.
+Artifacts carry ETags derived from job id and file mtime/size, so
+repeat viewer loads are answered with 304 without a database query.
 """
 
+import hashlib
+import os
 from pathlib import Path
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse
+import aiofiles
+import aiofiles.os
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.core.config import get_settings
-from backend.core.database import get_db
+from backend.core.database import get_async_db, get_db
+from backend.core.file_serving import (
+    artifact_etag,
+    cache_headers,
+    etag_matches,
+    not_modified_response,
+    serve_file,
+)
 from backend.core.logging import get_logger
 from backend.models.job import JobStatus
-from backend.services import JobService
+from backend.services import ArtifactService, AsyncJobService, JobService
 
 logger = get_logger(__name__)
 settings = get_settings()
@@ -23,9 +38,159 @@ settings = get_settings()
 router = APIRouter(prefix="/visualizations", tags=["visualizations"])
 
 
+def _stat_artifact(path: Path) -> Optional[os.stat_result]:
+    """Stat an artifact, returning None if it does not exist."""
+    try:
+        return path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _listing_etag(job_id: UUID, entries, variant: str) -> str:
+    """Strong ETag for a response derived from a set of artifact files."""
+    key = f"{job_id}:{variant}:{ArtifactService.signature(entries)}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:32] + '"'
+
+
+def _get_job_or_404(db: Session, job_id: UUID):
+    """Load a job or raise 404."""
+    job = JobService.get_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return job
+
+
+def _serve_artifact(
+    request: Request,
+    db: Session,
+    job_id: UUID,
+    path: Path,
+    media_type: str,
+    filename: Optional[str] = None,
+    not_found_detail: str = "File not found",
+    require_completed: bool = False,
+    decompress: bool = False,
+):
+    """
+    Serve a job artifact with HTTP caching.
+    
+    The ETag is derived from the job id and the artifact's mtime/size, so a
+    matching ``If-None-Match`` is answered with 304 before the database is
+    queried. Artifacts of completed jobs are marked immutable.
+    
+    Args:
+        request: Incoming request
+        db: Database session (only used on cache misses)
+        job_id: Job identifier
+        path: Artifact path
+        media_type: Content-Type of the artifact
+        filename: Download name for Content-Disposition
+        not_found_detail: Error detail when the artifact is missing
+        require_completed: Reject jobs that are not completed
+        decompress: Offer the decoded content of a .gz artifact
+    
+    Returns:
+        304, file response, or X-Accel-Redirect hand-off
+    
+    Raises:
+        HTTPException: If job not found, not completed, or artifact missing
+    """
+    stat_result = _stat_artifact(path)
+    
+    etag = None
+    if stat_result is not None:
+        variant = ""
+        if decompress:
+            variant = "gzip" if "gzip" in request.headers.get("accept-encoding", "").lower() else "identity"
+        etag = artifact_etag(job_id, stat_result, variant)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    
+    job = _get_job_or_404(db, job_id)
+    
+    if require_completed and job.status != JobStatus.COMPLETED:
+        raise HTTPException(status_code=400, detail="Job not yet completed")
+    
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    
+    return serve_file(
+        request,
+        path,
+        media_type=media_type,
+        filename=filename,
+        decompress=decompress,
+        headers=cache_headers(etag, immutable=job.status == JobStatus.COMPLETED),
+        stat_result=stat_result,
+    )
+
+
+async def _serve_json_artifact(
+    request: Request,
+    db: AsyncSession,
+    job_id: UUID,
+    path: Path,
+    not_found_detail: str = "File not found",
+):
+    """
+    Serve a small JSON artifact from an async route.
+    
+    Same caching semantics as _serve_artifact, but the stat, the job
+    lookup and the file read are all awaited, so polling viewers never
+    hold a threadpool slot.
+    
+    Args:
+        request: Incoming request
+        db: Async database session (only used on cache misses)
+        job_id: Job identifier
+        path: Artifact path
+        not_found_detail: Error detail when the artifact is missing
+    
+    Returns:
+        304 or the stored JSON bytes
+    
+    Raises:
+        HTTPException: If job not found or artifact missing
+    """
+    try:
+        stat_result = await aiofiles.os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        stat_result = None
+    
+    etag = None
+    if stat_result is not None:
+        etag = artifact_etag(job_id, stat_result)
+        if etag_matches(request, etag):
+            return not_modified_response(etag)
+    
+    job = await AsyncJobService.get_job(db, job_id)
+    
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    if stat_result is None:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            content = await f.read()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers=cache_headers(etag, immutable=job.status == JobStatus.COMPLETED),
+    )
+
+
 @router.get("/{job_id}/whole-hippocampus/anatomical")
 def get_anatomical_t1(
     job_id: UUID,
+    request: Request,
+    decompress: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -33,44 +198,40 @@ def get_anatomical_t1(
     
     Args:
         job_id: Job identifier
+        request: Incoming request (Range and Accept-Encoding headers)
+        decompress: Offer the decoded .nii (gzip Content-Encoding when accepted)
         db: Database session dependency
     
     Returns:
-        NIfTI file (.nii.gz)
+        NIfTI file (.nii.gz), honouring Range requests
     
     Raises:
         HTTPException: If job not found or file missing
     """
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.status != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not yet completed")
-    
     # Construct path to T1 file
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "whole_hippocampus"
     t1_path = viz_dir / "anatomical.nii.gz"
     
-    if not t1_path.exists():
-        raise HTTPException(status_code=404, detail="Anatomical image not found")
-    
     logger.info("serving_anatomical_t1", job_id=str(job_id))
     
-    return FileResponse(
-        path=t1_path,
+    return _serve_artifact(
+        request,
+        db,
+        job_id,
+        t1_path,
         media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f'inline; filename="{job_id}_anatomical.nii.gz"',
-            "Accept-Ranges": "bytes"
-        }
+        filename=f"{job_id}_anatomical.nii.gz",
+        not_found_detail="Anatomical image not found",
+        require_completed=True,
+        decompress=decompress,
     )
 
 
 @router.get("/{job_id}/whole-hippocampus/nifti")
 def get_whole_hippocampus_nifti(
     job_id: UUID,
+    request: Request,
+    decompress: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -78,51 +239,47 @@ def get_whole_hippocampus_nifti(
     
     Args:
         job_id: Job identifier
+        request: Incoming request (Range and Accept-Encoding headers)
+        decompress: Offer the decoded .nii (gzip Content-Encoding when accepted)
         db: Database session dependency
     
     Returns:
-        NIfTI file (.nii.gz)
+        NIfTI file (.nii.gz), honouring Range requests
     
     Raises:
         HTTPException: If job not found or file missing
     """
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.status != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not yet completed")
-    
     # Construct path to visualization files
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "whole_hippocampus"
     nifti_path = viz_dir / "segmentation.nii.gz"
     
-    if not nifti_path.exists():
-        raise HTTPException(status_code=404, detail="Segmentation file not found")
-    
     logger.info("serving_whole_hippocampus_nifti", job_id=str(job_id))
     
-    return FileResponse(
-        path=nifti_path,
+    return _serve_artifact(
+        request,
+        db,
+        job_id,
+        nifti_path,
         media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f'inline; filename="{job_id}_whole_hippocampus.nii.gz"',
-            "Accept-Ranges": "bytes"
-        }
+        filename=f"{job_id}_whole_hippocampus.nii.gz",
+        not_found_detail="Segmentation file not found",
+        require_completed=True,
+        decompress=decompress,
     )
 
 
 @router.get("/{job_id}/whole-hippocampus/metadata")
-def get_whole_hippocampus_metadata(
+async def get_whole_hippocampus_metadata(
     job_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get metadata for whole hippocampus segmentation.
     
     Args:
         job_id: Job identifier
+        request: Incoming request (conditional headers)
         db: Database session dependency
     
     Returns:
@@ -131,28 +288,24 @@ def get_whole_hippocampus_metadata(
     Raises:
         HTTPException: If job not found or file missing
     """
-    import json
-    
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "whole_hippocampus"
     metadata_path = viz_dir / "segmentation_metadata.json"
     
-    if not metadata_path.exists():
-        raise HTTPException(status_code=404, detail="Metadata not found")
-    
-    with open(metadata_path, 'r') as f:
-        metadata = json.load(f)
-    
-    return metadata
+    # Served as stored bytes; the file is already JSON
+    return await _serve_json_artifact(
+        request,
+        db,
+        job_id,
+        metadata_path,
+        not_found_detail="Metadata not found",
+    )
 
 
 @router.get("/{job_id}/subfields/nifti")
 def get_subfields_nifti(
     job_id: UUID,
+    request: Request,
+    decompress: bool = False,
     db: Session = Depends(get_db),
 ):
     """
@@ -160,50 +313,46 @@ def get_subfields_nifti(
     
     Args:
         job_id: Job identifier
+        request: Incoming request (Range and Accept-Encoding headers)
+        decompress: Offer the decoded .nii (gzip Content-Encoding when accepted)
         db: Database session dependency
     
     Returns:
-        NIfTI file (.nii.gz)
+        NIfTI file (.nii.gz), honouring Range requests
     
     Raises:
         HTTPException: If job not found or file missing
     """
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.status != JobStatus.COMPLETED:
-        raise HTTPException(status_code=400, detail="Job not yet completed")
-    
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "subfields"
     nifti_path = viz_dir / "segmentation.nii.gz"
     
-    if not nifti_path.exists():
-        raise HTTPException(status_code=404, detail="Subfields segmentation not found")
-    
     logger.info("serving_subfields_nifti", job_id=str(job_id))
     
-    return FileResponse(
-        path=nifti_path,
+    return _serve_artifact(
+        request,
+        db,
+        job_id,
+        nifti_path,
         media_type="application/octet-stream",
-        headers={
-            "Content-Disposition": f'inline; filename="{job_id}_subfields.nii.gz"',
-            "Accept-Ranges": "bytes"
-        }
+        filename=f"{job_id}_subfields.nii.gz",
+        not_found_detail="Subfields segmentation not found",
+        require_completed=True,
+        decompress=decompress,
     )
 
 
 @router.get("/{job_id}/subfields/metadata")
-def get_subfields_metadata(
+async def get_subfields_metadata(
     job_id: UUID,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     """
     Get metadata for hippocampal subfields segmentation.
     
     Args:
         job_id: Job identifier
+        request: Incoming request (conditional headers)
         db: Database session dependency
     
     Returns:
@@ -212,29 +361,24 @@ def get_subfields_metadata(
     Raises:
         HTTPException: If job not found or file missing
     """
-    import json
-    
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "subfields"
     metadata_path = viz_dir / "segmentation_metadata.json"
     
-    if not metadata_path.exists():
-        raise HTTPException(status_code=404, detail="Metadata not found")
-    
-    with open(metadata_path, 'r') as f:
-        metadata = json.load(f)
-    
-    return metadata
+    # Served as stored bytes; the file is already JSON
+    return await _serve_json_artifact(
+        request,
+        db,
+        job_id,
+        metadata_path,
+        not_found_detail="Metadata not found",
+    )
 
 
 @router.get("/{job_id}/overlay/{slice_id}")
 def get_overlay_image(
     job_id: UUID,
     slice_id: str,  # "slice_00", "slice_01", etc.
+    request: Request,
     orientation: str = "axial",  # "axial", "coronal", or "sagittal"
     layer: str = "overlay",  # "anatomical", "overlay", or "combined" (legacy)
     seg_type: str = "whole",  # "whole" or "subfields"
@@ -249,6 +393,7 @@ def get_overlay_image(
         orientation: View orientation ('axial', 'coronal', or 'sagittal')
         layer: Image layer ('anatomical' for base T1, 'overlay' for segmentation, 'combined' for legacy merged)
         seg_type: Segmentation type (whole or subfields)
+        request: Incoming request (conditional and Range headers)
         db: Database session dependency
     
     Returns:
@@ -265,11 +410,6 @@ def get_overlay_image(
     if layer not in ['anatomical', 'overlay', 'combined']:
         raise HTTPException(status_code=400, detail=f"Invalid layer: {layer}. Must be 'anatomical', 'overlay', or 'combined'")
     
-    job = JobService.get_job(db, job_id)
-    
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
     # Path includes orientation subdirectory
     viz_dir = Path(settings.output_dir) / str(job_id) / "visualizations" / "overlays" / orientation
     
@@ -290,14 +430,122 @@ def get_overlay_image(
         else:
             image_path = viz_dir / f"subfields_{slice_id}.png"
     
-    if not image_path.exists():
-        raise HTTPException(status_code=404, detail=f"Image not found: {layer} layer for {orientation} orientation")
-    
-    logger.info("serving_image_layer", job_id=str(job_id), slice=slice_id, orientation=orientation, layer=layer, type=seg_type)
+    logger.debug("serving_image_layer", job_id=str(job_id), slice=slice_id, orientation=orientation, layer=layer, type=seg_type)
     
-    return FileResponse(
-        path=image_path,
+    return _serve_artifact(
+        request,
+        db,
+        job_id,
+        image_path,
         media_type="image/png",
-        filename=f"{job_id}_{orientation}_{layer}_{seg_type}_{slice_id}.png"
+        filename=f"{job_id}_{orientation}_{layer}_{seg_type}_{slice_id}.png",
+        not_found_detail=f"Image not found: {layer} layer for {orientation} orientation",
+    )
+
+
+
+@router.get("/{job_id}/manifest")
+def get_artifact_manifest(
+    job_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    List every visualization artifact of a job with its size and hash.
+    
+    Overlay entries include their orientation, layer, seg_type and slice
+    so the viewer can address them inside the overlay bundle.
+    
+    Args:
+        job_id: Job identifier
+        request: Incoming request (conditional headers)
+        db: Database session dependency
+    
+    Returns:
+        JSON manifest of artifacts
+    
+    Raises:
+        HTTPException: If job not found or no artifacts exist
+    """
+    artifacts = ArtifactService.list_artifacts(job_id)
+    etag = _listing_etag(job_id, artifacts, "manifest")
+    
+    if artifacts and etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    job = _get_job_or_404(db, job_id)
+    
+    if not artifacts:
+        raise HTTPException(status_code=404, detail="No visualizations found")
+    
+    manifest = ArtifactService.build_manifest(job_id)
+    
+    return JSONResponse(
+        manifest,
+        headers=cache_headers(etag, immutable=job.status == JobStatus.COMPLETED),
     )
 
+
+@router.get("/{job_id}/overlays/bundle")
+def get_overlay_bundle(
+    job_id: UUID,
+    request: Request,
+    format: str = "packed",  # "packed" or "zip"
+    orientation: Optional[str] = None,  # restrict to one orientation
+    db: Session = Depends(get_db),
+):
+    """
+    Get all overlay images of a job in a single response.
+    
+    ``packed`` returns a 4-byte big-endian index length, a JSON offset
+    index and the concatenated PNGs; ``zip`` returns a streamed,
+    uncompressed zip archive.
+    
+    Args:
+        job_id: Job identifier
+        request: Incoming request (conditional headers)
+        format: Bundle format ('packed' or 'zip')
+        orientation: Optional orientation filter
+        db: Database session dependency
+    
+    Returns:
+        Streamed overlay bundle
+    
+    Raises:
+        HTTPException: If parameters are invalid, job not found or no overlays exist
+    """
+    if format not in ("packed", "zip"):
+        raise HTTPException(status_code=400, detail=f"Invalid format: {format}. Must be 'packed' or 'zip'")
+    
+    if orientation is not None and orientation not in ['axial', 'coronal', 'sagittal']:
+        raise HTTPException(status_code=400, detail=f"Invalid orientation: {orientation}")
+    
+    overlays = ArtifactService.list_overlays(job_id, orientation)
+    etag = _listing_etag(job_id, overlays, f"bundle:{format}:{orientation}")
+    
+    if overlays and etag_matches(request, etag):
+        return not_modified_response(etag)
+    
+    job = _get_job_or_404(db, job_id)
+    
+    if not overlays:
+        raise HTTPException(status_code=404, detail="No overlay images found")
+    
+    headers = cache_headers(etag, immutable=job.status == JobStatus.COMPLETED)
+    
+    logger.info("serving_overlay_bundle", job_id=str(job_id), format=format, overlays=len(overlays))
+    
+    if format == "packed":
+        headers["content-length"] = str(ArtifactService.packed_bundle_size(job_id, overlays))
+        return StreamingResponse(
+            ArtifactService.iter_packed_bundle(job_id, overlays),
+            media_type="application/octet-stream",
+            headers=headers,
+        )
+    
+    headers["content-disposition"] = f'attachment; filename="{job_id}_overlays.zip"'
+    return StreamingResponse(
+        ArtifactService.iter_zip_bundle(job_id, overlays),
+        media_type="application/zip",
+        headers=headers,
+    )
@@ -1,8 +1,8 @@
 """Core configuration and utilities for NeuroInsight application."""
 
 from .config import Settings, get_settings
-from .database import Base, get_db, init_db
+from .database import Base, get_async_db, get_db, init_db
 from .logging import setup_logging
 
-__all__ = ["Settings", "get_settings", "Base", "get_db", "init_db", "setup_logging"]
+__all__ = ["Settings", "get_settings", "Base", "get_async_db", "get_db", "init_db", "setup_logging"]
 
@@ -6,7 +6,7 @@ enabling type-safe configuration from environment variables.
 """
 
 from functools import lru_cache
-from typing import List
+from typing import List, Optional
 
 from pydantic import Field, validator
 from pydantic_settings import BaseSettings
@@ -57,6 +57,20 @@ class Settings(BaseSettings):
     upload_dir: str = Field(default="/data/uploads", env="UPLOAD_DIR")
     output_dir: str = Field(default="/data/outputs", env="OUTPUT_DIR")
     max_upload_size: int = Field(default=524288000, env="MAX_UPLOAD_SIZE")  # 500MB
+    # Internal nginx location mapped to output_dir; when set, artifact bytes are
+    # served by nginx via X-Accel-Redirect instead of the API worker
+    x_accel_redirect_prefix: Optional[str] = Field(default=None, env="X_ACCEL_REDIRECT_PREFIX")
+    artifact_cache_max_age: int = Field(default=604800, env="ARTIFACT_CACHE_MAX_AGE")  # 7 days, completed jobs
+    job_cache_enabled: bool = Field(default=True, env="JOB_CACHE_ENABLED")  # Terminal job state cache
+    job_cache_size: int = Field(default=1024, env="JOB_CACHE_SIZE")
+    job_cache_ttl_seconds: float = Field(default=300.0, env="JOB_CACHE_TTL_SECONDS")
+    job_events_backend: str = Field(default="redis", env="JOB_EVENTS_BACKEND")  # "redis" or "memory" (desktop)
+    job_events_keepalive_seconds: float = Field(default=15.0, env="JOB_EVENTS_KEEPALIVE_SECONDS")
+    job_count_cache_seconds: float = Field(default=30.0, env="JOB_COUNT_CACHE_SECONDS")  # X-Total-Count freshness
+    cohort_stats_cache_seconds: float = Field(default=300.0, env="COHORT_STATS_CACHE_SECONDS")  # Also dropped on metric insert
+    cohort_dataset_enabled: bool = Field(default=True, env="COHORT_DATASET_ENABLED")  # Parquet copy of all metrics
+    cohort_dataset_dir: str = Field(default="/data/cohort", env="COHORT_DATASET_DIR")
+    cohort_dataset_compact_interval_hours: int = Field(default=24, env="COHORT_DATASET_COMPACT_INTERVAL_HOURS")
     
     # Cleanup & Retention Policies
     cleanup_enabled: bool = Field(default=True, env="CLEANUP_ENABLED")
@@ -71,6 +85,24 @@ class Settings(BaseSettings):
     )
     processing_timeout: int = Field(default=36000, env="PROCESSING_TIMEOUT")  # 10 hours
     max_concurrent_jobs: int = Field(default=2, env="MAX_CONCURRENT_JOBS")
+    dicom_conversion_backend: str = Field(default="auto", env="DICOM_CONVERSION_BACKEND")  # auto, native, dcm2niix
+    dicom_decode_workers: int = Field(default=0, env="DICOM_DECODE_WORKERS")  # 0 = auto
+    max_archive_extracted_size: int = Field(default=4294967296, env="MAX_ARCHIVE_EXTRACTED_SIZE")  # 4GB
+    progress_min_interval_seconds: float = Field(default=2.0, env="PROGRESS_MIN_INTERVAL_SECONDS")  # Between progress writes
+    progress_min_delta: int = Field(default=2, env="PROGRESS_MIN_DELTA")  # Progress points worth a write within a step
+    retry_storage_max_retries: int = Field(default=5, env="RETRY_STORAGE_MAX_RETRIES")
+    retry_storage_backoff_seconds: float = Field(default=2.0, env="RETRY_STORAGE_BACKOFF_SECONDS")  # Doubles per retry
+    retry_infrastructure_max_retries: int = Field(default=4, env="RETRY_INFRASTRUCTURE_MAX_RETRIES")
+    retry_infrastructure_backoff_seconds: float = Field(default=15.0, env="RETRY_INFRASTRUCTURE_BACKOFF_SECONDS")
+    retry_backoff_max_seconds: float = Field(default=600.0, env="RETRY_BACKOFF_MAX_SECONDS")
+    admission_backpressure: str = Field(default="reject", env="ADMISSION_BACKPRESSURE")  # reject (429), defer or off
+    admission_max_wait_seconds: float = Field(default=86400.0, env="ADMISSION_MAX_WAIT_SECONDS")  # Projected queue wait
+    admission_max_disk_usage: float = Field(default=0.9, env="ADMISSION_MAX_DISK_USAGE")  # Fraction of the upload volume
+    admission_disk_retry_after_seconds: int = Field(default=600, env="ADMISSION_DISK_RETRY_AFTER_SECONDS")
+    admission_default_job_seconds: float = Field(default=2100.0, env="ADMISSION_DEFAULT_JOB_SECONDS")  # Until jobs completed
+    admission_history_size: int = Field(default=200, env="ADMISSION_HISTORY_SIZE")  # Completed jobs behind the percentiles
+    admission_stats_cache_seconds: float = Field(default=60.0, env="ADMISSION_STATS_CACHE_SECONDS")
+    admission_release_interval_seconds: float = Field(default=60.0, env="ADMISSION_RELEASE_INTERVAL_SECONDS")
     
     # Security
     secret_key: str = Field(default="dev-secret-key-change-me", env="SECRET_KEY")
@@ -5,9 +5,11 @@ This module provides SQLAlchemy database connection handling,
 session management, and base model class.
 """
 
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -31,6 +33,36 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create base class for models
 Base = declarative_base()
 
+# Async engine and session factory, created on first use so that Celery
+# workers (sync only) never need the async drivers
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+# Filename search index. PostgreSQL: trigram GIN index for ILIKE.
+# SQLite: FTS5 trigram table (keyed by job id, since VACUUM may renumber
+# the rowids of jobs) kept in step by triggers.
+SEARCH_INDEX_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_filename_trgm ON jobs USING gin (filename gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(job_id UNINDEXED, filename, tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN "
+        "INSERT INTO jobs_fts(job_id, filename) VALUES (new.id, new.filename); END",
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN "
+        "DELETE FROM jobs_fts WHERE job_id = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF filename ON jobs BEGIN "
+        "UPDATE jobs_fts SET filename = new.filename WHERE job_id = old.id; END",
+    ],
+}
+
+# Async drivers for each sync backend
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -54,6 +86,73 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def to_async_url(database_url: str) -> str:
+    """
+    Convert a sync database URL to its async driver equivalent.
+    
+    ``postgresql://`` (and ``postgresql+psycopg2://``) map to asyncpg,
+    ``sqlite://`` maps to aiosqlite. URLs that already name an async
+    driver are returned unchanged.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+    
+    Returns:
+        Async database URL
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS or url.drivername in ASYNC_DRIVERS.values():
+        return database_url
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the shared async engine, creating it on first use.
+    
+    Returns:
+        AsyncEngine bound to the configured database
+    """
+    global _async_engine, _AsyncSessionLocal
+    
+    if _async_engine is None:
+        async_url = to_async_url(settings.database_url)
+        options = {"pool_pre_ping": True}
+        if not async_url.startswith("sqlite"):
+            options.update(pool_size=10, max_overflow=20)
+        _async_engine = create_async_engine(
+            async_url,
+            echo=settings.environment == "development",
+            **options,
+        )
+        _AsyncSessionLocal = async_sessionmaker(
+            _async_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    
+    return _async_engine
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async database session dependency for FastAPI.
+    
+    Used by ``async def`` routes so database access does not hold a
+    threadpool slot or block the event loop. Relationships are not
+    lazy-loaded on async sessions; load them explicitly (e.g. with
+    ``selectinload``).
+    
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+    """
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        yield db
+
+
 def init_db() -> None:
     """
     Initialize database by creating all tables.
@@ -64,7 +163,29 @@ def init_db() -> None:
     Note:
         In production, use Alembic migrations instead of this function.
     """
-    from backend.models import Job, Metric  # noqa: F401
+    from backend.models import Batch, Blob, Job, Metric, RegionStats  # noqa: F401
     
     Base.metadata.create_all(bind=engine)
+    init_search_index(engine)
+
+
+def init_search_index(bind) -> None:
+    """
+    Create the job filename search index if it does not exist.
+    
+    A new SQLite FTS table is filled from the existing jobs.
+    
+    Args:
+        bind: Engine or connection of the application database
+    """
+    statements = SEARCH_INDEX_DDL.get(bind.dialect.name)
+    if not statements:
+        return
+    
+    with bind.begin() as conn:
+        is_new = bind.dialect.name == "sqlite" and not inspect(conn).has_table("jobs_fts")
+        for statement in statements:
+            conn.execute(text(statement))
+        if is_new:
+            conn.execute(text("INSERT INTO jobs_fts(job_id, filename) SELECT id, filename FROM jobs"))
 
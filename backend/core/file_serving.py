@@ -0,0 +1,430 @@
+"""
+Range-capable file serving for large visualization artifacts.
+
+Provides a file response that honours HTTP ``Range`` requests (single
+and multiple ranges), hands the byte copy to the server via the ASGI
+zero-copy extension when available, and can delegate serving entirely
+to nginx with ``X-Accel-Redirect``.
+"""
+
+import hashlib
+import os
+import secrets
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request
+from starlette.datastructures import Headers
+from starlette.responses import Response, StreamingResponse
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CHUNK_SIZE = 256 * 1024
+
+# More ranges than this are answered with the full body (RFC 9110 allows it)
+MAX_RANGES = 32
+
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when no requested range overlaps the file."""
+
+
+def parse_range_header(value: Optional[str], size: int) -> List[Tuple[int, int]]:
+    """
+    Parse a ``Range: bytes=...`` header into inclusive byte ranges.
+
+    Overlapping and adjacent ranges are merged. Malformed headers are
+    ignored (an empty list means "send the full body").
+
+    Args:
+        value: Raw Range header value
+        size: File size in bytes
+
+    Returns:
+        Sorted list of (start, end) inclusive ranges
+
+    Raises:
+        RangeNotSatisfiable: If the header is valid but no range overlaps the file
+    """
+    if not value:
+        return []
+
+    unit, _, spec = value.partition("=")
+    if unit.strip().lower() != "bytes" or not spec:
+        return []
+
+    ranges: List[Tuple[int, int]] = []
+    for part in spec.split(","):
+        start_text, sep, end_text = part.strip().partition("-")
+        if not sep:
+            return []
+        try:
+            if start_text:
+                start = int(start_text)
+                end = int(end_text) if end_text else max(start, size - 1)
+                if end < start:
+                    return []
+            else:
+                # Suffix range: last N bytes
+                suffix = int(end_text)
+                if suffix == 0:
+                    continue
+                start, end = max(size - suffix, 0), size - 1
+        except ValueError:
+            return []
+
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    if not ranges:
+        raise RangeNotSatisfiable()
+
+    if len(ranges) > MAX_RANGES:
+        return []
+
+    ranges.sort()
+    merged = [ranges[0]]
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+        if start <= last_end + 1:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def _read_at(fd: int, offset: int, length: int) -> bytes:
+    """Positional read that does not move a shared file offset."""
+    if hasattr(os, "pread"):
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> str:
+    """Build a Content-Disposition header value for a download name."""
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"{disposition}; filename*=utf-8''{quoted}"
+    return f'{disposition}; filename="{filename}"'
+
+
+class RangeFileResponse(Response):
+    """
+    File response with byte-range support.
+
+    - No ``Range`` header: 200 with the full file
+    - One range: 206 with ``Content-Range``
+    - Several ranges: 206 ``multipart/byteranges``
+    - Unsatisfiable range: 416 with ``Content-Range: bytes */size``
+
+    Bytes are sent with the ``http.response.zerocopysend`` ASGI extension
+    when the server advertises it; otherwise they are read with
+    ``os.pread`` in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        media_type: str = "application/octet-stream",
+        filename: Optional[str] = None,
+        headers: Optional[dict] = None,
+        content_encoding: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+    ):
+        """
+        Initialize range file response.
+
+        Args:
+            path: File to serve
+            media_type: Content-Type of the file
+            filename: Download name for Content-Disposition
+            headers: Additional response headers
+            content_encoding: Content-Encoding of the stored bytes (disables ranges)
+            stat_result: Pre-computed os.stat() of the file
+        """
+        self.path = Path(path)
+        self.status_code = 200
+        self.media_type = media_type
+        self.background = None
+        self.content_encoding = content_encoding
+        self.stat_result = stat_result or os.stat(self.path)
+        self.init_headers(headers)
+
+        if filename:
+            self.headers.setdefault("content-disposition", content_disposition(filename))
+        if content_encoding:
+            self.headers["content-encoding"] = content_encoding
+            self.headers["vary"] = "Accept-Encoding"
+            self.headers["accept-ranges"] = "none"
+        else:
+            self.headers["accept-ranges"] = "bytes"
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Send the full file, one range, or a multipart set of ranges."""
+        size = self.stat_result.st_size
+        request_headers = Headers(scope=scope)
+        send_body = scope.get("method", "GET") != "HEAD"
+
+        ranges: List[Tuple[int, int]] = []
+        if not self.content_encoding:
+            try:
+                ranges = parse_range_header(request_headers.get("range"), size)
+            except RangeNotSatisfiable:
+                self.status_code = 416
+                self.headers["content-range"] = f"bytes */{size}"
+                self.headers["content-length"] = "0"
+                await send({"type": "http.response.start", "status": 416, "headers": self.raw_headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            # Conditional range: only honour Range if the validator still matches
+            if_range = request_headers.get("if-range")
+            if ranges and if_range and if_range != self.headers.get("etag"):
+                ranges = []
+
+        zerocopy = ZEROCOPY_EXTENSION in scope.get("extensions", {})
+
+        if not ranges:
+            self.headers["content-length"] = str(size)
+            await self._start(send, 200)
+            if send_body:
+                await self._send_file_part(send, 0, size, more_body=False, zerocopy=zerocopy)
+            else:
+                await send({"type": "http.response.body", "body": b""})
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            self.headers["content-range"] = f"bytes {start}-{end}/{size}"
+            self.headers["content-length"] = str(end - start + 1)
+            await self._start(send, 206)
+            if send_body:
+                await self._send_file_part(send, start, end - start + 1, more_body=False, zerocopy=zerocopy)
+            else:
+                await send({"type": "http.response.body", "body": b""})
+        else:
+            await self._send_multipart(send, ranges, size, send_body, zerocopy)
+
+        if self.background is not None:
+            await self.background()
+
+    async def _start(self, send, status: int) -> None:
+        """Send the response start message."""
+        self.status_code = status
+        await send({"type": "http.response.start", "status": status, "headers": self.raw_headers})
+
+    async def _send_file_part(self, send, offset: int, count: int, more_body: bool, zerocopy: bool) -> None:
+        """Send ``count`` bytes of the file starting at ``offset``."""
+        with open(self.path, "rb") as f:
+            if zerocopy:
+                await send({
+                    "type": ZEROCOPY_EXTENSION,
+                    "file": f,
+                    "offset": offset,
+                    "count": count,
+                    "more_body": more_body,
+                })
+                return
+
+            fd = f.fileno()
+            remaining = count
+            position = offset
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(_read_at, fd, position, min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                position += len(chunk)
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": more_body or remaining > 0,
+                })
+
+            if count == 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": more_body})
+
+    async def _send_multipart(self, send, ranges, size: int, send_body: bool, zerocopy: bool) -> None:
+        """Send several ranges as multipart/byteranges."""
+        boundary = secrets.token_hex(16)
+        part_headers = [
+            (
+                f"--{boundary}\r\n"
+                f"Content-Type: {self.media_type}\r\n"
+                f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+            ).encode("latin-1")
+            for start, end in ranges
+        ]
+        closing = f"--{boundary}--\r\n".encode("latin-1")
+        length = sum(len(h) + (end - start + 1) + 2 for h, (start, end) in zip(part_headers, ranges)) + len(closing)
+
+        self.headers["content-type"] = f"multipart/byteranges; boundary={boundary}"
+        self.headers["content-length"] = str(length)
+        await self._start(send, 206)
+
+        if not send_body:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        for header, (start, end) in zip(part_headers, ranges):
+            await send({"type": "http.response.body", "body": header, "more_body": True})
+            await self._send_file_part(send, start, end - start + 1, more_body=True, zerocopy=zerocopy)
+            await send({"type": "http.response.body", "body": b"\r\n", "more_body": True})
+        await send({"type": "http.response.body", "body": closing, "more_body": False})
+
+
+def artifact_etag(job_id, stat_result: os.stat_result, variant: str = "") -> str:
+    """
+    Build a strong ETag for a job artifact.
+
+    Artifacts are rewritten only when a job is reprocessed, which changes
+    their mtime and usually their size, so job id + mtime + size identify
+    the content without hashing the file.
+
+    Args:
+        job_id: Job identifier
+        stat_result: os.stat() of the artifact
+        variant: Representation key (e.g. content encoding) of the response
+
+    Returns:
+        Quoted ETag value
+    """
+    key = f"{job_id}:{stat_result.st_mtime_ns}:{stat_result.st_size}:{variant}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether If-None-Match contains the ETag (or ``*``)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    # Weak comparison applies to If-None-Match
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def cache_headers(etag: str, immutable: bool) -> dict:
+    """
+    Caching headers for an artifact response.
+
+    Args:
+        etag: Strong ETag of the artifact
+        immutable: True for artifacts of completed jobs
+
+    Returns:
+        Header dictionary with ETag and Cache-Control
+    """
+    if immutable:
+        cache_control = f"private, max-age={settings.artifact_cache_max_age}, immutable"
+    else:
+        # Artifacts of running jobs may still change; always revalidate
+        cache_control = "private, no-cache"
+    return {"etag": etag, "cache-control": cache_control}
+
+
+def not_modified_response(etag: str) -> Response:
+    """304 response for a matching If-None-Match."""
+    return Response(status_code=304, headers={"etag": etag})
+
+
+def _gunzip_stream(path: Path) -> Iterator[bytes]:
+    """Decompress a gzip file incrementally."""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            data = decompressor.decompress(chunk)
+            if data:
+                yield data
+    tail = decompressor.flush()
+    if tail:
+        yield tail
+
+
+def _accel_location(path: Path, gzip_encoded: bool) -> Optional[str]:
+    """Map an output file to its internal nginx location, if configured."""
+    prefix = settings.x_accel_redirect_prefix
+    if not prefix:
+        return None
+    try:
+        relative = path.resolve().relative_to(Path(settings.output_dir).resolve())
+    except ValueError:
+        return None
+    base = prefix.rstrip("/") + ("-gzip" if gzip_encoded else "")
+    return f"{base}/{quote(relative.as_posix())}"
+
+
+def serve_file(
+    request: Request,
+    path: Path,
+    media_type: str = "application/octet-stream",
+    filename: Optional[str] = None,
+    decompress: bool = False,
+    headers: Optional[dict] = None,
+    stat_result: Optional[os.stat_result] = None,
+) -> Response:
+    """
+    Serve an artifact with range, gzip and X-Accel-Redirect support.
+
+    With ``decompress=True`` a ``.gz`` file is offered as its decoded
+    content: clients that accept gzip get the stored bytes unchanged with
+    ``Content-Encoding: gzip`` (the browser decompresses them), others get
+    a streamed decompression.
+
+    Args:
+        request: Incoming request (for Accept-Encoding)
+        path: File to serve
+        media_type: Content-Type of the decoded content
+        filename: Download name (``.gz`` is dropped when decompressing)
+        decompress: Offer the decoded content of a ``.gz`` file
+        headers: Additional response headers
+        stat_result: Pre-computed os.stat() of the file
+
+    Returns:
+        Response streaming the file (or an X-Accel-Redirect hand-off)
+    """
+    headers = dict(headers or {})
+    is_gzip = path.suffix == ".gz"
+    gzip_encoded = False
+
+    if decompress and is_gzip:
+        if filename and filename.endswith(".gz"):
+            filename = filename[:-3]
+        accepts_gzip = "gzip" in request.headers.get("accept-encoding", "").lower()
+        if not accepts_gzip:
+            headers["vary"] = "Accept-Encoding"
+            if filename:
+                headers["content-disposition"] = content_disposition(filename)
+            return StreamingResponse(_gunzip_stream(path), media_type=media_type, headers=headers)
+        gzip_encoded = True
+
+    accel_location = _accel_location(path, gzip_encoded)
+    if accel_location:
+        # nginx serves the bytes (with ranges); only headers go through Python
+        headers["X-Accel-Redirect"] = accel_location
+        if filename:
+            headers["content-disposition"] = content_disposition(filename)
+        if gzip_encoded:
+            headers["vary"] = "Accept-Encoding"
+        return Response(status_code=200, media_type=media_type, headers=headers)
+
+    return RangeFileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        headers=headers,
+        content_encoding="gzip" if gzip_encoded else None,
+        stat_result=stat_result,
+    )
@@ -0,0 +1,83 @@
+"""
+Cache invalidation across processes over Redis pub/sub.
+
+In-process caches (terminal job state, cohort statistics) are filled in
+every API and worker process. When one process changes the underlying
+rows, it publishes an invalidation message on the cache's channel and
+the others drop the affected entries. Redis is optional: publishing is
+best effort and each cache's TTL bounds staleness while it is away.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+from .config import get_settings
+from .logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Seconds to wait before resubscribing after a Redis error
+RECONNECT_SECONDS = 5
+
+
+class RedisInvalidationChannel:
+    """
+    Publish and receive invalidation messages on one Redis channel.
+    """
+
+    def __init__(self, channel: str, name: str):
+        """
+        Initialize invalidation channel.
+
+        Args:
+            channel: Redis pub/sub channel name
+            name: Short cache name for logs and the listener thread
+        """
+        self.channel = channel
+        self.name = name
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, message: str) -> None:
+        """Publish an invalidation to other processes (best effort)."""
+        try:
+            import redis
+
+            redis.Redis.from_url(settings.redis_url, socket_timeout=0.5).publish(self.channel, message)
+        except Exception as e:
+            logger.debug("cache_invalidation_publish_failed", cache=self.name, message=message, error=str(e))
+
+    def start_listener(self, on_message: Callable[[str], None], on_error: Callable[[], None]) -> None:
+        """
+        Subscribe to invalidations published by other processes.
+
+        Runs in a daemon thread (started once); reconnects after Redis
+        errors.
+
+        Args:
+            on_message: Called with each decoded message
+            on_error: Called after a Redis error, since messages may have
+                been missed until the listener resubscribes
+        """
+        if self._listener is not None:
+            return
+
+        def listen():
+            import redis
+
+            while True:
+                try:
+                    pubsub = redis.Redis.from_url(settings.redis_url).pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self.channel)
+                    logger.info("cache_invalidation_listener_subscribed", cache=self.name)
+                    for message in pubsub.listen():
+                        data = message["data"]
+                        on_message(data.decode() if isinstance(data, bytes) else str(data))
+                except Exception as e:
+                    on_error()
+                    logger.warning("cache_invalidation_listener_error", cache=self.name, error=str(e))
+                    time.sleep(RECONNECT_SECONDS)
+
+        self._listener = threading.Thread(target=listen, name=f"{self.name}-invalidation", daemon=True)
+        self._listener.start()
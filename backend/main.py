@@ -11,9 +11,13 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from backend.api import cleanup_router, jobs_router, metrics_router, upload_router, visualizations_router
+from backend.api import batches_router, cleanup_router, jobs_router, metrics_router, upload_router, visualizations_router
 from backend.core import get_settings, init_db, setup_logging
 from backend.core.logging import get_logger
+from backend.services.cohort_stats_service import cohort_stats_cache
+from backend.services.job_cache import job_cache
+from backend.services.job_events import job_events
+from backend.services.pipeline_error_stats import pipeline_error_stats
 
 # Initialize settings and logging
 settings = get_settings()
@@ -44,6 +48,15 @@ async def lifespan(app: FastAPI):
         logger.error("database_initialization_failed", error=str(e))
         raise
     
+    # Drop cached job state when workers change a job
+    job_cache.start_invalidation_listener()
+    
+    # Drop cached cohort statistics when workers insert metrics
+    cohort_stats_cache.start_invalidation_listener()
+    
+    # Fan out worker progress events to SSE/WebSocket clients
+    job_events.start_listener()
+    
     yield
     
     # Shutdown
@@ -61,6 +74,9 @@ app = FastAPI(
 )
 
 # Configure CORS
+# Let browsers read the job list pagination headers
+PAGINATION_HEADERS = ["X-Next-Cursor", "X-Total-Count"]
+
 # If cors_origins_list contains "*", use allow_origin_regex to match all origins
 cors_origins = settings.cors_origins_list
 if cors_origins == ["*"]:
@@ -71,6 +87,7 @@ if cors_origins == ["*"]:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=PAGINATION_HEADERS,
     )
 else:
     # Use specific origins
@@ -80,6 +97,7 @@ else:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=PAGINATION_HEADERS,
     )
 
 
@@ -96,6 +114,9 @@ async def health_check():
         "app_name": settings.app_name,
         "version": settings.app_version,
         "environment": settings.environment,
+        "job_cache": job_cache.stats(),
+        "job_event_subscribers": job_events.subscriber_count(),
+        "pipeline_errors": pipeline_error_stats.stats(),
     }
 
 
@@ -140,6 +161,7 @@ async def global_exception_handler(request, exc):
 
 # Include routers
 app.include_router(upload_router)
+app.include_router(batches_router)
 app.include_router(jobs_router)
 app.include_router(metrics_router)
 app.include_router(visualizations_router)
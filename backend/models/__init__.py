@@ -1,7 +1,10 @@
 """Database models for NeuroInsight application."""
 
+from .batch import Batch
+from .blob import Blob
 from .job import Job
 from .metric import Metric
+from .region_stats import RegionStats
 
-__all__ = ["Job", "Metric"]
+__all__ = ["Batch", "Blob", "Job", "Metric", "RegionStats"]
 
@@ -0,0 +1,70 @@
+"""
+Batch model for grouping jobs submitted together.
+
+Cohort imports submit many scans in one request. The batch record ties
+the resulting jobs together so their aggregate progress can be queried.
+"""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from backend.core.database import Base
+
+
+class Batch(Base):
+    """
+    Batch model representing a multi-scan submission.
+
+    Attributes:
+        id: Unique batch identifier
+        name: Optional user-supplied label (e.g. cohort name)
+        job_count: Number of jobs created for the batch
+        created_at: Timestamp when batch was submitted
+        jobs: Jobs belonging to this batch
+    """
+
+    __tablename__ = "batches"
+
+    # Primary key
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        doc="Unique batch identifier"
+    )
+
+    name = Column(
+        String(255),
+        nullable=True,
+        doc="Optional batch label"
+    )
+
+    job_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Number of jobs in the batch"
+    )
+
+    # Timestamps
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Batch submission timestamp"
+    )
+
+    # Relationships
+    jobs = relationship(
+        "Job",
+        back_populates="batch",
+        doc="Jobs belonging to this batch"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of Batch."""
+        return f"<Batch(id={self.id}, jobs={self.job_count})>"
@@ -0,0 +1,87 @@
+"""
+Blob model for content-addressed upload storage.
+
+Uploaded scans are stored once per unique content hash. Jobs reference
+blobs by digest, and the reference count decides when the underlying
+file can be removed from disk.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from backend.core.database import Base
+
+
+class Blob(Base):
+    """
+    Blob model representing a unique uploaded file.
+
+    Attributes:
+        digest: SHA-256 hex digest of the file contents
+        size_bytes: File size in bytes
+        storage_path: Path to the blob in the content-addressed store
+        ref_count: Number of jobs referencing this blob
+        created_at: Timestamp when blob was first stored
+        last_referenced_at: Timestamp of the most recent new reference
+        jobs: Jobs referencing this blob
+    """
+
+    __tablename__ = "blobs"
+
+    # Primary key
+    digest = Column(
+        String(64),
+        primary_key=True,
+        doc="SHA-256 hex digest of the file contents"
+    )
+
+    size_bytes = Column(
+        BigInteger,
+        nullable=False,
+        doc="File size in bytes"
+    )
+
+    storage_path = Column(
+        Text,
+        nullable=False,
+        doc="Path to the blob in the content-addressed store"
+    )
+
+    ref_count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Number of jobs referencing this blob"
+    )
+
+    # Timestamps
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Blob creation timestamp"
+    )
+
+    last_referenced_at = Column(
+        DateTime,
+        nullable=True,
+        doc="Timestamp of the most recent new reference"
+    )
+
+    # Relationships
+    jobs = relationship(
+        "Job",
+        back_populates="blob",
+        doc="Jobs referencing this blob"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of Blob."""
+        return f"<Blob(digest={self.digest[:12]}, size={self.size_bytes}, refs={self.ref_count})>"
+
+    @property
+    def is_referenced(self) -> bool:
+        """Check if any job still references this blob."""
+        return self.ref_count > 0
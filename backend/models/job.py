@@ -9,7 +9,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, DateTime, Enum, Integer, String, Text
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -34,23 +34,35 @@ class Job(Base):
         id: Unique job identifier
         filename: Original filename of uploaded MRI
         file_path: Path to stored file (local or S3)
+        blob_digest: Content hash of the uploaded file in the blob store
+        batch_id: Batch this job was submitted with, if any
         status: Current processing status
         error_message: Error details if job failed
         created_at: Timestamp when job was created
         started_at: Timestamp when processing started
         completed_at: Timestamp when processing completed
         result_path: Path to processing output directory
+        series_instance_uid: DICOM series selected from a study archive
+        series_description: Description of the selected series
         metrics: Related hippocampal metrics
     """
     
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination of the job list (newest first); also serves
+        # created_at ranges
+        Index("ix_jobs_created_at_id", "created_at", "id"),
+        # Job list and admission queue filtered by status, in creation order
+        Index("ix_jobs_status_created_at_id", "status", "created_at", "id"),
+        # Retention cleanup: jobs of a status completed before a cutoff
+        Index("ix_jobs_status_completed_at", "status", "completed_at"),
+    )
     
     # Primary key
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
         doc="Unique job identifier"
     )
     
@@ -67,12 +79,27 @@ class Job(Base):
         doc="Storage path (local filesystem or S3 URI)"
     )
     
+    blob_digest = Column(
+        String(64),
+        ForeignKey("blobs.digest"),
+        nullable=True,
+        index=True,
+        doc="SHA-256 digest of the uploaded file in the blob store"
+    )
+    
+    batch_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("batches.id"),
+        nullable=True,
+        index=True,
+        doc="Batch this job was submitted with"
+    )
+    
     # Status tracking
     status = Column(
         Enum(JobStatus),
         nullable=False,
         default=JobStatus.PENDING,
-        index=True,
         doc="Current processing status"
     )
     
@@ -100,7 +127,6 @@ class Job(Base):
         DateTime,
         nullable=False,
         default=datetime.utcnow,
-        index=True,
         doc="Job creation timestamp"
     )
     
@@ -113,6 +139,7 @@ class Job(Base):
     completed_at = Column(
         DateTime,
         nullable=True,
+        index=True,
         doc="Processing completion timestamp"
     )
     
@@ -123,6 +150,19 @@ class Job(Base):
         doc="Path to processing output directory"
     )
     
+    # Series discovery (study archive uploads only)
+    series_instance_uid = Column(
+        String(128),
+        nullable=True,
+        doc="SeriesInstanceUID of the T1 series selected from an archive"
+    )
+    
+    series_description = Column(
+        String(255),
+        nullable=True,
+        doc="Description of the selected series"
+    )
+    
     # Relationships
     metrics = relationship(
         "Metric",
@@ -131,6 +171,18 @@ class Job(Base):
         doc="Associated hippocampal metrics"
     )
     
+    blob = relationship(
+        "Blob",
+        back_populates="jobs",
+        doc="Content-addressed blob holding the uploaded file"
+    )
+    
+    batch = relationship(
+        "Batch",
+        back_populates="jobs",
+        doc="Batch this job was submitted with"
+    )
+    
     def __repr__(self) -> str:
         """String representation of Job."""
         return f"<Job(id={self.id}, filename={self.filename}, status={self.status.value})>"
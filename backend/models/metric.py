@@ -8,7 +8,7 @@ for hippocampal subregions extracted from MRI scans.
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, String
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -31,13 +31,17 @@ class Metric(Base):
     """
     
     __tablename__ = "metrics"
+    __table_args__ = (
+        # Metrics of a region (by-region API, cohort statistics); PostgreSQL
+        # also answers region statistics from the index alone
+        Index("ix_metrics_region_job_id", "region", "job_id", postgresql_include=["asymmetry_index"]),
+    )
     
     # Primary key
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
         default=uuid.uuid4,
-        index=True,
         doc="Unique metric identifier"
     )
     
@@ -0,0 +1,129 @@
+"""
+RegionStats model for materialized cohort statistics.
+
+One row per hippocampal region summarizes the asymmetry index of every
+stored metric of that region, so a job's standing in the cohort can be
+computed without scanning the metrics table.
+"""
+
+import math
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import JSON, Column, DateTime, Float, Integer, String
+
+from backend.core.database import Base
+
+# The asymmetry index lies in [-1, 1]; fixed-width bins over that range
+# give exact, mergeable and reversible counts (unlike t-digest or KLL,
+# which cannot un-insert a value)
+HISTOGRAM_LOW = -1.0
+HISTOGRAM_HIGH = 1.0
+HISTOGRAM_BINS = 2000
+BIN_WIDTH = (HISTOGRAM_HIGH - HISTOGRAM_LOW) / HISTOGRAM_BINS
+
+
+def histogram_bin(value: float) -> int:
+    """Histogram bin index of an asymmetry index."""
+    index = int((value - HISTOGRAM_LOW) / BIN_WIDTH)
+    return min(max(index, 0), HISTOGRAM_BINS - 1)
+
+
+class RegionStats(Base):
+    """
+    RegionStats model holding running statistics of one region.
+
+    Attributes:
+        region: Hippocampal subregion name
+        count: Number of metrics summarized
+        mean: Mean asymmetry index
+        m2: Sum of squared deviations from the mean (Welford)
+        histogram: Sparse bin counts, keyed by bin index as a string
+        updated_at: Timestamp of the last change
+    """
+
+    __tablename__ = "region_stats"
+
+    # Primary key
+    region = Column(
+        String(100),
+        primary_key=True,
+        doc="Hippocampal subregion name"
+    )
+
+    # Running moments
+    count = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Number of metrics summarized"
+    )
+
+    mean = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+        doc="Mean asymmetry index"
+    )
+
+    m2 = Column(
+        Float,
+        nullable=False,
+        default=0.0,
+        doc="Sum of squared deviations from the mean"
+    )
+
+    # Quantile sketch
+    histogram = Column(
+        JSON,
+        nullable=False,
+        default=dict,
+        doc="Sparse asymmetry index histogram {bin index: count}"
+    )
+
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Timestamp of the last change"
+    )
+
+    def __repr__(self) -> str:
+        """String representation of RegionStats."""
+        return f"<RegionStats(region={self.region}, count={self.count}, mean={self.mean:.4f})>"
+
+    @property
+    def std(self) -> Optional[float]:
+        """Sample standard deviation of the asymmetry index."""
+        if self.count < 2:
+            return None
+        return math.sqrt(max(self.m2, 0.0) / (self.count - 1))
+
+    def z_score(self, value: float) -> Optional[float]:
+        """Standard score of an asymmetry index within the cohort."""
+        std = self.std
+        if not std:
+            return None
+        return (value - self.mean) / std
+
+    def percentile_rank(self, value: float) -> Optional[float]:
+        """
+        Percentage of the cohort with a lower asymmetry index.
+
+        Values are assumed uniform within a bin, so the result is exact
+        up to one bin width (0.001) of asymmetry index.
+        """
+        if not self.count:
+            return None
+
+        target = histogram_bin(value)
+        below = 0.0
+        for index, n in self.histogram.items():
+            index = int(index)
+            if index < target:
+                below += n
+            elif index == target:
+                bin_low = HISTOGRAM_LOW + target * BIN_WIDTH
+                below += n * min(max((value - bin_low) / BIN_WIDTH, 0.0), 1.0)
+
+        return 100.0 * below / self.count
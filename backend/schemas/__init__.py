@@ -1,14 +1,20 @@
 """Pydantic schemas for API request/response validation."""
 
-from .job import JobCreate, JobResponse, JobStatus, JobUpdate
-from .metric import MetricCreate, MetricResponse
+from .batch import BatchJobStatus, BatchResponse
+from .job import JobCreate, JobEta, JobResponse, JobStatus, JobUpdate
+from .metric import CohortStatsResponse, MetricCreate, MetricRankResponse, MetricResponse
 
 __all__ = [
+    "BatchJobStatus",
+    "BatchResponse",
+    "CohortStatsResponse",
     "JobCreate",
+    "JobEta",
     "JobResponse",
     "JobStatus",
     "JobUpdate",
     "MetricCreate",
+    "MetricRankResponse",
     "MetricResponse",
 ]
 
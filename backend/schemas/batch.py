@@ -0,0 +1,111 @@
+"""
+Pydantic schemas for batch submission API operations.
+
+These schemas describe multi-scan submissions and their aggregate
+progress.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from .job import JobStatus
+
+
+class BatchJobStatus(BaseModel):
+    """
+    Schema for the status of one job within a batch.
+    """
+    
+    id: UUID = Field(
+        ...,
+        description="Job identifier"
+    )
+    
+    filename: str = Field(
+        ...,
+        description="Original filename"
+    )
+    
+    status: JobStatus = Field(
+        ...,
+        description="Current processing status"
+    )
+    
+    progress: int = Field(
+        default=0,
+        description="Processing progress percentage (0-100)",
+        ge=0,
+        le=100
+    )
+    
+    current_step: Optional[str] = Field(
+        None,
+        description="Current processing step description"
+    )
+    
+    error_message: Optional[str] = Field(
+        None,
+        description="Error details if failed"
+    )
+    
+    class Config:
+        """Pydantic configuration."""
+        from_attributes = True
+
+
+class BatchResponse(BaseModel):
+    """
+    Schema for batch API responses.
+    
+    Includes aggregate progress and per-job status.
+    """
+    
+    id: UUID = Field(
+        ...,
+        description="Unique batch identifier"
+    )
+    
+    name: Optional[str] = Field(
+        None,
+        description="Optional batch label"
+    )
+    
+    created_at: datetime = Field(
+        ...,
+        description="Batch submission timestamp"
+    )
+    
+    job_count: int = Field(
+        ...,
+        description="Number of jobs in the batch"
+    )
+    
+    progress: float = Field(
+        default=0.0,
+        description="Mean progress of all jobs (0-100)",
+        ge=0,
+        le=100
+    )
+    
+    status_counts: Dict[str, int] = Field(
+        default={},
+        description="Number of jobs per status"
+    )
+    
+    finished: bool = Field(
+        default=False,
+        description="True when every job is completed, failed or cancelled"
+    )
+    
+    jobs: List[BatchJobStatus] = Field(
+        default=[],
+        description="Per-job status"
+    )
+    
+    skipped: List[str] = Field(
+        default=[],
+        description="Submitted files that were not valid scans (submission only)"
+    )
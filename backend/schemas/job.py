@@ -41,6 +41,12 @@ class JobCreate(BaseModel):
         description="Storage path for the uploaded file",
         example="/data/uploads/patient_001_T1w.nii.gz"
     )
+    
+    blob_digest: Optional[str] = Field(
+        None,
+        description="SHA-256 digest of the uploaded file in the blob store",
+        example="9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+    )
 
 
 class JobUpdate(BaseModel):
@@ -94,6 +100,50 @@ class MetricSummary(BaseModel):
         from_attributes = True
 
 
+class JobEta(BaseModel):
+    """
+    Estimated start and completion of an active job.
+    
+    Projected from the queue ahead of the job and the p50/p90 durations
+    of recently completed jobs of the same input kind.
+    """
+    
+    profile: str = Field(
+        ...,
+        description="Duration profile (nifti, dicom or archive)"
+    )
+    
+    queue_position: int = Field(
+        ...,
+        description="Pending jobs ahead of this one"
+    )
+    
+    jobs_in_flight: int = Field(
+        ...,
+        description="Jobs currently processing"
+    )
+    
+    deferred: bool = Field(
+        False,
+        description="Accepted but not enqueued until the queue drains"
+    )
+    
+    estimated_start_at: datetime = Field(
+        ...,
+        description="Expected processing start (UTC)"
+    )
+    
+    estimated_completion_at: datetime = Field(
+        ...,
+        description="Expected completion at median durations (UTC)"
+    )
+    
+    estimated_completion_p90_at: datetime = Field(
+        ...,
+        description="Completion at 90th percentile durations (UTC)"
+    )
+
+
 class JobResponse(BaseModel):
     """
     Schema for job API responses.
@@ -116,6 +166,11 @@ class JobResponse(BaseModel):
         description="Storage path"
     )
     
+    batch_id: Optional[UUID] = Field(
+        None,
+        description="Batch this job was submitted with"
+    )
+    
     status: JobStatus = Field(
         ...,
         description="Current processing status"
@@ -146,6 +201,16 @@ class JobResponse(BaseModel):
         description="Output directory path"
     )
     
+    series_instance_uid: Optional[str] = Field(
+        None,
+        description="DICOM series selected from a study archive"
+    )
+    
+    series_description: Optional[str] = Field(
+        None,
+        description="Description of the selected series"
+    )
+    
     progress: int = Field(
         default=0,
         description="Processing progress percentage (0-100)",
@@ -163,6 +228,11 @@ class JobResponse(BaseModel):
         description="Associated hippocampal metrics"
     )
     
+    eta: Optional[JobEta] = Field(
+        None,
+        description="Estimated start and completion (pending and running jobs)"
+    )
+    
     class Config:
         """Pydantic configuration."""
         from_attributes = True
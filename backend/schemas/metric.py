@@ -6,7 +6,7 @@ metric-related API requests and responses.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field, validator
@@ -115,3 +115,86 @@ class MetricResponse(BaseModel):
         """Pydantic configuration."""
         from_attributes = True
 
+
+
+class Histogram(BaseModel):
+    """Fixed-width histogram of one metric field."""
+    
+    edges: List[float] = Field(
+        ...,
+        description="Bin edges (bins + 1 values)"
+    )
+    
+    counts: List[int] = Field(
+        ...,
+        description="Number of values per bin"
+    )
+
+
+class FieldStats(BaseModel):
+    """Summary statistics of one metric field across a cohort."""
+    
+    count: int = Field(..., description="Number of values")
+    mean: Optional[float] = Field(None, description="Arithmetic mean")
+    std: Optional[float] = Field(None, description="Sample standard deviation")
+    min: Optional[float] = Field(None, description="Smallest value")
+    max: Optional[float] = Field(None, description="Largest value")
+    
+    percentiles: Dict[str, float] = Field(
+        ...,
+        description="Linearly interpolated percentiles keyed by percent",
+        example={"5": -0.08, "50": 0.01, "95": 0.09}
+    )
+    
+    histogram: Histogram = Field(
+        ...,
+        description="Histogram over [min, max]"
+    )
+
+
+class CohortStatsResponse(BaseModel):
+    """
+    Schema for cohort statistics responses.
+    
+    Aggregates asymmetry_index, left_volume and right_volume over all
+    metrics matching the filters.
+    """
+    
+    region: Optional[str] = Field(None, description="Region filter")
+    status: Optional[str] = Field(None, description="Job status filter")
+    start: Optional[datetime] = Field(None, description="Earliest job creation time (inclusive)")
+    end: Optional[datetime] = Field(None, description="Latest job creation time (exclusive)")
+    
+    count: int = Field(
+        ...,
+        description="Number of matching metrics"
+    )
+    
+    fields: Dict[str, FieldStats] = Field(
+        ...,
+        description="Statistics keyed by field name"
+    )
+
+
+class MetricRankResponse(BaseModel):
+    """
+    Schema for a metric's position within its region's cohort.
+    """
+    
+    region: str = Field(..., description="Hippocampal subregion name")
+    asymmetry_index: float = Field(..., description="Asymmetry index of this job")
+    cohort_count: int = Field(..., description="Number of metrics of the region in the cohort")
+    cohort_mean: Optional[float] = Field(None, description="Cohort mean asymmetry index")
+    cohort_std: Optional[float] = Field(None, description="Cohort sample standard deviation")
+    
+    z_score: Optional[float] = Field(
+        None,
+        description="Standard score within the cohort"
+    )
+    
+    percentile_rank: Optional[float] = Field(
+        None,
+        ge=0,
+        le=100,
+        description="Percentage of the cohort with a lower asymmetry index"
+    )
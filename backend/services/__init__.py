@@ -1,10 +1,20 @@
 """Business logic services for NeuroInsight application."""
 
+from .admission_service import AdmissionService
+from .artifact_service import ArtifactService
+from .async_job_service import AsyncJobService
+from .async_metric_service import AsyncMetricService
+from .batch_service import BatchService
+from .blob_service import BlobService
 from .cleanup_service import CleanupService
+from .cohort_dataset_service import CohortDatasetService
+from .cohort_stats_service import CohortStatsService
 from .job_service import JobService
 from .metric_service import MetricService
+from .progress_reporter import ProgressReporter
+from .region_stats_service import RegionStatsService
 from .storage_service import StorageService
 from .task_management_service import TaskManagementService
 
-__all__ = ["CleanupService", "JobService", "MetricService", "StorageService", "TaskManagementService"]
+__all__ = ["AdmissionService", "ArtifactService", "AsyncJobService", "AsyncMetricService", "BatchService", "BlobService", "CleanupService", "CohortDatasetService", "CohortStatsService", "JobService", "MetricService", "ProgressReporter", "RegionStatsService", "StorageService", "TaskManagementService"]
 
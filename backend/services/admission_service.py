@@ -0,0 +1,347 @@
+"""
+Queue-aware admission control and completion time estimates.
+
+Before an upload is stored, the work already enqueued (running jobs and
+the pending queue) is scheduled onto the FastSurfer slots
+(``MAX_CONCURRENT_JOBS``) with historical job durations to project how
+long a new job would wait. Past ``ADMISSION_MAX_WAIT_SECONDS`` the
+upload is refused with 429 and a Retry-After, or, with
+``ADMISSION_BACKPRESSURE=defer``, accepted without being enqueued;
+``release_deferred`` enqueues deferred jobs oldest first as the queue
+drains. Disk usage of the upload volume past
+``ADMISSION_MAX_DISK_USAGE`` always refuses uploads.
+
+Durations are the p50/p90 processing times (started to completed) of
+recent completed jobs per profile, i.e. input kind: a NIfTI file, a
+DICOM series to convert, or a study archive that also needs series
+discovery. Percentiles are cached for ``ADMISSION_STATS_CACHE_SECONDS``.
+"""
+
+import heapq
+import math
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.models import Job
+from backend.models.job import JobStatus
+from pipeline.utils.series_discovery import is_archive
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+PROFILES = ("nifti", "dicom", "archive")
+
+# Profiles with fewer completed jobs use the durations of all profiles
+MIN_PROFILE_SAMPLES = 5
+
+# current_step of jobs accepted but not enqueued yet
+DEFERRED_STEP = "Deferred - waiting for processing capacity"
+
+_durations_lock = threading.Lock()
+_durations: Dict = {"expires": 0.0, "stats": None}
+
+
+def job_profile(filename: str) -> str:
+    """
+    Get the duration profile of a scan from its filename.
+
+    Args:
+        filename: Original filename
+
+    Returns:
+        "nifti", "dicom" or "archive"
+    """
+    name = filename.lower()
+    if is_archive(Path(name)):
+        return "archive"
+    if name.endswith((".nii", ".nii.gz")):
+        return "nifti"
+    return "dicom"
+
+
+@dataclass
+class AdmissionDecision:
+    """Outcome of an admission check."""
+
+    admitted: bool
+    deferred: bool = False
+    reason: Optional[str] = None
+    retry_after: Optional[int] = None
+    projected_wait_seconds: float = 0.0
+
+
+def _queue_delay(slots: int, running_remaining: Sequence[float], ahead: Sequence[float]) -> float:
+    """
+    Schedule queued jobs onto FastSurfer slots.
+
+    Args:
+        slots: Number of FastSurfer slots
+        running_remaining: Remaining seconds of each running job
+        ahead: Durations of the queued jobs, in queue order
+
+    Returns:
+        Seconds from now until a job queued behind ``ahead`` starts
+    """
+    slots = max(1, slots)
+    # Running jobs past FastSurfer no longer hold a slot; the ones with
+    # the most work left do
+    free_at = sorted(running_remaining, reverse=True)[:slots]
+    free_at += [0.0] * (slots - len(free_at))
+    heapq.heapify(free_at)
+
+    for duration in ahead:
+        heapq.heappush(free_at, heapq.heappop(free_at) + duration)
+    return free_at[0]
+
+
+class AdmissionService:
+    """
+    Service class for admission decisions and job ETAs.
+    """
+
+    @staticmethod
+    def durations(db: Session) -> Dict[str, Dict[str, float]]:
+        """
+        Get p50/p90 processing durations per profile (cached).
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary of profile -> {"p50", "p90", "samples"}
+        """
+        with _durations_lock:
+            if _durations["stats"] is not None and _durations["expires"] > time.monotonic():
+                return _durations["stats"]
+
+        rows = db.execute(
+            select(Job.filename, Job.started_at, Job.completed_at)
+            .where(Job.status == JobStatus.COMPLETED, Job.started_at.is_not(None))
+            .order_by(Job.completed_at.desc())
+            .limit(settings.admission_history_size)
+        ).all()
+
+        samples: Dict[str, List[float]] = {profile: [] for profile in PROFILES}
+        for filename, started_at, completed_at in rows:
+            seconds = (completed_at - started_at).total_seconds()
+            if seconds > 0:
+                samples[job_profile(filename)].append(seconds)
+        everything = [seconds for values in samples.values() for seconds in values]
+
+        def percentiles(values):
+            if not values:
+                default = settings.admission_default_job_seconds
+                return {"p50": default, "p90": default, "samples": 0}
+            p50, p90 = np.percentile(values, [50, 90])
+            return {"p50": float(p50), "p90": float(p90), "samples": len(values)}
+
+        stats = {
+            profile: percentiles(values if len(values) >= MIN_PROFILE_SAMPLES else everything)
+            for profile, values in samples.items()
+        }
+
+        with _durations_lock:
+            _durations["stats"] = stats
+            _durations["expires"] = time.monotonic() + settings.admission_stats_cache_seconds
+        return stats
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop the cached durations."""
+        with _durations_lock:
+            _durations["stats"] = None
+
+    @staticmethod
+    def _queue(db: Session) -> Tuple[List[Tuple[str, datetime]], List[Tuple]]:
+        """Running jobs (filename, started_at) and pending jobs in queue order."""
+        running = db.execute(
+            select(Job.filename, Job.started_at).where(Job.status == JobStatus.RUNNING)
+        ).all()
+        pending = db.execute(
+            select(Job.id, Job.filename, Job.current_step)
+            .where(Job.status == JobStatus.PENDING)
+            .order_by(Job.created_at, Job.id)
+        ).all()
+        return running, pending
+
+    @staticmethod
+    def _start_delay(db: Session, running: Sequence, ahead: Sequence[str], now: datetime) -> Dict[str, float]:
+        """
+        Project when a job queued behind ``ahead`` (filenames) would start.
+
+        Returns:
+            Dictionary with the start delay at p50 and at p90 durations
+        """
+        durations = AdmissionService.durations(db)
+
+        delays = {}
+        for quantile in ("p50", "p90"):
+            remaining = [
+                max(0.0, durations[job_profile(filename)][quantile] - (now - (started_at or now)).total_seconds())
+                for filename, started_at in running
+            ]
+            queued = [durations[job_profile(filename)][quantile] for filename in ahead]
+            delays[quantile] = _queue_delay(settings.max_concurrent_jobs, remaining, queued)
+        return delays
+
+    @staticmethod
+    def admit(db: Session, now: Optional[datetime] = None) -> AdmissionDecision:
+        """
+        Decide whether a new upload is accepted.
+
+        Args:
+            db: Database session
+            now: Current time (UTC, naive like the job timestamps)
+
+        Returns:
+            AdmissionDecision
+        """
+        mode = settings.admission_backpressure
+        if mode == "off":
+            return AdmissionDecision(admitted=True)
+
+        # Deferring would still store the upload, so disk pressure always refuses
+        usage = AdmissionService.disk_usage()
+        if usage is not None and usage > settings.admission_max_disk_usage:
+            logger.warning("admission_refused_disk", disk_usage=round(usage, 3))
+            return AdmissionDecision(
+                admitted=False,
+                reason="Storage is nearly full; please retry later",
+                retry_after=settings.admission_disk_retry_after_seconds,
+            )
+
+        running, pending = AdmissionService._queue(db)
+        enqueued = [filename for _, filename, step in pending if step != DEFERRED_STEP]
+        wait = AdmissionService._start_delay(db, running, enqueued, now or datetime.utcnow())["p50"]
+        if wait <= settings.admission_max_wait_seconds:
+            return AdmissionDecision(admitted=True, projected_wait_seconds=wait)
+
+        if mode == "defer":
+            logger.info("admission_deferred", projected_wait_seconds=round(wait))
+            return AdmissionDecision(admitted=True, deferred=True, projected_wait_seconds=wait)
+
+        retry_after = max(1, math.ceil(wait - settings.admission_max_wait_seconds))
+        logger.warning("admission_refused_queue", projected_wait_seconds=round(wait), retry_after=retry_after)
+        return AdmissionDecision(
+            admitted=False,
+            reason=f"Processing queue is full (projected wait {round(wait / 3600, 1)} h); please retry later",
+            retry_after=retry_after,
+            projected_wait_seconds=wait,
+        )
+
+    @staticmethod
+    def disk_usage() -> Optional[float]:
+        """Used fraction of the upload volume, or None if unavailable."""
+        try:
+            usage = shutil.disk_usage(settings.upload_dir)
+        except OSError:
+            return None
+        return usage.used / usage.total if usage.total else None
+
+    @staticmethod
+    def job_eta(db: Session, job: Job, now: Optional[datetime] = None) -> Optional[Dict]:
+        """
+        Estimate when an active job starts and completes.
+
+        Args:
+            db: Database session
+            job: Job instance
+            now: Current time (UTC, naive like the job timestamps)
+
+        Returns:
+            ETA dictionary (see schemas.JobEta), or None for finished jobs
+        """
+        if job.status not in (JobStatus.PENDING, JobStatus.RUNNING):
+            return None
+
+        now = now or datetime.utcnow()
+        profile = job_profile(job.filename)
+        duration = AdmissionService.durations(db)[profile]
+
+        running, pending = AdmissionService._queue(db)
+
+        if job.status == JobStatus.RUNNING:
+            elapsed = (now - (job.started_at or now)).total_seconds()
+            return {
+                "profile": profile,
+                "queue_position": 0,
+                "jobs_in_flight": len(running),
+                "deferred": False,
+                "estimated_start_at": job.started_at or now,
+                "estimated_completion_at": now + timedelta(seconds=max(0.0, duration["p50"] - elapsed)),
+                "estimated_completion_p90_at": now + timedelta(seconds=max(0.0, duration["p90"] - elapsed)),
+            }
+
+        ids = [job_id for job_id, _, _ in pending]
+        position = ids.index(job.id) if job.id in ids else len(ids)
+        ahead = [filename for _, filename, _ in pending[:position]]
+        delays = AdmissionService._start_delay(db, running, ahead, now)
+        return {
+            "profile": profile,
+            "queue_position": position,
+            "jobs_in_flight": len(running),
+            "deferred": job.current_step == DEFERRED_STEP,
+            "estimated_start_at": now + timedelta(seconds=delays["p50"]),
+            "estimated_completion_at": now + timedelta(seconds=delays["p50"] + duration["p50"]),
+            "estimated_completion_p90_at": now + timedelta(seconds=delays["p90"] + duration["p90"]),
+        }
+
+    @staticmethod
+    def defer_jobs(db: Session, job_ids: Sequence) -> None:
+        """
+        Mark accepted jobs as deferred instead of enqueueing them.
+
+        Args:
+            db: Database session
+            job_ids: Job identifiers
+        """
+        for job in db.execute(select(Job).where(Job.id.in_(list(job_ids)))).scalars():
+            job.current_step = DEFERRED_STEP
+        db.commit()
+        logger.info("jobs_deferred", job_count=len(job_ids))
+
+    @staticmethod
+    def release_deferred(db: Session, enqueue: Callable, now: Optional[datetime] = None) -> int:
+        """
+        Enqueue deferred jobs, oldest first, while the queue has room.
+
+        Args:
+            db: Database session
+            enqueue: Function(job_id) starting a job's processing
+            now: Current time (UTC, naive like the job timestamps)
+
+        Returns:
+            Number of jobs enqueued
+        """
+        released = 0
+        while True:
+            running, pending = AdmissionService._queue(db)
+            deferred = [job_id for job_id, _, step in pending if step == DEFERRED_STEP]
+            if not deferred:
+                break
+
+            enqueued = [filename for _, filename, step in pending if step != DEFERRED_STEP]
+            wait = AdmissionService._start_delay(db, running, enqueued, now or datetime.utcnow())["p50"]
+            if wait > settings.admission_max_wait_seconds:
+                break
+
+            job = db.get(Job, deferred[0])
+            job.current_step = None
+            db.commit()
+            enqueue(job.id)
+            released += 1
+
+        if released:
+            logger.info("deferred_jobs_released", job_count=released)
+        return released
@@ -0,0 +1,320 @@
+"""
+Artifact service for visualization bundles and manifests.
+
+This service lists a job's visualization artifacts, keeps a manifest of
+their sizes and hashes, and packs all overlay images into a single
+response so the viewer does not issue one request per slice.
+"""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+MANIFEST_CACHE_NAME = ".manifest_cache.json"
+
+# Overlay file name patterns -> (layer, seg_type)
+OVERLAY_PATTERNS = [
+    (re.compile(r"^anatomical_(?P<slice>.+)\.png$"), "anatomical", "whole"),
+    (re.compile(r"^hippocampus_overlay_(?P<slice>.+)\.png$"), "overlay", "whole"),
+    (re.compile(r"^subfields_overlay_(?P<slice>.+)\.png$"), "overlay", "subfields"),
+    (re.compile(r"^hippocampus_(?P<slice>.+)\.png$"), "combined", "whole"),
+    (re.compile(r"^subfields_(?P<slice>.+)\.png$"), "combined", "subfields"),
+]
+
+ORIENTATIONS = ("axial", "coronal", "sagittal")
+
+
+class _StreamBuffer:
+    """Write-only file object that collects zip output for streaming."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ArtifactService:
+    """
+    Service class for visualization artifact listings and bundles.
+
+    All methods work on the job's output directory only; callers decide
+    whether the job may be served.
+    """
+
+    @staticmethod
+    def visualizations_dir(job_id: UUID) -> Path:
+        """Get the visualization directory of a job."""
+        return Path(settings.output_dir) / str(job_id) / "visualizations"
+
+    @staticmethod
+    def list_artifacts(job_id: UUID) -> List[Tuple[str, os.stat_result]]:
+        """
+        List all visualization artifacts with their stat results.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Sorted list of (relative POSIX path, stat result)
+        """
+        root = ArtifactService.visualizations_dir(job_id)
+        artifacts = []
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    artifacts.append((path.relative_to(root).as_posix(), path.stat()))
+                except FileNotFoundError:
+                    continue
+        artifacts.sort(key=lambda item: item[0])
+        return artifacts
+
+    @staticmethod
+    def parse_overlay(relative_path: str) -> Optional[Dict[str, str]]:
+        """
+        Parse an overlay path into orientation, layer, seg_type and slice.
+
+        Args:
+            relative_path: Path relative to the visualization directory
+
+        Returns:
+            Overlay descriptor, or None if the path is not an overlay image
+        """
+        parts = relative_path.split("/")
+        if len(parts) != 3 or parts[0] != "overlays" or parts[1] not in ORIENTATIONS:
+            return None
+        for pattern, layer, seg_type in OVERLAY_PATTERNS:
+            match = pattern.match(parts[2])
+            if match:
+                return {
+                    "orientation": parts[1],
+                    "layer": layer,
+                    "seg_type": seg_type,
+                    "slice_id": match.group("slice"),
+                }
+        return None
+
+    @staticmethod
+    def list_overlays(job_id: UUID, orientation: Optional[str] = None) -> List[Tuple[str, os.stat_result, Dict]]:
+        """
+        List overlay images, optionally for one orientation.
+
+        Args:
+            job_id: Job identifier
+            orientation: Restrict to one orientation
+
+        Returns:
+            Sorted list of (relative path, stat result, overlay descriptor)
+        """
+        overlays = []
+        for relative_path, stat_result in ArtifactService.list_artifacts(job_id):
+            descriptor = ArtifactService.parse_overlay(relative_path)
+            if descriptor and (orientation is None or descriptor["orientation"] == orientation):
+                overlays.append((relative_path, stat_result, descriptor))
+        return overlays
+
+    @staticmethod
+    def signature(entries) -> str:
+        """
+        Compute a version signature from artifact paths, mtimes and sizes.
+
+        Args:
+            entries: Iterable of (relative path, stat result, ...) tuples
+
+        Returns:
+            Hex digest identifying the current set of files
+        """
+        digest = hashlib.sha1()
+        for entry in entries:
+            relative_path, stat_result = entry[0], entry[1]
+            digest.update(f"{relative_path}:{stat_result.st_mtime_ns}:{stat_result.st_size};".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _file_sha256(path: Path) -> str:
+        """Hash a file in chunks."""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def build_manifest(job_id: UUID) -> Dict:
+        """
+        Build the manifest of all visualization artifacts.
+
+        SHA-256 hashes are cached in a hidden file next to the artifacts
+        and recomputed only for files whose mtime or size changed.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Manifest dictionary with per-artifact size, hash and overlay info
+        """
+        root = ArtifactService.visualizations_dir(job_id)
+        cache_path = root / MANIFEST_CACHE_NAME
+        try:
+            with open(cache_path, "r") as f:
+                cache = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            cache = {}
+
+        artifacts = ArtifactService.list_artifacts(job_id)
+        new_cache = {}
+        entries = []
+        rehashed = 0
+        for relative_path, stat_result in artifacts:
+            key = f"{stat_result.st_mtime_ns}:{stat_result.st_size}"
+            cached = cache.get(relative_path)
+            if cached and cached.get("key") == key:
+                sha256 = cached["sha256"]
+            else:
+                sha256 = ArtifactService._file_sha256(root / relative_path)
+                rehashed += 1
+            new_cache[relative_path] = {"key": key, "sha256": sha256}
+
+            entry = {"path": relative_path, "size": stat_result.st_size, "sha256": sha256}
+            overlay = ArtifactService.parse_overlay(relative_path)
+            if overlay:
+                entry["overlay"] = overlay
+            entries.append(entry)
+
+        if rehashed or len(new_cache) != len(cache):
+            # Unique hidden temp file, so concurrent builds never share one
+            # and it is never listed as an artifact
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{MANIFEST_CACHE_NAME}.")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(new_cache, f)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                if tmp_path:
+                    Path(tmp_path).unlink(missing_ok=True)
+                logger.warning("manifest_cache_write_failed", job_id=str(job_id), error=str(e))
+
+        overlays = [e for e in entries if "overlay" in e]
+        logger.info(
+            "artifact_manifest_built",
+            job_id=str(job_id),
+            artifacts=len(entries),
+            rehashed=rehashed,
+        )
+
+        return {
+            "job_id": str(job_id),
+            "version": ArtifactService.signature(artifacts),
+            "artifact_count": len(entries),
+            "total_bytes": sum(e["size"] for e in entries),
+            "overlay_count": len(overlays),
+            "overlay_bytes": sum(e["size"] for e in overlays),
+            "artifacts": entries,
+        }
+
+    @staticmethod
+    def packed_index(job_id: UUID, overlays) -> Tuple[bytes, List[Dict], int]:
+        """
+        Build the JSON offset index of a packed bundle.
+
+        Args:
+            job_id: Job identifier
+            overlays: Overlay listing from list_overlays()
+
+        Returns:
+            Tuple of (encoded index, index entries, total image bytes)
+        """
+        index = []
+        offset = 0
+        for relative_path, stat_result, descriptor in overlays:
+            index.append({
+                "path": relative_path,
+                "offset": offset,
+                "length": stat_result.st_size,
+                **descriptor,
+            })
+            offset += stat_result.st_size
+
+        index_bytes = json.dumps({"job_id": str(job_id), "entries": index}).encode("utf-8")
+        return index_bytes, index, offset
+
+    @staticmethod
+    def packed_bundle_size(job_id: UUID, overlays) -> int:
+        """Exact byte length of the packed bundle (for Content-Length)."""
+        index_bytes, _, data_size = ArtifactService.packed_index(job_id, overlays)
+        return 4 + len(index_bytes) + data_size
+
+    @staticmethod
+    def iter_packed_bundle(job_id: UUID, overlays) -> Iterator[bytes]:
+        """
+        Stream overlays as one packed atlas.
+
+        Layout: 4-byte big-endian index length, UTF-8 JSON index, then the
+        concatenated PNG bytes. Index offsets are relative to the first
+        byte after the index.
+
+        Args:
+            job_id: Job identifier
+            overlays: Overlay listing from list_overlays()
+
+        Yields:
+            Bundle chunks
+        """
+        root = ArtifactService.visualizations_dir(job_id)
+        index_bytes, index, _ = ArtifactService.packed_index(job_id, overlays)
+        yield struct.pack(">I", len(index_bytes)) + index_bytes
+
+        for entry in index:
+            with open(root / entry["path"], "rb") as f:
+                data = f.read(entry["length"])
+            # Pad or truncate so offsets stay valid if a file changed mid-stream
+            yield data.ljust(entry["length"], b"\0")[:entry["length"]]
+
+    @staticmethod
+    def iter_zip_bundle(job_id: UUID, overlays) -> Iterator[bytes]:
+        """
+        Stream overlays as an uncompressed zip archive.
+
+        PNGs are already compressed, so entries are stored (no deflate)
+        and the archive is written incrementally.
+
+        Args:
+            job_id: Job identifier
+            overlays: Overlay listing from list_overlays()
+
+        Yields:
+            Zip archive chunks
+        """
+        root = ArtifactService.visualizations_dir(job_id)
+        buffer = _StreamBuffer()
+        with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as zf:
+            for relative_path, _, _ in overlays:
+                zf.write(root / relative_path, arcname=relative_path)
+                yield buffer.drain()
+        yield buffer.drain()
@@ -0,0 +1,329 @@
+"""
+Async read path for jobs.
+
+Used by the ``async def`` API routes that are polled most often (job
+list, job detail, status). Writes and worker-side operations stay on
+the sync JobService, which Celery tasks keep using unchanged.
+"""
+
+import base64
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import column, func, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.models import Job, Metric
+from backend.models.job import JobStatus
+from backend.services.job_cache import job_cache
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Below this many rows the planner estimate is not trusted; count exactly
+ESTIMATE_MIN_ROWS = 10000
+
+# (status or None) -> (expires_at, count)
+_count_cache: Dict[Optional[str], Tuple[float, int]] = {}
+
+
+def encode_cursor(job: Job) -> str:
+    """
+    Encode the keyset position after a job.
+
+    Args:
+        job: Last job of a page
+
+    Returns:
+        Opaque URL-safe cursor
+    """
+    raw = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Opaque cursor
+
+    Returns:
+        Tuple of (created_at, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(job_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _model_status(status) -> Optional[JobStatus]:
+    """Map an API status filter onto the model enum."""
+    return JobStatus(getattr(status, "value", status)) if status else None
+
+
+class AsyncJobService:
+    """
+    Service class for job reads on an AsyncSession.
+
+    Async sessions cannot lazy-load relationships, so every method loads
+    what the caller needs up front.
+    """
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: UUID, with_metrics: bool = False) -> Optional[Job]:
+        """
+        Retrieve a job by ID.
+
+        Terminal jobs are served from the shared job cache like
+        JobService.get_job.
+
+        Args:
+            db: Async database session
+            job_id: Job identifier
+            with_metrics: Also load the job's metrics
+
+        Returns:
+            Job instance if found, None otherwise
+        """
+        job = job_cache.lookup(job_id)
+        if job is not None:
+            job = await db.merge(job, load=False)
+            if with_metrics:
+                result = await db.execute(select(Metric).where(Metric.job_id == job_id))
+                set_committed_value(job, "metrics", list(result.scalars()))
+            return job
+
+        query = select(Job).where(Job.id == job_id)
+        if with_metrics:
+            query = query.options(selectinload(Job.metrics))
+        job = (await db.execute(query)).scalar_one_or_none()
+        if job is not None:
+            job_cache.put(job)
+
+        return job
+
+    @staticmethod
+    async def get_jobs(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[JobStatus] = None,
+        include_metrics: bool = True,
+    ) -> List[Job]:
+        """
+        Retrieve multiple jobs with offset pagination.
+
+        Prefer get_jobs_page for deep pages; offsets are scanned and
+        discarded by the database.
+
+        Args:
+            db: Async database session
+            skip: Number of records to skip (pagination)
+            limit: Maximum number of records to return
+            status: Filter by job status (optional)
+            include_metrics: Load metrics (one extra query per page)
+
+        Returns:
+            List of job instances
+        """
+        query = AsyncJobService._list_query(status, include_metrics)
+        query = query.order_by(Job.created_at.desc(), Job.id.desc()).offset(skip).limit(limit)
+        return list((await db.execute(query)).scalars())
+
+    @staticmethod
+    async def get_jobs_page(
+        db: AsyncSession,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        include_metrics: bool = True,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """
+        Retrieve a page of jobs with keyset pagination.
+
+        Jobs are ordered newest first on (created_at, id), which the
+        ix_jobs_created_at_id index serves directly, so every page costs
+        the same regardless of depth.
+
+        Args:
+            db: Async database session
+            limit: Maximum number of records to return
+            cursor: Cursor from the previous page (None for the first page)
+            status: Filter by job status (optional)
+            include_metrics: Load metrics (one extra query per page)
+
+        Returns:
+            Tuple of (jobs, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = AsyncJobService._list_query(status, include_metrics)
+        return await AsyncJobService._page(db, query, limit, cursor)
+
+    @staticmethod
+    async def search_jobs(
+        db: AsyncSession,
+        q: Optional[str] = None,
+        prefix: bool = False,
+        status: Optional[JobStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        completed_after: Optional[datetime] = None,
+        completed_before: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_metrics: bool = False,
+    ) -> Tuple[List[Job], Optional[str]]:
+        """
+        Search jobs by filename, status and date ranges.
+
+        Filename matching is case-insensitive and served by the search
+        index (see core.database.SEARCH_INDEX_DDL); results are paged
+        like get_jobs_page.
+
+        Args:
+            db: Async database session
+            q: Filename fragment (optional)
+            prefix: Match q at the start of the filename only
+            status: Filter by job status (optional)
+            created_after: Earliest creation time, inclusive (optional)
+            created_before: Latest creation time, exclusive (optional)
+            completed_after: Earliest completion time, inclusive (optional)
+            completed_before: Latest completion time, exclusive (optional)
+            limit: Maximum number of records to return
+            cursor: Cursor from the previous page (None for the first page)
+            include_metrics: Load metrics (one extra query per page)
+
+        Returns:
+            Tuple of (jobs, cursor of the next page or None)
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = AsyncJobService.search_query(
+            db.bind.dialect.name, q, prefix, status,
+            created_after, created_before, completed_after, completed_before, include_metrics,
+        )
+        return await AsyncJobService._page(db, query, limit, cursor)
+
+    @staticmethod
+    def search_query(
+        dialect: str,
+        q: Optional[str] = None,
+        prefix: bool = False,
+        status: Optional[JobStatus] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        completed_after: Optional[datetime] = None,
+        completed_before: Optional[datetime] = None,
+        include_metrics: bool = False,
+    ):
+        """Unpaged SELECT for search_jobs on the given SQL dialect."""
+        query = AsyncJobService._list_query(status, include_metrics)
+        if q:
+            query = query.where(*AsyncJobService._filename_filters(dialect, q, prefix))
+        if created_after:
+            query = query.where(Job.created_at >= created_after)
+        if created_before:
+            query = query.where(Job.created_at < created_before)
+        if completed_after:
+            query = query.where(Job.completed_at >= completed_after)
+        if completed_before:
+            query = query.where(Job.completed_at < completed_before)
+        return query
+
+    @staticmethod
+    def _filename_filters(dialect: str, q: str, prefix: bool) -> List:
+        """Filename match clauses that the dialect's search index can serve."""
+        if dialect == "sqlite" and len(q) >= 3:
+            # FTS5 trigram phrase query = case-insensitive substring match
+            phrase = '"' + q.replace('"', '""') + '"'
+            matches = text("SELECT job_id FROM jobs_fts WHERE jobs_fts MATCH :phrase").bindparams(phrase=phrase)
+            filters = [Job.id.in_(matches.columns(column("job_id")))]
+            if prefix:
+                filters.append(func.lower(func.substr(Job.filename, 1, len(q))) == q.lower())
+            return filters
+
+        # Trigram GIN index on PostgreSQL; fragments shorter than a
+        # trigram fall back to a scan on either database
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"{escaped}%" if prefix else f"%{escaped}%"
+        return [Job.filename.ilike(pattern, escape="\\")]
+
+    @staticmethod
+    async def _page(db: AsyncSession, query, limit: int, cursor: Optional[str]) -> Tuple[List[Job], Optional[str]]:
+        """Apply keyset pagination on (created_at, id) and run the query."""
+        if cursor:
+            created_at, job_id = decode_cursor(cursor)
+            query = query.where(tuple_(Job.created_at, Job.id) < tuple_(created_at, job_id))
+
+        query = query.order_by(Job.created_at.desc(), Job.id.desc()).limit(limit + 1)
+        jobs = list((await db.execute(query)).scalars())
+
+        next_cursor = encode_cursor(jobs[limit - 1]) if len(jobs) > limit else None
+        return jobs[:limit], next_cursor
+
+    @staticmethod
+    def _list_query(status, include_metrics: bool):
+        """Base SELECT for job listings."""
+        # Metrics come from one IN query per page instead of one per job
+        loader = selectinload(Job.metrics) if include_metrics else noload(Job.metrics)
+        query = select(Job).options(loader)
+
+        model_status = _model_status(status)
+        if model_status:
+            query = query.where(Job.status == model_status)
+
+        return query
+
+    @staticmethod
+    async def count_jobs(db: AsyncSession, status: Optional[JobStatus] = None) -> int:
+        """
+        Count jobs without scanning the table on every call.
+
+        Counts are reused for JOB_COUNT_CACHE_SECONDS. On PostgreSQL the
+        unfiltered total of a large table comes from the planner
+        estimate in pg_class; status counts use the status index.
+
+        Args:
+            db: Async database session
+            status: Filter by job status (optional)
+
+        Returns:
+            Number of jobs (approximate for large unfiltered tables)
+        """
+        model_status = _model_status(status)
+        key = model_status.value if model_status else None
+        cached = _count_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        count = None
+        if model_status is None and db.bind.dialect.name == "postgresql":
+            estimate = (await db.execute(
+                text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'jobs'::regclass")
+            )).scalar()
+            if estimate is not None and estimate >= ESTIMATE_MIN_ROWS:
+                count = int(estimate)
+
+        if count is None:
+            query = select(func.count()).select_from(Job)
+            if model_status:
+                query = query.where(Job.status == model_status)
+            count = (await db.execute(query)).scalar_one()
+
+        _count_cache[key] = (time.monotonic() + settings.job_count_cache_seconds, count)
+        return count
@@ -0,0 +1,104 @@
+"""
+Async read path for hippocampal metrics.
+
+Mirrors the read methods of MetricService for the ``async def``
+metrics routes.
+"""
+
+from typing import Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Metric, RegionStats
+
+
+class AsyncMetricService:
+    """
+    Service class for metric reads on an AsyncSession.
+    """
+
+    @staticmethod
+    async def get_metric(db: AsyncSession, metric_id: UUID) -> Optional[Metric]:
+        """
+        Retrieve a metric by ID.
+
+        Args:
+            db: Async database session
+            metric_id: Metric identifier
+
+        Returns:
+            Metric instance if found, None otherwise
+        """
+        return await db.get(Metric, metric_id)
+
+    @staticmethod
+    async def get_metrics_by_job(db: AsyncSession, job_id: UUID) -> List[Metric]:
+        """
+        Retrieve all metrics for a specific job.
+
+        Args:
+            db: Async database session
+            job_id: Job identifier
+
+        Returns:
+            List of metric instances
+        """
+        result = await db.execute(select(Metric).where(Metric.job_id == job_id))
+        return list(result.scalars())
+
+    @staticmethod
+    async def get_metrics_by_region(db: AsyncSession, region: str) -> List[Metric]:
+        """
+        Retrieve all metrics for a specific hippocampal region.
+
+        Args:
+            db: Async database session
+            region: Hippocampal subregion name
+
+        Returns:
+            List of metric instances
+        """
+        result = await db.execute(select(Metric).where(Metric.region == region))
+        return list(result.scalars())
+
+    @staticmethod
+    async def get_job_ranks(db: AsyncSession, job_id: UUID) -> List[Dict]:
+        """
+        Place each of a job's metrics within its region's cohort.
+
+        Reads the materialized RegionStats rows, so the cost does not
+        grow with the number of stored metrics.
+
+        Args:
+            db: Async database session
+            job_id: Job identifier
+
+        Returns:
+            One dictionary per metric with cohort size, mean, std,
+            z-score and percentile rank of its asymmetry index
+        """
+        metrics = await AsyncMetricService.get_metrics_by_job(db, job_id)
+        if not metrics:
+            return []
+
+        result = await db.execute(
+            select(RegionStats).where(RegionStats.region.in_({m.region for m in metrics}))
+        )
+        stats_by_region = {stats.region: stats for stats in result.scalars()}
+
+        ranks = []
+        for metric in sorted(metrics, key=lambda m: m.region):
+            stats = stats_by_region.get(metric.region)
+            ranks.append({
+                "region": metric.region,
+                "asymmetry_index": metric.asymmetry_index,
+                "cohort_count": stats.count if stats else 0,
+                "cohort_mean": stats.mean if stats and stats.count else None,
+                "cohort_std": stats.std if stats else None,
+                "z_score": stats.z_score(metric.asymmetry_index) if stats else None,
+                "percentile_rank": stats.percentile_rank(metric.asymmetry_index) if stats else None,
+            })
+
+        return ranks
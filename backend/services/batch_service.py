@@ -0,0 +1,161 @@
+"""
+Batch service for multi-scan submissions.
+
+This service creates the jobs of a batch in a single transaction and
+reports the aggregate progress of a batch with a single query.
+"""
+
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend.core.logging import get_logger
+from backend.models import Batch, Job
+from backend.models.job import JobStatus
+from backend.schemas import JobCreate
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+
+class BatchService:
+    """
+    Service class for batch-related operations.
+
+    Handles bulk job creation and batch status aggregation.
+    """
+
+    @staticmethod
+    def create_batch(
+        db: Session,
+        jobs: List[JobCreate],
+        name: Optional[str] = None,
+    ) -> Tuple[Batch, List[UUID]]:
+        """
+        Create a batch and all of its jobs in one transaction.
+
+        Job rows are written with a single executemany INSERT instead of
+        one ORM flush and commit per job.
+
+        Args:
+            db: Database session
+            jobs: Job creation data, one entry per scan
+            name: Optional batch label
+
+        Returns:
+            Tuple of (created batch, job ids in submission order)
+        """
+        now = datetime.utcnow()
+        batch = Batch(id=uuid.uuid4(), name=name, job_count=len(jobs), created_at=now)
+
+        job_ids = [uuid.uuid4() for _ in jobs]
+        rows = [
+            {
+                "id": job_id,
+                "filename": job_data.filename,
+                "file_path": job_data.file_path,
+                "blob_digest": job_data.blob_digest,
+                "batch_id": batch.id,
+                "status": JobStatus.PENDING,
+                "progress": 0,
+                "created_at": now,
+            }
+            for job_id, job_data in zip(job_ids, jobs)
+        ]
+
+        try:
+            db.add(batch)
+            db.flush()
+            if rows:
+                db.execute(insert(Job), rows)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        db.refresh(batch)
+
+        logger.info(
+            "batch_created",
+            batch_id=str(batch.id),
+            job_count=len(job_ids),
+        )
+
+        return batch, job_ids
+
+    @staticmethod
+    def get_batch_status(db: Session, batch_id: UUID) -> Optional[Dict]:
+        """
+        Get a batch with aggregate progress and per-job status.
+
+        The batch and its jobs are fetched with one outer-join query that
+        selects only the status columns (metrics are not loaded).
+
+        Args:
+            db: Database session
+            batch_id: Batch identifier
+
+        Returns:
+            Dictionary matching BatchResponse, or None if not found
+        """
+        rows = db.execute(
+            select(
+                Batch.id,
+                Batch.name,
+                Batch.created_at,
+                Batch.job_count,
+                Job.id.label("job_id"),
+                Job.filename,
+                Job.status,
+                Job.progress,
+                Job.current_step,
+                Job.error_message,
+            )
+            .outerjoin(Job, Job.batch_id == Batch.id)
+            .where(Batch.id == batch_id)
+            .order_by(Job.created_at, Job.filename)
+        ).all()
+
+        if not rows:
+            return None
+
+        first = rows[0]
+        jobs = [
+            {
+                "id": row.job_id,
+                "filename": row.filename,
+                "status": row.status.value,
+                # Finished jobs count as done even if progress was not bumped
+                "progress": 100 if row.status == JobStatus.COMPLETED else (row.progress or 0),
+                "current_step": row.current_step,
+                "error_message": row.error_message,
+            }
+            for row in rows
+            if row.job_id is not None
+        ]
+
+        status_counts: Dict[str, int] = {}
+        for row in rows:
+            if row.job_id is not None:
+                status_counts[row.status.value] = status_counts.get(row.status.value, 0) + 1
+
+        done_progress = [
+            100 if JobStatus(job["status"]) in TERMINAL_STATUSES else job["progress"]
+            for job in jobs
+        ]
+
+        return {
+            "id": first.id,
+            "name": first.name,
+            "created_at": first.created_at,
+            "job_count": first.job_count,
+            "progress": round(sum(done_progress) / len(done_progress), 1) if jobs else 0.0,
+            "status_counts": status_counts,
+            "finished": bool(jobs) and all(JobStatus(job["status"]) in TERMINAL_STATUSES for job in jobs),
+            "jobs": jobs,
+        }
@@ -0,0 +1,252 @@
+"""
+Blob service for content-addressed upload storage.
+
+This service keeps the reference counts of uploaded blobs in the
+database. A blob is removed from disk only when the last job that
+references it is deleted, and after the transaction that deleted its
+record has committed.
+"""
+
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy import delete, event, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.core.logging import get_logger
+from backend.models import Blob
+
+logger = get_logger(__name__)
+
+
+class BlobService:
+    """
+    Service class for blob reference counting.
+
+    Reference count changes are issued as single UPDATE statements so
+    concurrent uploads of the same scan never lose an increment.
+    """
+
+    @staticmethod
+    def get_blob(db: Session, digest: str) -> Optional[Blob]:
+        """
+        Retrieve a blob by digest.
+
+        Args:
+            db: Database session
+            digest: SHA-256 hex digest
+
+        Returns:
+            Blob instance if found, None otherwise
+        """
+        return db.query(Blob).filter(Blob.digest == digest).first()
+
+    @staticmethod
+    def acquire(db: Session, digest: str, size_bytes: int, storage_path: str) -> Blob:
+        """
+        Add a reference to a blob, creating the blob record if needed.
+
+        Args:
+            db: Database session
+            digest: SHA-256 hex digest
+            size_bytes: File size in bytes
+            storage_path: Path to the blob in the content-addressed store
+
+        Returns:
+            Blob instance with the updated reference count
+        """
+        now = datetime.utcnow()
+        increment = (
+            update(Blob)
+            .where(Blob.digest == digest)
+            .values(ref_count=Blob.ref_count + 1, last_referenced_at=now)
+        )
+
+        created = False
+        if db.execute(increment).rowcount == 0:
+            try:
+                db.add(Blob(
+                    digest=digest,
+                    size_bytes=size_bytes,
+                    storage_path=storage_path,
+                    ref_count=1,
+                    created_at=now,
+                    last_referenced_at=now,
+                ))
+                db.commit()
+                created = True
+            except IntegrityError:
+                # Another upload inserted the same digest first
+                db.rollback()
+                db.execute(increment)
+                db.commit()
+        else:
+            db.commit()
+
+        blob = BlobService.get_blob(db, digest)
+
+        logger.info(
+            "blob_acquired",
+            digest=digest,
+            created=created,
+            ref_count=blob.ref_count,
+            size_bytes=blob.size_bytes,
+        )
+
+        return blob
+
+    @staticmethod
+    def release(db: Session, digest: str) -> bool:
+        """
+        Drop a reference to a blob and delete it when unreferenced (no commit).
+
+        The blob record is deleted in the caller's transaction; its file
+        is removed once that transaction commits (see _remove_file).
+
+        Args:
+            db: Database session
+            digest: SHA-256 hex digest
+
+        Returns:
+            True if the blob reached zero references and will be deleted
+        """
+        blob = BlobService.get_blob(db, digest)
+        if not blob:
+            logger.warning("blob_not_found", digest=digest)
+            return False
+
+        storage_path = blob.storage_path
+
+        db.execute(
+            update(Blob)
+            .where(Blob.digest == digest, Blob.ref_count > 0)
+            .values(ref_count=Blob.ref_count - 1)
+        )
+
+        # Only the release that observes zero references removes the row
+        deleted = db.execute(
+            delete(Blob)
+            .where(Blob.digest == digest, Blob.ref_count <= 0)
+            .execution_options(synchronize_session=False)
+        ).rowcount == 1
+
+        if deleted:
+            BlobService._remove_after_commit(db, digest, storage_path)
+        else:
+            logger.info("blob_released", digest=digest)
+
+        return deleted
+
+    @staticmethod
+    def purge_unreferenced(db: Session, dry_run: bool = False) -> int:
+        """
+        Delete blobs whose reference count has dropped to zero.
+
+        Args:
+            db: Database session
+            dry_run: If True, only report what would be deleted
+
+        Returns:
+            Number of blobs deleted (or that would be deleted)
+        """
+        unreferenced = db.query(Blob).filter(Blob.ref_count <= 0).all()
+
+        for blob in unreferenced:
+            logger.info("unreferenced_blob_found", digest=blob.digest, dry_run=dry_run)
+            if not dry_run:
+                BlobService._remove_after_commit(db, blob.digest, blob.storage_path)
+                db.delete(blob)
+
+        if not dry_run:
+            db.commit()
+
+        return len(unreferenced)
+
+    @staticmethod
+    def _remove_after_commit(db: Session, digest: str, storage_path: str) -> None:
+        """Schedule a blob file for removal when the session's transaction commits."""
+        if "released_blobs" not in db.info:
+            db.info["released_blobs"] = []
+
+            @event.listens_for(db, "after_commit")
+            def remove_released(session):
+                released, session.info["released_blobs"] = session.info["released_blobs"], []
+                for pending in released:
+                    BlobService._remove_file(session.get_bind(), *pending)
+
+            @event.listens_for(db, "after_rollback")
+            def keep_released(session):
+                session.info["released_blobs"] = []
+
+        db.info["released_blobs"].append((digest, storage_path))
+
+    @staticmethod
+    def _remove_file(bind, digest: str, storage_path: str) -> None:
+        """
+        Remove the file of a deleted blob unless it was re-acquired meanwhile.
+
+        An upload of the same content may insert a new record right after
+        the delete committed and, seeing the file, discard its own copy.
+        The file is therefore first moved to a tombstone; if a record for
+        the digest exists by then, the file is moved back. An upload that
+        checks for the file after the move stores its own copy instead.
+        """
+        path = Path(storage_path)
+        tombstone = path.with_name(f".{path.name}.{uuid.uuid4().hex}.deleted")
+        try:
+            os.replace(path, tombstone)
+        except FileNotFoundError:
+            return
+
+        try:
+            with bind.connect() as conn:
+                reacquired = conn.execute(select(Blob.digest).where(Blob.digest == digest)).first() is not None
+        except Exception as e:
+            logger.warning("blob_recheck_failed", digest=digest, error=str(e))
+            reacquired = True
+
+        if reacquired:
+            os.replace(tombstone, path)
+            logger.info("blob_reacquired_during_delete", digest=digest)
+        else:
+            tombstone.unlink(missing_ok=True)
+            logger.info("blob_deleted", digest=digest, path=storage_path)
+
+    @staticmethod
+    def get_dedup_stats(db: Session) -> Dict[str, float]:
+        """
+        Compute deduplication statistics for the blob store.
+
+        Logical bytes count every job reference; physical bytes count
+        each unique blob once.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Dictionary with blob counts, byte totals and dedup ratio
+        """
+        blob_count, references, physical_bytes, logical_bytes = db.query(
+            func.count(Blob.digest),
+            func.coalesce(func.sum(Blob.ref_count), 0),
+            func.coalesce(func.sum(Blob.size_bytes), 0),
+            func.coalesce(func.sum(Blob.size_bytes * Blob.ref_count), 0),
+        ).filter(Blob.ref_count > 0).one()
+
+        physical_bytes = int(physical_bytes)
+        logical_bytes = int(logical_bytes)
+        saved_bytes = logical_bytes - physical_bytes
+
+        return {
+            "blob_count": int(blob_count),
+            "reference_count": int(references),
+            "logical_bytes": logical_bytes,
+            "physical_bytes": physical_bytes,
+            "saved_bytes": saved_bytes,
+            "saved_mb": saved_bytes / 1024 / 1024,
+            "dedup_ratio": (logical_bytes / physical_bytes) if physical_bytes else 1.0,
+        }
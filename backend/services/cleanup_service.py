@@ -8,6 +8,7 @@ This service provides long-term storage management:
 - Storage quota management
 """
 
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -18,13 +19,20 @@ from sqlalchemy.orm import Session
 from backend.core.config import get_settings
 from backend.core.database import SessionLocal
 from backend.core.logging import get_logger
-from backend.models import Job, Metric
+from backend.models import Job
 from backend.models.job import JobStatus
+from backend.services.blob_service import BlobService
+from backend.services.cohort_stats_service import cohort_stats_cache
+from backend.services.job_cache import job_cache
+from backend.services.metric_service import MetricService
 from backend.services.storage_service import StorageService
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Staged uploads older than this are leftovers from interrupted uploads
+STAGING_MAX_AGE_SECONDS = 3600
+
 
 class CleanupService:
     """
@@ -37,12 +45,17 @@ class CleanupService:
         self.uploads_dir = Path(settings.upload_dir)
         self.outputs_dir = Path(settings.output_dir)
     
-    def delete_job_files(self, job: Job) -> Tuple[int, int]:
+    def delete_job_files(self, job: Job, db: Optional[Session] = None) -> Tuple[int, int]:
         """
         Delete all files associated with a job.
         
+        The job's upload is a hard link into the blob store, so removing it
+        only drops this job's reference. The blob itself is deleted once its
+        reference count reaches zero.
+        
         Args:
             job: Job instance
+            db: Database session (required to release the job's blob reference)
             
         Returns:
             Tuple of (upload_files_deleted, output_files_deleted)
@@ -59,6 +72,16 @@ class CleanupService:
             except Exception as e:
                 logger.warning("job_upload_file_delete_failed", job_id=str(job.id), error=str(e))
         
+        # Release the blob reference (blob is removed when no job uses it)
+        if job.blob_digest and db is not None:
+            digest = job.blob_digest
+            try:
+                job.blob_digest = None
+                db.flush()
+                BlobService.release(db, digest)
+            except Exception as e:
+                logger.warning("job_blob_release_failed", job_id=str(job.id), digest=digest, error=str(e))
+        
         # Delete output directory
         output_dir = self.outputs_dir / str(job.id)
         if output_dir.exists():
@@ -97,6 +120,7 @@ class CleanupService:
         ).all()
         
         jobs_deleted = 0
+        deleted_ids = []
         upload_files_deleted = 0
         output_dirs_deleted = 0
         
@@ -111,19 +135,25 @@ class CleanupService:
             
             if not dry_run:
                 # Delete associated metrics
-                db.query(Metric).filter(Metric.job_id == job.id).delete()
+                MetricService.delete_job_metrics(db, job.id)
                 
                 # Delete files
-                upload_del, output_del = self.delete_job_files(job)
+                upload_del, output_del = self.delete_job_files(job, db)
                 upload_files_deleted += upload_del
                 output_dirs_deleted += output_del
                 
                 # Delete job record
                 db.delete(job)
+                deleted_ids.append(job.id)
                 jobs_deleted += 1
         
         if not dry_run:
             db.commit()
+            # After the commit, so no reader caches a row being deleted
+            for job_id in deleted_ids:
+                job_cache.invalidate(job_id)
+            if jobs_deleted:
+                cohort_stats_cache.invalidate()
         
         return (jobs_deleted, upload_files_deleted, output_dirs_deleted)
     
@@ -152,6 +182,7 @@ class CleanupService:
         ).all()
         
         jobs_deleted = 0
+        deleted_ids = []
         upload_files_deleted = 0
         output_dirs_deleted = 0
         
@@ -166,19 +197,25 @@ class CleanupService:
             
             if not dry_run:
                 # Delete associated metrics
-                db.query(Metric).filter(Metric.job_id == job.id).delete()
+                MetricService.delete_job_metrics(db, job.id)
                 
                 # Delete files
-                upload_del, output_del = self.delete_job_files(job)
+                upload_del, output_del = self.delete_job_files(job, db)
                 upload_files_deleted += upload_del
                 output_dirs_deleted += output_del
                 
                 # Delete job record
                 db.delete(job)
+                deleted_ids.append(job.id)
                 jobs_deleted += 1
         
         if not dry_run:
             db.commit()
+            # After the commit, so no reader caches a row being deleted
+            for job_id in deleted_ids:
+                job_cache.invalidate(job_id)
+            if jobs_deleted:
+                cohort_stats_cache.invalidate()
         
         return (jobs_deleted, upload_files_deleted, output_dirs_deleted)
     
@@ -186,6 +223,10 @@ class CleanupService:
         """
         Find and clean up files/directories with no corresponding job.
         
+        Upload ownership comes from the database: a file in the upload
+        directory is orphaned when no job references it, and a blob is
+        orphaned when it has no blob record or zero references.
+        
         Args:
             db: Database session
             dry_run: If True, only report what would be deleted
@@ -193,37 +234,42 @@ class CleanupService:
         Returns:
             Tuple of (orphaned_uploads_deleted, orphaned_outputs_deleted)
         """
-        # Get all job IDs from database
-        all_jobs = db.query(Job).all()
-        valid_job_ids = {str(job.id) for job in all_jobs}
+        # Get job IDs and upload paths from database
+        job_rows = db.query(Job.id, Job.file_path).all()
+        valid_job_ids = {str(job_id) for job_id, _ in job_rows}
+        # Resolved, so relative or symlinked job paths still match the listing
+        valid_upload_paths = {Path(file_path).resolve() for _, file_path in job_rows if file_path}
         
         orphaned_uploads = 0
         orphaned_outputs = 0
         
-        # Check upload files
+        # Check per-job upload files (hard links into the blob store)
         if self.uploads_dir.exists():
             for upload_file in self.uploads_dir.glob("*"):
-                if not upload_file.is_file():
+                if not upload_file.is_file() or upload_file.name.startswith("."):
+                    continue
+                
+                if upload_file.resolve() in valid_upload_paths:
                     continue
                 
-                # Extract UUID from filename (format: uuid_filename.ext)
-                filename = upload_file.name
-                if '_' in filename:
-                    potential_uuid = filename.split('_')[0]
-                    if len(potential_uuid) == 36:  # UUID length
-                        if potential_uuid not in valid_job_ids:
-                            logger.info(
-                                "orphaned_upload_found",
-                                file=filename,
-                                dry_run=dry_run
-                            )
-                            
-                            if not dry_run:
-                                try:
-                                    upload_file.unlink()
-                                    orphaned_uploads += 1
-                                except Exception as e:
-                                    logger.warning("orphaned_upload_delete_failed", file=filename, error=str(e))
+                logger.info(
+                    "orphaned_upload_found",
+                    file=upload_file.name,
+                    dry_run=dry_run
+                )
+                
+                if not dry_run:
+                    try:
+                        upload_file.unlink()
+                        orphaned_uploads += 1
+                    except Exception as e:
+                        logger.warning("orphaned_upload_delete_failed", file=upload_file.name, error=str(e))
+        
+        # Check blob store: unreferenced records, then files without a record
+        purged_blobs = BlobService.purge_unreferenced(db, dry_run=dry_run)
+        if not dry_run:
+            orphaned_uploads += purged_blobs
+        orphaned_uploads += self._cleanup_orphaned_blobs(db, dry_run=dry_run)
         
         # Check output directories
         if self.outputs_dir.exists():
@@ -250,10 +296,52 @@ class CleanupService:
         
         return (orphaned_uploads, orphaned_outputs)
     
-    def get_storage_stats(self) -> dict:
+    def _cleanup_orphaned_blobs(self, db: Session, dry_run: bool = False) -> int:
+        """Delete blob files with no referenced blob record and stale staged uploads."""
+        from backend.models import Blob
+        
+        blobs_dir = self.uploads_dir / "blobs"
+        if not blobs_dir.exists():
+            return 0
+        
+        referenced = {
+            digest for (digest,) in db.query(Blob.digest).filter(Blob.ref_count > 0).all()
+        }
+        now = time.time()
+        deleted = 0
+        
+        for blob_file in blobs_dir.rglob("*"):
+            if not blob_file.is_file():
+                continue
+            
+            if blob_file.parent.name == ".staging":
+                # Only remove staged files from interrupted uploads
+                if now - blob_file.stat().st_mtime < STAGING_MAX_AGE_SECONDS:
+                    continue
+            elif blob_file.name in referenced:
+                continue
+            
+            logger.info("orphaned_blob_found", file=blob_file.name, dry_run=dry_run)
+            
+            if not dry_run:
+                try:
+                    blob_file.unlink()
+                    deleted += 1
+                except Exception as e:
+                    logger.warning("orphaned_blob_delete_failed", file=blob_file.name, error=str(e))
+        
+        return deleted
+    
+    def get_storage_stats(self, db: Optional[Session] = None) -> dict:
         """
         Get storage usage statistics.
         
+        Upload sizes count each inode once, so hard-linked duplicates do
+        not inflate the totals.
+        
+        Args:
+            db: Database session (optional, enables deduplication statistics)
+        
         Returns:
             Dictionary with storage statistics
         """
@@ -263,10 +351,17 @@ class CleanupService:
         output_count = 0
         
         if self.uploads_dir.exists():
-            for f in self.uploads_dir.glob("*"):
-                if f.is_file():
-                    upload_size += f.stat().st_size
+            seen_inodes = set()
+            for f in self.uploads_dir.rglob("*"):
+                if not f.is_file():
+                    continue
+                stat = f.stat()
+                if f.parent == self.uploads_dir:
                     upload_count += 1
+                inode = (stat.st_dev, stat.st_ino)
+                if inode not in seen_inodes:
+                    seen_inodes.add(inode)
+                    upload_size += stat.st_size
         
         if self.outputs_dir.exists():
             for d in self.outputs_dir.iterdir():
@@ -274,7 +369,7 @@ class CleanupService:
                     output_size += sum(f.stat().st_size for f in d.rglob("*") if f.is_file())
                     output_count += 1
         
-        return {
+        stats = {
             "uploads": {
                 "count": upload_count,
                 "size_bytes": upload_size,
@@ -290,4 +385,8 @@ class CleanupService:
             "total_size_mb": (upload_size + output_size) / 1024 / 1024,
             "total_size_gb": (upload_size + output_size) / 1024 / 1024 / 1024,
         }
-
+        
+        if db is not None:
+            stats["dedup"] = BlobService.get_dedup_stats(db)
+        
+        return stats
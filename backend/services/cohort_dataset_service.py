@@ -0,0 +1,348 @@
+"""
+Columnar cohort dataset of hippocampal metrics.
+
+Every completed job appends its metrics to a Parquet dataset under
+COHORT_DATASET_DIR, partitioned by the month the job was created:
+
+    month=2025-01/part-<job_id>.parquet   one file per appended job
+    month=2025-01/data-<millis>.parquet   compacted partition
+
+Parts are written atomically and replace earlier parts of the same job
+(reprocessing); rows of a job that has a part file are ignored in the
+compacted file. Compaction folds parts into one sorted file per month
+and drops jobs that no longer exist in the database.
+
+Exports stream record batches from the dataset, so arbitrarily large
+filter results are served without loading them into memory.
+"""
+
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from sqlalchemy.orm import Session
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+from backend.models import Job
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+SCHEMA = pa.schema([
+    ("job_id", pa.string()),
+    ("job_created_at", pa.timestamp("us")),
+    ("region", pa.string()),
+    ("left_volume", pa.float64()),
+    ("right_volume", pa.float64()),
+    ("asymmetry_index", pa.float64()),
+    ("written_at", pa.timestamp("us")),
+])
+
+EXPORT_COLUMNS = ["job_id", "job_created_at", "region", "left_volume", "right_volume", "asymmetry_index"]
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+# Rows buffered per written batch / Parquet row group
+EXPORT_BATCH_ROWS = 65536
+
+
+class _StreamSink:
+    """Write-only file object whose contents are drained by a generator."""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet footers store absolute offsets, so report bytes written
+        # so far rather than what is still buffered
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _partition_name(created_at: datetime) -> str:
+    return f"month={created_at:%Y-%m}"
+
+
+def _file_stamp(path: Path) -> Optional[tuple]:
+    """Identity of a file's current contents (inode, mtime), or None if missing."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class CohortDatasetService:
+    """
+    Service class for the partitioned Parquet cohort dataset.
+    """
+
+    @staticmethod
+    def root() -> Path:
+        """Dataset root directory."""
+        return Path(settings.cohort_dataset_dir)
+
+    @staticmethod
+    def append_job(job: Job, metrics: Iterable) -> Optional[Path]:
+        """
+        Write a completed job's metrics to its month partition.
+
+        Args:
+            job: Completed job
+            metrics: Objects with region, left_volume, right_volume and
+                asymmetry_index (Metric or MetricCreate)
+
+        Returns:
+            Path of the written part file, or None if the dataset is disabled
+        """
+        if not settings.cohort_dataset_enabled:
+            return None
+
+        written_at = datetime.utcnow()
+        rows = [
+            {
+                "job_id": str(job.id),
+                "job_created_at": job.created_at,
+                "region": metric.region,
+                "left_volume": metric.left_volume,
+                "right_volume": metric.right_volume,
+                "asymmetry_index": metric.asymmetry_index,
+                "written_at": written_at,
+            }
+            for metric in metrics
+        ]
+
+        partition = CohortDatasetService.root() / _partition_name(job.created_at)
+        partition.mkdir(parents=True, exist_ok=True)
+        path = partition / f"part-{job.id}.parquet"
+        tmp_path = partition / f".part-{job.id}.parquet.tmp"
+        pq.write_table(pa.Table.from_pylist(rows, schema=SCHEMA), tmp_path)
+        os.replace(tmp_path, path)
+
+        logger.info("cohort_dataset_appended", job_id=str(job.id), rows=len(rows), partition=partition.name)
+        return path
+
+    @staticmethod
+    def compact(db: Optional[Session] = None) -> Dict[str, int]:
+        """
+        Fold part files into one compacted file per month.
+
+        Args:
+            db: Database session; when given, rows of jobs that no longer
+                exist are dropped
+
+        Returns:
+            Dictionary with partitions compacted, part files merged and rows kept
+        """
+        summary = {"partitions": 0, "parts_merged": 0, "rows": 0}
+        root = CohortDatasetService.root()
+        if not root.exists():
+            return summary
+
+        for partition in sorted(root.glob("month=*")):
+            merged, rows = CohortDatasetService._compact_partition(partition, db)
+            if merged is not None:
+                summary["partitions"] += 1
+                summary["parts_merged"] += merged
+                summary["rows"] += rows
+
+        logger.info("cohort_dataset_compacted", **summary)
+        return summary
+
+    @staticmethod
+    def _compact_partition(partition: Path, db: Optional[Session]):
+        """Compact one partition; returns (parts merged, rows) or (None, 0) if untouched."""
+        parts = sorted(partition.glob("part-*.parquet"))
+        data_files = sorted(partition.glob("data-*.parquet"))
+        if not parts and len(data_files) <= 1 and db is None:
+            return None, 0
+
+        # append_job may replace a part while it is being compacted; only
+        # parts still holding the contents read here are removed below
+        stamps = {path: _file_stamp(path) for path in parts}
+        parts = [path for path in parts if stamps[path] is not None]
+        tables = [pq.read_table(path, schema=SCHEMA) for path in parts]
+        part_ids = CohortDatasetService._part_job_ids(parts)
+        if data_files:
+            compacted = pq.read_table(data_files[-1], schema=SCHEMA)
+            tables.append(compacted.filter(pc.invert(pc.is_in(compacted["job_id"], pa.array(part_ids, pa.string())))))
+        table = pa.concat_tables(tables) if tables else SCHEMA.empty_table()
+
+        if db is not None and table.num_rows:
+            job_ids = [UUID(job_id) for job_id in pc.unique(table["job_id"]).to_pylist()]
+            existing = set()
+            for i in range(0, len(job_ids), 500):
+                chunk = job_ids[i:i + 500]
+                existing.update(str(job_id) for (job_id,) in db.query(Job.id).filter(Job.id.in_(chunk)))
+            table = table.filter(pc.is_in(table["job_id"], pa.array(sorted(existing), pa.string())))
+
+        # Sorted files let readers skip row groups by date
+        table = table.sort_by([("job_created_at", "ascending"), ("job_id", "ascending"), ("region", "ascending")])
+
+        if table.num_rows:
+            path = partition / f"data-{int(time.time() * 1000):013d}.parquet"
+            tmp_path = partition / f".{path.name}.tmp"
+            pq.write_table(table, tmp_path, row_group_size=EXPORT_BATCH_ROWS)
+            os.replace(tmp_path, path)
+
+        # New file first, then parts, then old data: a concurrent reader
+        # sees either the old or the new state, never a gap. A replaced
+        # part stays and supersedes its job's compacted rows.
+        for path in parts:
+            if _file_stamp(path) == stamps[path]:
+                path.unlink(missing_ok=True)
+            else:
+                logger.info("cohort_dataset_part_replaced_during_compaction", part=path.name)
+        for path in data_files:
+            path.unlink(missing_ok=True)
+        if not table.num_rows and not any(partition.iterdir()):
+            partition.rmdir()
+
+        return len(parts), table.num_rows
+
+    @staticmethod
+    def _part_job_ids(parts: List[Path]) -> List[str]:
+        return [path.stem[len("part-"):] for path in parts]
+
+    @staticmethod
+    def scan(
+        region: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        batch_rows: int = EXPORT_BATCH_ROWS,
+    ) -> Iterator[pa.RecordBatch]:
+        """
+        Stream record batches of the dataset matching the filters.
+
+        Args:
+            region: Hippocampal subregion name (optional)
+            start: Earliest job creation time, inclusive (optional)
+            end: Latest job creation time, exclusive (optional)
+            batch_rows: Maximum rows per batch
+
+        Yields:
+            Record batches with EXPORT_COLUMNS
+        """
+        root = CohortDatasetService.root()
+        if not root.exists():
+            return
+
+        condition = None
+        for clause in (
+            ds.field("region") == region if region else None,
+            ds.field("job_created_at") >= pa.scalar(start, pa.timestamp("us")) if start else None,
+            ds.field("job_created_at") < pa.scalar(end, pa.timestamp("us")) if end else None,
+        ):
+            if clause is not None:
+                condition = clause if condition is None else condition & clause
+
+        first_month = _partition_name(start) if start else None
+        last_month = _partition_name(end) if end else None
+
+        for partition in sorted(root.glob("month=*")):
+            # Prune whole months outside the date range
+            if (first_month and partition.name < first_month) or (last_month and partition.name > last_month):
+                continue
+
+            parts = sorted(partition.glob("part-*.parquet"))
+            data_files = sorted(partition.glob("data-*.parquet"))
+            sources = []
+            if data_files:
+                # Parts supersede compacted rows of the same job
+                superseded = ~ds.field("job_id").isin(CohortDatasetService._part_job_ids(parts)) if parts else None
+                sources.append(([data_files[-1]], superseded))
+            if parts:
+                sources.append((parts, None))
+
+            for paths, extra in sources:
+                dataset = ds.dataset([str(p) for p in paths], schema=SCHEMA, format="parquet")
+                scan_filter = condition
+                if extra is not None:
+                    scan_filter = extra if scan_filter is None else scan_filter & extra
+                yield from dataset.to_batches(columns=EXPORT_COLUMNS, filter=scan_filter, batch_size=batch_rows)
+
+    @staticmethod
+    def export(
+        export_format: str,
+        region: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[bytes]:
+        """
+        Encode matching rows as CSV, Parquet or an Arrow IPC stream.
+
+        Rows are buffered up to EXPORT_BATCH_ROWS and each encoded chunk
+        is yielded as soon as it is written.
+
+        Args:
+            export_format: "csv", "parquet" or "arrow"
+            region: Hippocampal subregion name (optional)
+            start: Earliest job creation time, inclusive (optional)
+            end: Latest job creation time, exclusive (optional)
+
+        Yields:
+            Encoded chunks
+
+        Raises:
+            ValueError: If the format is not supported
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        schema = pa.schema([SCHEMA.field(name) for name in EXPORT_COLUMNS])
+        sink = _StreamSink()
+        if export_format == "csv":
+            writer = pa_csv.CSVWriter(sink, schema)
+        elif export_format == "parquet":
+            writer = pq.ParquetWriter(sink, schema)
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+
+        def write(batches):
+            writer.write_table(pa.Table.from_batches(batches, schema=schema))
+
+        pending, pending_rows = [], 0
+        for batch in CohortDatasetService.scan(region, start, end):
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            if pending_rows >= EXPORT_BATCH_ROWS:
+                write(pending)
+                pending, pending_rows = [], 0
+                yield sink.drain()
+
+        if pending:
+            write(pending)
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,284 @@
+"""
+Cohort statistics over hippocampal metrics.
+
+Summarizes asymmetry_index, left_volume and right_volume across many
+scans (count, mean, std, percentiles, histogram) without sending the
+rows to the client. On PostgreSQL the aggregation runs in SQL; on
+SQLite (desktop mode) the three columns are fetched and summarized
+with NumPy, since SQLite lacks percentile and stddev functions.
+
+Results are cached per filter set and dropped whenever metrics are
+inserted or deleted. Invalidations are published on Redis so the API
+processes see metrics written by workers; the TTL bounds staleness if
+Redis is unavailable.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import get_settings
+from backend.core.invalidation import RedisInvalidationChannel
+from backend.core.logging import get_logger
+from backend.models import Job, Metric
+from backend.models.job import JobStatus
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+STATS_FIELDS = ("asymmetry_index", "left_volume", "right_volume")
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+INVALIDATION_CHANNEL = "neuroinsight:cohort-stats:invalidate"
+
+
+class CohortStatsCache:
+    """
+    TTL cache of cohort statistics keyed by filter set.
+
+    Any metric insert or delete clears the whole cache: filter sets
+    overlap, and recomputing one is a single aggregate query.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, max_size: int = 256):
+        """
+        Initialize cohort statistics cache.
+
+        Args:
+            ttl_seconds: Entry lifetime in seconds
+            max_size: Maximum number of cached filter sets
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[Tuple, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        self._channel = RedisInvalidationChannel(INVALIDATION_CHANNEL, "cohort-stats")
+
+    def get(self, key: Tuple) -> Optional[Dict]:
+        """Return cached statistics for a filter set, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return None
+            return entry[1]
+
+    def put(self, key: Tuple, stats: Dict) -> None:
+        """Cache statistics for a filter set."""
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                self._entries.clear()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, stats)
+
+    def invalidate(self, broadcast: bool = True) -> None:
+        """
+        Drop all cached statistics in this process and, optionally, all others.
+
+        Args:
+            broadcast: Publish the invalidation on Redis
+        """
+        with self._lock:
+            self._entries.clear()
+
+        if broadcast:
+            self._publish()
+
+    def _publish(self) -> None:
+        """Publish an invalidation to other processes (best effort)."""
+        self._channel.publish("*")
+
+    def start_invalidation_listener(self) -> None:
+        """Subscribe to invalidations published by other processes."""
+        def clear(*_) -> None:
+            self.invalidate(broadcast=False)
+
+        self._channel.start_listener(on_message=clear, on_error=clear)
+
+
+cohort_stats_cache = CohortStatsCache(ttl_seconds=settings.cohort_stats_cache_seconds)
+
+
+def _histogram_range(low: float, high: float) -> Tuple[float, float]:
+    """Histogram range for the observed min/max (as numpy.histogram picks it)."""
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def _empty_field_stats() -> Dict:
+    return {
+        "count": 0,
+        "mean": None,
+        "std": None,
+        "min": None,
+        "max": None,
+        "percentiles": {},
+        "histogram": {"edges": [], "counts": []},
+    }
+
+
+class CohortStatsService:
+    """
+    Service class for aggregate statistics over metrics.
+    """
+
+    @staticmethod
+    async def get_stats(
+        db: AsyncSession,
+        region: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        bins: int = 20,
+    ) -> Dict:
+        """
+        Compute cohort statistics for metrics matching the filters.
+
+        Args:
+            db: Async database session
+            region: Hippocampal subregion name (optional)
+            status: Status of the metrics' jobs (optional)
+            start: Earliest job creation time, inclusive (optional)
+            end: Latest job creation time, exclusive (optional)
+            bins: Number of histogram bins
+
+        Returns:
+            Dictionary with the filters, row count and per-field statistics
+        """
+        model_status = JobStatus(getattr(status, "value", status)) if status else None
+        key = (region, model_status, start, end, bins)
+        cached = cohort_stats_cache.get(key)
+        if cached is not None:
+            return cached
+
+        filters = CohortStatsService._filters(region, model_status, start, end)
+        if db.bind.dialect.name == "postgresql":
+            count, fields = await CohortStatsService._sql_stats(db, filters, bins)
+        else:
+            count, fields = await CohortStatsService._numpy_stats(db, filters, bins)
+
+        stats = {
+            "region": region,
+            "status": model_status.value if model_status else None,
+            "start": start,
+            "end": end,
+            "count": count,
+            "fields": fields,
+        }
+        cohort_stats_cache.put(key, stats)
+
+        logger.info("cohort_stats_computed", region=region, status=stats["status"], count=count)
+        return stats
+
+    @staticmethod
+    def _filters(region, status, start, end) -> List:
+        """WHERE clauses for the metric filters."""
+        filters = []
+        if region:
+            filters.append(Metric.region == region)
+        if status:
+            filters.append(Job.status == status)
+        if start:
+            filters.append(Job.created_at >= start)
+        if end:
+            filters.append(Job.created_at < end)
+        return filters
+
+    @staticmethod
+    def _select(columns, filters):
+        """SELECT over metrics, joined to jobs only when a job filter is set."""
+        query = select(*columns).select_from(Metric)
+        if any(clause.left.table is Job.__table__ for clause in filters):
+            query = query.join(Job, Job.id == Metric.job_id)
+        return query.where(*filters)
+
+    @staticmethod
+    def _summary_query(filters: List):
+        """PostgreSQL query for count plus mean, std, min, max and percentiles per field."""
+        fractions = array([literal(p / 100) for p in PERCENTILES])
+        columns = [func.count().label("count")]
+        for name in STATS_FIELDS:
+            column = getattr(Metric, name)
+            columns += [
+                func.avg(column),
+                func.stddev_samp(column),
+                func.min(column),
+                func.max(column),
+                func.percentile_cont(fractions).within_group(column),
+            ]
+        return CohortStatsService._select(columns, filters)
+
+    @staticmethod
+    def _histogram_query(name: str, low: float, high: float, bins: int, filters: List):
+        """PostgreSQL query for per-bucket counts of one field."""
+        column = getattr(Metric, name)
+        # width_bucket puts the maximum in bucket bins + 1; fold it into the last bin
+        bucket = func.least(func.width_bucket(column, low, high, bins), bins).label("bucket")
+        return CohortStatsService._select([bucket, func.count()], filters).group_by(bucket)
+
+    @staticmethod
+    async def _sql_stats(db: AsyncSession, filters: List, bins: int) -> Tuple[int, Dict]:
+        """Aggregate in PostgreSQL: one summary query plus one histogram query per field."""
+        row = (await db.execute(CohortStatsService._summary_query(filters))).one()
+
+        count = row[0]
+        fields = {}
+        for k, name in enumerate(STATS_FIELDS):
+            if count == 0:
+                fields[name] = _empty_field_stats()
+                continue
+
+            mean, std, minimum, maximum, percentiles = row[1 + 5 * k: 6 + 5 * k]
+            low, high = _histogram_range(minimum, maximum)
+            counts = [0] * bins
+            query = CohortStatsService._histogram_query(name, low, high, bins, filters)
+            for index, n in (await db.execute(query)).all():
+                counts[index - 1] = n
+
+            fields[name] = {
+                "count": count,
+                "mean": float(mean),
+                "std": float(std) if std is not None else None,
+                "min": float(minimum),
+                "max": float(maximum),
+                "percentiles": {str(p): float(v) for p, v in zip(PERCENTILES, percentiles)},
+                "histogram": {"edges": np.linspace(low, high, bins + 1).tolist(), "counts": counts},
+            }
+
+        return count, fields
+
+    @staticmethod
+    async def _numpy_stats(db: AsyncSession, filters: List, bins: int) -> Tuple[int, Dict]:
+        """Fetch the three columns and summarize them with NumPy."""
+        columns = [getattr(Metric, name) for name in STATS_FIELDS]
+        rows = (await db.execute(CohortStatsService._select(columns, filters))).all()
+        values = np.array(rows, dtype=float).reshape(-1, len(STATS_FIELDS))
+
+        count = len(values)
+        fields = {}
+        for k, name in enumerate(STATS_FIELDS):
+            if count == 0:
+                fields[name] = _empty_field_stats()
+                continue
+
+            column = values[:, k]
+            counts, edges = np.histogram(column, bins=bins, range=_histogram_range(column.min(), column.max()))
+            fields[name] = {
+                "count": count,
+                "mean": float(column.mean()),
+                "std": float(column.std(ddof=1)) if count > 1 else None,
+                "min": float(column.min()),
+                "max": float(column.max()),
+                "percentiles": {
+                    str(p): float(v) for p, v in zip(PERCENTILES, np.percentile(column, PERCENTILES))
+                },
+                "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+            }
+
+        return count, fields
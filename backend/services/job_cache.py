@@ -0,0 +1,200 @@
+"""
+In-process cache of terminal job state.
+
+Once a job is COMPLETED, FAILED or CANCELLED its row rarely changes, yet
+every visualization, metadata, status and metrics request reads it
+again. This cache keeps a column snapshot of terminal jobs (bounded LRU
+with TTL) and re-attaches it to the caller's session without a query.
+
+Invalidations are published on Redis so API processes drop entries
+changed by workers (e.g. a job being reprocessed); the TTL bounds
+staleness if Redis is unavailable.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from backend.core.config import get_settings
+from backend.core.invalidation import RedisInvalidationChannel
+from backend.core.logging import get_logger
+from backend.models import Job
+from backend.models.job import JobStatus
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+
+INVALIDATION_CHANNEL = "neuroinsight:job-cache:invalidate"
+
+
+class JobStateCache:
+    """
+    Bounded LRU + TTL cache of terminal job rows.
+
+    Entries are plain column dictionaries, so cached state never shares
+    ORM instances between sessions or threads.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 300.0, enabled: bool = True):
+        """
+        Initialize job state cache.
+
+        Args:
+            max_size: Maximum number of cached jobs
+            ttl_seconds: Entry lifetime in seconds
+            enabled: Disable to always read from the database
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[UUID, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._channel = RedisInvalidationChannel(INVALIDATION_CHANNEL, "job-cache")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, db: Session, job_id: UUID) -> Optional[Job]:
+        """
+        Return a cached terminal job attached to ``db``, or None on a miss.
+
+        Args:
+            db: Session to attach the job to
+            job_id: Job identifier
+
+        Returns:
+            Persistent Job instance, or None if not cached
+        """
+        job = self.lookup(job_id)
+        if job is None:
+            return None
+
+        # Attach without a SELECT; relationships (metrics, blob, batch)
+        # stay unloaded and lazy-load on access.
+        return db.merge(job, load=False)
+
+    def lookup(self, job_id: UUID) -> Optional[Job]:
+        """
+        Return a cached terminal job as a detached instance.
+
+        Callers attach it with ``merge(job, load=False)``; async sessions
+        use this directly since they cannot share the sync code path.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Detached Job instance, or None if not cached
+        """
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, columns = entry
+            if expires_at < time.monotonic():
+                del self._entries[job_id]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(job_id)
+            self.hits += 1
+
+        job = Job(**columns)
+        make_transient_to_detached(job)
+        return job
+
+    def put(self, job: Job) -> None:
+        """
+        Cache a job if it is in a terminal state.
+
+        Args:
+            job: Freshly loaded, unmodified job instance
+        """
+        if not self.enabled or job.status not in TERMINAL_STATUSES:
+            return
+
+        columns = {attr.key: getattr(job, attr.key) for attr in sa_inspect(Job).column_attrs}
+
+        with self._lock:
+            self._entries[job.id] = (time.monotonic() + self.ttl_seconds, columns)
+            self._entries.move_to_end(job.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, job_id: UUID, broadcast: bool = True) -> None:
+        """
+        Drop a job from this process's cache and, optionally, all others.
+
+        Args:
+            job_id: Job identifier
+            broadcast: Publish the invalidation on Redis
+        """
+        with self._lock:
+            if self._entries.pop(job_id, None) is not None:
+                self.invalidations += 1
+
+        if broadcast and self.enabled:
+            self._publish(job_id)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with size, hits, misses, hit rate, evictions and invalidations
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _publish(self, job_id: UUID) -> None:
+        """Publish an invalidation to other processes (best effort)."""
+        self._channel.publish(str(job_id))
+
+    def start_invalidation_listener(self) -> None:
+        """Subscribe to invalidations published by other processes."""
+        if not self.enabled:
+            return
+
+        def on_message(message: str) -> None:
+            try:
+                self.invalidate(UUID(message), broadcast=False)
+            except ValueError:
+                pass
+
+        # Entries may be stale until Redis is back; drop them all
+        self._channel.start_listener(on_message, on_error=self.clear)
+
+
+job_cache = JobStateCache(
+    max_size=settings.job_cache_size,
+    ttl_seconds=settings.job_cache_ttl_seconds,
+    enabled=settings.job_cache_enabled,
+)
@@ -0,0 +1,280 @@
+"""
+Job event broker for pushing progress to clients.
+
+Workers publish progress and status changes here instead of clients
+polling the database. With the ``redis`` backend events travel over one
+Redis pub/sub channel, and each API process holds a single subscription
+that fans out to its SSE/WebSocket clients. The ``memory`` backend
+(desktop mode, where processing runs in-process) dispatches directly.
+
+The broker also remembers the latest state of recently active jobs so a
+client that connects late gets the current (or final) state without a
+database query.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+EVENTS_CHANNEL = "neuroinsight:job-events"
+
+# Status values after which a job's event stream ends
+FINAL_STATUSES = {"completed", "failed", "cancelled", "deleted"}
+
+STATE_FIELDS = ("status", "progress", "current_step", "error_message")
+
+
+def job_state(job) -> Dict:
+    """
+    Build the pushed state of a job from its ORM instance.
+
+    Args:
+        job: Job instance
+
+    Returns:
+        Dictionary with job_id, status, progress, current_step, error_message
+    """
+    return {
+        "job_id": str(job.id),
+        "status": job.status.value,
+        "progress": job.progress,
+        "current_step": job.current_step,
+        "error_message": job.error_message,
+    }
+
+
+def is_final(state: Dict) -> bool:
+    """Check whether an event or state ends the job's stream."""
+    return state.get("status") in FINAL_STATUSES
+
+
+def format_sse(event_type: str, data: Dict) -> str:
+    """
+    Encode one server-sent event.
+
+    Args:
+        event_type: SSE event name
+        data: JSON-serializable payload
+
+    Returns:
+        Event text terminated by a blank line
+    """
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class Subscription:
+    """
+    One client's view of the event stream.
+
+    Events are delivered into an asyncio queue on the subscriber's event
+    loop; if a slow client lets the queue fill up the oldest event is
+    dropped, since each event carries the full progress state.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, job_ids: Optional[Iterable[str]], max_queue: int):
+        self.loop = loop
+        self.job_ids: Set[str] = set(job_ids or ())
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+
+    def matches(self, job_id: str) -> bool:
+        return job_id in self.job_ids
+
+    def push(self, event: Dict) -> None:
+        """Queue an event (call on the subscriber's loop)."""
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: Dict) -> None:
+        """Hand an event to the subscriber's loop (thread-safe)."""
+        try:
+            self.loop.call_soon_threadsafe(self.push, event)
+        except RuntimeError:
+            # Loop closed; the subscriber is gone
+            pass
+
+    async def get(self, timeout: float) -> Optional[Dict]:
+        """
+        Wait for the next event.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            Event dictionary, or None on timeout
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class JobEventBroker:
+    """
+    Publish job events and fan them out to in-process subscribers.
+    """
+
+    def __init__(self, backend: str = "redis", replay_size: int = 1024, max_queue: int = 100):
+        """
+        Initialize job event broker.
+
+        Args:
+            backend: "redis" (API and workers in separate processes) or
+                "memory" (desktop, single process)
+            replay_size: Number of jobs whose latest state is remembered
+            max_queue: Per-subscriber queue length
+        """
+        self.backend = backend
+        self.replay_size = replay_size
+        self.max_queue = max_queue
+        self._origin = uuid.uuid4().hex
+        self._states: "OrderedDict[str, Dict]" = OrderedDict()
+        self._subscriptions: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, job_id, event_type: str, **fields) -> Dict:
+        """
+        Publish an event for a job.
+
+        Args:
+            job_id: Job identifier
+            event_type: "progress", "status" or "deleted"
+            **fields: State fields (status, progress, current_step, error_message)
+
+        Returns:
+            The published event
+        """
+        event = {"type": event_type, "job_id": str(job_id), "timestamp": time.time(), **fields}
+        if event_type == "deleted":
+            event["status"] = "deleted"
+
+        self._dispatch(event)
+
+        if self.backend == "redis":
+            self._publish_redis(event)
+
+        return event
+
+    def publish_state(self, job) -> Dict:
+        """Publish a status event carrying the job's full state."""
+        state = job_state(job)
+        return self.publish(state.pop("job_id"), "status", **state)
+
+    def snapshot(self, job_id) -> Optional[Dict]:
+        """
+        Get the latest known state of a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            State dictionary, or None if no event was seen for the job
+        """
+        with self._lock:
+            state = self._states.get(str(job_id))
+            return dict(state) if state else None
+
+    def subscribe(self, job_ids: Optional[Iterable] = None) -> Subscription:
+        """
+        Subscribe the current event loop to events of some jobs.
+
+        Must be called from a coroutine.
+
+        Args:
+            job_ids: Jobs to receive events for (more can be added later)
+
+        Returns:
+            Subscription to read events from
+        """
+        subscription = Subscription(
+            asyncio.get_running_loop(),
+            (str(job_id) for job_id in job_ids or ()),
+            self.max_queue,
+        )
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering events to a subscription."""
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions in this process."""
+        with self._lock:
+            return len(self._subscriptions)
+
+    def _dispatch(self, event: Dict) -> None:
+        """Update the replay state and deliver to matching subscribers."""
+        job_id = event["job_id"]
+        with self._lock:
+            if event.get("status") == "deleted":
+                self._states.pop(job_id, None)
+            else:
+                state = self._states.pop(job_id, {"job_id": job_id})
+                state.update({k: event[k] for k in STATE_FIELDS if k in event})
+                self._states[job_id] = state
+                while len(self._states) > self.replay_size:
+                    self._states.popitem(last=False)
+            targets = [s for s in self._subscriptions if s.matches(job_id)]
+
+        for subscription in targets:
+            subscription.deliver(event)
+
+    def _publish_redis(self, event: Dict) -> None:
+        """Publish an event on Redis (best effort)."""
+        try:
+            if self._redis is None:
+                import redis
+
+                self._redis = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5)
+            self._redis.publish(EVENTS_CHANNEL, json.dumps({"origin": self._origin, "event": event}))
+        except Exception as e:
+            logger.debug("job_event_publish_failed", job_id=event["job_id"], error=str(e))
+
+    def start_listener(self) -> None:
+        """
+        Receive events published by other processes (redis backend only).
+
+        Runs in a daemon thread; reconnects after Redis errors.
+        """
+        if self.backend != "redis" or self._listener is not None:
+            return
+
+        def listen():
+            import redis
+
+            while True:
+                try:
+                    pubsub = redis.Redis.from_url(settings.redis_url).pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(EVENTS_CHANNEL)
+                    logger.info("job_events_listener_subscribed")
+                    for message in pubsub.listen():
+                        try:
+                            payload = json.loads(message["data"])
+                        except (TypeError, ValueError):
+                            continue
+                        if payload.get("origin") != self._origin and "event" in payload:
+                            self._dispatch(payload["event"])
+                except Exception as e:
+                    logger.warning("job_events_listener_error", error=str(e))
+                    time.sleep(5)
+
+        self._listener = threading.Thread(target=listen, name="job-events", daemon=True)
+        self._listener.start()
+
+
+job_events = JobEventBroker(backend=settings.job_events_backend)
@@ -0,0 +1,308 @@
+"""
+Registry of the processes running each job, for direct cancellation.
+
+At launch time the API records a job's Celery task id, and the worker
+records the FastSurfer container (``docker run --name ni-<job>``,
+labelled with the job id) or the Singularity process group. Cancelling
+a job is then a lookup: revoke the task, set the job's cancel flag and
+publish it on a Redis channel. The worker process that owns the job
+kills its container or process group when the message arrives, and the
+running task stops at its next stage by checking the flag - no host
+process scans, worker broadcasts or database polling.
+
+With the ``redis`` backend entries live in one Redis hash per job; the
+``memory`` backend (desktop mode, single process) keeps them in a dict
+and handles cancellations directly. The backend follows
+``JOB_EVENTS_BACKEND``.
+"""
+
+import json
+import os
+import signal
+import subprocess
+import threading
+import time
+from typing import Dict, Optional, Set
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+CANCEL_CHANNEL = "neuroinsight:job-cancel"
+REGISTRY_KEY_PREFIX = "neuroinsight:job-registry:"
+CONTAINER_PREFIX = "ni-"
+CONTAINER_LABEL = "neuroinsight.job_id"
+
+
+class JobCancelled(Exception):
+    """Raised inside processing when the job has been cancelled."""
+
+
+def container_name(job_id) -> str:
+    """Deterministic name of a job's FastSurfer container."""
+    return f"{CONTAINER_PREFIX}{job_id}"
+
+
+class JobRegistry:
+    """
+    Record task ids and process handles of jobs and cancel them directly.
+
+    Shared entries (task id, container, pgid, cancel flag) are visible to
+    all processes; each process also remembers which of the registered
+    containers and process groups it launched itself, since only that
+    process can stop them.
+    """
+
+    def __init__(self, backend: str = "redis", ttl_seconds: float = 86400.0):
+        """
+        Initialize job registry.
+
+        Args:
+            backend: "redis" (API and workers in separate processes) or
+                "memory" (desktop, single process)
+            ttl_seconds: Lifetime of a job's entry in Redis
+        """
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Dict] = {}
+        self._owned: Dict[str, Dict] = {}
+        self._cancelled: Set[str] = set()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener: Optional[threading.Thread] = None
+
+    def register(self, job_id, owned: bool = False, **fields) -> None:
+        """
+        Record handles of a job.
+
+        Args:
+            job_id: Job identifier
+            owned: The calling process launched the container/process
+                group and will stop it on cancellation
+            **fields: task_id, container, pid and/or pgid
+        """
+        job_id = str(job_id)
+        if owned:
+            with self._lock:
+                self._owned.setdefault(job_id, {}).update(fields)
+                cancelled = job_id in self._cancelled
+
+            # Cancelled while launching: stop it right away
+            if cancelled or self.is_cancelled(job_id):
+                self._terminate(job_id)
+
+        if self.backend == "memory":
+            with self._lock:
+                self._entries.setdefault(job_id, {}).update(fields)
+            return
+
+        try:
+            client = self._client()
+            key = REGISTRY_KEY_PREFIX + job_id
+            pipe = client.pipeline()
+            pipe.hset(key, mapping={name: str(value) for name, value in fields.items()})
+            pipe.expire(key, int(self.ttl_seconds))
+            pipe.execute()
+        except Exception as e:
+            logger.warning("job_registry_write_failed", job_id=job_id, error=str(e))
+
+    def release(self, job_id, *fields: str) -> None:
+        """
+        Drop handles that no longer exist (e.g. the container exited).
+
+        Args:
+            job_id: Job identifier
+            *fields: Field names to drop
+        """
+        job_id = str(job_id)
+        with self._lock:
+            owned = self._owned.get(job_id, {})
+            for name in fields:
+                owned.pop(name, None)
+            if self.backend == "memory":
+                for name in fields:
+                    self._entries.get(job_id, {}).pop(name, None)
+
+        if self.backend == "redis":
+            try:
+                self._client().hdel(REGISTRY_KEY_PREFIX + job_id, *fields)
+            except Exception as e:
+                logger.debug("job_registry_release_failed", job_id=job_id, error=str(e))
+
+    def forget(self, job_id) -> None:
+        """Drop everything known about a finished job."""
+        job_id = str(job_id)
+        with self._lock:
+            self._owned.pop(job_id, None)
+            self._cancelled.discard(job_id)
+            self._entries.pop(job_id, None)
+
+        if self.backend == "redis":
+            try:
+                self._client().delete(REGISTRY_KEY_PREFIX + job_id)
+            except Exception as e:
+                logger.debug("job_registry_forget_failed", job_id=job_id, error=str(e))
+
+    def get(self, job_id) -> Dict:
+        """
+        Get the registered handles of a job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Dictionary of task_id, container, pid, pgid and cancelled
+            (only those recorded)
+        """
+        job_id = str(job_id)
+        if self.backend == "memory":
+            with self._lock:
+                return dict(self._entries.get(job_id, {}))
+
+        try:
+            entry = self._client().hgetall(REGISTRY_KEY_PREFIX + job_id)
+        except Exception as e:
+            logger.warning("job_registry_read_failed", job_id=job_id, error=str(e))
+            return {}
+        return {name.decode(): value.decode() for name, value in entry.items()}
+
+    def request_cancel(self, job_id) -> None:
+        """
+        Flag a job as cancelled and tell its owner to stop it.
+
+        Args:
+            job_id: Job identifier
+        """
+        job_id = str(job_id)
+        self.register(job_id, cancelled=1)
+
+        if self.backend == "memory":
+            self._on_cancel(job_id)
+            return
+
+        try:
+            self._client().publish(CANCEL_CHANNEL, json.dumps({"job_id": job_id}))
+        except Exception as e:
+            logger.warning("job_cancel_publish_failed", job_id=job_id, error=str(e))
+        # The requesting process may own the job too
+        self._on_cancel(job_id)
+
+    def is_cancelled(self, job_id) -> bool:
+        """
+        Check a job's cancel flag.
+
+        Answered from memory once the cancel message arrived; otherwise a
+        single Redis HGET.
+        """
+        job_id = str(job_id)
+        with self._lock:
+            if job_id in self._cancelled:
+                return True
+        if self.backend == "memory":
+            return False
+
+        try:
+            cancelled = self._client().hget(REGISTRY_KEY_PREFIX + job_id, "cancelled") is not None
+        except Exception as e:
+            logger.debug("job_cancel_check_failed", job_id=job_id, error=str(e))
+            return False
+        if cancelled:
+            with self._lock:
+                self._cancelled.add(job_id)
+        return cancelled
+
+    def raise_if_cancelled(self, job_id) -> None:
+        """Raise JobCancelled if the job's cancel flag is set."""
+        if self.is_cancelled(job_id):
+            raise JobCancelled(f"Job {job_id} was cancelled")
+
+    def wait_released(self, job_id, timeout: float) -> bool:
+        """
+        Wait until a job's container and process group are gone.
+
+        Args:
+            job_id: Job identifier
+            timeout: Seconds to wait at most
+
+        Returns:
+            True if no container or process group is registered anymore
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            entry = self.get(job_id)
+            if "container" not in entry and "pgid" not in entry:
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.1)
+
+    def _on_cancel(self, job_id: str) -> None:
+        """Remember the cancellation and stop the job if this process owns it."""
+        with self._lock:
+            self._cancelled.add(job_id)
+            owned = job_id in self._owned
+        if owned:
+            self._terminate(job_id)
+
+    def _terminate(self, job_id: str) -> None:
+        """Kill the container or process group this process launched for a job."""
+        with self._lock:
+            handles = dict(self._owned.get(job_id, {}))
+
+        if "container" in handles:
+            try:
+                subprocess.run(["docker", "kill", handles["container"]], capture_output=True, timeout=30)
+                logger.info("job_container_killed", job_id=job_id, container=handles["container"])
+            except Exception as e:
+                logger.warning("job_container_kill_failed", job_id=job_id, error=str(e))
+
+        if "pgid" in handles:
+            try:
+                os.killpg(int(handles["pgid"]), signal.SIGTERM)
+                logger.info("job_process_group_terminated", job_id=job_id, pgid=handles["pgid"])
+            except ProcessLookupError:
+                pass
+            except Exception as e:
+                logger.warning("job_process_group_kill_failed", job_id=job_id, error=str(e))
+
+    def _client(self):
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5)
+        return self._redis
+
+    def start_listener(self) -> None:
+        """
+        Receive cancellations published by other processes (redis backend only).
+
+        Runs in a daemon thread; reconnects after Redis errors.
+        """
+        if self.backend != "redis" or self._listener is not None:
+            return
+
+        def listen():
+            import redis
+
+            while True:
+                try:
+                    pubsub = redis.Redis.from_url(settings.redis_url).pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(CANCEL_CHANNEL)
+                    logger.info("job_cancel_listener_subscribed")
+                    for message in pubsub.listen():
+                        try:
+                            job_id = json.loads(message["data"])["job_id"]
+                        except (TypeError, ValueError, KeyError):
+                            continue
+                        self._on_cancel(job_id)
+                except Exception as e:
+                    logger.warning("job_cancel_listener_error", error=str(e))
+                    time.sleep(5)
+
+        self._listener = threading.Thread(target=listen, name="job-cancel", daemon=True)
+        self._listener.start()
+
+
+job_registry = JobRegistry(backend=settings.job_events_backend, ttl_seconds=settings.processing_timeout + 3600)
@@ -14,9 +14,14 @@ from sqlalchemy.orm import Session
 from datetime import datetime
 
 from backend.core.logging import get_logger
-from backend.models import Job, Metric
+from backend.models import Job
 from backend.models.job import JobStatus
-from backend.schemas import JobCreate, JobUpdate
+from backend.schemas import JobCreate, JobUpdate, MetricCreate
+from backend.services.cohort_stats_service import cohort_stats_cache
+from backend.services.job_cache import job_cache
+from backend.services.job_events import job_events
+from backend.services.job_registry import job_registry
+from backend.services.metric_service import MetricService
 
 logger = get_logger(__name__)
 
@@ -43,6 +48,7 @@ class JobService:
         job = Job(
             filename=job_data.filename,
             file_path=job_data.file_path,
+            blob_digest=job_data.blob_digest,
             status=JobStatus.PENDING,
             created_at=datetime.utcnow(),
         )
@@ -65,6 +71,9 @@ class JobService:
         """
         Retrieve a job by ID.
         
+        Terminal jobs (completed, failed, cancelled) are served from the
+        in-process job cache; active jobs always come from the database.
+        
         Args:
             db: Database session
             job_id: Job identifier
@@ -72,7 +81,15 @@ class JobService:
         Returns:
             Job instance if found, None otherwise
         """
-        return db.query(Job).filter(Job.id == job_id).first()
+        job = job_cache.get(db, job_id)
+        if job is not None:
+            return job
+        
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is not None:
+            job_cache.put(job)
+        
+        return job
     
     @staticmethod
     def get_jobs(
@@ -125,6 +142,7 @@ class JobService:
             setattr(job, field, value)
         
         db.commit()
+        job_cache.invalidate(job_id)
         db.refresh(job)
         
         logger.info(
@@ -183,21 +201,22 @@ class JobService:
             job.completed_at = datetime.utcnow()
             job.error_message = "Job cancelled by user"
             db.commit()
+            job_events.publish_state(job)
             
-            # Wait a moment for processes to terminate gracefully
-            import time
-            time.sleep(2)
+            # Give the worker a moment to stop the container before its
+            # output directory is deleted
+            job_registry.wait_released(job_id, timeout=2.0)
             
             logger.info("job_marked_cancelled", job_id=str(job_id))
         
         # Delete associated metrics
-        db.query(Metric).filter(Metric.job_id == job_id).delete()
+        MetricService.delete_job_metrics(db, job_id)
         
         # Delete associated files (upload and output directory)
         try:
             from backend.services import CleanupService
             cleanup_service = CleanupService()
-            cleanup_service.delete_job_files(job)
+            cleanup_service.delete_job_files(job, db)
         except Exception as e:
             logger.warning("file_cleanup_failed_during_job_delete", job_id=str(job_id), error=str(e))
             # Continue with database deletion even if file deletion fails
@@ -205,6 +224,9 @@ class JobService:
         # Delete job record
         db.delete(job)
         db.commit()
+        job_cache.invalidate(job_id)
+        cohort_stats_cache.invalidate()
+        job_events.publish(job_id, "deleted")
         
         logger.info(
             "job_deleted_with_files",
@@ -236,9 +258,11 @@ class JobService:
         job.started_at = datetime.utcnow()
         
         db.commit()
+        job_cache.invalidate(job_id)
         db.refresh(job)
         
         logger.info("job_started", job_id=str(job.id))
+        job_events.publish_state(job)
         
         return job
     
@@ -267,8 +291,11 @@ class JobService:
         job.status = JobStatus.COMPLETED
         job.completed_at = datetime.utcnow()
         job.result_path = result_path
+        job.progress = 100
+        job.current_step = "Complete"
         
         db.commit()
+        job_cache.invalidate(job_id)
         db.refresh(job)
         
         logger.info(
@@ -276,6 +303,108 @@ class JobService:
             job_id=str(job.id),
             duration_seconds=job.duration_seconds,
         )
+        job_events.publish_state(job)
+        
+        return job
+    
+    @staticmethod
+    def finalize_job(
+        db: Session,
+        job_id: UUID,
+        result_path: str,
+        metrics_data: List[MetricCreate],
+        series_selection: Optional[dict] = None,
+    ) -> Optional[Job]:
+        """
+        Save a job's metrics and mark it completed in one transaction.
+        
+        The metrics replace those of any earlier run, and the series
+        selection, the status change and the final progress are written
+        with them in a single commit, so readers see either the running
+        job or its complete results. The job row is locked first; a job
+        that is already completed is returned unchanged, so a repeated
+        delivery of the final stage is harmless.
+        
+        Args:
+            db: Database session
+            job_id: Job identifier
+            result_path: Path to processing results
+            metrics_data: List of metric creation data
+            series_selection: Selected series summary, for DICOM study archives
+        
+        Returns:
+            Completed job instance, or None if the job was not found or
+            is no longer running
+        """
+        job = db.query(Job).filter(Job.id == job_id).with_for_update().first()
+        
+        if not job:
+            return None
+        
+        if job.status == JobStatus.COMPLETED:
+            db.rollback()
+            logger.info("job_already_completed", job_id=str(job_id))
+            return job
+        
+        if job.status != JobStatus.RUNNING:
+            status = job.status.value
+            db.rollback()
+            logger.warning("job_not_finalized", job_id=str(job_id), status=status)
+            return None
+        
+        metrics_count = MetricService.replace_job_metrics(db, job_id, metrics_data)
+        if series_selection:
+            JobService._apply_series_selection(job, series_selection)
+        
+        job.status = JobStatus.COMPLETED
+        job.completed_at = datetime.utcnow()
+        job.result_path = result_path
+        job.progress = 100
+        job.current_step = "Complete"
+        
+        db.commit()
+        job_cache.invalidate(job_id)
+        cohort_stats_cache.invalidate()
+        
+        logger.info(
+            "job_completed",
+            job_id=str(job.id),
+            duration_seconds=job.duration_seconds,
+            metrics_count=metrics_count,
+        )
+        job_events.publish_state(job)
+        
+        return job
+    
+    @staticmethod
+    def record_series_selection(db: Session, job_id: UUID, selection: dict) -> Optional[Job]:
+        """
+        Record which DICOM series was selected from a study archive.
+        
+        Args:
+            db: Database session
+            job_id: Job identifier
+            selection: Series summary as produced by series discovery
+        
+        Returns:
+            Updated job instance if found, None otherwise
+        """
+        job = db.query(Job).filter(Job.id == job_id).first()
+        
+        if not job:
+            return None
+        
+        JobService._apply_series_selection(job, selection)
+        
+        db.commit()
+        job_cache.invalidate(job_id)
+        db.refresh(job)
+        
+        logger.info(
+            "job_series_recorded",
+            job_id=str(job.id),
+            series_uid=job.series_instance_uid,
+        )
         
         return job
     
@@ -302,6 +431,7 @@ class JobService:
         job.error_message = error_message
         
         db.commit()
+        job_cache.invalidate(job_id)
         db.refresh(job)
         
         logger.error(
@@ -309,6 +439,12 @@ class JobService:
             job_id=str(job.id),
             error=error_message,
         )
+        job_events.publish_state(job)
         
         return job
-
+    
+    @staticmethod
+    def _apply_series_selection(job: Job, selection: dict) -> None:
+        """Copy a series summary onto the job (no commit)."""
+        job.series_instance_uid = selection.get("series_uid")
+        job.series_description = (selection.get("description") or "")[:255] or None
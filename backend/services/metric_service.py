@@ -8,11 +8,14 @@ hippocampal asymmetry metrics.
 from typing import List, Optional
 from uuid import UUID
 
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 
 from backend.core.logging import get_logger
 from backend.models import Metric
 from backend.schemas import MetricCreate
+from backend.services.cohort_stats_service import cohort_stats_cache
+from backend.services.region_stats_service import RegionStatsService
 
 logger = get_logger(__name__)
 
@@ -45,8 +48,10 @@ class MetricService:
         )
         
         db.add(metric)
+        RegionStatsService.add(db, [metric])
         db.commit()
         db.refresh(metric)
+        cohort_stats_cache.invalidate()
         
         logger.info(
             "metric_created",
@@ -85,7 +90,9 @@ class MetricService:
         ]
         
         db.add_all(metrics)
+        RegionStatsService.add(db, metrics)
         db.commit()
+        cohort_stats_cache.invalidate()
         
         for metric in metrics:
             db.refresh(metric)
@@ -98,6 +105,75 @@ class MetricService:
         
         return metrics
     
+    @staticmethod
+    def replace_job_metrics(
+        db: Session,
+        job_id: UUID,
+        metrics_data: List[MetricCreate]
+    ) -> int:
+        """
+        Replace all metrics of a job (no commit).
+        
+        The earlier metrics are deleted and the new ones inserted with a
+        single executemany, and the region statistics are adjusted in the
+        same transaction. Replacing twice with the same data leaves the
+        same rows, so a repeated run does not duplicate metrics.
+        
+        Args:
+            db: Database session
+            job_id: Job identifier
+            metrics_data: List of metric creation data
+        
+        Returns:
+            Number of inserted metrics
+        """
+        MetricService.delete_job_metrics(db, job_id)
+        if not metrics_data:
+            return 0
+        
+        db.execute(
+            insert(Metric),
+            [
+                {
+                    "job_id": job_id,
+                    "region": data.region,
+                    "left_volume": data.left_volume,
+                    "right_volume": data.right_volume,
+                    "asymmetry_index": data.asymmetry_index,
+                }
+                for data in metrics_data
+            ],
+        )
+        RegionStatsService.add(db, metrics_data)
+        return len(metrics_data)
+    
+    @staticmethod
+    def delete_job_metrics(db: Session, job_id: UUID) -> int:
+        """
+        Delete all metrics of a job (no commit).
+        
+        The metrics are subtracted from the region statistics in the
+        same transaction. Where the database supports it, the DELETE
+        returns the values the statistics need, saving a SELECT.
+        
+        Args:
+            db: Database session
+            job_id: Job identifier
+        
+        Returns:
+            Number of deleted metrics
+        """
+        statement = delete(Metric).where(Metric.job_id == job_id)
+        if db.get_bind().dialect.delete_returning:
+            metrics = db.execute(statement.returning(Metric.region, Metric.asymmetry_index)).all()
+        else:
+            metrics = db.query(Metric.region, Metric.asymmetry_index).filter(Metric.job_id == job_id).all()
+            if metrics:
+                db.execute(statement)
+        
+        RegionStatsService.remove(db, metrics)
+        return len(metrics)
+    
     @staticmethod
     def get_metric(db: Session, metric_id: UUID) -> Optional[Metric]:
         """
@@ -0,0 +1,132 @@
+"""
+Counters of classified pipeline errors.
+
+Workers record every retried and every failed stage by error class.
+Failing a deterministic error at once instead of retrying it is counted
+as compute avoided: the retries the former policy (every error retried
+``LEGACY_MAX_RETRIES`` times) would still have made, each costing about
+as long as the failed attempt.
+
+With the ``redis`` backend counters live in one Redis hash shared by all
+workers and read by the API; the ``memory`` backend (desktop mode,
+single process) keeps them in a dict. The backend follows
+``JOB_EVENTS_BACKEND``.
+"""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+from backend.core.config import get_settings
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+STATS_KEY = "neuroinsight:pipeline-errors"
+
+# Retries per stage before errors were classified
+LEGACY_MAX_RETRIES = 5
+
+
+class PipelineErrorStats:
+    """Count retries and failures per error class and the compute they saved."""
+
+    def __init__(self, backend: str = "redis"):
+        """
+        Initialize pipeline error counters.
+
+        Args:
+            backend: "redis" (shared by workers and API) or "memory"
+                (desktop, single process)
+        """
+        self.backend = backend
+        self._counters: Counter = Counter()
+        self._lock = threading.Lock()
+        self._redis = None
+
+    def record_retry(self, kind: str) -> None:
+        """
+        Count a stage retried after a transient error.
+
+        Args:
+            kind: Error class (PipelineError.kind)
+        """
+        self._increment({f"retried:{kind}": 1})
+
+    def record_failure(self, kind: str, retries: int = LEGACY_MAX_RETRIES, attempt_seconds: float = 0.0) -> None:
+        """
+        Count a stage that failed the job, and the retries it did not make.
+
+        Args:
+            kind: Error class (PipelineError.kind)
+            retries: Retries of the stage made before this attempt (the
+                default counts no retries avoided, for callers that never
+                retried)
+            attempt_seconds: Duration of the failed attempt
+        """
+        retries_avoided = max(0, LEGACY_MAX_RETRIES - retries)
+        self._increment({
+            f"failed:{kind}": 1,
+            "retries_avoided": retries_avoided,
+            "compute_seconds_avoided": round(retries_avoided * attempt_seconds, 3),
+        })
+
+    def stats(self) -> Dict:
+        """
+        Get the counters.
+
+        Returns:
+            Dictionary with retried and failed stages per error class,
+            retries avoided and compute seconds avoided
+        """
+        if self.backend == "memory":
+            with self._lock:
+                counters = dict(self._counters)
+        else:
+            try:
+                counters = {
+                    name.decode(): float(value)
+                    for name, value in self._client().hgetall(STATS_KEY).items()
+                }
+            except Exception as e:
+                logger.debug("pipeline_error_stats_read_failed", error=str(e))
+                counters = {}
+
+        def by_kind(prefix):
+            return {
+                name[len(prefix):]: int(value)
+                for name, value in counters.items()
+                if name.startswith(prefix)
+            }
+
+        return {
+            "retried": by_kind("retried:"),
+            "failed": by_kind("failed:"),
+            "retries_avoided": int(counters.get("retries_avoided", 0)),
+            "compute_seconds_avoided": round(counters.get("compute_seconds_avoided", 0.0), 1),
+        }
+
+    def _increment(self, amounts: Dict[str, float]) -> None:
+        if self.backend == "memory":
+            with self._lock:
+                self._counters.update(amounts)
+            return
+
+        try:
+            pipe = self._client().pipeline()
+            for name, amount in amounts.items():
+                pipe.hincrbyfloat(STATS_KEY, name, amount)
+            pipe.execute()
+        except Exception as e:
+            logger.debug("pipeline_error_stats_write_failed", error=str(e))
+
+    def _client(self):
+        if self._redis is None:
+            import redis
+
+            self._redis = redis.Redis.from_url(settings.redis_url, socket_timeout=0.5)
+        return self._redis
+
+
+pipeline_error_stats = PipelineErrorStats(backend=settings.job_events_backend)
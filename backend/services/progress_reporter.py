@@ -0,0 +1,249 @@
+"""
+Coalescing job progress reporter.
+
+Processing reports progress far more often than anyone needs to see it
+persisted: the worker task and the processor both report around each
+stage, and every report used to be its own UPDATE and commit. The
+reporter keeps progress monotonic, writes at most once per interval
+unless progress moved by a minimum delta, folds bursts of reports into
+a single write, and always delivers stage boundaries (a new step
+description) - immediately, or at the end of the current interval so a
+long stage never sits behind a stale label.
+
+Writes fan out to sinks: the jobs table, the job event broker and, for
+tests, an in-memory list.
+"""
+
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import update
+
+from backend.core.config import get_settings
+from backend.core.database import SessionLocal
+from backend.core.logging import get_logger
+from backend.models.job import Job
+from backend.services.job_events import job_events
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+
+class DatabaseProgressSink:
+    """
+    Persist progress on the job row.
+
+    Each write uses its own short-lived session, so trailing writes from
+    the reporter's timer thread never touch the caller's session.
+    """
+
+    def __init__(self, session_factory: Callable = SessionLocal):
+        self.session_factory = session_factory
+
+    def write(self, job_id: UUID, progress: int, step: Optional[str]) -> None:
+        db = self.session_factory()
+        try:
+            db.execute(
+                update(Job)
+                .where(Job.id == job_id)
+                .values(progress=progress, current_step=step)
+            )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class EventProgressSink:
+    """Push progress to SSE/WebSocket clients through the job event broker."""
+
+    def write(self, job_id: UUID, progress: int, step: Optional[str]) -> None:
+        job_events.publish(job_id, "progress", progress=progress, current_step=step)
+
+
+class MemoryProgressSink:
+    """Record written progress in a list (tests and benchmarks)."""
+
+    def __init__(self):
+        self.writes: List[Tuple[int, Optional[str]]] = []
+
+    def write(self, job_id: UUID, progress: int, step: Optional[str]) -> None:
+        self.writes.append((progress, step))
+
+
+class ProgressSpan:
+    """
+    View of a reporter that maps 0-100 onto part of its range.
+
+    Lets a component report its own 0-100 progress (e.g. the processor)
+    while the caller keeps the rest of the range for its own stages.
+    """
+
+    def __init__(self, reporter: "ProgressReporter", start: int, end: int):
+        self.reporter = reporter
+        self.start = start
+        self.end = end
+
+    def report(self, progress: int, step: Optional[str] = None) -> None:
+        self.reporter.report(self.start + (self.end - self.start) * progress / 100, step)
+
+    def flush(self) -> None:
+        self.reporter.flush()
+
+
+class ProgressReporter:
+    """
+    Throttle, coalesce and fan out progress reports of one job.
+
+    Reports are written when the interval since the last write has passed
+    and progress moved by at least the minimum delta. Step changes and
+    completion skip the delta check; if they arrive within the interval
+    they are written by a timer when it ends, replaced by any later
+    report in between. Anything else is held until the next write or
+    ``flush()``.
+
+    Thread-safe; sink errors are logged and do not fail processing.
+    """
+
+    def __init__(
+        self,
+        job_id: UUID,
+        sinks: Optional[List] = None,
+        min_interval: Optional[float] = None,
+        min_delta: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize progress reporter.
+
+        Args:
+            job_id: Job identifier
+            sinks: Objects with ``write(job_id, progress, step)``
+                (defaults to the database and the event broker)
+            min_interval: Minimum seconds between writes
+            min_delta: Progress points that count as a change worth writing
+            clock: Monotonic time source
+        """
+        self.job_id = job_id
+        self.sinks = sinks if sinks is not None else [DatabaseProgressSink(), EventProgressSink()]
+        self.min_interval = settings.progress_min_interval_seconds if min_interval is None else min_interval
+        self.min_delta = settings.progress_min_delta if min_delta is None else min_delta
+        self.clock = clock
+
+        self.progress = 0
+        self.step: Optional[str] = None
+        self.writes = 0
+        self._written: Optional[Tuple[int, Optional[str]]] = None
+        self._written_at: Optional[float] = None
+        self._pending = False
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+
+    def report(self, progress: float, step: Optional[str] = None) -> None:
+        """
+        Report progress.
+
+        Args:
+            progress: Percentage (0-100); values below the current
+                progress are ignored
+            step: Description of the current step (unchanged if None)
+        """
+        progress = int(min(max(progress, 0), 100))
+        with self._lock:
+            if progress < self.progress:
+                logger.debug("progress_regression_ignored", job_id=str(self.job_id), progress=progress, current=self.progress)
+                return
+            if progress == self.progress and step in (None, self.step):
+                return
+
+            self.progress = progress
+            if step is not None:
+                self.step = step
+            self._pending = True
+
+            last_progress, last_step = self._written or (-1, None)
+            boundary = self.step != last_step or progress == 100
+            if not boundary and progress - last_progress < self.min_delta:
+                return
+
+            wait = self._wait()
+            if wait <= 0:
+                self._write()
+            elif boundary:
+                self._schedule(wait)
+
+    def span(self, start: int, end: int) -> ProgressSpan:
+        """
+        Delegate part of the range to a component.
+
+        Args:
+            start: Progress at the component's 0%
+            end: Progress at the component's 100%
+
+        Returns:
+            Reporter view for the component
+        """
+        return ProgressSpan(self, start, end)
+
+    def flush(self) -> None:
+        """Write held progress now, ignoring the interval."""
+        with self._lock:
+            if self._pending:
+                self._write()
+
+    def close(self) -> None:
+        """Flush and stop the trailing-write timer."""
+        self.flush()
+        with self._lock:
+            self._cancel_timer()
+
+    def __enter__(self) -> "ProgressReporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _wait(self) -> float:
+        if self._written_at is None:
+            return 0.0
+        return self._written_at + self.min_interval - self.clock()
+
+    def _schedule(self, delay: float) -> None:
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            self._timer = None
+            self.flush()
+
+    def _cancel_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _write(self) -> None:
+        self._cancel_timer()
+        self._pending = False
+        self._written = (self.progress, self.step)
+        self._written_at = self.clock()
+        self.writes += 1
+
+        for sink in self.sinks:
+            try:
+                sink.write(self.job_id, self.progress, self.step)
+            except Exception as e:
+                logger.warning(
+                    "progress_sink_failed",
+                    job_id=str(self.job_id),
+                    sink=type(sink).__name__,
+                    error=str(e),
+                )
+        logger.info("progress_updated", job_id=str(self.job_id), progress=self.progress, step=self.step)
@@ -0,0 +1,197 @@
+"""
+Materialized cohort statistics per region.
+
+Keeps RegionStats in step with the metrics table: inserts merge their
+moments and histogram counts in, deletions subtract them again. Both
+happen in the caller's transaction, so the statistics commit or roll
+back together with the metrics they describe.
+"""
+
+import math
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from backend.core.logging import get_logger
+from backend.models import Metric, RegionStats
+from backend.models.region_stats import histogram_bin
+
+logger = get_logger(__name__)
+
+
+def _summarize(values: List[float]):
+    """Count, mean, M2 and sparse histogram of a batch of values."""
+    n = len(values)
+    mean = sum(values) / n
+    m2 = sum((v - mean) ** 2 for v in values)
+    histogram: Dict[str, int] = defaultdict(int)
+    for value in values:
+        histogram[str(histogram_bin(value))] += 1
+    return n, mean, m2, histogram
+
+
+class RegionStatsService:
+    """
+    Service class for maintaining per-region running statistics.
+    """
+
+    @staticmethod
+    def add(db: Session, metrics: Iterable) -> None:
+        """
+        Merge new metrics into their regions' statistics (no commit).
+
+        Args:
+            db: Database session
+            metrics: Objects with region and asymmetry_index
+        """
+        RegionStatsService._apply(db, metrics, sign=1)
+
+    @staticmethod
+    def remove(db: Session, metrics: Iterable) -> None:
+        """
+        Subtract deleted metrics from their regions' statistics (no commit).
+
+        Args:
+            db: Database session
+            metrics: Objects with region and asymmetry_index
+        """
+        RegionStatsService._apply(db, metrics, sign=-1)
+
+    @staticmethod
+    def _apply(db: Session, metrics: Iterable, sign: int) -> None:
+        values_by_region: Dict[str, List[float]] = defaultdict(list)
+        for metric in metrics:
+            values_by_region[metric.region].append(metric.asymmetry_index)
+        if not values_by_region:
+            return
+
+        for stats in RegionStatsService._lock_rows(db, sorted(values_by_region)):
+            n_b, mean_b, m2_b, histogram_b = _summarize(values_by_region[stats.region])
+            n_a, mean_a, m2_a = stats.count or 0, stats.mean or 0.0, stats.m2 or 0.0
+
+            # Chan et al. parallel update, run forwards or backwards
+            if sign > 0:
+                n = n_a + n_b
+                delta = mean_b - mean_a
+                stats.mean = mean_a + delta * n_b / n
+                stats.m2 = m2_a + m2_b + delta * delta * n_a * n_b / n
+            else:
+                n = n_a - n_b
+                if n <= 0:
+                    stats.mean, stats.m2 = 0.0, 0.0
+                else:
+                    mean = (n_a * mean_a - n_b * mean_b) / n
+                    delta = mean_b - mean
+                    stats.mean = mean
+                    stats.m2 = max(m2_a - m2_b - delta * delta * n * n_b / n_a, 0.0)
+            stats.count = max(n, 0)
+
+            histogram = dict(stats.histogram or {})
+            for index, k in histogram_b.items():
+                remaining = histogram.get(index, 0) + sign * k
+                if remaining > 0:
+                    histogram[index] = remaining
+                else:
+                    histogram.pop(index, None)
+            stats.histogram = histogram
+            stats.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def _lock_rows(db: Session, regions: List[str]) -> List[RegionStats]:
+        """Create missing rows and lock all of them, in region order."""
+        dialect = db.bind.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            db.execute(
+                insert(RegionStats)
+                .values([
+                    {"region": region, "count": 0, "mean": 0.0, "m2": 0.0, "histogram": {}, "updated_at": datetime.utcnow()}
+                    for region in regions
+                ])
+                .on_conflict_do_nothing(index_elements=["region"])
+            )
+        else:
+            existing = set(db.scalars(select(RegionStats.region).where(RegionStats.region.in_(regions))))
+            db.add_all(RegionStats(region=region, histogram={}) for region in regions if region not in existing)
+            db.flush()
+
+        # Concurrent workers updating the same region serialize here;
+        # the fixed order prevents deadlocks
+        query = (
+            select(RegionStats)
+            .where(RegionStats.region.in_(regions))
+            .order_by(RegionStats.region)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        )
+        return list(db.scalars(query))
+
+    @staticmethod
+    def rebuild(db: Session) -> int:
+        """
+        Recompute all region statistics from the metrics table and commit.
+
+        Args:
+            db: Database session
+
+        Returns:
+            Number of regions written
+        """
+        db.query(RegionStats).delete()
+        db.flush()
+        regions = 0
+        for (region,) in db.query(Metric.region).distinct():
+            rows = db.query(Metric.region, Metric.asymmetry_index).filter(Metric.region == region).all()
+            RegionStatsService.add(db, rows)
+            regions += 1
+        db.commit()
+
+        logger.info("region_stats_rebuilt", regions=regions)
+        return regions
+
+    @staticmethod
+    def verify(db: Session, tolerance: float = 1e-9) -> List[Dict]:
+        """
+        Compare the stored statistics with an exact recomputation.
+
+        Args:
+            db: Database session
+            tolerance: Allowed relative difference of mean and std
+
+        Returns:
+            List of mismatches, each with region, field, stored and exact values
+        """
+        values_by_region: Dict[str, List[float]] = defaultdict(list)
+        for region, value in db.query(Metric.region, Metric.asymmetry_index).yield_per(10000):
+            values_by_region[region].append(value)
+        stored = {stats.region: stats for stats in db.query(RegionStats)}
+
+        mismatches = []
+        for region in sorted(set(values_by_region) | set(stored)):
+            values = values_by_region.get(region, [])
+            stats = stored.get(region)
+            exact = RegionStats(region=region, count=0, mean=0.0, m2=0.0, histogram={})
+            if values:
+                exact.count, exact.mean, exact.m2, exact.histogram = _summarize(values)
+                exact.histogram = dict(exact.histogram)
+
+            actual = stats or RegionStats(region=region, count=0, mean=0.0, m2=0.0, histogram={})
+            checks = [
+                ("count", actual.count, exact.count, actual.count == exact.count),
+                ("mean", actual.mean, exact.mean, math.isclose(actual.mean, exact.mean, rel_tol=tolerance, abs_tol=tolerance)),
+                ("std", actual.std, exact.std, (actual.std is None) == (exact.std is None) and (
+                    exact.std is None or math.isclose(actual.std, exact.std, rel_tol=tolerance, abs_tol=tolerance))),
+                ("histogram", actual.histogram, exact.histogram, (actual.histogram or {}) == exact.histogram),
+            ]
+            for field, stored_value, exact_value, ok in checks:
+                if not ok:
+                    mismatches.append({"region": region, "field": field, "stored": stored_value, "exact": exact_value})
+
+        if mismatches:
+            logger.warning("region_stats_mismatch", count=len(mismatches), regions=sorted({m["region"] for m in mismatches}))
+        return mismatches
@@ -5,20 +5,27 @@ This service abstracts file storage operations, supporting both
 local filesystem and S3-compatible (MinIO) storage backends.
 """
 
+import hashlib
 import os
 import shutil
+import tempfile
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Optional, Tuple
 
 from minio import Minio
 from minio.error import S3Error
+from sqlalchemy.orm import Session
 
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
+from backend.services.blob_service import BlobService
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Chunk size for streaming uploads through the hasher
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
 
 class StorageService:
     """
@@ -84,6 +91,111 @@ class StorageService:
         """Explicit helper to save locally then mirror to S3; returns local path."""
         return self.save_upload(file, filename)
     
+    def save_upload_deduplicated(
+        self,
+        db: Session,
+        file: BinaryIO,
+        filename: str,
+    ) -> Tuple[str, str]:
+        """
+        Save an uploaded file into the content-addressed blob store.
+        
+        The file is streamed to a staging file while its SHA-256 digest is
+        computed. If a blob with the same digest already exists, the staged
+        copy is discarded. The job gets its own hard link to the blob under
+        ``filename`` so processing still sees a regular file in the upload
+        directory without using additional disk space.
+        
+        Args:
+            db: Database session (for blob reference counting)
+            file: File-like object to save
+            filename: Per-job filename (e.g. ``{uuid}_{original}``)
+        
+        Returns:
+            Tuple of (local path for the job, blob digest)
+        """
+        staged_path, digest, size_bytes = self._stage_and_hash(file)
+        blob_path = self.blob_path(digest)
+        
+        try:
+            blob = BlobService.acquire(db, digest, size_bytes, str(blob_path))
+            
+            if blob_path.exists():
+                # Duplicate content: keep the existing blob
+                Path(staged_path).unlink(missing_ok=True)
+                logger.info("upload_deduplicated", digest=digest, ref_count=blob.ref_count)
+            else:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(staged_path, blob_path)
+                logger.info("blob_stored", digest=digest, path=str(blob_path), size_bytes=size_bytes)
+                
+                if self.use_s3:
+                    try:
+                        with open(blob_path, "rb") as fsrc:
+                            self._save_to_s3(fsrc, f"blobs/{digest}")
+                    except S3Error as e:
+                        logger.warning("s3_upload_deferred", error=str(e), digest=digest)
+        finally:
+            Path(staged_path).unlink(missing_ok=True)
+        
+        local_path = self._link_blob(blob_path, filename)
+        return local_path, digest
+    
+    def blob_path(self, digest: str) -> Path:
+        """
+        Get the content-addressed path for a blob digest.
+        
+        Blobs are fanned out by the first two hex characters to keep
+        directory sizes small.
+        
+        Args:
+            digest: SHA-256 hex digest
+        
+        Returns:
+            Path to the blob file
+        """
+        return Path(settings.upload_dir) / "blobs" / digest[:2] / digest
+    
+    def _stage_and_hash(self, file: BinaryIO) -> Tuple[str, str, int]:
+        """Stream a file to the staging area while computing its digest."""
+        staging_dir = Path(settings.upload_dir) / "blobs" / ".staging"
+        staging_dir.mkdir(parents=True, exist_ok=True)
+        
+        hasher = hashlib.sha256()
+        size_bytes = 0
+        
+        fd, staged_path = tempfile.mkstemp(dir=staging_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                while True:
+                    chunk = file.read(HASH_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    hasher.update(chunk)
+                    f.write(chunk)
+                    size_bytes += len(chunk)
+        except Exception:
+            Path(staged_path).unlink(missing_ok=True)
+            raise
+        
+        return staged_path, hasher.hexdigest(), size_bytes
+    
+    def _link_blob(self, blob_path: Path, filename: str) -> str:
+        """Expose a blob under a per-job filename via hard link (copy as fallback)."""
+        link_path = Path(settings.upload_dir) / filename
+        link_path.unlink(missing_ok=True)
+        
+        try:
+            os.link(blob_path, link_path)
+        except OSError as e:
+            # Filesystems without hard link support (e.g. FAT, some network mounts)
+            logger.warning("blob_hard_link_failed", error=str(e), note="Falling back to copy")
+            shutil.copyfile(blob_path, link_path)
+        
+        logger.info("file_saved_local", path=str(link_path), blob=blob_path.name)
+        
+        return str(link_path)
+    
     def _save_to_local(self, file: BinaryIO, filename: str) -> str:
         """Save file to local filesystem."""
         file_path = Path(settings.upload_dir) / filename
@@ -0,0 +1,258 @@
+"""
+Unit tests for admission control.
+
+Tests duration percentiles per profile, queue ETAs, refusing or
+deferring uploads past the thresholds, releasing deferred jobs and the
+ETA and 429 responses of the API.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import jobs, upload
+from backend.core.database import Base, get_async_db, get_db
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.schemas import JobEta
+from backend.services import admission_service
+from backend.services.admission_service import DEFERRED_STEP, AdmissionService, job_profile
+from backend.services.job_cache import JobStateCache
+
+NOW = datetime(2026, 10, 19, 12, 0, 0)
+
+
+@pytest.fixture(autouse=True)
+def admission_settings(monkeypatch):
+    """Two FastSurfer slots, a one-hour wait limit and no cached durations."""
+    monkeypatch.setattr(admission_service.settings, "max_concurrent_jobs", 2)
+    monkeypatch.setattr(admission_service.settings, "admission_backpressure", "reject")
+    monkeypatch.setattr(admission_service.settings, "admission_max_wait_seconds", 3600.0)
+    monkeypatch.setattr(admission_service.settings, "admission_default_job_seconds", 1000.0)
+    monkeypatch.setattr(AdmissionService, "disk_usage", staticmethod(lambda: 0.5))
+    AdmissionService.clear_cache()
+    yield
+    AdmissionService.clear_cache()
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync and async engines on one SQLite file."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__],
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield engine, async_engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(database):
+    session = sessionmaker(bind=database[0])()
+    yield session
+    session.close()
+
+
+def add_job(db, status, filename="sub_T1w.nii.gz", created_offset=0, started_offset=None, seconds=None, step=None):
+    """Add a job; offsets are seconds before NOW."""
+    job = Job(
+        id=uuid.uuid4(),
+        filename=filename,
+        status=status,
+        current_step=step,
+        created_at=NOW - timedelta(seconds=created_offset),
+    )
+    if started_offset is not None:
+        job.started_at = NOW - timedelta(seconds=started_offset)
+    if seconds is not None:
+        job.started_at = NOW - timedelta(days=1)
+        job.completed_at = job.started_at + timedelta(seconds=seconds)
+    db.add(job)
+    db.commit()
+    return job
+
+
+class TestDurations:
+    """Tests for historical duration percentiles."""
+
+    def test_profiles(self):
+        """Profiles follow the input kind."""
+        assert job_profile("sub_T1w.nii.gz") == "nifti"
+        assert job_profile("study.zip") == "archive"
+        assert job_profile("series_T1") == "dicom"
+
+    def test_percentiles_per_profile_with_fallbacks(self, db):
+        """Profiles without enough history use all jobs, or the default without any."""
+        for seconds in range(1000, 2000, 100):
+            add_job(db, JobStatus.COMPLETED, seconds=seconds)
+        add_job(db, JobStatus.COMPLETED, filename="study.zip", seconds=5000)
+
+        durations = AdmissionService.durations(db)
+
+        assert durations["nifti"] == {"p50": 1450.0, "p90": 1810.0, "samples": 10}
+        assert durations["archive"]["samples"] == 11  # Below MIN_PROFILE_SAMPLES: all jobs
+
+    def test_default_without_history(self, db):
+        """Until jobs complete, the configured duration is assumed."""
+        assert AdmissionService.durations(db)["dicom"] == {"p50": 1000.0, "p90": 1000.0, "samples": 0}
+
+
+class TestEta:
+    """Tests for job ETAs."""
+
+    def test_pending_job_waits_for_slots(self, db):
+        """Jobs ahead are scheduled onto the free and running slots."""
+        add_job(db, JobStatus.RUNNING, started_offset=400)
+        add_job(db, JobStatus.RUNNING, started_offset=0)
+        add_job(db, JobStatus.PENDING, created_offset=30)
+        add_job(db, JobStatus.PENDING, created_offset=20)
+        job = add_job(db, JobStatus.PENDING, created_offset=10)
+
+        eta = AdmissionService.job_eta(db, job, now=NOW)
+
+        # Slots free after 600 s and 1000 s; the two jobs ahead end at 1600 s and 2000 s
+        assert eta["queue_position"] == 2
+        assert eta["jobs_in_flight"] == 2
+        assert eta["estimated_start_at"] == NOW + timedelta(seconds=1600)
+        assert eta["estimated_completion_at"] == NOW + timedelta(seconds=2600)
+
+    def test_running_job(self, db):
+        """A running job completes after its remaining duration."""
+        job = add_job(db, JobStatus.RUNNING, started_offset=250)
+
+        eta = AdmissionService.job_eta(db, job, now=NOW)
+
+        assert eta["queue_position"] == 0
+        assert eta["estimated_completion_at"] == NOW + timedelta(seconds=750)
+
+    def test_finished_job_has_no_eta(self, db):
+        assert AdmissionService.job_eta(db, add_job(db, JobStatus.COMPLETED, seconds=100)) is None
+
+
+class TestAdmission:
+    """Tests for backpressure."""
+
+    @pytest.fixture
+    def full_queue(self, db):
+        """Two running jobs and six queued: a new job would wait 4000 s."""
+        for _ in range(2):
+            add_job(db, JobStatus.RUNNING, started_offset=0)
+        for offset in range(6):
+            add_job(db, JobStatus.PENDING, created_offset=100 - offset)
+
+    def test_admitted_below_threshold(self, db):
+        decision = AdmissionService.admit(db, now=NOW)
+
+        assert decision.admitted and not decision.deferred
+
+    def test_refused_with_retry_after(self, db, full_queue):
+        """Past the wait threshold, uploads are refused until the excess drains."""
+        decision = AdmissionService.admit(db, now=NOW)
+
+        assert not decision.admitted
+        assert decision.retry_after == 400
+
+    def test_deferred(self, db, full_queue, monkeypatch):
+        monkeypatch.setattr(admission_service.settings, "admission_backpressure", "defer")
+
+        decision = AdmissionService.admit(db, now=NOW)
+
+        assert decision.admitted and decision.deferred
+
+    def test_disk_usage_always_refuses(self, db, monkeypatch):
+        """Deferring would still store the file."""
+        monkeypatch.setattr(admission_service.settings, "admission_backpressure", "defer")
+        monkeypatch.setattr(AdmissionService, "disk_usage", staticmethod(lambda: 0.95))
+
+        decision = AdmissionService.admit(db, now=NOW)
+
+        assert not decision.admitted
+        assert decision.retry_after == admission_service.settings.admission_disk_retry_after_seconds
+
+    def test_release_deferred_oldest_first(self, db, monkeypatch):
+        """Deferred jobs are enqueued while the projected wait stays below the threshold."""
+        monkeypatch.setattr(admission_service.settings, "admission_max_wait_seconds", 1000.0)
+        deferred = [add_job(db, JobStatus.PENDING, created_offset=100 - i, step=DEFERRED_STEP) for i in range(5)]
+        enqueued = []
+
+        released = AdmissionService.release_deferred(db, enqueued.append, now=NOW)
+
+        # Two slots free now, two more after 1000 s; the fifth job would wait 2000 s
+        assert released == 4
+        assert enqueued == [job.id for job in deferred[:4]]
+        db.refresh(deferred[4])
+        assert deferred[4].current_step == DEFERRED_STEP
+
+
+class TestApi:
+    """Tests for the upload and job routes."""
+
+    @pytest.fixture
+    def client(self, database, monkeypatch):
+        engine, async_engine = database
+        monkeypatch.setattr("backend.services.async_job_service.job_cache", JobStateCache(max_size=8, ttl_seconds=60))
+        app = FastAPI()
+        app.include_router(jobs.router)
+        app.include_router(upload.router)
+        SessionLocal = sessionmaker(bind=engine)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        with TestClient(app) as client:
+            yield client
+
+    def test_job_includes_eta(self, client, db):
+        """Pending jobs report their queue position and estimated completion."""
+        add_job(db, JobStatus.PENDING, created_offset=20)
+        job = add_job(db, JobStatus.PENDING, created_offset=10)
+
+        body = client.get(f"/jobs/{job.id}").json()
+
+        assert body["eta"]["queue_position"] == 1
+        assert body["eta"]["profile"] == "nifti"
+
+    @pytest.mark.filterwarnings("error:Pydantic serializer warnings")
+    def test_eta_serializes_as_schema(self, client, db):
+        """Job and upload responses carry the ETA as a JobEta, not a raw dict."""
+        job = add_job(db, JobStatus.RUNNING, started_offset=0)
+
+        response = upload._job_response(db, job)
+
+        assert client.get(f"/jobs/{job.id}").json()["eta"]["queue_position"] == 0
+        assert isinstance(response.eta, JobEta)
+        assert response.model_dump_json()
+
+    def test_upload_refused_when_full(self, client, db, monkeypatch):
+        """A full queue answers 429 with Retry-After before storing anything."""
+        monkeypatch.setattr(admission_service.settings, "admission_max_wait_seconds", 0.0)
+        add_job(db, JobStatus.RUNNING, started_offset=0)
+        add_job(db, JobStatus.RUNNING, started_offset=0)
+        stored = []
+        monkeypatch.setattr(upload, "_store_upload", lambda *args: stored.append(args))
+
+        response = client.post("/upload/", files={"file": ("sub_T1w.nii.gz", b"scan", "application/gzip")})
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+        assert stored == []
@@ -0,0 +1,237 @@
+"""
+Unit tests for HTTP caching of visualization artifacts.
+
+Tests ETags, 304 responses without database access, Cache-Control
+and the overlay bundle and manifest endpoints.
+"""
+
+import json
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import visualizations
+from backend.core import file_serving
+from backend.core.database import Base, get_async_db, get_db
+from backend.models import Batch, Blob, Job
+from backend.models.job import JobStatus
+
+METADATA = {"labels": {"17": "Left-Hippocampus", "53": "Right-Hippocampus"}}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite file engine shared across threads (and with the async engine)."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'test.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def async_engine(engine, tmp_path):
+    """aiosqlite engine on the same database file."""
+    return create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+
+
+@pytest.fixture
+def job_id(engine, tmp_path, monkeypatch):
+    """Completed job with an overlay and segmentation metadata on disk."""
+    monkeypatch.setattr(visualizations.settings, "output_dir", str(tmp_path))
+    monkeypatch.setattr(file_serving.settings, "x_accel_redirect_prefix", None)
+
+    job_id = uuid.uuid4()
+    session = sessionmaker(bind=engine)()
+    session.add(Job(
+        id=job_id,
+        filename="sub01_T1w.nii.gz",
+        status=JobStatus.COMPLETED,
+        created_at=datetime.utcnow(),
+    ))
+    session.commit()
+    session.close()
+
+    viz_dir = tmp_path / str(job_id) / "visualizations"
+    (viz_dir / "overlays" / "axial").mkdir(parents=True)
+    (viz_dir / "overlays" / "axial" / "hippocampus_overlay_slice_00.png").write_bytes(b"\x89PNG fake")
+    (viz_dir / "whole_hippocampus").mkdir()
+    (viz_dir / "whole_hippocampus" / "segmentation_metadata.json").write_text(json.dumps(METADATA))
+    return job_id
+
+
+@pytest.fixture
+def client(engine, async_engine):
+    """Client for the visualizations router backed by SQLite."""
+    app = FastAPI()
+    app.include_router(visualizations.router)
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def count_queries(*engines):
+    """Record executed statements on the engines."""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        engine = getattr(engine, "sync_engine", engine)
+        event.listen(engine, "before_cursor_execute", record)
+
+    return statements
+
+
+class TestArtifactCaching:
+    """Tests for conditional requests on artifacts."""
+
+    def test_completed_job_artifact_is_immutable(self, client, job_id):
+        """Completed job artifacts carry a strong ETag and immutable caching."""
+        response = client.get(f"/visualizations/{job_id}/overlay/slice_00")
+
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+        assert "immutable" in response.headers["cache-control"]
+
+    def test_revalidation_skips_database(self, client, job_id, engine):
+        """A matching If-None-Match returns 304 without any query."""
+        etag = client.get(f"/visualizations/{job_id}/overlay/slice_00").headers["etag"]
+        statements = count_queries(engine)
+
+        response = client.get(
+            f"/visualizations/{job_id}/overlay/slice_00",
+            headers={"If-None-Match": etag},
+        )
+
+        assert response.status_code == 304
+        assert response.headers["etag"] == etag
+        assert statements == []
+
+    def test_etag_changes_when_artifact_rewritten(self, client, job_id, tmp_path):
+        """Reprocessing (new mtime/size) invalidates the ETag."""
+        url = f"/visualizations/{job_id}/overlay/slice_00"
+        etag = client.get(url).headers["etag"]
+        path = tmp_path / str(job_id) / "visualizations" / "overlays" / "axial" / "hippocampus_overlay_slice_00.png"
+        path.write_bytes(b"\x89PNG regenerated overlay")
+
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_metadata_served_as_stored_bytes(self, client, job_id, tmp_path):
+        """Metadata JSON is sent as the file bytes, not re-serialized."""
+        path = tmp_path / str(job_id) / "visualizations" / "whole_hippocampus" / "segmentation_metadata.json"
+
+        response = client.get(f"/visualizations/{job_id}/whole-hippocampus/metadata")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.content == path.read_bytes()
+
+    def test_metadata_revalidation_skips_database(self, client, job_id, engine, async_engine):
+        """The async metadata route also answers 304 without a query."""
+        url = f"/visualizations/{job_id}/whole-hippocampus/metadata"
+        etag = client.get(url).headers["etag"]
+        statements = count_queries(engine, async_engine)
+
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert statements == []
+
+    def test_missing_artifact_still_checks_job(self, client):
+        """Unknown jobs return 404 from the database check."""
+        response = client.get(f"/visualizations/{uuid.uuid4()}/overlay/slice_00")
+
+        assert response.status_code == 404
+        assert response.json()["detail"] == "Job not found"
+
+
+class TestOverlayBundle:
+    """Tests for the single-request overlay bundle and manifest."""
+
+    def test_packed_bundle_index_matches_files(self, client, job_id, tmp_path):
+        """Offsets in the packed index address each overlay's bytes."""
+        import struct
+
+        response = client.get(f"/visualizations/{job_id}/overlays/bundle")
+        body = response.content
+        (index_length,) = struct.unpack(">I", body[:4])
+        index = json.loads(body[4:4 + index_length])
+        data = body[4 + index_length:]
+
+        assert response.status_code == 200
+        assert int(response.headers["content-length"]) == len(body)
+        entry = index["entries"][0]
+        assert entry["orientation"] == "axial" and entry["layer"] == "overlay"
+        path = tmp_path / str(job_id) / "visualizations" / entry["path"]
+        assert data[entry["offset"]:entry["offset"] + entry["length"]] == path.read_bytes()
+
+    def test_zip_bundle(self, client, job_id):
+        """The zip bundle contains every overlay."""
+        import io
+        import zipfile
+
+        response = client.get(f"/visualizations/{job_id}/overlays/bundle?format=zip")
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
+            assert zf.namelist() == ["overlays/axial/hippocampus_overlay_slice_00.png"]
+
+    def test_manifest_lists_hashes(self, client, job_id, tmp_path):
+        """The manifest lists size and SHA-256 of every artifact."""
+        import hashlib
+
+        response = client.get(f"/visualizations/{job_id}/manifest")
+        manifest = response.json()
+        by_path = {entry["path"]: entry for entry in manifest["artifacts"]}
+        metadata = tmp_path / str(job_id) / "visualizations" / "whole_hippocampus" / "segmentation_metadata.json"
+
+        assert manifest["artifact_count"] == 2
+        assert manifest["overlay_count"] == 1
+        entry = by_path["whole_hippocampus/segmentation_metadata.json"]
+        assert entry["sha256"] == hashlib.sha256(metadata.read_bytes()).hexdigest()
+
+    def test_manifest_cache_written_without_temp_files(self, client, job_id, tmp_path):
+        """The hash cache is replaced atomically and leaves no temp file behind."""
+        viz_dir = tmp_path / str(job_id) / "visualizations"
+
+        client.get(f"/visualizations/{job_id}/manifest")
+
+        assert [p.name for p in viz_dir.iterdir() if p.name.startswith(".")] == [".manifest_cache.json"]
+        assert len(json.loads((viz_dir / ".manifest_cache.json").read_text())) == 2
+
+    def test_bundle_revalidation_skips_database(self, client, job_id, engine):
+        """A cached bundle is revalidated without a query."""
+        etag = client.get(f"/visualizations/{job_id}/overlays/bundle").headers["etag"]
+        statements = count_queries(engine)
+
+        response = client.get(f"/visualizations/{job_id}/overlays/bundle", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert statements == []
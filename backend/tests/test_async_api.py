@@ -0,0 +1,235 @@
+"""
+Unit tests for the async job and metrics routes.
+
+Tests the AsyncSession read path used by the polled endpoints and URL
+conversion to async drivers.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import jobs, metrics
+from backend.core.database import Base, get_async_db, get_db, to_async_url
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services import async_job_service
+from backend.services.job_cache import JobStateCache
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync and async engines on one SQLite file."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__],
+    )
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    yield engine, async_engine
+    engine.dispose()
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh job cache shared by the sync and async services."""
+    cache = JobStateCache(max_size=8, ttl_seconds=60)
+    monkeypatch.setattr("backend.services.async_job_service.job_cache", cache)
+    monkeypatch.setattr(async_job_service, "_count_cache", {})
+    return cache
+
+
+@pytest.fixture
+def client(database, cache):
+    """Client for the jobs and metrics routers."""
+    engine, async_engine = database
+    app = FastAPI()
+    app.include_router(jobs.router)
+    app.include_router(metrics.router)
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def completed_job(database):
+    """Completed job with two metrics."""
+    engine, _ = database
+    job_id = uuid.uuid4()
+    with sessionmaker(bind=engine)() as session:
+        session.add(Job(id=job_id, filename="sub01_T1w.nii.gz", status=JobStatus.COMPLETED, created_at=datetime.utcnow()))
+        for region, left, right in [("CA1", 600.0, 580.0), ("CA3", 200.0, 210.0)]:
+            session.add(Metric(
+                job_id=job_id,
+                region=region,
+                left_volume=left,
+                right_volume=right,
+                asymmetry_index=(left - right) / (left + right),
+            ))
+        session.commit()
+    return job_id
+
+
+class TestAsyncDatabaseUrl:
+    """Tests for async driver selection."""
+
+    def test_postgres_uses_asyncpg(self):
+        """PostgreSQL URLs switch to asyncpg and keep credentials."""
+        assert to_async_url("postgresql://u:p@db:5432/neuro") == "postgresql+asyncpg://u:p@db:5432/neuro"
+
+    def test_sqlite_uses_aiosqlite(self):
+        """SQLite URLs (desktop) switch to aiosqlite."""
+        assert to_async_url("sqlite:///data/neuro.db") == "sqlite+aiosqlite:///data/neuro.db"
+
+
+class TestAsyncRoutes:
+    """Tests for the async job and metrics endpoints."""
+
+    def test_job_detail_includes_metrics(self, client, completed_job):
+        """Metrics are eagerly loaded on the async session."""
+        response = client.get(f"/jobs/{completed_job}")
+
+        assert response.status_code == 200
+        assert sorted(m["region"] for m in response.json()["metrics"]) == ["CA1", "CA3"]
+
+    def test_cached_job_detail_loads_metrics(self, client, completed_job, cache):
+        """A cache hit still returns the job's metrics."""
+        client.get(f"/jobs/{completed_job}")
+        response = client.get(f"/jobs/{completed_job}")
+
+        assert cache.stats()["hits"] == 1
+        assert len(response.json()["metrics"]) == 2
+
+    def test_status_poll_of_cached_job_skips_database(self, client, completed_job, database):
+        """Polling a finished job issues no query once cached."""
+        _, async_engine = database
+        client.get(f"/jobs/{completed_job}/status")
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        response = client.get(f"/jobs/{completed_job}/status")
+
+        assert response.json()["status"] == "completed"
+        assert statements == []
+
+    def test_list_jobs(self, client, completed_job):
+        """The job list carries metrics for each job."""
+        response = client.get("/jobs/")
+
+        assert [job["id"] for job in response.json()] == [str(completed_job)]
+        assert len(response.json()[0]["metrics"]) == 2
+
+    def test_metrics_by_job_and_region(self, client, completed_job):
+        """Metrics routes read through the async session."""
+        by_job = client.get("/metrics/", params={"job_id": str(completed_job)}).json()
+        by_region = client.get("/metrics/region/CA1").json()
+
+        assert len(by_job) == 2
+        assert [m["region"] for m in by_region] == ["CA1"]
+        assert client.get(f"/metrics/{by_job[0]['id']}").status_code == 200
+
+    def test_missing_job(self, client):
+        """Unknown jobs return 404."""
+        assert client.get(f"/jobs/{uuid.uuid4()}/status").status_code == 404
+
+
+@pytest.fixture
+def many_jobs(database):
+    """25 jobs with distinct creation times, one metric each."""
+    engine, _ = database
+    base = datetime(2026, 1, 1)
+    job_ids = []
+    with sessionmaker(bind=engine)() as session:
+        for k in range(25):
+            job_id = uuid.uuid4()
+            job_ids.append(job_id)
+            session.add(Job(
+                id=job_id,
+                filename=f"sub{k:02d}_T1w.nii.gz",
+                status=JobStatus.COMPLETED if k % 5 else JobStatus.FAILED,
+                # Pairs share a timestamp so the id tie-breaker is exercised
+                created_at=base + timedelta(minutes=k // 2),
+            ))
+            session.add(Metric(job_id=job_id, region="CA1", left_volume=1.0, right_volume=1.0, asymmetry_index=0.0))
+        session.commit()
+    return job_ids
+
+
+class TestJobListing:
+    """Tests for keyset pagination of GET /jobs/."""
+
+    def test_cursor_pages_cover_all_jobs_once(self, client, many_jobs):
+        """Following X-Next-Cursor visits every job exactly once, newest first."""
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 10, **({"cursor": cursor} if cursor else {})}
+            response = client.get("/jobs/", params=params)
+            seen.extend(job["id"] for job in response.json())
+            cursor = response.headers.get("x-next-cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == len(set(seen)) == 25
+        assert response.headers["x-total-count"] == "25"
+        created = [client.get(f"/jobs/{job_id}").json()["created_at"] for job_id in seen]
+        assert created == sorted(created, reverse=True)
+
+    def test_metrics_loaded_without_n_plus_one(self, client, many_jobs, database):
+        """A page of jobs with metrics takes a fixed number of queries."""
+        _, async_engine = database
+        client.get("/jobs/", params={"limit": 1})  # warm the count cache
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        response = client.get("/jobs/", params={"limit": 25})
+
+        assert all(len(job["metrics"]) == 1 for job in response.json())
+        assert len(statements) == 2
+
+    def test_listing_without_metrics(self, client, many_jobs):
+        """include_metrics=false skips the metrics query."""
+        response = client.get("/jobs/", params={"include_metrics": "false"})
+
+        assert all(job["metrics"] == [] for job in response.json())
+
+    def test_status_filter(self, client, many_jobs):
+        """Status filters apply to pages and the total count."""
+        response = client.get("/jobs/", params={"status": "failed"})
+
+        assert len(response.json()) == 5
+        assert response.headers["x-total-count"] == "5"
+
+    def test_invalid_cursor(self, client):
+        """Malformed cursors are rejected."""
+        assert client.get("/jobs/", params={"cursor": "not-a-cursor"}).status_code == 400
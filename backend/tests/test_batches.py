@@ -0,0 +1,149 @@
+"""
+Unit tests for batch submission.
+
+Tests bulk job creation, aggregate batch status and archive expansion.
+"""
+
+import io
+import tarfile
+import zipfile
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.api.batches import _iter_archive_members
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job
+from backend.models.job import JobStatus
+from backend.schemas import JobCreate
+from backend.services.batch_service import BatchService
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine with batch, job and blob tables."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__],
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Session bound to the in-memory engine."""
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def make_jobs(count):
+    """Build job creation data for a cohort."""
+    return [JobCreate(filename=f"sub{i:03d}_T1w.nii.gz", file_path=f"/data/{i}.nii.gz") for i in range(count)]
+
+
+class TestBatchCreation:
+    """Tests for creating batches."""
+
+    def test_jobs_created_with_batch(self, db):
+        """All jobs are pending and linked to the batch."""
+        batch, job_ids = BatchService.create_batch(db, make_jobs(5), name="cohort-a")
+
+        jobs = db.query(Job).filter(Job.batch_id == batch.id).all()
+        assert batch.job_count == 5
+        assert {job.id for job in jobs} == set(job_ids)
+        assert all(job.status == JobStatus.PENDING for job in jobs)
+
+    def test_single_insert_statement_for_jobs(self, db, engine):
+        """Job rows are written with one executemany INSERT."""
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        BatchService.create_batch(db, make_jobs(50))
+
+        assert len([s for s in statements if s.startswith("INSERT INTO jobs")]) == 1
+
+
+class TestBatchStatus:
+    """Tests for aggregate batch status."""
+
+    def test_aggregate_progress(self, db):
+        """Progress averages jobs, counting finished jobs as complete."""
+        batch, job_ids = BatchService.create_batch(db, make_jobs(4))
+        jobs = {job.id: job for job in db.query(Job).all()}
+        jobs[job_ids[0]].status = JobStatus.COMPLETED
+        jobs[job_ids[1]].status = JobStatus.FAILED
+        jobs[job_ids[2]].status = JobStatus.RUNNING
+        jobs[job_ids[2]].progress = 50
+        db.commit()
+
+        status = BatchService.get_batch_status(db, batch.id)
+
+        assert status["progress"] == pytest.approx(62.5)
+        assert status["status_counts"] == {"completed": 1, "failed": 1, "running": 1, "pending": 1}
+        assert status["finished"] is False
+        assert len(status["jobs"]) == 4
+
+    def test_status_uses_one_query(self, db, engine):
+        """Batch status is read with a single SELECT."""
+        batch, _ = BatchService.create_batch(db, make_jobs(10))
+        statements = []
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        BatchService.get_batch_status(db, batch.id)
+
+        assert len([s for s in statements if s.lstrip().startswith("SELECT")]) == 1
+
+    def test_unknown_batch(self, db):
+        """An unknown batch id returns None."""
+        import uuid
+
+        assert BatchService.get_batch_status(db, uuid.uuid4()) is None
+
+
+ARCHIVE_MEMBERS = {
+    "cohort/sub001_T1w.nii.gz": b"one",
+    "cohort/.DS_Store": b"finder",
+    "__MACOSX/cohort/._sub001_T1w.nii.gz": b"fork",
+    "cohort/sub002_T1w.nii.gz": b"two",
+}
+
+
+class TestArchiveMembers:
+    """Tests for expanding uploaded archives into scans."""
+
+    def test_zip_skips_dotfiles_and_macosx(self):
+        """Finder metadata in a zip is not submitted as scans."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            for name, data in ARCHIVE_MEMBERS.items():
+                zf.writestr(name, data)
+
+        upload = SimpleNamespace(filename="cohort.zip", file=buffer)
+        members = [(name, stream.read()) for name, stream in _iter_archive_members(upload)]
+
+        assert members == [("sub001_T1w.nii.gz", b"one"), ("sub002_T1w.nii.gz", b"two")]
+
+    def test_tar_skips_dotfiles_and_macosx(self):
+        """Finder metadata in a tar is not submitted as scans."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w:gz") as tf:
+            for name, data in ARCHIVE_MEMBERS.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                tf.addfile(info, io.BytesIO(data))
+
+        upload = SimpleNamespace(filename="cohort.tar.gz", file=buffer)
+        members = [(name, stream.read()) for name, stream in _iter_archive_members(upload)]
+
+        assert members == [("sub001_T1w.nii.gz", b"one"), ("sub002_T1w.nii.gz", b"two")]
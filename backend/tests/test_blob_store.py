@@ -0,0 +1,151 @@
+"""
+Unit tests for the content-addressed upload blob store.
+
+Tests hashing, hard-link deduplication and reference counting.
+"""
+
+import io
+import os
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job
+from backend.services import storage_service as storage_module
+from backend.services.cleanup_service import CleanupService
+from backend.services.blob_service import BlobService
+from backend.services.storage_service import StorageService
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with the blob and job tables."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Local-only storage service rooted in a temporary upload directory."""
+    monkeypatch.setattr(storage_module.settings, "upload_dir", str(tmp_path))
+    service = StorageService.__new__(StorageService)
+    service.use_s3 = False
+    return service
+
+
+class TestBlobDeduplication:
+    """Tests for storing uploads by content hash."""
+
+    def test_duplicate_upload_shares_inode(self, db, storage):
+        """Re-uploading the same scan creates a hard link, not a copy."""
+        first, digest_a = storage.save_upload_deduplicated(db, io.BytesIO(b"scan-data"), "a_T1.nii")
+        second, digest_b = storage.save_upload_deduplicated(db, io.BytesIO(b"scan-data"), "b_T1.nii")
+
+        assert digest_a == digest_b
+        assert os.stat(first).st_ino == os.stat(second).st_ino
+        assert BlobService.get_blob(db, digest_a).ref_count == 2
+
+    def test_distinct_content_gets_distinct_blobs(self, db, storage):
+        """Different contents produce different digests."""
+        _, digest_a = storage.save_upload_deduplicated(db, io.BytesIO(b"one"), "a_T1.nii")
+        _, digest_b = storage.save_upload_deduplicated(db, io.BytesIO(b"two"), "b_T1.nii")
+
+        assert digest_a != digest_b
+        assert db.query(Blob).count() == 2
+
+    def test_staging_area_is_empty_after_upload(self, db, storage, tmp_path):
+        """Staged copies are removed once the blob is stored."""
+        storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "a_T1.nii")
+        storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "b_T1.nii")
+
+        assert list((tmp_path / "blobs" / ".staging").iterdir()) == []
+
+
+class TestBlobReferenceCounting:
+    """Tests for blob release and statistics."""
+
+    def test_blob_deleted_only_at_zero_references(self, db, storage):
+        """The blob file survives until the last reference is released."""
+        _, digest = storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "a_T1.nii")
+        storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "b_T1.nii")
+        blob_path = storage.blob_path(digest)
+
+        assert BlobService.release(db, digest) is False
+        assert blob_path.exists()
+
+        assert BlobService.release(db, digest) is True
+        assert blob_path.exists()
+
+        db.commit()
+        assert not blob_path.exists()
+        assert BlobService.get_blob(db, digest) is None
+
+    def test_rolled_back_release_keeps_blob(self, db, storage):
+        """A release that is rolled back leaves the record and the file."""
+        _, digest = storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "a_T1.nii")
+        blob_path = storage.blob_path(digest)
+
+        assert BlobService.release(db, digest) is True
+        db.rollback()
+        db.commit()
+
+        assert blob_path.exists()
+        assert BlobService.get_blob(db, digest).ref_count == 1
+
+    def test_blob_reacquired_during_delete_is_kept(self, db, storage):
+        """A blob re-acquired after its record was deleted keeps its file."""
+        _, digest = storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "a_T1.nii")
+        blob_path = storage.blob_path(digest)
+        BlobService.release(db, digest)
+        db.info["released_blobs"].clear()
+        db.commit()
+
+        # A new upload inserts the record and finds the file still present
+        storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "b_T1.nii")
+        BlobService._remove_file(db.get_bind(), digest, str(blob_path))
+
+        assert blob_path.exists()
+        assert list(blob_path.parent.iterdir()) == [blob_path]
+        assert BlobService.get_blob(db, digest).ref_count == 1
+
+    def test_dedup_stats(self, db, storage):
+        """Dedup ratio and saved bytes reflect shared references."""
+        for name in ("a_T1.nii", "b_T1.nii", "c_T1.nii"):
+            storage.save_upload_deduplicated(db, io.BytesIO(b"x" * 100), name)
+
+        stats = BlobService.get_dedup_stats(db)
+
+        assert stats["physical_bytes"] == 100
+        assert stats["logical_bytes"] == 300
+        assert stats["saved_bytes"] == 200
+        assert stats["dedup_ratio"] == pytest.approx(3.0)
+
+
+class TestOrphanedUploads:
+    """Tests for orphaned upload detection."""
+
+    def test_upload_referenced_by_relative_path_is_kept(self, db, storage, tmp_path, monkeypatch):
+        """A job path written relative to the working directory still owns its upload."""
+        upload_path, digest = storage.save_upload_deduplicated(db, io.BytesIO(b"scan"), "a_T1.nii")
+        orphan = tmp_path / "orphan_T1.nii"
+        orphan.write_bytes(b"scan")
+        monkeypatch.chdir(tmp_path.parent)
+        db.add(Job(id=uuid.uuid4(), filename="a_T1.nii",
+                   file_path=os.path.relpath(upload_path), blob_digest=digest))
+        db.commit()
+
+        cleanup = CleanupService.__new__(CleanupService)
+        cleanup.uploads_dir = tmp_path
+        cleanup.outputs_dir = tmp_path / "outputs"
+        uploads_deleted, _ = cleanup.cleanup_orphaned_files(db)
+
+        assert uploads_deleted == 1
+        assert os.path.exists(upload_path)
+        assert not orphan.exists()
@@ -0,0 +1,180 @@
+"""
+Unit tests for the Parquet cohort dataset.
+
+Tests appending jobs, reprocessing, compaction and the streaming
+CSV/Parquet/Arrow export.
+"""
+
+import io
+import uuid
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import metrics
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services import cohort_dataset_service
+from backend.services.cohort_dataset_service import CohortDatasetService
+
+JANUARY = datetime(2025, 1, 10)
+FEBRUARY = datetime(2025, 2, 10)
+
+
+def make_job(created_at: datetime):
+    return SimpleNamespace(id=uuid.uuid4(), created_at=created_at)
+
+
+def make_metrics(left: float):
+    return [
+        SimpleNamespace(region="CA1", left_volume=left, right_volume=600.0, asymmetry_index=(left - 600) / (left + 600)),
+        SimpleNamespace(region="CA3", left_volume=200.0, right_volume=210.0, asymmetry_index=-10 / 410),
+    ]
+
+
+def read_all(**filters) -> pa.Table:
+    return pa.Table.from_batches(list(CohortDatasetService.scan(**filters)))
+
+
+@pytest.fixture
+def dataset_dir(tmp_path, monkeypatch):
+    """Dataset rooted in a temporary directory."""
+    monkeypatch.setattr(cohort_dataset_service.settings, "cohort_dataset_dir", str(tmp_path / "cohort"))
+    monkeypatch.setattr(cohort_dataset_service.settings, "cohort_dataset_enabled", True)
+    return tmp_path / "cohort"
+
+
+@pytest.fixture
+def jobs(dataset_dir):
+    """Three January jobs and one February job."""
+    appended = []
+    for k, created_at in enumerate([JANUARY, JANUARY + timedelta(days=1), JANUARY + timedelta(days=2), FEBRUARY]):
+        job = make_job(created_at)
+        CohortDatasetService.append_job(job, make_metrics(610.0 + k))
+        appended.append(job)
+    return appended
+
+
+class TestCohortDataset:
+    """Tests for appending, scanning and compaction."""
+
+    def test_append_partitions_by_month(self, jobs, dataset_dir):
+        """Each job gets one part file in its month partition."""
+        assert sorted(p.name for p in dataset_dir.iterdir()) == ["month=2025-01", "month=2025-02"]
+        assert len(list((dataset_dir / "month=2025-01").glob("part-*.parquet"))) == 3
+        assert read_all().num_rows == 8
+
+    def test_scan_filters(self, jobs):
+        """Region and date filters apply across partitions."""
+        table = read_all(region="CA1", start=JANUARY + timedelta(days=1), end=FEBRUARY)
+
+        assert sorted(table.column("job_id").to_pylist()) == sorted([str(jobs[1].id), str(jobs[2].id)])
+        assert "written_at" not in table.column_names
+
+    def test_compaction_keeps_rows_and_latest_reprocessing(self, jobs, dataset_dir):
+        """Compaction merges parts; a later part supersedes compacted rows."""
+        summary = CohortDatasetService.compact()
+        january = dataset_dir / "month=2025-01"
+
+        assert summary == {"partitions": 2, "parts_merged": 4, "rows": 8}
+        assert [p.name.startswith("data-") for p in january.iterdir()] == [True]
+
+        CohortDatasetService.append_job(jobs[0], make_metrics(700.0))
+        table = read_all(region="CA1")
+        left = dict(zip(table.column("job_id").to_pylist(), table.column("left_volume").to_pylist()))
+
+        assert table.num_rows == 4
+        assert left[str(jobs[0].id)] == 700.0
+
+        CohortDatasetService.compact()
+        assert read_all(region="CA1").num_rows == 4
+
+    def test_part_replaced_during_compaction_is_kept(self, jobs, dataset_dir, monkeypatch):
+        """A job re-finalized while its part is compacted keeps its new rows."""
+        read_table = pq.read_table
+
+        def read_then_reprocess(path, **kwargs):
+            table = read_table(path, **kwargs)
+            if str(path).endswith(f"part-{jobs[0].id}.parquet"):
+                CohortDatasetService.append_job(jobs[0], make_metrics(700.0))
+            return table
+
+        with monkeypatch.context() as patch:
+            patch.setattr(cohort_dataset_service.pq, "read_table", read_then_reprocess)
+            CohortDatasetService.compact()
+
+        table = read_all(region="CA1")
+        left = dict(zip(table.column("job_id").to_pylist(), table.column("left_volume").to_pylist()))
+        assert table.num_rows == 4
+        assert left[str(jobs[0].id)] == 700.0
+        assert (dataset_dir / "month=2025-01" / f"part-{jobs[0].id}.parquet").exists()
+
+    def test_compaction_drops_deleted_jobs(self, jobs, tmp_path):
+        """With a session, rows of jobs missing from the database are dropped."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+        with sessionmaker(bind=engine)() as session:
+            for job in jobs[:2]:
+                session.add(Job(id=job.id, filename="sub_T1w.nii.gz", status=JobStatus.COMPLETED, created_at=job.created_at))
+            session.commit()
+
+            summary = CohortDatasetService.compact(session)
+
+        assert summary["rows"] == 4
+        assert set(read_all().column("job_id").to_pylist()) == {str(jobs[0].id), str(jobs[1].id)}
+
+
+class TestCohortExport:
+    """Tests for the streaming export."""
+
+    @pytest.fixture
+    def client(self, jobs):
+        app = FastAPI()
+        app.include_router(metrics.router)
+        with TestClient(app) as client:
+            yield client
+
+    def test_csv_export(self, client):
+        """CSV export has a header and one line per row."""
+        response = client.get("/metrics/export", params={"format": "csv", "region": "CA3"})
+        table = pa_csv.read_csv(io.BytesIO(response.content))
+
+        assert response.headers["content-type"].startswith("text/csv")
+        assert "cohort_metrics.csv" in response.headers["content-disposition"]
+        assert table.num_rows == 4
+        assert set(table.column("region").to_pylist()) == {"CA3"}
+
+    @pytest.mark.parametrize("export_format", ["parquet", "arrow"])
+    def test_binary_exports_round_trip(self, client, export_format):
+        """Parquet and Arrow IPC exports decode to the filtered rows."""
+        response = client.get("/metrics/export", params={"format": export_format, "start": FEBRUARY.isoformat()})
+
+        if export_format == "parquet":
+            table = pq.read_table(io.BytesIO(response.content))
+        else:
+            table = pa.ipc.open_stream(response.content).read_all()
+
+        assert table.num_rows == 2
+        assert table.schema.field("job_created_at").type == pa.timestamp("us")
+
+    def test_export_is_streamed_in_chunks(self, jobs, monkeypatch):
+        """Rows are encoded and yielded per buffered batch."""
+        monkeypatch.setattr(cohort_dataset_service, "EXPORT_BATCH_ROWS", 2)
+
+        chunks = list(CohortDatasetService.export("parquet"))
+
+        assert len(chunks) > 2
+        assert pq.read_table(io.BytesIO(b"".join(chunks))).num_rows == 8
+
+    def test_unknown_format(self, client):
+        """Unsupported formats are rejected before streaming."""
+        assert client.get("/metrics/export", params={"format": "xlsx"}).status_code == 400
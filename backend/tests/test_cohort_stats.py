@@ -0,0 +1,175 @@
+"""
+Unit tests for cohort statistics.
+
+Tests the NumPy path used on SQLite, the filters, cache invalidation on
+metric insert and the PostgreSQL aggregate queries.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import metrics
+from backend.core.database import Base, get_async_db
+from backend.models import Batch, Blob, Job, Metric, RegionStats
+from backend.models.job import JobStatus
+from backend.schemas import MetricCreate
+from backend.services import MetricService
+from backend.services.cohort_stats_service import CohortStatsCache, CohortStatsService
+
+START = datetime(2025, 1, 1)
+
+
+@pytest.fixture
+def stats_cache(monkeypatch):
+    """Fresh statistics cache that does not publish on Redis."""
+    cache = CohortStatsCache(ttl_seconds=60)
+    monkeypatch.setattr(cache, "_publish", lambda: None)
+    monkeypatch.setattr("backend.services.cohort_stats_service.cohort_stats_cache", cache)
+    monkeypatch.setattr("backend.services.metric_service.cohort_stats_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync engine for setup and async engine for the routes, one SQLite file."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__, RegionStats.__table__],
+    )
+    yield engine, create_async_engine(f"sqlite+aiosqlite:///{path}")
+    engine.dispose()
+
+
+@pytest.fixture
+def client(database, stats_cache):
+    """Client for the metrics router."""
+    _, async_engine = database
+    app = FastAPI()
+    app.include_router(metrics.router)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def cohort(database):
+    """Ten jobs on consecutive days with one CA1 and one CA3 metric each."""
+    engine, _ = database
+    rng = np.random.default_rng(0)
+    left = rng.normal(600, 30, 10)
+    right = rng.normal(590, 30, 10)
+    with sessionmaker(bind=engine)() as session:
+        for k in range(10):
+            job_id = uuid.uuid4()
+            status = JobStatus.FAILED if k == 9 else JobStatus.COMPLETED
+            session.add(Job(id=job_id, filename=f"sub{k:02d}_T1w.nii.gz", status=status, created_at=START + timedelta(days=k)))
+            session.add(Metric(job_id=job_id, region="CA1", left_volume=left[k], right_volume=right[k],
+                               asymmetry_index=(left[k] - right[k]) / (left[k] + right[k])))
+            session.add(Metric(job_id=job_id, region="CA3", left_volume=200.0, right_volume=210.0,
+                               asymmetry_index=-10 / 410))
+        session.commit()
+    return left, right
+
+
+class TestCohortStatsEndpoint:
+    """Tests for GET /metrics/stats on SQLite."""
+
+    def test_matches_numpy(self, client, cohort):
+        """Summary statistics agree with NumPy over the same rows."""
+        left, right = cohort
+        ai = (left - right) / (left + right)
+
+        body = client.get("/metrics/stats", params={"region": "CA1", "bins": 4}).json()
+        stats = body["fields"]["asymmetry_index"]
+
+        assert body["count"] == 10
+        assert stats["mean"] == pytest.approx(ai.mean())
+        assert stats["std"] == pytest.approx(ai.std(ddof=1))
+        assert stats["percentiles"]["50"] == pytest.approx(np.median(ai))
+        assert stats["histogram"]["counts"] == np.histogram(ai, bins=4)[0].tolist()
+        assert body["fields"]["left_volume"]["max"] == pytest.approx(left.max())
+
+    def test_filters(self, client, cohort):
+        """Region, status and date range narrow the cohort."""
+        params = {
+            "region": "CA1",
+            "status": "completed",
+            "start": (START + timedelta(days=2)).isoformat(),
+            "end": (START + timedelta(days=12)).isoformat(),
+        }
+        assert client.get("/metrics/stats", params=params).json()["count"] == 7
+        assert client.get("/metrics/stats").json()["count"] == 20
+
+    def test_constant_field_and_empty_cohort(self, client, cohort):
+        """Identical values get a unit-wide histogram; no rows gives nulls."""
+        constant = client.get("/metrics/stats", params={"region": "CA3", "bins": 2}).json()
+        empty = client.get("/metrics/stats", params={"region": "subiculum"}).json()
+
+        assert constant["fields"]["left_volume"]["histogram"] == {"edges": [199.5, 200.0, 200.5], "counts": [0, 10]}
+        assert empty["count"] == 0
+        assert empty["fields"]["asymmetry_index"]["mean"] is None
+
+    def test_cached_until_metrics_inserted(self, client, cohort, database):
+        """Repeat requests skip the database until a metric is inserted."""
+        engine, async_engine = database
+        client.get("/metrics/stats", params={"region": "CA3"})
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        assert client.get("/metrics/stats", params={"region": "CA3"}).json()["count"] == 10
+        assert statements == []
+
+        with sessionmaker(bind=engine)() as session:
+            job_id = session.query(Job.id).first()[0]
+            MetricService.create_metrics_bulk(
+                session, [MetricCreate(job_id=job_id, region="CA3", left_volume=205.0, right_volume=200.0)]
+            )
+
+        assert client.get("/metrics/stats", params={"region": "CA3"}).json()["count"] == 11
+
+
+class TestPostgresQueries:
+    """Tests for the SQL aggregation used on PostgreSQL."""
+
+    def compile(self, query) -> str:
+        return str(query.compile(dialect=postgresql.dialect())).lower()
+
+    def test_summary_query_aggregates_in_sql(self):
+        """Percentiles and stddev run in the database, joined to jobs only when needed."""
+        region_only = self.compile(CohortStatsService._summary_query(CohortStatsService._filters("CA1", None, None, None)))
+        with_status = self.compile(CohortStatsService._summary_query(
+            CohortStatsService._filters("CA1", JobStatus.COMPLETED, None, None)
+        ))
+
+        assert "percentile_cont" in region_only and "within group" in region_only
+        assert "stddev_samp" in region_only
+        assert "join jobs" not in region_only
+        assert "join jobs" in with_status
+
+    def test_histogram_query_clamps_maximum(self):
+        """The maximum value falls into the last bucket."""
+        sql = self.compile(CohortStatsService._histogram_query("left_volume", 0.0, 1.0, 20, []))
+
+        assert "least(width_bucket(" in sql
+        assert "group by" in sql
@@ -0,0 +1,98 @@
+"""
+Unit tests for native DICOM series assembly.
+
+Tests slice sorting, affine computation and NIfTI output.
+"""
+
+import nibabel as nib
+import numpy as np
+import pytest
+
+pytest.importorskip("pydicom")
+
+from pipeline.utils.dicom_series import (
+    DicomConversionError,
+    convert_series_to_nifti,
+)
+
+
+def write_series(directory, slices=5, rows=4, columns=3, position_step=2.0, duplicate=False):
+    """Write a tiny axial series with shuffled file names."""
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import ExplicitVRLittleEndian, MRImageStorage, generate_uid
+
+    series_uid = generate_uid()
+    for k in range(slices):
+        meta = FileMetaDataset()
+        meta.MediaStorageSOPClassUID = MRImageStorage
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+        ds = Dataset()
+        ds.file_meta = meta
+        ds.SOPClassUID = MRImageStorage
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.SeriesInstanceUID = series_uid
+        ds.Modality = "MR"
+        ds.InstanceNumber = k + 1
+        z = 0.0 if duplicate else k * position_step
+        ds.ImagePositionPatient = [10.0, 20.0, z]
+        ds.ImageOrientationPatient = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+        ds.PixelSpacing = [0.5, 0.8]
+        ds.Rows = rows
+        ds.Columns = columns
+        ds.SamplesPerPixel = 1
+        ds.PhotometricInterpretation = "MONOCHROME2"
+        ds.BitsAllocated = 16
+        ds.BitsStored = 16
+        ds.HighBit = 15
+        ds.PixelRepresentation = 0
+        # Each slice is filled with its index so ordering can be checked
+        ds.PixelData = np.full((rows, columns), k, dtype=np.uint16).tobytes()
+        ds.save_as(str(directory / f"file_{(slices - k):03d}.dcm"), enforce_file_format=True)
+
+
+class TestNativeConversion:
+    """Tests for in-process DICOM to NIfTI conversion."""
+
+    def test_volume_shape_and_slice_order(self, tmp_path):
+        """Slices are ordered by position, not by file name."""
+        write_series(tmp_path)
+        output = convert_series_to_nifti(tmp_path, tmp_path / "out.nii")
+
+        data = np.asarray(nib.load(str(output)).dataobj)
+        assert data.shape == (3, 4, 5)
+        assert [int(data[0, 0, k]) for k in range(5)] == [0, 1, 2, 3, 4]
+
+    def test_affine_converts_lps_to_ras(self, tmp_path):
+        """Affine encodes spacing and flips LPS x/y into RAS."""
+        write_series(tmp_path)
+        affine = nib.load(str(convert_series_to_nifti(tmp_path, tmp_path / "out.nii"))).affine
+
+        expected = np.array([
+            [-0.8, 0.0, 0.0, -10.0],
+            [0.0, -0.5, 0.0, -20.0],
+            [0.0, 0.0, 2.0, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ])
+        np.testing.assert_allclose(affine, expected)
+
+    def test_output_is_uncompressed(self, tmp_path):
+        """A .nii output path is written without gzip."""
+        write_series(tmp_path)
+        output = convert_series_to_nifti(tmp_path, tmp_path / "out.nii")
+
+        with open(output, "rb") as f:
+            assert f.read(2) != b"\x1f\x8b"
+
+    def test_duplicate_positions_rejected(self, tmp_path):
+        """Duplicate slice positions fall back instead of producing a bad volume."""
+        write_series(tmp_path, duplicate=True)
+
+        with pytest.raises(DicomConversionError):
+            convert_series_to_nifti(tmp_path, tmp_path / "out.nii")
+
+    def test_empty_directory_rejected(self, tmp_path):
+        """An empty directory raises a conversion error."""
+        with pytest.raises(DicomConversionError):
+            convert_series_to_nifti(tmp_path, tmp_path / "out.nii")
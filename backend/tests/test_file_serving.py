@@ -0,0 +1,129 @@
+"""
+Unit tests for range-capable artifact serving.
+
+Tests Range parsing, 206/416 responses and gzip negotiation.
+"""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from backend.core import file_serving
+from backend.core.file_serving import RangeNotSatisfiable, parse_range_header, serve_file
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """App serving a raw file and a gzip file through serve_file."""
+    monkeypatch.setattr(file_serving.settings, "x_accel_redirect_prefix", None)
+    raw_path = tmp_path / "volume.bin"
+    raw_path.write_bytes(CONTENT)
+    gz_path = tmp_path / "volume.nii.gz"
+    gz_path.write_bytes(gzip.compress(CONTENT))
+
+    app = FastAPI()
+
+    @app.get("/raw")
+    def raw(request: Request):
+        return serve_file(request, raw_path, filename="volume.bin")
+
+    @app.get("/gz")
+    def gz(request: Request, decompress: bool = False):
+        return serve_file(request, gz_path, filename="volume.nii.gz", decompress=decompress)
+
+    return TestClient(app)
+
+
+class TestParseRange:
+    """Tests for Range header parsing."""
+
+    def test_single_and_open_ranges(self):
+        """Closed, open-ended and suffix ranges resolve to inclusive bounds."""
+        assert parse_range_header("bytes=0-99", 1000) == [(0, 99)]
+        assert parse_range_header("bytes=900-", 1000) == [(900, 999)]
+        assert parse_range_header("bytes=-100", 1000) == [(900, 999)]
+
+    def test_overlapping_ranges_merged(self):
+        """Overlapping and adjacent ranges collapse into one."""
+        assert parse_range_header("bytes=0-10,5-20,21-30,100-110", 1000) == [(0, 30), (100, 110)]
+
+    def test_malformed_header_ignored(self):
+        """Invalid syntax means the full body is sent."""
+        assert parse_range_header("items=0-1", 1000) == []
+        assert parse_range_header("bytes=abc", 1000) == []
+
+    def test_unsatisfiable(self):
+        """Ranges entirely past the end are unsatisfiable."""
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range_header("bytes=2000-3000", 1000)
+
+
+class TestRangeResponses:
+    """Tests for 200/206/416 responses."""
+
+    def test_full_body(self, client):
+        """No Range header returns the whole file."""
+        response = client.get("/raw")
+
+        assert response.status_code == 200
+        assert response.content == CONTENT
+        assert response.headers["accept-ranges"] == "bytes"
+
+    def test_single_range(self, client):
+        """One range returns 206 with Content-Range."""
+        response = client.get("/raw", headers={"Range": "bytes=100-199"})
+
+        assert response.status_code == 206
+        assert response.content == CONTENT[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(CONTENT)}"
+
+    def test_multiple_ranges(self, client):
+        """Several ranges return multipart/byteranges."""
+        response = client.get("/raw", headers={"Range": "bytes=0-9,5000-5009"})
+
+        assert response.status_code == 206
+        assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+        assert int(response.headers["content-length"]) == len(response.content)
+        assert CONTENT[0:10] in response.content
+        assert CONTENT[5000:5010] in response.content
+        assert f"Content-Range: bytes 5000-5009/{len(CONTENT)}".encode() in response.content
+
+    def test_range_not_satisfiable(self, client):
+        """A range past the end returns 416."""
+        response = client.get("/raw", headers={"Range": "bytes=999999-"})
+
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+class TestGzipNegotiation:
+    """Tests for serving .nii.gz as gzip Content-Encoding."""
+
+    def test_stored_bytes_sent_with_content_encoding(self, client):
+        """Clients accepting gzip get the stored file as-is, decoded by the client."""
+        response = client.get("/gz?decompress=true", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == CONTENT  # httpx decodes transparently, like a browser
+        assert 'filename="volume.nii"' in response.headers["content-disposition"]
+
+    def test_decompressed_for_clients_without_gzip(self, client):
+        """Clients without gzip support get a streamed decompression."""
+        response = client.get("/gz?decompress=true", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == CONTENT
+
+    def test_x_accel_redirect(self, client, tmp_path, monkeypatch):
+        """With a prefix configured, nginx is asked to send the bytes."""
+        monkeypatch.setattr(file_serving.settings, "x_accel_redirect_prefix", "/_protected/outputs")
+        monkeypatch.setattr(file_serving.settings, "output_dir", str(tmp_path))
+
+        response = client.get("/gz")
+
+        assert response.headers["x-accel-redirect"] == "/_protected/outputs/volume.nii.gz"
+        assert response.content == b""
@@ -0,0 +1,93 @@
+"""
+Query plan tests for the job and metric indexes.
+
+Runs the service queries against SQLite and checks that the filtered
+ones are served by the composite indexes instead of a scan or a
+single-column index plus a filter.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services import CleanupService, JobService, MetricService
+
+START = datetime(2025, 3, 1)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """SQLite engine with a few hundred jobs and metrics."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+    statuses = [JobStatus.COMPLETED, JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.PENDING]
+    with sessionmaker(bind=engine)() as db:
+        for k in range(200):
+            status = statuses[k % len(statuses)]
+            job = Job(
+                id=uuid.uuid4(),
+                filename=f"sub{k:03d}_T1w.nii.gz",
+                status=status,
+                created_at=START + timedelta(hours=k),
+                completed_at=START + timedelta(hours=k, minutes=30) if status != JobStatus.PENDING else None,
+            )
+            db.add(job)
+            if status == JobStatus.COMPLETED:
+                db.add(Metric(job_id=job.id, region=f"Left-CA{k % 4 + 1}", left_volume=1.0,
+                              right_volume=1.0, asymmetry_index=0.0))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def plans(engine, fn) -> str:
+    """SQLite query plans of the SELECTs that fn(db) runs."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with sessionmaker(bind=engine)() as db:
+            fn(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    with engine.connect() as conn:
+        return " | ".join(
+            row[-1]
+            for statement, parameters in statements
+            for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        )
+
+
+class TestIndexPlan:
+    """Tests that filtered service queries use the composite indexes."""
+
+    def test_job_list_by_status(self, engine):
+        """Status-filtered job lists read the (status, created_at, id) index in order."""
+        plan = plans(engine, lambda db: JobService.get_jobs(db, status=JobStatus.FAILED))
+
+        assert "SEARCH jobs USING INDEX ix_jobs_status_created_at_id (status=?)" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_retention_cleanup(self, engine):
+        """Retention cleanup bounds both status and completion time."""
+        cleanup = CleanupService.__new__(CleanupService)
+        plan = plans(engine, lambda db: cleanup.cleanup_old_completed_jobs(db, days_old=1, dry_run=True))
+
+        assert "USING INDEX ix_jobs_status_completed_at (status=? AND completed_at<?)" in plan
+
+    def test_metrics_by_region(self, engine):
+        """Metrics by region are looked up instead of scanned."""
+        plan = plans(engine, lambda db: MetricService.get_metrics_by_region(db, "Left-CA1"))
+
+        assert "SEARCH metrics USING INDEX ix_metrics_region_job_id (region=?)" in plan
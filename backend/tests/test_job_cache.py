@@ -0,0 +1,199 @@
+"""
+Unit tests for the terminal job state cache.
+
+Tests cache hits without queries, bypass for active jobs, invalidation
+through JobService, LRU eviction, TTL expiry and counters.
+"""
+
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.schemas import JobUpdate
+from backend.services import job_cache as job_cache_module
+from backend.services.job_cache import JobStateCache
+from backend.services.job_service import JobService
+
+
+@pytest.fixture
+def engine():
+    """In-memory SQLite engine."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def SessionLocal(engine):
+    return sessionmaker(bind=engine)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Fresh cache installed in JobService, without Redis broadcasts."""
+    cache = JobStateCache(max_size=8, ttl_seconds=60)
+    monkeypatch.setattr(cache, "_publish", lambda job_id: None)
+    monkeypatch.setattr("backend.services.job_service.job_cache", cache)
+    return cache
+
+
+def add_job(SessionLocal, status: JobStatus) -> uuid.UUID:
+    """Insert a job and return its ID."""
+    job_id = uuid.uuid4()
+    with SessionLocal() as session:
+        session.add(Job(id=job_id, filename="sub01_T1w.nii.gz", status=status, created_at=datetime.utcnow()))
+        session.commit()
+    return job_id
+
+
+def count_queries(engine):
+    """Record executed statements on the engine."""
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+class TestJobStateCache:
+    """Tests for JobService.get_job backed by the cache."""
+
+    def test_terminal_job_hit_skips_database(self, SessionLocal, engine, cache):
+        """A second read of a completed job issues no SELECT."""
+        job_id = add_job(SessionLocal, JobStatus.COMPLETED)
+        with SessionLocal() as db:
+            JobService.get_job(db, job_id)
+
+        statements = count_queries(engine)
+        with SessionLocal() as db:
+            job = JobService.get_job(db, job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.filename == "sub01_T1w.nii.gz"
+
+        assert statements == []
+        assert cache.stats()["hits"] == 1
+
+    def test_cached_job_lazy_loads_relationships(self, SessionLocal, cache):
+        """Jobs returned from the cache are attached to the session."""
+        job_id = add_job(SessionLocal, JobStatus.COMPLETED)
+        with SessionLocal() as db:
+            JobService.get_job(db, job_id)
+
+        with SessionLocal() as db:
+            job = JobService.get_job(db, job_id)
+            assert job in db
+            assert job.metrics == []
+
+    def test_active_job_always_reads_database(self, SessionLocal, engine, cache):
+        """Pending and running jobs are never cached."""
+        job_id = add_job(SessionLocal, JobStatus.RUNNING)
+        statements = count_queries(engine)
+
+        for _ in range(3):
+            with SessionLocal() as db:
+                JobService.get_job(db, job_id)
+
+        assert len([s for s in statements if s.startswith("SELECT")]) == 3
+        assert cache.stats()["size"] == 0
+
+    def test_update_invalidates(self, SessionLocal, cache):
+        """update_job drops the cached state."""
+        job_id = add_job(SessionLocal, JobStatus.COMPLETED)
+        with SessionLocal() as db:
+            JobService.get_job(db, job_id)
+            JobService.update_job(db, job_id, JobUpdate(error_message="Re-queued"))
+
+        with SessionLocal() as db:
+            assert JobService.get_job(db, job_id).error_message == "Re-queued"
+        assert cache.stats()["invalidations"] == 1
+
+    def test_delete_invalidates(self, SessionLocal, cache):
+        """delete_job drops the cached state."""
+        job_id = add_job(SessionLocal, JobStatus.FAILED)
+        with SessionLocal() as db:
+            JobService.get_job(db, job_id)
+            JobService.delete_job(db, job_id)
+
+        with SessionLocal() as db:
+            assert JobService.get_job(db, job_id) is None
+
+    def test_delete_of_active_job_not_recached(self, SessionLocal, cache, monkeypatch):
+        """A poller reading the CANCELLED row while the worker stops does not keep it cached."""
+        job_id = add_job(SessionLocal, JobStatus.RUNNING)
+
+        def poll_while_waiting(job_id, timeout):
+            with SessionLocal() as poller:
+                assert JobService.get_job(poller, job_id).status == JobStatus.CANCELLED
+
+        monkeypatch.setattr("backend.services.job_service.job_registry.wait_released", poll_while_waiting)
+        with SessionLocal() as db:
+            JobService.delete_job(db, job_id)
+
+        with SessionLocal() as db:
+            assert JobService.get_job(db, job_id) is None
+
+    def test_lru_eviction(self, SessionLocal, cache):
+        """The least recently used job is evicted at capacity."""
+        job_ids = [add_job(SessionLocal, JobStatus.COMPLETED) for _ in range(cache.max_size + 1)]
+        with SessionLocal() as db:
+            for job_id in job_ids:
+                JobService.get_job(db, job_id)
+
+        stats = cache.stats()
+        assert stats["size"] == cache.max_size
+        assert stats["evictions"] == 1
+        with SessionLocal() as db:
+            assert cache.get(db, job_ids[0]) is None
+            assert cache.get(db, job_ids[-1]) is not None
+
+    def test_ttl_expiry(self, SessionLocal, cache, monkeypatch):
+        """Entries older than the TTL are treated as misses."""
+        job_id = add_job(SessionLocal, JobStatus.COMPLETED)
+        with SessionLocal() as db:
+            JobService.get_job(db, job_id)
+
+        now = job_cache_module.time.monotonic()
+        monkeypatch.setattr(job_cache_module.time, "monotonic", lambda: now + cache.ttl_seconds + 1)
+
+        with SessionLocal() as db:
+            assert cache.get(db, job_id) is None
+        assert cache.stats()["size"] == 0
+
+    def test_disabled_cache_never_hits(self, SessionLocal, cache):
+        """A disabled cache always falls through to the database."""
+        cache.enabled = False
+        job_id = add_job(SessionLocal, JobStatus.COMPLETED)
+        for _ in range(2):
+            with SessionLocal() as db:
+                JobService.get_job(db, job_id)
+
+        stats = cache.stats()
+        assert stats["hits"] == 0 and stats["size"] == 0
+
+    def test_invalidation_messages(self, SessionLocal, cache, monkeypatch):
+        """Messages from other processes drop one job; listener errors drop all."""
+        callbacks = {}
+        monkeypatch.setattr(cache._channel, "start_listener", lambda on_message, on_error: callbacks.update(
+            on_message=on_message, on_error=on_error
+        ))
+        cache.start_invalidation_listener()
+        job_ids = [add_job(SessionLocal, JobStatus.COMPLETED) for _ in range(3)]
+        for job_id in job_ids:
+            with SessionLocal() as db:
+                JobService.get_job(db, job_id)
+
+        callbacks["on_message"](str(job_ids[0]))
+        callbacks["on_message"]("not-a-uuid")
+        assert cache.stats()["size"] == 2
+
+        callbacks["on_error"]()
+        assert cache.stats()["size"] == 0
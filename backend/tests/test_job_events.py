@@ -0,0 +1,240 @@
+"""
+Unit tests for pushed job progress.
+
+Tests the in-process event broker, the SSE stream with final-state
+replay and the multi-job WebSocket.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import jobs
+from backend.core.database import Base, get_async_db
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services.job_cache import JobStateCache
+from backend.services.job_events import JobEventBroker
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """In-memory broker installed in the jobs router."""
+    broker = JobEventBroker(backend="memory")
+    monkeypatch.setattr(jobs, "job_events", broker)
+    monkeypatch.setattr(jobs.settings, "job_events_keepalive_seconds", 0.2)
+    monkeypatch.setattr("backend.services.async_job_service.job_cache", JobStateCache())
+    return broker
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync engine for setup and async engine for the routes, one SQLite file."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__],
+    )
+    yield engine, create_async_engine(f"sqlite+aiosqlite:///{path}")
+    engine.dispose()
+
+
+@pytest.fixture
+def client(database, broker):
+    """Client for the jobs router."""
+    _, async_engine = database
+    app = FastAPI()
+    app.include_router(jobs.router)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+def add_job(database, status: JobStatus, progress: int = 0) -> uuid.UUID:
+    """Insert a job and return its ID."""
+    engine, _ = database
+    job_id = uuid.uuid4()
+    with sessionmaker(bind=engine)() as session:
+        session.add(Job(
+            id=job_id,
+            filename="sub01_T1w.nii.gz",
+            status=status,
+            progress=progress,
+            created_at=datetime.utcnow(),
+        ))
+        session.commit()
+    return job_id
+
+
+def parse_sse(text: str):
+    """Split an SSE body into (event, data) pairs, skipping comments."""
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = [line for line in block.split("\n") if not line.startswith(":")]
+        if lines:
+            fields = dict(line.split(": ", 1) for line in lines)
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def publish_when_subscribed(broker, *events):
+    """Publish events from another thread once a client has subscribed."""
+    def run():
+        deadline = time.time() + 5
+        while broker.subscriber_count() == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        for job_id, event_type, fields in events:
+            broker.publish(job_id, event_type, **fields)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+class TestJobEventBroker:
+    """Tests for broker fan-out and replay state."""
+
+    def test_fan_out_to_matching_subscribers(self):
+        """Only subscribers of the job receive its events."""
+        broker = JobEventBroker(backend="memory")
+
+        async def scenario():
+            watching = broker.subscribe(["job-a"])
+            other = broker.subscribe(["job-b"])
+            broker.publish("job-a", "progress", progress=40, current_step="Segmenting")
+            return await watching.get(timeout=1), await other.get(timeout=0.05)
+
+        received, missed = asyncio.run(scenario())
+
+        assert received["progress"] == 40
+        assert missed is None
+
+    def test_replay_state_merges_events(self):
+        """The replay state combines status and later progress events."""
+        broker = JobEventBroker(backend="memory")
+        broker.publish("job-a", "status", status="running", progress=5)
+        broker.publish("job-a", "progress", progress=60, current_step="Subfields")
+
+        assert broker.snapshot("job-a") == {
+            "job_id": "job-a",
+            "status": "running",
+            "progress": 60,
+            "current_step": "Subfields",
+        }
+
+        broker.publish("job-a", "deleted")
+        assert broker.snapshot("job-a") is None
+
+    def test_slow_subscriber_keeps_latest_events(self):
+        """A full queue drops the oldest event."""
+        broker = JobEventBroker(backend="memory", max_queue=2)
+
+        async def scenario():
+            subscription = broker.subscribe(["job-a"])
+            for progress in (10, 20, 30):
+                broker.publish("job-a", "progress", progress=progress)
+            await asyncio.sleep(0)
+            return [(await subscription.get(timeout=1))["progress"] for _ in range(2)]
+
+        assert asyncio.run(scenario()) == [20, 30]
+
+
+class TestJobEventStream:
+    """Tests for GET /jobs/{id}/events."""
+
+    def test_finished_job_replays_final_state_and_closes(self, client, database):
+        """A late subscriber to a finished job gets one snapshot."""
+        job_id = add_job(database, JobStatus.COMPLETED, progress=100)
+
+        response = client.get(f"/jobs/{job_id}/events")
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert parse_sse(response.text) == [
+            ("snapshot", {
+                "job_id": str(job_id),
+                "status": "completed",
+                "progress": 100,
+                "current_step": None,
+                "error_message": None,
+            }),
+        ]
+
+    def test_streams_progress_until_final_status(self, client, database, broker):
+        """Progress events are pushed until the job completes."""
+        job_id = add_job(database, JobStatus.RUNNING, progress=15)
+        publisher = publish_when_subscribed(
+            broker,
+            (job_id, "progress", {"progress": 50, "current_step": "Segmenting"}),
+            (job_id, "status", {"status": "completed", "progress": 100}),
+        )
+
+        response = client.get(f"/jobs/{job_id}/events")
+        publisher.join()
+
+        events = parse_sse(response.text)
+        assert [name for name, _ in events] == ["snapshot", "progress", "status"]
+        assert events[0][1]["progress"] == 15
+        assert events[1][1]["current_step"] == "Segmenting"
+        assert broker.subscriber_count() == 0
+
+    def test_no_database_access_after_connect(self, client, database, broker):
+        """Events are fanned out without per-client queries."""
+        engine, async_engine = database
+        job_id = add_job(database, JobStatus.RUNNING)
+        broker.publish(job_id, "status", status="running", progress=20)
+        statements = []
+        event.listen(
+            async_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        publisher = publish_when_subscribed(broker, (job_id, "status", {"status": "failed"}))
+
+        response = client.get(f"/jobs/{job_id}/events")
+        publisher.join()
+
+        assert [name for name, _ in parse_sse(response.text)] == ["snapshot", "status"]
+        assert statements == []
+
+    def test_unknown_job(self, client):
+        """Unknown jobs return 404 instead of an empty stream."""
+        assert client.get(f"/jobs/{uuid.uuid4()}/events").status_code == 404
+
+
+class TestJobEventWebSocket:
+    """Tests for the multi-job WebSocket."""
+
+    def test_subscribe_to_several_jobs(self, client, database, broker):
+        """One socket carries snapshots and events of several jobs."""
+        running = add_job(database, JobStatus.RUNNING, progress=30)
+        pending = add_job(database, JobStatus.PENDING)
+
+        with client.websocket_connect("/jobs/events") as websocket:
+            websocket.send_json({"subscribe": [str(running), str(pending), "not-a-uuid"]})
+            first = [websocket.receive_json() for _ in range(3)]
+            broker.publish(pending, "progress", progress=5, current_step="Starting")
+            update = websocket.receive_json()
+
+        assert {(m["type"], m["job_id"]) for m in first} == {
+            ("snapshot", str(running)),
+            ("snapshot", str(pending)),
+            ("error", "not-a-uuid"),
+        }
+        assert update["job_id"] == str(pending) and update["progress"] == 5
@@ -0,0 +1,127 @@
+"""
+Unit tests for the job registry.
+
+Tests recording task ids and process handles, killing a job's own
+process group or container on cancellation, and the task management
+service using the registry instead of broadcasts and process scans.
+"""
+
+import os
+import subprocess
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.models.job import JobStatus
+from backend.services import job_registry as job_registry_module
+from backend.services import task_management_service
+from backend.services.job_registry import JobCancelled, JobRegistry, container_name
+from backend.services.task_management_service import TaskManagementService
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """In-memory registry used by the task management service."""
+    registry = JobRegistry(backend="memory")
+    monkeypatch.setattr(task_management_service, "job_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def sleeper():
+    """A process in its own process group, like a Singularity run."""
+    process = subprocess.Popen(["sleep", "30"], preexec_fn=os.setsid)
+    yield process
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+class TestJobRegistry:
+    """Tests for recording handles and cancelling."""
+
+    def test_register_release_forget(self, registry):
+        """Handles are recorded, dropped one by one and forgotten together."""
+        job_id = uuid.uuid4()
+        registry.register(job_id, task_id="task-1")
+        registry.register(job_id, container=container_name(job_id))
+
+        assert registry.get(job_id) == {"task_id": "task-1", "container": f"ni-{job_id}"}
+
+        registry.release(job_id, "container")
+        assert registry.get(job_id) == {"task_id": "task-1"}
+
+        registry.forget(job_id)
+        assert registry.get(job_id) == {}
+
+    def test_cancel_kills_owned_process_group(self, registry, sleeper):
+        """The owning process kills the registered process group."""
+        job_id = uuid.uuid4()
+        registry.register(job_id, owned=True, pid=sleeper.pid, pgid=os.getpgid(sleeper.pid))
+
+        registry.request_cancel(job_id)
+
+        assert sleeper.wait(timeout=5) != 0
+        assert registry.is_cancelled(job_id)
+        with pytest.raises(JobCancelled):
+            registry.raise_if_cancelled(job_id)
+
+    def test_cancel_kills_owned_container_by_name(self, registry, monkeypatch):
+        """Containers are killed by their deterministic name."""
+        commands = []
+        monkeypatch.setattr(job_registry_module.subprocess, "run", lambda cmd, **kwargs: commands.append(cmd))
+        job_id = uuid.uuid4()
+        registry.register(job_id, owned=True, container=container_name(job_id))
+
+        registry.request_cancel(job_id)
+
+        assert commands == [["docker", "kill", f"ni-{job_id}"]]
+
+    def test_handles_of_other_processes_are_not_touched(self, registry, sleeper):
+        """Only processes registered as owned are killed."""
+        job_id = uuid.uuid4()
+        registry.register(job_id, pgid=os.getpgid(sleeper.pid))
+
+        registry.request_cancel(job_id)
+
+        assert sleeper.poll() is None
+
+    def test_launch_after_cancel_is_stopped(self, registry, sleeper):
+        """A process group registered after the cancellation is killed at once."""
+        job_id = uuid.uuid4()
+        registry.request_cancel(job_id)
+
+        registry.register(job_id, owned=True, pgid=os.getpgid(sleeper.pid))
+
+        assert sleeper.wait(timeout=5) != 0
+
+
+class TestTaskManagementService:
+    """Tests for cancellation through the registry."""
+
+    @pytest.fixture
+    def control(self, monkeypatch):
+        control = MagicMock()
+        monkeypatch.setattr(task_management_service.celery_app, "control", control)
+        return control
+
+    def test_pending_job_is_revoked_without_broadcast(self, registry, control):
+        """The task id comes from the registry; no worker is inspected."""
+        job_id = uuid.uuid4()
+        registry.register(job_id, task_id="task-1")
+
+        assert TaskManagementService.cancel_job_task(job_id, JobStatus.PENDING.value)
+
+        control.revoke.assert_called_once_with("task-1", terminate=False)
+        control.inspect.assert_not_called()
+        assert registry.is_cancelled(job_id)
+
+    def test_running_job_process_group_is_killed(self, registry, control, sleeper):
+        """Cancelling a running job stops its registered process group."""
+        job_id = uuid.uuid4()
+        registry.register(job_id, task_id="task-1")
+        registry.register(job_id, owned=True, pgid=os.getpgid(sleeper.pid))
+
+        assert TaskManagementService.cancel_job_task(job_id, JobStatus.RUNNING.value)
+        assert sleeper.wait(timeout=5) != 0
@@ -0,0 +1,177 @@
+"""
+Unit tests for job search.
+
+Tests filename matching through the SQLite FTS5 trigram table, combined
+filters, keyset pagination, and the query plans showing that searches
+use the indexes.
+"""
+
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import jobs
+from backend.core.database import Base, get_async_db, init_search_index
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services import AsyncJobService
+from backend.services.job_cache import JobStateCache
+
+START = datetime(2025, 3, 1)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync and async engines on one SQLite file with the search index."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__],
+    )
+    init_search_index(engine)
+    yield engine, create_async_engine(f"sqlite+aiosqlite:///{path}")
+    engine.dispose()
+
+
+@pytest.fixture
+def client(database, monkeypatch):
+    """Client for the jobs router."""
+    _, async_engine = database
+    monkeypatch.setattr("backend.services.async_job_service.job_cache", JobStateCache())
+    app = FastAPI()
+    app.include_router(jobs.router)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def scans(database):
+    """Jobs created one day apart; every third one failed."""
+    engine, _ = database
+    filenames = [f"SUB{k:02d}_T1w.nii.gz" for k in range(12)] + ["sub99xT1w.nii.gz", "ctrl_01_T1w.nii.gz"]
+    with sessionmaker(bind=engine)() as session:
+        for k, filename in enumerate(filenames):
+            created_at = START + timedelta(days=k)
+            status = JobStatus.FAILED if k % 3 == 2 else JobStatus.COMPLETED
+            session.add(Job(
+                id=uuid.uuid4(),
+                filename=filename,
+                status=status,
+                created_at=created_at,
+                completed_at=created_at + timedelta(hours=2),
+            ))
+        session.commit()
+    return filenames
+
+
+def filenames(response):
+    return [job["filename"] for job in response.json()]
+
+
+class TestJobSearch:
+    """Tests for GET /jobs/search."""
+
+    def test_substring_is_case_insensitive(self, client, scans):
+        """Fragments match anywhere in the filename, ignoring case."""
+        assert filenames(client.get("/jobs/search", params={"q": "b05_t1"})) == ["SUB05_T1w.nii.gz"]
+
+    def test_prefix(self, client, scans):
+        """Prefix mode only matches at the start of the filename."""
+        substring = filenames(client.get("/jobs/search", params={"q": "01_T1w"}))
+        prefix = filenames(client.get("/jobs/search", params={"q": "ctrl_01", "match": "prefix"}))
+
+        assert sorted(substring) == ["SUB01_T1w.nii.gz", "ctrl_01_T1w.nii.gz"]
+        assert prefix == ["ctrl_01_T1w.nii.gz"]
+
+    def test_wildcards_are_literal(self, client, scans):
+        """Underscore and percent match themselves, also below trigram length."""
+        assert filenames(client.get("/jobs/search", params={"q": "9_", "limit": 100})) == ["SUB09_T1w.nii.gz"]
+        assert "sub99xT1w.nii.gz" not in filenames(client.get("/jobs/search", params={"q": "_T1w", "limit": 100}))
+
+    def test_combined_filters_and_pages(self, client, scans):
+        """Status and date ranges combine with the filename; pages chain by cursor."""
+        params = {
+            "q": "sub",
+            "status": "completed",
+            "created_after": (START + timedelta(days=1)).isoformat(),
+            "completed_before": (START + timedelta(days=11)).isoformat(),
+            "limit": 3,
+        }
+        first = client.get("/jobs/search", params=params)
+        second = client.get("/jobs/search", params={**params, "cursor": first.headers["X-Next-Cursor"]})
+
+        assert filenames(first) == ["SUB10_T1w.nii.gz", "SUB09_T1w.nii.gz", "SUB07_T1w.nii.gz"]
+        assert filenames(second) == ["SUB06_T1w.nii.gz", "SUB04_T1w.nii.gz", "SUB03_T1w.nii.gz"]
+
+    def test_index_follows_renames_and_deletes(self, client, scans, database):
+        """Triggers keep the FTS table in step with the jobs table."""
+        engine, _ = database
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE jobs SET filename = 'renamed_scan.nii.gz' WHERE filename = 'SUB03_T1w.nii.gz'"))
+            conn.execute(text("DELETE FROM jobs WHERE filename = 'SUB04_T1w.nii.gz'"))
+
+        assert filenames(client.get("/jobs/search", params={"q": "renamed"})) == ["renamed_scan.nii.gz"]
+        assert filenames(client.get("/jobs/search", params={"q": "SUB03"})) == []
+        assert filenames(client.get("/jobs/search", params={"q": "SUB04"})) == []
+
+    def test_invalid_match_mode(self, client):
+        """Only substring and prefix matching are supported."""
+        assert client.get("/jobs/search", params={"q": "sub", "match": "regex"}).status_code == 422
+
+
+def explain(engine, query) -> str:
+    """SQLite query plan of a SELECT."""
+    sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return " | ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+class TestSearchQueryPlans:
+    """Tests that searches are served by indexes instead of table scans."""
+
+    def test_filename_uses_fts_index(self, database, scans):
+        """Filename fragments are looked up in the FTS5 trigram index."""
+        engine, _ = database
+        plan = explain(engine, AsyncJobService.search_query("sqlite", q="SUB05"))
+
+        assert "SCAN jobs_fts VIRTUAL TABLE INDEX" in plan
+        assert "SEARCH jobs USING INDEX" in plan
+
+    def test_date_ranges_use_btree_indexes(self, database, scans):
+        """Creation and completion ranges use their indexes."""
+        engine, _ = database
+        created = explain(engine, AsyncJobService.search_query("sqlite", created_after=START))
+        completed = explain(engine, AsyncJobService.search_query("sqlite", completed_after=START))
+
+        assert "USING INDEX ix_jobs_created_at" in created
+        assert "USING INDEX ix_jobs_completed_at" in completed
+
+    @pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set")
+    def test_postgres_filename_uses_trigram_index(self):
+        """On PostgreSQL, ILIKE fragments use the trigram GIN index."""
+        engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+        Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+        init_search_index(engine)
+        query = AsyncJobService.search_query("postgresql", q="sub05")
+        sql = str(query.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+        with engine.begin() as conn:
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            plan = " ".join(row[0] for row in conn.execute(text(f"EXPLAIN {sql}")))
+
+        assert "ix_jobs_filename_trgm" in plan
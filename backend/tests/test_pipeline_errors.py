@@ -0,0 +1,84 @@
+"""
+Unit tests for pipeline error classification.
+
+Tests mapping library exceptions onto the error classes, the per-class
+retry policies and the error counters.
+"""
+
+import subprocess
+
+import pytest
+import redis.exceptions
+import sqlalchemy.exc
+
+from backend.services.pipeline_error_stats import PipelineErrorStats
+from pipeline import errors
+from pipeline.errors import (
+    InfrastructureTransientError,
+    InputInvalidError,
+    PipelineError,
+    SegmentationFailedError,
+    StorageTransientError,
+    classify,
+    retry_policy,
+)
+from pipeline.utils.dicom_series import DicomConversionError
+from pipeline.utils.series_discovery import SeriesDiscoveryError
+
+
+class TestClassify:
+    """Tests for mapping exceptions onto error classes."""
+
+    @pytest.mark.parametrize("exc, kind", [
+        (ConnectionRefusedError("refused"), "infrastructure_transient"),
+        (sqlalchemy.exc.OperationalError("SELECT 1", {}, Exception("database is locked")), "infrastructure_transient"),
+        (redis.exceptions.ConnectionError("redis down"), "infrastructure_transient"),
+        (subprocess.CalledProcessError(125, ["docker", "run"]), "infrastructure_transient"),
+        (subprocess.CalledProcessError(1, ["dcm2niix"]), "unclassified"),
+        (SeriesDiscoveryError("No DICOM files found in archive"), "input_invalid"),
+        (DicomConversionError("Slices have differing orientations"), "input_invalid"),
+        (KeyError("metrics"), "unclassified"),
+    ])
+    def test_kinds(self, exc, kind):
+        """Library and pipeline exceptions get their class."""
+        error = classify(exc)
+
+        assert error.kind == kind
+        assert error is exc or error.__cause__ is exc
+
+    def test_only_transient_errors_are_retried(self):
+        """Deterministic and unknown errors have no retry policy."""
+        assert retry_policy(InputInvalidError("corrupt")) is None
+        assert retry_policy(SegmentationFailedError("rejected")) is None
+        assert retry_policy(PipelineError("unknown")) is None
+        assert retry_policy(StorageTransientError("not yet")) is not None
+        assert retry_policy(InfrastructureTransientError("daemon down")) is not None
+
+    def test_backoff_is_exponential_and_capped(self, monkeypatch):
+        """Delays double per retry up to the maximum."""
+        monkeypatch.setattr(errors.settings, "retry_infrastructure_backoff_seconds", 15.0)
+        monkeypatch.setattr(errors.settings, "retry_backoff_max_seconds", 100.0)
+        policy = retry_policy(InfrastructureTransientError("daemon down"))
+
+        assert [policy.countdown(retries) for retries in range(5)] == [15.0, 30.0, 60.0, 100.0, 100.0]
+
+
+class TestPipelineErrorStats:
+    """Tests for the error counters."""
+
+    def test_counts_retries_failures_and_compute_avoided(self):
+        """A failure on the first attempt avoids all former retries."""
+        stats = PipelineErrorStats(backend="memory")
+
+        stats.record_retry("storage_transient")
+        stats.record_failure("input_invalid", retries=0, attempt_seconds=60.0)
+        stats.record_failure("segmentation_failed", retries=0, attempt_seconds=1800.0)
+        stats.record_failure("storage_transient", retries=5, attempt_seconds=1.0)
+        stats.record_failure("unclassified")
+
+        assert stats.stats() == {
+            "retried": {"storage_transient": 1},
+            "failed": {"input_invalid": 1, "segmentation_failed": 1, "storage_transient": 1, "unclassified": 1},
+            "retries_avoided": 10,
+            "compute_seconds_avoided": 9300.0,
+        }
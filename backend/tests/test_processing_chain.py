@@ -0,0 +1,345 @@
+"""
+Unit tests for the staged processing pipeline.
+
+Tests queue routing, running the Celery chain end to end (eagerly, with
+FastSurfer and rendering stubbed out), stage idempotency, stopping the
+chain on cancellation and retrying only transient errors.
+"""
+
+import subprocess
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job, Metric, RegionStats
+from backend.models.job import JobStatus
+from backend.services import cohort_dataset_service
+from backend.services.job_registry import JobRegistry
+from backend.services.pipeline_error_stats import PipelineErrorStats
+from backend.services.progress_reporter import MemoryProgressSink, ProgressReporter
+from pipeline import errors
+from pipeline.errors import StorageTransientError
+from pipeline.processors import mri_processor
+from pipeline.processors.mri_processor import MRIProcessor
+from workers.celery_app import celery_app
+from workers.tasks import processing
+
+# Unstubbed processor steps, for tests exercising their error handling
+prepare_input = MRIProcessor._prepare_input
+run_fastsurfer = MRIProcessor._run_fastsurfer
+
+
+class StubStorage:
+    def get_file_path(self, file_path):
+        return file_path
+
+
+@pytest.fixture
+def calls(tmp_path, monkeypatch):
+    """Stub the expensive processor steps and count their calls."""
+    calls = {"fastsurfer": 0, "visualizations": 0}
+
+    def run_fastsurfer(self, nifti_path):
+        calls["fastsurfer"] += 1
+        fastsurfer_dir = self.output_dir / "fastsurfer"
+        fastsurfer_dir.mkdir(exist_ok=True)
+        return fastsurfer_dir
+
+    def generate_visualizations(self, nifti_path, fastsurfer_dir):
+        calls["visualizations"] += 1
+        return {}
+
+    monkeypatch.setattr(mri_processor.settings, "output_dir", str(tmp_path / "outputs"))
+    monkeypatch.setattr(MRIProcessor, "_detect_gpu", lambda self: False)
+    monkeypatch.setattr(MRIProcessor, "_prepare_input", lambda self, input_path: Path(input_path))
+    monkeypatch.setattr(MRIProcessor, "_run_fastsurfer", run_fastsurfer)
+    monkeypatch.setattr(MRIProcessor, "_generate_visualizations", generate_visualizations)
+    monkeypatch.setattr(
+        MRIProcessor,
+        "_extract_hippocampal_data",
+        lambda self, fastsurfer_dir: {"Hippocampus": {"left": 3500.0, "right": 3400.0}},
+    )
+    return calls
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    registry = JobRegistry(backend="memory")
+    monkeypatch.setattr(processing, "job_registry", registry)
+    return registry
+
+
+@pytest.fixture
+def error_stats(monkeypatch):
+    stats = PipelineErrorStats(backend="memory")
+    monkeypatch.setattr(processing, "pipeline_error_stats", stats)
+    return stats
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    """SQLite database for the stages; progress goes to memory."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__, RegionStats.__table__],
+    )
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(processing, "SessionLocal", factory)
+    monkeypatch.setattr(processing, "StorageService", StubStorage)
+    monkeypatch.setattr(processing, "ProgressReporter", lambda job_id: ProgressReporter(job_id, sinks=[MemoryProgressSink()]))
+    monkeypatch.setattr(cohort_dataset_service.settings, "cohort_dataset_enabled", False)
+    monkeypatch.setattr("backend.services.metric_service.cohort_stats_cache._publish", lambda: None)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def job_id(session_factory, tmp_path):
+    """A pending job whose upload is a NIfTI file."""
+    job_id = uuid.uuid4()
+    with session_factory() as session:
+        session.add(Job(
+            id=job_id,
+            filename="sub_T1w.nii.gz",
+            file_path=str(tmp_path / "sub_T1w.nii.gz"),
+            status=JobStatus.PENDING,
+            created_at=datetime.utcnow(),
+        ))
+        session.commit()
+    return job_id
+
+
+def final_state(job_id, left_volume):
+    """Chain state as persist_results receives it."""
+    return {
+        "job_id": str(job_id),
+        "output_dir": "outputs",
+        "series_selection": {"selected": {"series_uid": "1.2.3", "description": "T1 MPRAGE"}},
+        "metrics": [{
+            "region": "Hippocampus",
+            "left_volume": left_volume,
+            "right_volume": 3400.0,
+            "asymmetry_index": (left_volume - 3400.0) / (left_volume + 3400.0),
+        }],
+    }
+
+
+class TestRouting:
+    """Tests for queue assignment."""
+
+    @pytest.mark.parametrize("task_name, queue", [
+        ("workers.tasks.processing.segment_scan", "segmentation"),
+        ("workers.tasks.processing.prepare_scan", "postprocess"),
+        ("workers.tasks.processing.visualize_scan", "postprocess"),
+        ("workers.tasks.processing.persist_results", "postprocess"),
+        ("workers.tasks.cleanup.run_cleanup", "postprocess"),
+    ])
+    def test_task_routes(self, task_name, queue):
+        """Only FastSurfer runs on the segmentation queue."""
+        assert celery_app.amqp.router.route({}, task_name)["queue"].name == queue
+
+    def test_chain_stages(self):
+        """The chain runs the five stages in order."""
+        stages = [task.task.rsplit(".", 1)[-1] for task in processing.processing_chain("job").tasks]
+
+        assert stages == ["prepare_scan", "segment_scan", "analyze_scan", "visualize_scan", "persist_results"]
+
+
+class TestProcessingChain:
+    """Tests for running the chain."""
+
+    def test_chain_completes_job(self, job_id, session_factory, registry, calls):
+        """All stages run and the job ends completed with its metrics."""
+        processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.progress == 100
+            assert [m.region for m in job.metrics] == ["Hippocampus"]
+        assert calls == {"fastsurfer": 1, "visualizations": 1}
+        assert registry.get(job_id) == {}
+
+    def test_rerun_skips_segmentation_and_replaces_metrics(self, job_id, session_factory, registry, calls):
+        """Reprocessing a job reuses FastSurfer output and does not duplicate metrics."""
+        processing.processing_chain(str(job_id)).apply_async()
+        with session_factory() as session:
+            session.get(Job, job_id).status = JobStatus.PENDING
+            session.commit()
+        processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            assert session.get(Job, job_id).status == JobStatus.COMPLETED
+            assert session.query(Metric).filter(Metric.job_id == job_id).count() == 1
+        assert calls == {"fastsurfer": 1, "visualizations": 2}
+
+    def test_duplicate_chain_of_completed_job_is_skipped(self, job_id, session_factory, registry, calls):
+        """A second delivery for a finished job neither restarts it nor reruns stages."""
+        processing.processing_chain(str(job_id)).apply_async()
+        with session_factory() as session:
+            completed_at = session.get(Job, job_id).completed_at
+
+        result = processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.completed_at == completed_at
+        assert result.get()["status"] == "skipped"
+        assert calls == {"fastsurfer": 1, "visualizations": 1}
+        assert registry.get(job_id) == {}
+
+    def test_duplicate_chain_of_running_job_is_skipped(self, job_id, session_factory, registry, calls):
+        """A duplicate (not redelivered) message does not start a second chain."""
+        with session_factory() as session:
+            session.get(Job, job_id).status = JobStatus.RUNNING
+            session.commit()
+
+        processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            assert session.get(Job, job_id).status == JobStatus.RUNNING
+        assert calls == {"fastsurfer": 0, "visualizations": 0}
+
+    def test_results_saved_in_one_commit(self, job_id, session_factory, registry, calls):
+        """Metrics, series selection and completion are written together."""
+        with session_factory() as session:
+            session.get(Job, job_id).status = JobStatus.RUNNING
+            session.commit()
+        commits = []
+        event.listen(session_factory.kw["bind"], "commit", lambda conn: commits.append(conn))
+
+        processing.persist_results.apply(args=(final_state(job_id, 3500.0),)).get()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.status == JobStatus.COMPLETED
+            assert job.progress == 100
+            assert job.series_instance_uid == "1.2.3"
+            assert [m.left_volume for m in job.metrics] == [3500.0]
+        assert len(commits) == 1
+
+    def test_repeated_final_stage_is_harmless(self, job_id, session_factory, registry, calls):
+        """A second delivery of the final stage leaves the completed job as it is."""
+        processing.processing_chain(str(job_id)).apply_async()
+        with session_factory() as session:
+            completed_at = session.get(Job, job_id).completed_at
+            metric_ids = [m.id for m in session.get(Job, job_id).metrics]
+
+        result = processing.persist_results.apply(args=(final_state(job_id, 1.0),)).get()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.completed_at == completed_at
+            assert [m.id for m in job.metrics] == metric_ids
+            assert session.query(RegionStats).filter(RegionStats.region == "Hippocampus").one().count == 1
+        assert result["status"] == "completed"
+
+    def test_cancellation_stops_chain(self, job_id, session_factory, registry, calls, monkeypatch):
+        """A cancel flag set during segmentation skips the remaining stages."""
+        run_fastsurfer = MRIProcessor._run_fastsurfer
+
+        def cancelled_during_segmentation(self, nifti_path):
+            registry.request_cancel(self.job_id)
+            return run_fastsurfer(self, nifti_path)
+
+        monkeypatch.setattr(MRIProcessor, "_run_fastsurfer", cancelled_during_segmentation)
+        monkeypatch.setattr(mri_processor, "job_registry", registry)
+        processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.status == JobStatus.RUNNING
+            assert job.metrics == []
+        assert calls["visualizations"] == 0
+
+
+class TestErrorClassification:
+    """Tests for retrying transient errors only."""
+
+    def test_invalid_input_fails_without_retry(self, job_id, session_factory, registry, calls, error_stats, monkeypatch):
+        """A corrupt NIfTI fails the job at once and never reaches FastSurfer."""
+        validations = []
+        monkeypatch.setattr(MRIProcessor, "_prepare_input", prepare_input)
+        monkeypatch.setattr(mri_processor.file_utils, "validate_nifti", lambda path: validations.append(path) and False)
+
+        with pytest.raises(errors.InputInvalidError):
+            processing.processing_chain(str(job_id)).apply_async().get()
+
+        with session_factory() as session:
+            job = session.get(Job, job_id)
+            assert job.status == JobStatus.FAILED
+            assert "Invalid or corrupt NIfTI" in job.error_message
+        assert len(validations) == 1
+        assert calls["fastsurfer"] == 0
+        stats = error_stats.stats()
+        assert stats["failed"] == {"input_invalid": 1}
+        assert stats["retried"] == {}
+        assert stats["retries_avoided"] == 5
+
+    def test_rejected_scan_fails_without_retry(self, job_id, session_factory, registry, calls, error_stats, monkeypatch):
+        """FastSurfer exiting with an error runs once and fails the job."""
+        runs = []
+
+        def docker(cmd, **kwargs):
+            if cmd[:2] == ["docker", "run"]:
+                runs.append(cmd)
+                raise subprocess.CalledProcessError(1, cmd, stderr="No brain found")
+
+        monkeypatch.setattr(MRIProcessor, "_run_fastsurfer", run_fastsurfer)
+        monkeypatch.setattr(mri_processor.subprocess_module, "run", docker)
+        monkeypatch.setattr(mri_processor, "job_registry", registry)
+
+        with pytest.raises(errors.SegmentationFailedError):
+            processing.processing_chain(str(job_id)).apply_async().get()
+
+        with session_factory() as session:
+            assert session.get(Job, job_id).status == JobStatus.FAILED
+        assert len(runs) == 1
+        assert error_stats.stats()["failed"] == {"segmentation_failed": 1}
+
+    def test_transient_storage_error_is_retried(self, job_id, session_factory, registry, calls, error_stats, monkeypatch):
+        """A storage read error is retried and the job completes."""
+        failures = [OSError("object not found yet")]
+
+        class FlakyStorage:
+            def get_file_path(self, file_path):
+                if failures:
+                    raise failures.pop()
+                return file_path
+
+        monkeypatch.setattr(processing, "StorageService", FlakyStorage)
+
+        processing.processing_chain(str(job_id)).apply_async()
+
+        with session_factory() as session:
+            assert session.get(Job, job_id).status == JobStatus.COMPLETED
+        stats = error_stats.stats()
+        assert stats["retried"] == {"storage_transient": 1}
+        assert stats["failed"] == {}
+
+    def test_transient_error_fails_after_class_limit(self, job_id, session_factory, registry, calls, error_stats, monkeypatch):
+        """Retries stop at the limit of the error's class."""
+        monkeypatch.setattr(errors.settings, "retry_storage_max_retries", 2)
+
+        class BrokenStorage:
+            def get_file_path(self, file_path):
+                raise OSError("storage down")
+
+        monkeypatch.setattr(processing, "StorageService", BrokenStorage)
+
+        with pytest.raises(StorageTransientError):
+            processing.processing_chain(str(job_id)).apply_async().get()
+
+        with session_factory() as session:
+            assert session.get(Job, job_id).status == JobStatus.FAILED
+        stats = error_stats.stats()
+        assert stats["retried"] == {"storage_transient": 2}
+        assert stats["failed"] == {"storage_transient": 1}
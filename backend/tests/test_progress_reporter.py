@@ -0,0 +1,166 @@
+"""
+Unit tests for the progress reporter.
+
+Tests monotonic progress, time and delta throttling, coalescing of
+report bursts, processor spans, sink fan-out and the number of writes
+for a replayed processing run.
+"""
+
+import time
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job
+from backend.models.job import JobStatus
+from backend.services.progress_reporter import DatabaseProgressSink, MemoryProgressSink, ProgressReporter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def sink():
+    return MemoryProgressSink()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def reporter(sink, clock):
+    """Reporter writing at most every 10 s or on 5-point moves."""
+    reporter = ProgressReporter(uuid.uuid4(), sinks=[sink], min_interval=10.0, min_delta=5, clock=clock)
+    yield reporter
+    reporter.close()
+
+
+class TestProgressReporter:
+    """Tests for throttling and coalescing."""
+
+    def test_progress_is_monotonic(self, reporter, sink, clock):
+        """Reports below the current progress are ignored."""
+        reporter.report(40, "Segmenting")
+        clock.now = 20
+        reporter.report(30, "Starting")
+
+        assert reporter.progress == 40
+        assert sink.writes == [(40, "Segmenting")]
+
+    def test_throttled_by_time_and_delta(self, reporter, sink, clock):
+        """Within a step, writes need both the interval and the delta."""
+        reporter.report(10, "Segmenting")
+        clock.now = 1
+        reporter.report(20)  # Too soon
+        clock.now = 11
+        reporter.report(22)  # Interval passed, delta from the last write reached
+        clock.now = 30
+        reporter.report(24)  # Delta too small
+
+        assert sink.writes == [(10, "Segmenting"), (22, "Segmenting")]
+
+        reporter.flush()
+        assert sink.writes[-1] == (24, "Segmenting")
+
+    def test_burst_coalesces_into_trailing_write(self, sink):
+        """Steps reported within the interval end up as one trailing write."""
+        with ProgressReporter(uuid.uuid4(), sinks=[sink], min_interval=0.05, min_delta=5) as reporter:
+            reporter.report(2, "Started")
+            reporter.report(4, "File retrieved")
+            reporter.report(9, "Preparing input")
+            time.sleep(0.2)
+
+            assert sink.writes == [(2, "Started"), (9, "Preparing input")]
+
+    def test_span_maps_component_range(self, reporter, sink):
+        """A span scales the component's 0-100 onto its part of the range."""
+        span = reporter.span(5, 90)
+        span.report(0, "Preparing input")
+        span.report(100, "Processing complete")
+        reporter.flush()
+
+        assert sink.writes == [(5, "Preparing input"), (90, "Processing complete")]
+
+    def test_completion_skips_delta(self, reporter, sink, clock):
+        """Reaching 100% is written as soon as the interval allows."""
+        reporter.report(99, "Saving")
+        clock.now = 10
+        reporter.report(100)
+
+        assert sink.writes[-1] == (100, "Saving")
+
+    def test_failing_sink_does_not_block_others(self, sink):
+        """Sink errors are logged; the other sinks still get the write."""
+        class BrokenSink:
+            def write(self, job_id, progress, step):
+                raise ConnectionError("redis down")
+
+        reporter = ProgressReporter(uuid.uuid4(), sinks=[BrokenSink(), sink], min_interval=0)
+        reporter.report(50, "Segmenting")
+
+        assert sink.writes == [(50, "Segmenting")]
+
+    def test_database_sink(self, tmp_path):
+        """The database sink updates progress and step on the job row."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+        Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__])
+        Session = sessionmaker(bind=engine)
+        job_id = uuid.uuid4()
+        with Session() as session:
+            session.add(Job(id=job_id, filename="sub_T1w.nii.gz", status=JobStatus.RUNNING, created_at=datetime.utcnow()))
+            session.commit()
+
+        ProgressReporter(job_id, sinks=[DatabaseProgressSink(Session)], min_interval=0).report(42, "Segmenting")
+
+        with Session() as session:
+            job = session.get(Job, job_id)
+            assert (job.progress, job.current_step) == (42, "Segmenting")
+
+
+class TestProcessingRunWrites:
+    """Tests the writes of a replayed processing run."""
+
+    # (progress, step, seconds until the next report) as reported by the
+    # task and the processor (through span(5, 90)); "long" stages outlast
+    # the write interval
+    RUN = [
+        ("task", 2, "Job started - preparing file...", 0),
+        ("task", 4, "File retrieved - initializing processor...", 0),
+        ("processor", 5, "Preparing input file...", 0),
+        ("processor", 10, "Running FastSurfer brain segmentation...", 0.2),
+        ("processor", 85, "Extracting hippocampal volumes...", 0),
+        ("processor", 90, "Calculating asymmetry indices...", 0),
+        ("processor", 95, "Generating visualizations...", 0.2),
+        ("processor", 98, "Saving results...", 0),
+        ("processor", 100, "Processing complete!", 0),
+        ("task", 92, "Processing complete - saving metrics...", 0),
+        ("task", 97, "Finalizing results...", 0),
+    ]
+
+    def test_fewer_writes_and_long_stages_labelled(self, sink):
+        """Thirteen per-call writes drop to six; long stages are still shown."""
+        with ProgressReporter(uuid.uuid4(), sinks=[sink], min_interval=0.05) as reporter:
+            span = reporter.span(5, 90)
+            for source, progress, step, duration in self.RUN:
+                (reporter if source == "task" else span).report(progress, step)
+                time.sleep(duration)
+
+        written = [p for p, _ in sink.writes]
+        steps = [s for _, s in sink.writes]
+
+        assert len(sink.writes) == 6
+        assert written == sorted(written)
+        assert "Running FastSurfer brain segmentation..." in steps
+        assert "Generating visualizations..." in steps
+        assert sink.writes[-1] == (97, "Finalizing results...")
@@ -0,0 +1,155 @@
+"""
+Unit tests for materialized region statistics.
+
+Tests incremental updates on metric insert and job deletion against an
+exact recomputation, percentile ranks and the ranks endpoint.
+"""
+
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import metrics
+from backend.core.database import Base, get_async_db
+from backend.models import Batch, Blob, Job, Metric, RegionStats
+from backend.models.job import JobStatus
+from backend.schemas import MetricCreate
+from backend.services import MetricService, RegionStatsService
+
+
+@pytest.fixture(autouse=True)
+def no_broadcast(monkeypatch):
+    """Keep cache invalidations in-process."""
+    monkeypatch.setattr("backend.services.metric_service.cohort_stats_cache._publish", lambda: None)
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Sync and async engines on one SQLite file."""
+    path = tmp_path / "test.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__, RegionStats.__table__],
+    )
+    yield engine, create_async_engine(f"sqlite+aiosqlite:///{path}")
+    engine.dispose()
+
+
+@pytest.fixture
+def session(database):
+    engine, _ = database
+    with sessionmaker(bind=engine)() as session:
+        yield session
+
+
+def add_job(session, asymmetries) -> uuid.UUID:
+    """Store a completed job with one metric per (region, asymmetry index)."""
+    job_id = uuid.uuid4()
+    session.add(Job(id=job_id, filename="sub_T1w.nii.gz", status=JobStatus.COMPLETED, created_at=datetime.utcnow()))
+    session.commit()
+    MetricService.create_metrics_bulk(session, [
+        MetricCreate(job_id=job_id, region=region, left_volume=1000 * (1 + ai), right_volume=1000 * (1 - ai))
+        for region, ai in asymmetries
+    ])
+    return job_id
+
+
+@pytest.fixture
+def cohort(session):
+    """Fifty jobs with normally distributed CA1 asymmetry and fixed CA3."""
+    rng = np.random.default_rng(1)
+    values = rng.normal(0.02, 0.05, 50)
+    job_ids = [add_job(session, [("CA1", ai), ("CA3", -0.01)]) for ai in values]
+    return job_ids, values
+
+
+class TestRegionStats:
+    """Tests for incremental maintenance."""
+
+    def test_insert_matches_exact_statistics(self, session, cohort):
+        """Running moments equal the exact mean and std."""
+        _, values = cohort
+        stats = session.get(RegionStats, "CA1")
+
+        assert stats.count == 50
+        assert stats.mean == pytest.approx(values.mean())
+        assert stats.std == pytest.approx(values.std(ddof=1))
+        assert RegionStatsService.verify(session) == []
+
+    def test_job_deletion_reverses_statistics(self, session, cohort):
+        """Deleting jobs subtracts their metrics again."""
+        job_ids, values = cohort
+        for job_id in job_ids[:20]:
+            MetricService.delete_job_metrics(session, job_id)
+        session.commit()
+        stats = session.get(RegionStats, "CA1")
+
+        assert stats.count == 30
+        assert stats.mean == pytest.approx(values[20:].mean())
+        assert stats.std == pytest.approx(values[20:].std(ddof=1))
+        assert RegionStatsService.verify(session) == []
+
+    def test_deleting_every_job_empties_region(self, session, cohort):
+        """A region with no metrics left has zero count and an empty sketch."""
+        job_ids, _ = cohort
+        for job_id in job_ids:
+            MetricService.delete_job_metrics(session, job_id)
+        session.commit()
+
+        assert session.get(RegionStats, "CA3").histogram == {}
+        assert RegionStatsService.verify(session) == []
+
+    def test_verify_detects_drift_and_rebuild_repairs(self, session, cohort):
+        """Metrics written around the service show up as mismatches."""
+        job_ids, _ = cohort
+        session.add(Metric(job_id=job_ids[0], region="CA1", left_volume=1.0, right_volume=1.0, asymmetry_index=0.0))
+        session.commit()
+
+        assert {m["field"] for m in RegionStatsService.verify(session)} == {"count", "mean", "std", "histogram"}
+
+        RegionStatsService.rebuild(session)
+        assert RegionStatsService.verify(session) == []
+
+    def test_percentile_rank_within_one_bin(self, session, cohort):
+        """Histogram ranks agree with exact ranks up to the bin width."""
+        _, values = cohort
+        stats = session.get(RegionStats, "CA1")
+
+        for value in (values.min(), np.median(values), 0.1):
+            exact = 100 * np.mean(values < value)
+            tolerance = 100 * np.sum(np.abs(values - value) < 0.001) / len(values)
+            assert abs(stats.percentile_rank(value) - exact) <= tolerance + 1e-9
+
+
+class TestRanksEndpoint:
+    """Tests for GET /metrics/ranks."""
+
+    def test_job_ranks(self, database, session, cohort):
+        """Each region of the job gets its z-score and percentile rank."""
+        _, async_engine = database
+        job_ids, values = cohort
+        app = FastAPI()
+        app.include_router(metrics.router)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with AsyncSessionLocal() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        with TestClient(app) as client:
+            ranks = client.get("/metrics/ranks", params={"job_id": str(job_ids[0])}).json()
+
+        assert [r["region"] for r in ranks] == ["CA1", "CA3"]
+        assert ranks[0]["cohort_count"] == 50
+        assert ranks[0]["z_score"] == pytest.approx((values[0] - values.mean()) / values.std(ddof=1))
+        assert 0 <= ranks[0]["percentile_rank"] <= 100
+        assert ranks[1]["z_score"] is None
@@ -0,0 +1,185 @@
+"""
+Unit tests for T1 series discovery in study archives.
+
+Tests archive extraction, series grouping, T1 ranking and archive
+preparation.
+"""
+
+import io
+import tarfile
+import zipfile
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pydicom")
+
+from pipeline.utils.series_discovery import (
+    SeriesDiscoveryError,
+    discover_t1_series,
+    extract_archive,
+)
+
+
+def write_series(directory, prefix, slices, description, **params):
+    """Write a tiny single-frame series with the given sequence parameters."""
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import ExplicitVRLittleEndian, MRImageStorage, generate_uid
+
+    series_uid = generate_uid()
+    for k in range(slices):
+        meta = FileMetaDataset()
+        meta.MediaStorageSOPClassUID = MRImageStorage
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+        ds = Dataset()
+        ds.file_meta = meta
+        ds.SOPClassUID = MRImageStorage
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.SeriesInstanceUID = series_uid
+        ds.Modality = "MR"
+        ds.SeriesDescription = description
+        ds.InstanceNumber = k + 1
+        ds.ImagePositionPatient = [0.0, 0.0, float(k)]
+        ds.ImageOrientationPatient = [1.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+        ds.PixelSpacing = [1.0, 1.0]
+        ds.Rows = 2
+        ds.Columns = 2
+        ds.SamplesPerPixel = 1
+        ds.PhotometricInterpretation = "MONOCHROME2"
+        ds.BitsAllocated = 16
+        ds.BitsStored = 16
+        ds.HighBit = 15
+        ds.PixelRepresentation = 0
+        for tag, value in params.items():
+            setattr(ds, tag, value)
+        ds.PixelData = np.zeros((2, 2), dtype=np.uint16).tobytes()
+        ds.save_as(str(directory / f"{prefix}_{k:03d}.dcm"), enforce_file_format=True)
+
+    return series_uid
+
+
+@pytest.fixture
+def study(tmp_path):
+    """Mixed study with a localizer, an axial T2 and a sagittal 3D MPRAGE."""
+    directory = tmp_path / "study"
+    directory.mkdir()
+    write_series(directory, "loc", 3, "localizer", ImageType=["ORIGINAL", "PRIMARY", "LOCALIZER"])
+    write_series(
+        directory, "t2", 70, "ax tse",
+        MRAcquisitionType="2D", ScanningSequence="SE", RepetitionTime=5000, EchoTime=95,
+    )
+    t1_uid = write_series(
+        directory, "mpr", 80, "sag 3d",
+        MRAcquisitionType="3D", ScanningSequence=["GR", "IR"],
+        RepetitionTime=2300, EchoTime=2.3, InversionTime=900, SliceThickness=1.0,
+    )
+    return directory, t1_uid
+
+
+class TestArchiveExtraction:
+    """Tests for streaming archive extraction."""
+
+    def test_tar_gz_extracted(self, study, tmp_path):
+        """Every member of a compressed tar is extracted."""
+        directory, _ = study
+        archive = tmp_path / "study.tar.gz"
+        with tarfile.open(archive, "w:gz") as tf:
+            tf.add(directory, arcname="study")
+
+        files = extract_archive(archive, tmp_path / "out")
+
+        assert len(files) == 153
+
+    def test_member_paths_cannot_escape(self, tmp_path):
+        """Traversal components are stripped from member names."""
+        archive = tmp_path / "evil.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("../../etc/passwd", b"x")
+
+        files = extract_archive(archive, tmp_path / "out")
+
+        assert len(files) == 1
+        assert files[0].parent == tmp_path / "out"
+
+    def test_size_limit_enforced(self, tmp_path):
+        """Archives that expand beyond the limit are rejected."""
+        archive = tmp_path / "big.tar"
+        with tarfile.open(archive, "w") as tf:
+            info = tarfile.TarInfo("big.dcm")
+            info.size = 4096
+            tf.addfile(info, io.BytesIO(b"\0" * 4096))
+
+        with pytest.raises(SeriesDiscoveryError):
+            extract_archive(archive, tmp_path / "out", max_bytes=1024)
+
+
+class TestT1Ranking:
+    """Tests for ranking series by T1 likelihood."""
+
+    def test_mprage_selected_from_mixed_study(self, study):
+        """The 3D inversion-prepared gradient echo wins over T2 and localizer."""
+        directory, t1_uid = study
+
+        candidates = discover_t1_series(sorted(directory.iterdir()))
+
+        assert len(candidates) == 3
+        assert candidates[0].series_uid == t1_uid
+        assert candidates[0].slice_count == 80
+
+    def test_no_t1_series_rejected(self, tmp_path):
+        """A study without a T1-like series raises instead of guessing."""
+        write_series(
+            tmp_path, "t2", 70, "ax t2 flair",
+            MRAcquisitionType="2D", RepetitionTime=9000, EchoTime=120, InversionTime=2500,
+        )
+
+        with pytest.raises(SeriesDiscoveryError):
+            discover_t1_series(sorted(tmp_path.iterdir()))
+
+    def test_files_without_preamble_read(self, study, tmp_path):
+        """Files lacking the 128-byte preamble and DICM prefix are still discovered."""
+        directory, t1_uid = study
+        stripped = tmp_path / "stripped"
+        stripped.mkdir()
+        for path in sorted(directory.glob("mpr_*.dcm")):
+            (stripped / path.name).write_bytes(path.read_bytes()[132:])
+
+        candidates = discover_t1_series(sorted(stripped.iterdir()))
+
+        assert candidates[0].series_uid == t1_uid
+        assert candidates[0].slice_count == 80
+
+    def test_non_dicom_files_rejected(self, tmp_path):
+        """An archive with no DICOM files raises a discovery error."""
+        (tmp_path / "readme.txt").write_text("not dicom")
+
+        with pytest.raises(SeriesDiscoveryError):
+            discover_t1_series([tmp_path / "readme.txt"])
+
+
+class TestArchivePreparation:
+    """Tests for preparing a study archive for processing."""
+
+    def test_extracted_study_removed_on_failure(self, tmp_path):
+        """A study without a T1 series leaves no extracted files behind."""
+        from pipeline.processors.mri_processor import MRIProcessor
+
+        study_dir = tmp_path / "study"
+        study_dir.mkdir()
+        write_series(study_dir, "loc", 3, "localizer", ImageType=["ORIGINAL", "PRIMARY", "LOCALIZER"])
+        archive = tmp_path / "study.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            for path in study_dir.iterdir():
+                zf.write(path, arcname=f"study/{path.name}")
+
+        processor = MRIProcessor.__new__(MRIProcessor)
+        processor.job_id = "job"
+        processor.output_dir = tmp_path / "output"
+        processor.output_dir.mkdir()
+
+        with pytest.raises(SeriesDiscoveryError):
+            processor._prepare_archive(archive)
+
+        assert not (processor.output_dir / "dicom_archive").exists()
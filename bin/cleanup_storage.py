@@ -52,9 +52,10 @@ def main():
             print("\nDRY RUN MODE - No files will be deleted\n")
         
         # Show current storage stats
-        stats = cleanup_service.get_storage_stats()
+        stats = cleanup_service.get_storage_stats(db)
         print(f"\nCurrent Storage:")
         print(f"  Uploads: {stats['uploads']['count']} files ({stats['uploads']['size_gb']:.2f} GB)")
+        print(f"  Dedup: {stats['dedup']['dedup_ratio']:.2f}x ({stats['dedup']['saved_mb']:.1f} MB saved)")
         print(f"  Outputs: {stats['outputs']['count']} directories ({stats['outputs']['size_gb']:.2f} GB)")
         print(f"  Total: {stats['total_size_gb']:.2f} GB")
         
@@ -118,7 +119,7 @@ def main():
         
         # Show final stats
         if not args.dry_run:
-            final_stats = cleanup_service.get_storage_stats()
+            final_stats = cleanup_service.get_storage_stats(db)
             print(f"\n{'='*80}")
             print("Cleanup Summary")
             print(f"{'='*80}")
@@ -5,20 +5,26 @@ Provides endpoints for retrieving, updating, and deleting
 MRI processing jobs.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from backend.core.database import get_db
 from backend.core.logging import get_logger
 from backend.schemas import JobResponse, JobStatus
 from backend.schemas.metric import MetricResponse
 from backend.services import JobService
+from backend.services.job_events import format_sse, is_final, job_events, job_state
 
 logger = get_logger(__name__)
 
+# Seconds between SSE keepalive comments
+EVENTS_KEEPALIVE_SECONDS = 15.0
+
 router = APIRouter(prefix="/jobs", tags=["jobs"])
 
 
@@ -150,3 +156,84 @@ def get_job_status(
         "error_message": job.error_message,
     }
 
+
+def _current_state(db: Session, job_id: UUID) -> Optional[Dict]:
+    """State to replay to a new subscriber: broker state, else one DB read."""
+    replay = job_events.snapshot(job_id)
+    if replay and "status" in replay:
+        return replay
+    
+    try:
+        job = JobService.get_job(db, job_id)
+        if not job:
+            return None
+        state = job_state(job)
+    finally:
+        # Do not hold the connection for the lifetime of the stream
+        db.close()
+    
+    state.update(replay or {})
+    return state
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(
+    job_id: UUID,
+    request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a job's progress as server-sent events.
+    
+    The first event (``snapshot``) carries the current state; ``progress``
+    and ``status`` events follow as the processing thread reports them.
+    The stream ends once the job reaches a final state.
+    
+    Args:
+        job_id: Job identifier
+        request: Incoming request (for disconnect detection)
+        db: Database session dependency (used once, for the initial state)
+    
+    Returns:
+        text/event-stream response
+    
+    Raises:
+        HTTPException: If job not found
+    """
+    # Subscribe before reading the state so no event falls in between
+    subscription = job_events.subscribe([job_id])
+    try:
+        state = await run_in_threadpool(_current_state, db, job_id)
+    except Exception:
+        job_events.unsubscribe(subscription)
+        raise
+    
+    if state is None:
+        job_events.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def event_stream():
+        try:
+            yield format_sse("snapshot", state)
+            if is_final(state):
+                return
+            
+            while True:
+                event = await subscription.get(timeout=EVENTS_KEEPALIVE_SECONDS)
+                if event is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield format_sse(event["type"], event)
+                if is_final(event):
+                    return
+        finally:
+            job_events.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
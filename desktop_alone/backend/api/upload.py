@@ -236,38 +236,25 @@ async def upload_mri(
         settings = get_settings()
         
         if settings.desktop_mode:
-            # Desktop mode: Process synchronously (no threading in frozen apps)
+            # Desktop mode: persistent queue worked by a bounded pool of runner threads
             try:
-                from workers.tasks.processing_desktop import process_mri_direct
-                import threading
-
-                # Process synchronously in a separate thread to avoid blocking the API
-                def process_async():
-                    try:
-                        logger.info("desktop_processing_starting", job_id=str(job.id))
-                        result = process_mri_direct(str(job.id))
-                        logger.info("desktop_processing_completed", job_id=str(job.id), result=result)
-                    except Exception as e:
-                        logger.error("desktop_processing_failed", job_id=str(job.id), error=str(e), exc_info=True)
-
-                # Start processing in background thread
-                processing_thread = threading.Thread(target=process_async, daemon=True)
-                processing_thread.start()
+                from backend.services import TaskService
 
+                TaskService.submit_job(str(job.id))
                 logger.info(
-                    "desktop_task_started",
+                    "desktop_task_queued",
                     job_id=str(job.id),
-                    mode="synchronous_thread"
+                    mode="job_queue"
                 )
             except Exception as task_error:
                 logger.error(
-                    "desktop_task_start_failed",
+                    "desktop_task_queue_failed",
                     job_id=str(job.id),
                     error=str(task_error),
                     error_type=type(task_error).__name__,
                     exc_info=True
                 )
-                # Don't raise - job is created successfully, just needs manual trigger
+                # Don't raise - pending jobs are queued again on the next start
         else:
             # Server mode: Use Celery
             try:
@@ -41,6 +41,8 @@ class Settings(BaseSettings):
     )
     
     # Database Configuration
+    sqlite_busy_timeout_ms: int = Field(default=30000, env="SQLITE_BUSY_TIMEOUT_MS")  # Desktop: wait for the writer
+    sqlite_mmap_size: int = Field(default=268435456, env="SQLITE_MMAP_SIZE")  # 256MB memory-mapped reads
     postgres_host: str = Field(default="localhost", env="POSTGRES_HOST")
     postgres_port: int = Field(default=5432, env="POSTGRES_PORT")
     postgres_user: str = Field(default="neuroinsight", env="POSTGRES_USER")
@@ -96,6 +98,11 @@ class Settings(BaseSettings):
     )
     processing_timeout: int = Field(default=36000, env="PROCESSING_TIMEOUT")  # 10 hours
     max_concurrent_jobs: int = Field(default=2, env="MAX_CONCURRENT_JOBS")
+    job_shutdown_timeout: int = Field(default=30, env="JOB_SHUTDOWN_TIMEOUT")  # Seconds to wait for running jobs on exit
+    postprocess_in_subprocess: bool = Field(default=True, env="POSTPROCESS_IN_SUBPROCESS")  # Desktop: keep the API responsive
+    postprocess_timeout: int = Field(default=1800, env="POSTPROCESS_TIMEOUT")  # 30 minutes
+    progress_min_interval_seconds: float = Field(default=2.0, env="PROGRESS_MIN_INTERVAL_SECONDS")  # Between progress writes
+    progress_min_delta: int = Field(default=2, env="PROGRESS_MIN_DELTA")  # Progress points worth a write within a step
     
     # Security
     secret_key: str = Field(default="dev-secret-key-change-me", env="SECRET_KEY")
@@ -5,9 +5,12 @@ This module provides SQLAlchemy database connection handling,
 session management, and base model class.
 """
 
+import threading
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -16,17 +19,110 @@ from .config import get_settings
 # Get application settings
 settings = get_settings()
 
+# Connection settings of SQLite databases (desktop mode). WAL lets API
+# reads run while a job writes progress; NORMAL sync is durable in WAL
+# mode except for the last transactions before a power loss. SQLite
+# ignores foreign keys (and ON DELETE CASCADE) unless enabled per
+# connection.
+SQLITE_PRAGMAS = {
+    "foreign_keys": "ON",
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": settings.sqlite_busy_timeout_ms,
+    "mmap_size": settings.sqlite_mmap_size,
+    "temp_store": "MEMORY",
+}
+
+# Writes of all sessions of the process, one transaction at a time. A
+# semaphore, not a lock: it is not owned by a thread, since a session may
+# end its transaction on another thread than the one that flushed (the
+# get_db teardown runs in the threadpool), and it is not reentrant, so two
+# sessions of one thread are serialized as well.
+_sqlite_write_lock = threading.Semaphore(1)
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """
+    Create the engine for a database URL.
+    
+    SQLite gets its own profile: the pragmas above on every connection and
+    a smaller pool (connections are cheap and readers do not block each
+    other in WAL mode). Other databases keep a pooled client-server setup.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+    
+    Returns:
+        Engine
+    """
+    echo = settings.environment == "development"
+    if make_url(database_url).get_backend_name() != "sqlite":
+        return create_engine(database_url, pool_pre_ping=True, pool_size=10, max_overflow=20, echo=echo)
+
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000},
+        pool_size=5,
+        max_overflow=10,
+        echo=echo,
+    )
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
+def serialize_sqlite_writes(session_factory: sessionmaker) -> None:
+    """
+    Let only one session of the process write to SQLite at a time.
+    
+    SQLite allows one writer per database. Without coordination, runner
+    threads writing progress, cancellation checks, the maintenance thread
+    and API requests race for the file lock and fail with "database is
+    locked" once busy_timeout expires. A session takes the process-wide
+    writer lock before its first write (flush or bulk UPDATE/DELETE) and
+    releases it when its transaction ends; waiting writers queue on the
+    lock while reads continue unblocked.
+    
+    Args:
+        session_factory: Session factory bound to a SQLite engine
+    """
+    timeout = settings.sqlite_busy_timeout_ms / 1000
+
+    def acquire(session):
+        if session.info.get("sqlite_writer"):
+            return
+        if not _sqlite_write_lock.acquire(timeout=timeout):
+            raise OperationalError("writer lock", None, TimeoutError("database is locked (writer queue timeout)"))
+        session.info["sqlite_writer"] = True
+
+    @event.listens_for(session_factory, "before_flush")
+    def lock_before_flush(session, flush_context, instances):
+        acquire(session)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def lock_before_bulk_write(orm_execute_state):
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            acquire(orm_execute_state.session)
+
+    @event.listens_for(session_factory, "after_transaction_end")
+    def unlock_after_transaction(session, transaction):
+        if transaction.parent is None and session.info.pop("sqlite_writer", False):
+            _sqlite_write_lock.release()
+
+
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    echo=settings.environment == "development",
-)
+engine = create_db_engine(settings.database_url)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+if engine.dialect.name == "sqlite":
+    serialize_sqlite_writes(SessionLocal)
 
 # Create base class for models
 Base = declarative_base()
@@ -64,7 +160,7 @@ def init_db() -> None:
     Note:
         In production, use Alembic migrations instead of this function.
     """
-    from backend.models import Job, Metric  # noqa: F401
+    from backend.models import Job, Metric, QueuedJob  # noqa: F401
     
     Base.metadata.create_all(bind=engine)
 
@@ -6,10 +6,16 @@ including middleware, routes, and lifecycle events.
 """
 
 import asyncio
+import multiprocessing
 import threading
 import time
 from contextlib import asynccontextmanager
 
+if __name__ == "__main__":
+    # Spawned post-processing children re-run the PyInstaller executable;
+    # hand them over to multiprocessing before the app is built
+    multiprocessing.freeze_support()
+
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -73,6 +79,12 @@ async def lifespan(app: FastAPI):
         logger.error("database_initialization_failed", error=str(e))
         raise
 
+    # Start the job executor: queues interrupted jobs again, then runs
+    # MAX_CONCURRENT_JOBS runner threads
+    if settings.desktop_mode:
+        from backend.services import TaskService
+        TaskService.start()
+
     # Start maintenance worker for desktop mode
     maintenance_thread = None
     if settings.desktop_mode:
@@ -83,6 +95,10 @@ async def lifespan(app: FastAPI):
     yield
 
     # Shutdown
+    if settings.desktop_mode:
+        logger.info("stopping_job_executor")
+        await asyncio.to_thread(TaskService.shutdown)
+
     if maintenance_thread and maintenance_thread.is_alive():
         logger.info("stopping_maintenance_worker")
         # Note: daemon thread will be terminated automatically on shutdown
@@ -2,6 +2,7 @@
 
 from .job import Job
 from .metric import Metric
+from .queued_job import QueuedJob
 
-__all__ = ["Job", "Metric"]
+__all__ = ["Job", "Metric", "QueuedJob"]
 
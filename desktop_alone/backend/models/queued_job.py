@@ -0,0 +1,89 @@
+"""
+Queue entry model for the desktop job executor.
+
+Desktop mode has no message broker, so jobs waiting for (or holding) a
+runner thread are kept in this table. Entries survive restarts and are
+removed once processing of the job has finished.
+"""
+
+from datetime import datetime
+from enum import Enum as PyEnum
+
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, String
+
+from backend.core.database import Base
+
+
+class QueueState(PyEnum):
+    """Enumeration of queue entry states."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+
+
+class QueuedJob(Base):
+    """
+    Queue entry of a job waiting for or being processed by a runner.
+
+    Attributes:
+        id: Entry identifier (increasing, breaks enqueue time ties)
+        job_id: Queued job identifier
+        priority: Higher priorities are processed first
+        state: Queued or claimed by a runner
+        enqueued_at: Timestamp when the job was queued
+        started_at: Timestamp when a runner claimed the job
+    """
+
+    __tablename__ = "job_queue"
+
+    id = Column(
+        Integer,
+        primary_key=True,
+        autoincrement=True,
+        doc="Queue entry identifier"
+    )
+
+    # Foreign key - String(36) for SQLite compatibility
+    job_id = Column(
+        String(36),
+        ForeignKey("jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        unique=True,
+        doc="Queued job identifier"
+    )
+
+    priority = Column(
+        Integer,
+        nullable=False,
+        default=0,
+        doc="Processing priority (higher first, FIFO within a priority)"
+    )
+
+    state = Column(
+        Enum(QueueState),
+        nullable=False,
+        default=QueueState.QUEUED,
+        doc="Queue entry state"
+    )
+
+    enqueued_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        doc="Enqueue timestamp"
+    )
+
+    started_at = Column(
+        DateTime,
+        nullable=True,
+        doc="Timestamp when a runner claimed the job"
+    )
+
+    # Claim order: highest priority, then oldest
+    __table_args__ = (
+        Index("ix_job_queue_claim", "state", "priority", "enqueued_at"),
+    )
+
+    def __repr__(self) -> str:
+        """String representation of QueuedJob."""
+        return f"<QueuedJob(job_id={self.job_id}, priority={self.priority}, state={self.state.value})>"
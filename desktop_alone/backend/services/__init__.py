@@ -3,8 +3,10 @@
 from .cleanup_service import CleanupService
 from .job_service import JobService
 from .metric_service import MetricService
+from .progress_reporter import ProgressReporter
 from .storage_service import StorageService
 from .task_management_service import TaskManagementService
+from .task_service import TaskService
 
-__all__ = ["CleanupService", "JobService", "MetricService", "StorageService", "TaskManagementService"]
+__all__ = ["CleanupService", "JobService", "MetricService", "ProgressReporter", "StorageService", "TaskManagementService", "TaskService"]
 
@@ -17,6 +17,7 @@ from backend.core.logging import get_logger
 from backend.models import Job, Metric
 from backend.models.job import JobStatus
 from backend.schemas import JobCreate, JobUpdate
+from backend.services.job_events import job_events
 
 logger = get_logger(__name__)
 
@@ -189,6 +190,7 @@ class JobService:
             job.completed_at = datetime.utcnow()
             job.error_message = "Job cancelled by user"
             db.commit()
+            job_events.publish_state(job)
             
             # Wait a moment for processes to terminate gracefully
             import time
@@ -211,6 +213,7 @@ class JobService:
         # Delete job record
         db.delete(job)
         db.commit()
+        job_events.publish(job_id, "deleted")
         
         logger.info(
             "job_deleted_with_files",
@@ -248,6 +251,8 @@ class JobService:
         
         logger.info("job_started", job_id=str(job.id))
         
+        job_events.publish_state(job)
+        
         return job
     
     @staticmethod
@@ -287,6 +292,8 @@ class JobService:
             duration_seconds=job.duration_seconds,
         )
         
+        job_events.publish_state(job)
+        
         return job
     
     @staticmethod
@@ -322,5 +329,7 @@ class JobService:
             error=error_message,
         )
         
+        job_events.publish_state(job)
+        
         return job
 
@@ -1,102 +1,331 @@
 """
-Task execution service - abstraction layer for desktop vs server mode.
+Task execution service - bounded job executor for desktop mode.
 
-Desktop mode: Uses direct threading (not ThreadPoolExecutor due to PyInstaller issues)
-Server mode: Uses Celery (if needed in future)
+Desktop mode has no Celery broker. Uploaded jobs are written to the
+``job_queue`` table and processed by a fixed number of runner threads
+(``MAX_CONCURRENT_JOBS``), highest priority first and FIFO within a
+priority. Because the queue lives in SQLite, jobs that were waiting or
+running when the application stopped are queued again on the next start.
+
+Runners are plain ``threading.Thread`` objects coordinated by a
+``threading.Condition``: ThreadPoolExecutor and multiprocessing do not
+work reliably in PyInstaller frozen apps.
 """
 
-import os
-from concurrent.futures import ThreadPoolExecutor, Future
-from typing import Callable, Any, Dict
-import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend.core.config import get_settings
+from backend.core.database import SessionLocal
+from backend.core.logging import get_logger
+from backend.models import Job, QueuedJob
+from backend.models.job import JobStatus
+from backend.models.queued_job import QueueState
+
+logger = get_logger(__name__)
+settings = get_settings()
+
+# Runners also look for new queue entries this often when not notified
+POLL_SECONDS = 5.0
+
+REQUEUED_STEP = "Queued again after restart"
+
+
+def _process_job(job_id: str) -> Any:
+    """Run the desktop pipeline (imported lazily: it imports the services)."""
+    from workers.tasks.processing_desktop import process_mri_direct
+
+    return process_mri_direct(job_id)
+
 
-logger = logging.getLogger(__name__)
+class JobExecutor:
+    """Fixed pool of runner threads processing the persistent job queue."""
 
-# ThreadPoolExecutor doesn't work reliably in PyInstaller frozen apps
-# Desktop mode uses direct threading instead
-executor = None  # Not used in desktop mode
+    def __init__(
+        self,
+        session_factory: Callable = SessionLocal,
+        process: Callable[[str], Any] = _process_job,
+        poll_seconds: float = POLL_SECONDS,
+    ):
+        """
+        Initialize the executor (runners start with ``start()``).
 
+        Args:
+            session_factory: Callable returning a database session
+            process: Function(job_id) processing one job
+            poll_seconds: Longest idle wait before re-reading the queue
+        """
+        self.session_factory = session_factory
+        self.process = process
+        self.poll_seconds = poll_seconds
+        self._wakeup = threading.Condition()
+        self._runners: List[threading.Thread] = []
+        self._active: Dict[str, str] = {}
+        self._stopping = False
 
-class TaskResult:
-    """Wrapper for task results compatible with both threading and Celery"""
-    
-    def __init__(self, future: Future, task_id: str):
-        self.future = future
-        self.task_id = task_id
-    
     @property
-    def id(self) -> str:
-        """Task ID"""
-        return self.task_id
-    
-    def ready(self) -> bool:
-        """Check if task is complete"""
-        return self.future.done()
-    
-    def get(self, timeout: float = None) -> Any:
-        """Get task result (blocks until complete)"""
+    def running(self) -> bool:
+        """Whether runner threads are started and not shutting down."""
+        return bool(self._runners) and not self._stopping
+
+    def start(self, workers: Optional[int] = None) -> int:
+        """
+        Queue interrupted jobs again and start the runner threads.
+
+        Args:
+            workers: Number of runners (default: MAX_CONCURRENT_JOBS)
+
+        Returns:
+            Number of jobs queued again
+        """
+        if self.running:
+            return 0
+
+        requeued = self.recover()
+        workers = max(1, workers or settings.max_concurrent_jobs)
+        self._stopping = False
+        self._runners = [
+            threading.Thread(target=self._run, name=f"job-runner-{index}", daemon=True)
+            for index in range(workers)
+        ]
+        for runner in self._runners:
+            runner.start()
+
+        logger.info("job_executor_started", workers=workers, requeued=requeued)
+        return requeued
+
+    def submit(self, job_id: str, priority: int = 0) -> bool:
+        """
+        Add a job to the queue and wake a runner.
+
+        Args:
+            job_id: Job identifier
+            priority: Higher priorities are processed first
+
+        Returns:
+            False if the job was already queued
+        """
+        db = self.session_factory()
+        try:
+            db.add(QueuedJob(job_id=str(job_id), priority=priority))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            logger.info("job_already_queued", job_id=str(job_id))
+            return False
+        finally:
+            db.close()
+
+        with self._wakeup:
+            self._wakeup.notify()
+        logger.info("job_queued", job_id=str(job_id), priority=priority)
+        return True
+
+    def recover(self) -> int:
+        """
+        Queue the jobs a previous run left pending or running.
+
+        Running jobs are reset to pending, queue entries of finished or
+        deleted jobs are dropped and pending jobs without an entry get one,
+        ordered by their upload time.
+
+        Returns:
+            Number of jobs queued again
+        """
+        db = self.session_factory()
         try:
-            return self.future.result(timeout=timeout)
+            interrupted = db.execute(
+                update(Job)
+                .where(Job.status == JobStatus.RUNNING)
+                .values(status=JobStatus.PENDING, progress=0, current_step=REQUEUED_STEP, started_at=None)
+            ).rowcount
+            db.execute(
+                update(QueuedJob)
+                .where(QueuedJob.state == QueueState.RUNNING)
+                .values(state=QueueState.QUEUED, started_at=None)
+            )
+
+            pending = dict(db.execute(
+                select(Job.id, Job.created_at).where(Job.status == JobStatus.PENDING)
+            ).all())
+            queued = 0
+            for entry in db.execute(select(QueuedJob)).scalars():
+                if entry.job_id in pending:
+                    del pending[entry.job_id]
+                    queued += 1
+                else:
+                    db.delete(entry)
+            for job_id, created_at in pending.items():
+                db.add(QueuedJob(job_id=job_id, enqueued_at=created_at))
+            db.commit()
+        finally:
+            db.close()
+
+        requeued = queued + len(pending)
+        if requeued:
+            logger.info("jobs_requeued", count=requeued, interrupted=interrupted)
+        return requeued
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get executor statistics.
+
+        Returns:
+            Dictionary with runner counts, the active jobs and the queue length
+        """
+        db = self.session_factory()
+        try:
+            queued = len(db.execute(
+                select(QueuedJob.id).where(QueuedJob.state == QueueState.QUEUED)
+            ).all())
+        finally:
+            db.close()
+
+        with self._wakeup:
+            active = dict(self._active)
+        return {
+            "mode": "job_queue",
+            "workers": len(self._runners),
+            "alive_workers": sum(runner.is_alive() for runner in self._runners),
+            "active_jobs": active,
+            "queue_size": queued,
+            "stopping": self._stopping,
+        }
+
+    def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Stop claiming jobs and wait for the runners.
+
+        Jobs still processing when the timeout ends keep their queue entry
+        and are queued again on the next start.
+
+        Args:
+            wait: Wait for the jobs being processed
+            timeout: Longest total wait in seconds (None waits forever)
+        """
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify_all()
+            busy = list(self._active)
+
+        logger.info("job_executor_stopping", active_jobs=busy)
+        if not wait:
+            return
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for runner in self._runners:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            runner.join(remaining)
+
+        unfinished = [runner.name for runner in self._runners if runner.is_alive()]
+        if unfinished:
+            logger.warning("job_executor_stop_timeout", runners=unfinished, active_jobs=list(self._active))
+        else:
+            self._runners = []
+            logger.info("job_executor_stopped")
+
+    def _run(self) -> None:
+        """Runner loop: claim, process and release jobs until shutdown."""
+        while True:
+            job_id = self._next_job()
+            if job_id is None:
+                return
+
+            try:
+                logger.info("desktop_processing_starting", job_id=job_id)
+                result = self.process(job_id)
+                logger.info("desktop_processing_completed", job_id=job_id, result=result)
+            except Exception as e:
+                logger.error("desktop_processing_failed", job_id=job_id, error=str(e), exc_info=True)
+            finally:
+                self._release(job_id)
+
+    def _next_job(self) -> Optional[str]:
+        """Block until a job is claimed, or return None on shutdown."""
+        with self._wakeup:
+            while not self._stopping:
+                try:
+                    job_id = self._claim()
+                except Exception as e:
+                    logger.warning("job_claim_failed", error=str(e))
+                    job_id = None
+                if job_id is not None:
+                    self._active[job_id] = threading.current_thread().name
+                    return job_id
+                self._wakeup.wait(self.poll_seconds)
+        return None
+
+    def _claim(self) -> Optional[str]:
+        """Mark the next queued entry as running (caller holds the lock)."""
+        db = self.session_factory()
+        try:
+            entry = db.execute(
+                select(QueuedJob)
+                .where(QueuedJob.state == QueueState.QUEUED)
+                .order_by(QueuedJob.priority.desc(), QueuedJob.enqueued_at, QueuedJob.id)
+                .limit(1)
+            ).scalar_one_or_none()
+            if entry is None:
+                return None
+            entry.state = QueueState.RUNNING
+            entry.started_at = datetime.utcnow()
+            db.commit()
+            return entry.job_id
+        finally:
+            db.close()
+
+    def _release(self, job_id: str) -> None:
+        """Remove a processed job from the queue."""
+        db = self.session_factory()
+        try:
+            db.query(QueuedJob).filter(QueuedJob.job_id == job_id).delete()
+            db.commit()
         except Exception as e:
-            logger.error(f"Task {self.task_id} failed: {e}")
-            raise
-    
-    def cancel(self) -> bool:
-        """Attempt to cancel task"""
-        return self.future.cancel()
+            db.rollback()
+            logger.warning("job_release_failed", job_id=job_id, error=str(e))
+        finally:
+            db.close()
+
+        with self._wakeup:
+            self._active.pop(job_id, None)
+
+
+job_executor = JobExecutor()
 
 
 class TaskService:
-    """Service for submitting and managing background tasks"""
-    
+    """Service for submitting and managing desktop background jobs"""
+
     @staticmethod
-    def submit_task(func: Callable, *args, **kwargs) -> TaskResult:
+    def start() -> int:
+        """Start the job executor; returns the number of jobs queued again."""
+        return job_executor.start()
+
+    @staticmethod
+    def submit_job(job_id: str, priority: int = 0) -> bool:
         """
-        Submit a task for background execution.
+        Queue a job for processing.
 
         Args:
-            func: Function to execute
-            *args: Positional arguments
-            **kwargs: Keyword arguments
+            job_id: Job identifier
+            priority: Higher priorities are processed first
 
         Returns:
-            TaskResult: Object to track task status
+            False if the job was already queued
         """
-        # Generate task ID
-        import uuid
-        task_id = str(uuid.uuid4())
-
-        logger.warning(f"TaskService.submit_task called but ThreadPoolExecutor disabled for desktop mode. Use direct threading instead.")
+        return job_executor.submit(job_id, priority=priority)
 
-        # This should not be called in desktop mode - raise error
-        raise RuntimeError("TaskService.submit_task should not be used in desktop mode. Use direct threading.")
-    
     @staticmethod
     def get_executor_stats() -> Dict[str, Any]:
-        """Get statistics about the task executor"""
-        if executor is None:
-            return {
-                "mode": "direct_threading",
-                "note": "ThreadPoolExecutor disabled for desktop mode",
-            }
-        return {
-            "max_workers": executor._max_workers,
-            "queue_size": executor._work_queue.qsize(),
-            "mode": "threading",
-        }
-    
+        """Get statistics about the job executor"""
+        return job_executor.stats()
+
     @staticmethod
     def shutdown(wait: bool = True):
-        """Shutdown the task executor"""
-        if executor is not None:
-            logger.info("Shutting down task executor")
-            executor.shutdown(wait=wait)
-        else:
-            logger.info("No task executor to shutdown (desktop mode)")
-
-
-# Convenience function - disabled in desktop mode
-def submit_task(func: Callable, *args, **kwargs) -> TaskResult:
-    """Submit a background task - disabled in desktop mode"""
-    raise RuntimeError("submit_task() should not be used in desktop mode. Use direct threading.")
-
+        """Shutdown the job executor, waiting up to JOB_SHUTDOWN_TIMEOUT"""
+        job_executor.shutdown(wait=wait, timeout=settings.job_shutdown_timeout)
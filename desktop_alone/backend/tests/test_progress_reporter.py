@@ -0,0 +1,53 @@
+"""
+Unit tests for the desktop progress reporter.
+
+Tests that progress reaches the SQLite job row whatever form the job id
+takes, and that the processor's absolute reports are coalesced.
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base, create_db_engine
+from backend.models import Job
+from backend.services.progress_reporter import DatabaseProgressSink, MemoryProgressSink, ProgressReporter
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'desktop.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__])
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+class TestDesktopProgressReporter:
+    """Tests for progress writes in desktop mode."""
+
+    @pytest.mark.parametrize("as_uuid", [False, True])
+    def test_progress_written_to_sqlite_row(self, session_factory, as_uuid):
+        """UUID objects and canonical strings both address the string job id."""
+        job_id = str(uuid.uuid4())
+        with session_factory() as db:
+            db.add(Job(id=job_id, filename="sub01_T1w.nii.gz"))
+            db.commit()
+
+        reporter_id = uuid.UUID(job_id) if as_uuid else job_id
+        with ProgressReporter(reporter_id, sinks=[DatabaseProgressSink(session_factory)], min_interval=0) as reporter:
+            reporter.report(42, "Running FastSurfer brain segmentation...")
+
+        with session_factory() as db:
+            job = db.get(Job, job_id)
+            assert (job.progress, job.current_step) == (42, "Running FastSurfer brain segmentation...")
+
+    def test_processor_reports_are_coalesced(self):
+        """Reports within one step are held until the interval passes."""
+        sink = MemoryProgressSink()
+        with ProgressReporter(uuid.uuid4(), sinks=[sink], min_interval=60.0) as reporter:
+            reporter.report(15, "Starting brain segmentation (FastSurfer)...")
+            for value in range(20, 65, 5):
+                reporter.report(value)
+
+        assert sink.writes == [(15, "Starting brain segmentation (FastSurfer)..."), (60, "Starting brain segmentation (FastSurfer)...")]
@@ -0,0 +1,182 @@
+"""
+Stress tests for the SQLite engine profile.
+
+Tests the connection pragmas and that concurrent progress writers and
+API-style readers on one SQLite file finish without "database is
+locked" errors.
+"""
+
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from backend.core import database
+from backend.core.database import Base, create_db_engine, serialize_sqlite_writes
+from backend.models import Job, Metric, QueuedJob
+from backend.models.job import JobStatus
+
+WRITERS = 4
+READERS = 8
+UPDATES = 100
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'desktop.db'}")
+    Base.metadata.create_all(bind=engine, tables=[Job.__table__, Metric.__table__, QueuedJob.__table__])
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    serialize_sqlite_writes(factory)
+    yield factory
+    engine.dispose()
+
+
+def add_jobs(factory, count):
+    with factory() as db:
+        jobs = [Job(id=str(uuid.uuid4()), filename=f"sub{k:02d}_T1w.nii.gz") for k in range(count)]
+        db.add_all(jobs)
+        db.commit()
+        return [job.id for job in jobs]
+
+
+def run_threads(targets):
+    """Run callables in threads; return the exceptions they raised."""
+    errors = []
+
+    def guarded(target):
+        try:
+            target()
+        except Exception as e:  # pragma: no cover - reported by the assertion
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class TestSqliteProfile:
+    """Tests for the SQLite pragmas and the writer lock."""
+
+    def test_pragmas(self, session_factory):
+        with session_factory() as db:
+            assert db.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert db.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert db.execute(text("PRAGMA busy_timeout")).scalar() > 0
+            assert db.execute(text("PRAGMA foreign_keys")).scalar() == 1
+
+    def test_deleting_job_removes_queue_entry(self, session_factory):
+        """Queue entries and metrics of a deleted job cascade away."""
+        job_id = add_jobs(session_factory, 1)[0]
+        with session_factory() as db:
+            db.add(QueuedJob(job_id=job_id))
+            db.add(Metric(job_id=job_id, region="Hippocampus", left_volume=1.0, right_volume=1.0,
+                          asymmetry_index=0.0))
+            db.commit()
+            db.delete(db.get(Job, job_id))
+            db.commit()
+
+            assert db.query(QueuedJob).count() == 0
+            assert db.query(Metric).count() == 0
+
+    def test_readers_not_blocked_by_open_write(self, session_factory):
+        """A write transaction in progress does not block reads (WAL)."""
+        job_id = add_jobs(session_factory, 1)[0]
+        writer = session_factory()
+        writer.execute(update(Job).where(Job.id == job_id).values(progress=50))
+
+        seen = []
+        errors = run_threads([
+            lambda: seen.append(session_factory().get(Job, job_id).progress)
+        ])
+
+        writer.commit()
+        writer.close()
+        assert errors == []
+        assert seen == [0]
+
+    def test_transaction_ended_on_another_thread(self, session_factory):
+        """A session may flush on one thread and be closed on another (get_db teardown)."""
+        job_id = add_jobs(session_factory, 1)[0]
+        session = session_factory()
+        session.get(Job, job_id).progress = 10
+        session.flush()
+
+        errors = run_threads([session.close])
+
+        assert errors == []
+        # The writer lock was released: another thread can write at once
+        assert run_threads([lambda: add_jobs(session_factory, 1)]) == []
+
+    def test_sessions_of_one_thread_are_serialized(self, session_factory, monkeypatch):
+        """A second session of the same thread waits for the first writer."""
+        monkeypatch.setattr(database.settings, "sqlite_busy_timeout_ms", 100)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=session_factory.kw["bind"])
+        serialize_sqlite_writes(factory)
+        job_id = add_jobs(factory, 1)[0]
+        first = factory()
+        first.get(Job, job_id).progress = 10
+        first.flush()
+
+        second = factory()
+        with pytest.raises(OperationalError, match="writer queue timeout"):
+            second.execute(update(Job).where(Job.id == job_id).values(progress=20))
+        second.close()
+        first.commit()
+        first.close()
+
+        with factory() as db:
+            assert db.get(Job, job_id).progress == 10
+
+    def test_concurrent_progress_writers_and_readers(self, session_factory):
+        """Runner threads write progress while API threads list and poll jobs."""
+        job_ids = add_jobs(session_factory, WRITERS)
+        done = threading.Event()
+        reads = []
+
+        def progress_writer(job_id):
+            def write():
+                with session_factory() as db:
+                    for progress in range(1, UPDATES + 1):
+                        db.execute(
+                            update(Job)
+                            .where(Job.id == job_id)
+                            .values(progress=progress % 101, current_step=f"step {progress}")
+                        )
+                        db.commit()
+                    # ORM path: status change plus metric rows in one flush
+                    job = db.get(Job, job_id)
+                    job.status = JobStatus.COMPLETED
+                    db.add(Metric(job_id=job_id, region="Hippocampus", left_volume=1.0, right_volume=1.0,
+                                  asymmetry_index=0.0))
+                    db.commit()
+            return write
+
+        def api_reader():
+            with session_factory() as db:
+                while not done.is_set():
+                    db.execute(select(Job).order_by(Job.created_at.desc()).limit(50)).scalars().all()
+                    db.get(Job, job_ids[0])
+                    db.rollback()
+                    reads.append(1)
+
+        readers = [threading.Thread(target=api_reader) for _ in range(READERS)]
+        for reader in readers:
+            reader.start()
+        errors = run_threads([progress_writer(job_id) for job_id in job_ids])
+        done.set()
+        for reader in readers:
+            reader.join()
+
+        assert errors == []
+        assert len(reads) > 0
+        with session_factory() as db:
+            jobs = db.execute(select(Job)).scalars().all()
+            assert {job.status for job in jobs} == {JobStatus.COMPLETED}
+            assert {job.current_step for job in jobs} == {f"step {UPDATES}"}
+            assert db.query(Metric).count() == WRITERS
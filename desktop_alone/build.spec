@@ -56,6 +56,9 @@ hidden_imports = [
     'nibabel.nifti1',
     'nibabel.freesurfer',
     
+    # Desktop job executor (imports the pipeline lazily)
+    'workers.tasks.processing_desktop',
+
     # Utilities
     'platformdirs',
     'structlog',
@@ -10,7 +10,7 @@ import os
 import platform
 import subprocess as subprocess_module
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from uuid import UUID
 
 import nibabel as nib
@@ -109,13 +109,14 @@ class MRIProcessor:
     5. Asymmetry index calculation
     """
     
-    def __init__(self, job_id: UUID, progress_callback=None):
+    def __init__(self, job_id: UUID, progress_callback=None, detect_gpu: bool = True):
         """
         Initialize MRI processor.
 
         Args:
             job_id: Unique job identifier
             progress_callback: Optional callback function(progress: int, step: str) for progress updates
+            detect_gpu: Probe for a GPU (only segmentation needs one)
         """
         print(f"DEBUG: MRIProcessor.__init__ called with job_id={job_id}")
         self.job_id = job_id
@@ -128,7 +129,7 @@ class MRIProcessor:
         self.smoke_test_mode = os.getenv("FASTSURFER_SMOKE_TEST") == "1"
         
         # Detect GPU availability
-        self.has_gpu = self._detect_gpu()
+        self.has_gpu = self._detect_gpu() if detect_gpu else False
         
         logger.info(
             "processor_initialized", 
@@ -173,6 +174,19 @@ class MRIProcessor:
         """
         logger.info("processing_pipeline_started", job_id=str(self.job_id))
         
+        nifti_path, fastsurfer_output = self.segment(input_path)
+        return self.postprocess(nifti_path, fastsurfer_output)
+    
+    def segment(self, input_path: str) -> Tuple[Path, Path]:
+        """
+        Prepare the input and run FastSurfer segmentation.
+        
+        Args:
+            input_path: Path to input MRI file (DICOM or NIfTI)
+        
+        Returns:
+            Tuple of (NIfTI input path, FastSurfer output directory)
+        """
         # Step 1: Convert to NIfTI if needed
         if self.progress_callback:
             self.progress_callback(17, "Preparing input file...")
@@ -183,6 +197,24 @@ class MRIProcessor:
             self.progress_callback(20, "Running FastSurfer brain segmentation (this may take a while)...")
         fastsurfer_output = self._run_fastsurfer(nifti_path)
         
+        return nifti_path, fastsurfer_output
+    
+    def postprocess(self, nifti_path: Path, fastsurfer_output: Path) -> Dict:
+        """
+        Run the post-segmentation stages: volumes, asymmetry, visualizations
+        and result files.
+        
+        Desktop mode runs these in a child process (see
+        workers.tasks.postprocess_desktop), so they must only depend on
+        the arguments and files on disk.
+        
+        Args:
+            nifti_path: NIfTI input path
+            fastsurfer_output: FastSurfer output directory
+        
+        Returns:
+            Dictionary containing processing results and metrics
+        """
         # Step 3: Extract hippocampal volumes (from FastSurfer outputs only)
         if self.progress_callback:
             self.progress_callback(65, "Extracting hippocampal volumes...")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Benchmark API Latency While a Desktop Job Post-Processes
+
+This script starts a uvicorn server (in its own process, like the desktop
+backend) that repeatedly runs the post-segmentation stages of a job on
+synthetic FastSurfer output (conformed 256^3 volumes), either in a thread
+of the server process or in a spawned child process
+(workers.tasks.postprocess_desktop), and measures the latency of small
+API requests meanwhile. An idle server gives the baseline.
+
+Usage:
+    python scripts/benchmark_postprocess_isolation.py [--seconds 60] [--clients 4] [--size 256]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def make_fastsurfer_output(workdir: Path, job_id: str, size: int) -> tuple:
+    """Write a T1 input and FastSurfer-like outputs; return (nifti, fastsurfer dir)."""
+    import nibabel as nib
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    shape = (size, size, size)
+    affine = np.eye(4)
+    t1 = rng.normal(1000, 100, size=shape).astype(np.float32)
+
+    labels = np.zeros(shape, dtype=np.int16)
+    c = size // 2
+    labels[c - 60:c + 60, c - 70:c + 70, c - 60:c + 60] = 2  # White matter
+    labels[c - 40:c - 20, c - 30:c + 10, c - 20:c] = 17  # Left hippocampus
+    labels[c + 20:c + 40, c - 30:c + 10, c - 20:c] = 53  # Right hippocampus
+
+    nifti_path = workdir / "input.nii.gz"
+    nib.save(nib.Nifti1Image(t1, affine), nifti_path)
+
+    fastsurfer_dir = workdir / "outputs" / job_id / "fastsurfer"
+    mri_dir = fastsurfer_dir / job_id / "mri"
+    stats_dir = fastsurfer_dir / job_id / "stats"
+    mri_dir.mkdir(parents=True)
+    stats_dir.mkdir(parents=True)
+    nib.save(nib.MGHImage(t1, affine), mri_dir / "orig.mgz")
+    nib.save(nib.MGHImage(labels.astype(np.int32), affine), mri_dir / "aparc.DKTatlas+aseg.deep.mgz")
+    (stats_dir / "aseg+DKT.stats").write_text(
+        "17 17 16000 4000.0 Left-Hippocampus 110.5 15.2 85.3 145.6 60.3\n"
+        "53 53 16000 4100.0 Right-Hippocampus 108.7 14.8 82.1 142.3 60.2\n"
+    )
+    return nifti_path, fastsurfer_dir
+
+
+def serve(port: int, mode: str, job_id: str, nifti_path: str, fastsurfer_dir: str) -> None:
+    """Run the benchmark server (child process entry point)."""
+    import uvicorn
+    from fastapi import FastAPI
+
+    from backend.core.logging import setup_logging
+    from pipeline.processors import MRIProcessor
+    from workers.tasks.postprocess_desktop import run_postprocess
+
+    setup_logging("WARNING", "production")
+    runs = {"completed": 0}
+
+    def postprocess_loop():
+        while True:
+            if mode == "thread":
+                processor = MRIProcessor(uuid.UUID(job_id), detect_gpu=False)
+                processor.postprocess(Path(nifti_path), Path(fastsurfer_dir))
+            else:
+                run_postprocess(job_id, Path(nifti_path), Path(fastsurfer_dir))
+            runs["completed"] += 1
+
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok", "postprocess_runs": runs["completed"]}
+
+    if mode != "idle":
+        threading.Thread(target=postprocess_loop, daemon=True).start()
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def free_port() -> int:
+    """Find an unused local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def measure(base: str, clients: int, seconds: float) -> tuple:
+    """Poll /ping from concurrent clients; return (latencies, post-processing runs)."""
+    import httpx
+
+    latencies = []
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        deadline = time.perf_counter() + 60
+        while True:
+            try:
+                await client.get("/ping")
+                break
+            except httpx.TransportError:
+                if time.perf_counter() > deadline:
+                    raise RuntimeError("benchmark server did not start")
+                await asyncio.sleep(0.1)
+
+        deadline = time.perf_counter() + seconds
+
+        async def poller():
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                response = await client.get("/ping")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*(poller() for _ in range(clients)))
+        runs = (await client.get("/ping")).json()["postprocess_runs"]
+    return latencies, runs
+
+
+def report(name: str, latencies, runs: int) -> None:
+    """Print latency percentiles."""
+    latencies = sorted(latencies)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(
+        f"  {name:<22} requests {len(latencies):6d}   p50 {pct(0.50):7.1f} ms   "
+        f"p99 {pct(0.99):8.1f} ms   max {latencies[-1] * 1000:8.1f} ms   post-processing runs {runs}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API latency during desktop post-processing")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Duration of each scenario")
+    parser.add_argument("--clients", type=int, default=4, help="Concurrent API clients")
+    parser.add_argument("--size", type=int, default=256, help="Volume edge length in voxels")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="postprocess_bench_"))
+    os.environ["OUTPUT_DIR"] = str(workdir / "outputs")
+    os.environ["UPLOAD_DIR"] = str(workdir / "uploads")
+    job_id = str(uuid.uuid4())
+
+    try:
+        nifti_path, fastsurfer_dir = make_fastsurfer_output(workdir, job_id, args.size)
+        print(f"API latency during post-processing ({args.size}^3 volumes, {args.clients} clients, {args.seconds:.0f} s)")
+
+        context = multiprocessing.get_context("spawn")
+        for name, mode in [("idle", "idle"), ("in server thread", "thread"), ("in child process", "process")]:
+            port = free_port()
+            server = context.Process(
+                target=serve,
+                args=(port, mode, job_id, str(nifti_path), str(fastsurfer_dir)),
+            )
+            server.start()
+            try:
+                latencies, runs = asyncio.run(measure(f"http://127.0.0.1:{port}", args.clients, args.seconds))
+            finally:
+                # SIGTERM lets uvicorn exit, which also ends a post-processing child
+                server.terminate()
+                server.join(30)
+                if server.is_alive():
+                    server.kill()
+                    server.join()
+            report(name, latencies, runs)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
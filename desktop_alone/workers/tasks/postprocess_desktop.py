@@ -0,0 +1,150 @@
+"""
+Post-segmentation stages in a child process (desktop mode).
+
+Desktop processing runs in a runner thread of the API process. Volume
+extraction, overlay rendering (matplotlib), NIfTI decoding (nibabel) and
+the CSV export (pandas) hold the GIL for seconds at a time, which stalls
+API requests while a job finishes. These stages therefore run in a
+spawned child process; progress and results come back over a pipe.
+
+If the child crashes (segfault in a native library, killed for running
+out of memory) only the job fails: the API process keeps serving.
+
+The ``spawn`` start method works the same on every platform and in
+PyInstaller builds, which call ``multiprocessing.freeze_support()`` at
+startup (see backend/main.py).
+"""
+
+import multiprocessing
+import signal
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+from uuid import UUID
+
+from backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds to wait for the child to exit after it sent its result
+JOIN_TIMEOUT = 5.0
+
+
+class PostprocessError(RuntimeError):
+    """Post-processing failed, crashed or timed out in the child process."""
+
+
+def _describe_exit(exitcode: Optional[int]) -> str:
+    """Human-readable cause of a child process exit."""
+    if exitcode is None:
+        return "still running"
+    if exitcode < 0:
+        try:
+            name = signal.Signals(-exitcode).name
+        except ValueError:
+            name = f"signal {-exitcode}"
+        if name == "SIGKILL":
+            return f"{name}, possibly out of memory"
+        return name
+    return f"exit code {exitcode}"
+
+
+def _postprocess_child(conn, job_id: str, nifti_path: str, fastsurfer_dir: str) -> None:
+    """
+    Child process entry point: run the stages and report over the pipe.
+
+    Messages are ("progress", progress, step), then ("result", results)
+    or ("error", error_type, message).
+    """
+    from pipeline.processors import MRIProcessor
+
+    def send_progress(progress: int, step: str):
+        conn.send(("progress", progress, step))
+
+    try:
+        try:
+            processor = MRIProcessor(UUID(job_id), progress_callback=send_progress, detect_gpu=False)
+            message = ("result", processor.postprocess(Path(nifti_path), Path(fastsurfer_dir)))
+        except Exception as e:
+            message = ("error", type(e).__name__, str(e))
+        conn.send(message)
+    except OSError:
+        # The parent went away (timeout or shutdown): nobody to report to
+        pass
+    finally:
+        conn.close()
+
+
+def run_postprocess(
+    job_id: str,
+    nifti_path: Path,
+    fastsurfer_dir: Path,
+    progress_callback: Optional[Callable[[int, str], None]] = None,
+    timeout: float = 1800,
+) -> Dict:
+    """
+    Run MRIProcessor.postprocess in a spawned child process.
+
+    Args:
+        job_id: Job identifier
+        nifti_path: NIfTI input path
+        fastsurfer_dir: FastSurfer output directory
+        progress_callback: Optional callback function(progress, step),
+            called in this process
+        timeout: Seconds before the child is killed
+
+    Returns:
+        Dictionary containing processing results and metrics
+
+    Raises:
+        PostprocessError: If the stages failed, the child crashed or
+            the timeout expired
+    """
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_postprocess_child,
+        args=(sender, str(job_id), str(nifti_path), str(fastsurfer_dir)),
+        name=f"postprocess-{job_id}",
+        daemon=True,
+    )
+    process.start()
+    # Keep only the read end here, so the pipe reports EOF once the child exits
+    sender.close()
+    logger.info("postprocess_child_started", job_id=str(job_id), pid=process.pid)
+
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PostprocessError(f"Post-processing timed out after {timeout:.0f} seconds")
+            if not receiver.poll(remaining):
+                continue
+
+            try:
+                message = receiver.recv()
+            except EOFError:
+                process.join(JOIN_TIMEOUT)
+                logger.error(
+                    "postprocess_child_crashed",
+                    job_id=str(job_id),
+                    exitcode=process.exitcode,
+                )
+                raise PostprocessError(
+                    f"Post-processing crashed ({_describe_exit(process.exitcode)})"
+                )
+
+            if message[0] == "progress":
+                if progress_callback:
+                    progress_callback(message[1], message[2])
+            elif message[0] == "result":
+                return message[1]
+            else:
+                raise PostprocessError(f"Post-processing failed: {message[1]}: {message[2]}")
+    finally:
+        receiver.close()
+        process.join(JOIN_TIMEOUT)
+        if process.is_alive():
+            process.kill()
+            process.join()
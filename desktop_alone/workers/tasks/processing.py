@@ -7,13 +7,12 @@ MRI processing pipeline.
 
 from uuid import UUID
 
-from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from backend.core.database import SessionLocal
 from backend.core.logging import get_logger
-from backend.models.job import Job
 from backend.services import JobService, MetricService, StorageService
+from backend.services.progress_reporter import ProgressReporter
 from pipeline.processors import MRIProcessor
 from pipeline.processors.mri_processor import DockerNotAvailableError
 from workers.celery_app import celery_app
@@ -21,29 +20,6 @@ from workers.celery_app import celery_app
 logger = get_logger(__name__)
 
 
-def update_job_progress(db: Session, job_id: UUID, progress: int, current_step: str):
-    """
-    Update job progress and current step description.
-    
-    Args:
-        db: Database session
-        job_id: Job identifier
-        progress: Progress percentage (0-100)
-        current_step: Description of current processing step
-    """
-    try:
-        db.execute(
-            update(Job)
-            .where(Job.id == job_id)
-            .values(progress=progress, current_step=current_step)
-        )
-        db.commit()
-        logger.info("progress_updated", job_id=str(job_id), progress=progress, step=current_step)
-    except Exception as e:
-        logger.warning("progress_update_failed", job_id=str(job_id), error=str(e))
-        db.rollback()
-
-
 @celery_app.task(
     name="workers.tasks.processing.process_mri_task",
     bind=True,
@@ -69,6 +45,7 @@ def process_mri_task(self, job_id: str):
         Dictionary with processing results
     """
     db: Session = SessionLocal()
+    progress = None
     
     try:
         logger.info("task_started", job_id=job_id, task_id=self.request.id)
@@ -98,8 +75,9 @@ def process_mri_task(self, job_id: str):
             logger.error("job_not_found_after_check", job_id=job_id)
             raise ValueError(f"Job {job_id} not found")
         
-        # Update progress: Job started
-        update_job_progress(db, job_uuid, 5, "Job started - preparing file...")
+        # Progress writes are throttled and coalesced by the reporter
+        progress = ProgressReporter(job_uuid)
+        progress.report(5, "Job started - preparing file...")
         
         # Get file path from storage (with Celery auto-retry on transient S3 delays)
         storage_service = StorageService()
@@ -118,18 +96,13 @@ def process_mri_task(self, job_id: str):
         logger.info("processing_started", job_id=job_id, file_path=file_path)
         
         # Update progress: File retrieved
-        update_job_progress(db, job_uuid, 10, "File retrieved - initializing processor...")
+        progress.report(10, "File retrieved - initializing processor...")
         
-        # Define progress callback for detailed tracking inside processor
-        def progress_callback(progress: int, step: str):
-            """Callback for processor to update job progress."""
-            update_job_progress(db, job_uuid, progress, step)
-        
-        # Initialize processor with progress callback
-        processor = MRIProcessor(job_uuid, progress_callback=progress_callback)
+        # The processor reports absolute progress straight to the reporter
+        processor = MRIProcessor(job_uuid, progress_callback=progress.report)
         
         # Update progress: Starting brain segmentation
-        update_job_progress(db, job_uuid, 15, "Starting brain segmentation (FastSurfer)...")
+        progress.report(15, "Starting brain segmentation (FastSurfer)...")
         
         # Run processing pipeline
         try:
@@ -170,7 +143,7 @@ def process_mri_task(self, job_id: str):
                 }
             
             # Update progress: Processing complete, saving results
-            update_job_progress(db, job_uuid, 85, "Processing complete - saving metrics...")
+            progress.report(85, "Processing complete - saving metrics...")
             
             logger.info(
                 "processing_completed",
@@ -209,13 +182,13 @@ def process_mri_task(self, job_id: str):
             MetricService.create_metrics_bulk(db, metrics_data)
             
             # Update progress: Finalizing
-            update_job_progress(db, job_uuid, 95, "Finalizing results...")
+            progress.report(95, "Finalizing results...")
             
             # Mark job as completed (this will set progress to 100)
             JobService.complete_job(db, job_uuid, results["output_dir"])
             
-            # Update progress: Complete
-            update_job_progress(db, job_uuid, 100, "Complete")
+            # Update progress: Complete, written when the reporter closes
+            progress.report(100, "Complete")
             
             logger.info("task_completed", job_id=job_id)
             
@@ -227,6 +200,9 @@ def process_mri_task(self, job_id: str):
             }
         
         except Exception as e:
+            # Write held progress now, so it cannot land after the failure
+            progress.close()
+
             # Mark job as failed
             error_message = f"Processing failed: {str(e)}"
             JobService.fail_job(db, job_uuid, error_message)
@@ -250,5 +226,7 @@ def process_mri_task(self, job_id: str):
             raise
     
     finally:
+        if progress is not None:
+            progress.close()
         db.close()
 
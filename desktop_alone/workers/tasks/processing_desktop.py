@@ -8,46 +8,21 @@ but uses threading instead of Celery for desktop mode.
 import time
 from uuid import UUID
 
-from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from backend.core.config import get_settings
 from backend.core.database import SessionLocal
 from backend.core.logging import get_logger
-from backend.models.job import Job, JobStatus
+from backend.models.job import JobStatus
 from backend.services import JobService, MetricService, StorageService
+from backend.services.progress_reporter import ProgressReporter
 from pipeline.processors import MRIProcessor
+from workers.tasks.postprocess_desktop import run_postprocess
 
 logger = get_logger(__name__)
 settings = get_settings()
 
 
-def update_job_progress(db: Session, job_id, progress: int, current_step: str):
-    """
-    Update job progress and current step description.
-    
-    Args:
-        db: Database session
-        job_id: Job identifier (string or UUID - will be converted to string for SQLite)
-        progress: Progress percentage (0-100)
-        current_step: Description of current processing step
-    """
-    try:
-        # Ensure job_id is string format (for SQLite VARCHAR(36) with dashes)
-        job_id_str = str(job_id)
-        
-        db.execute(
-            update(Job)
-            .where(Job.id == job_id_str)
-            .values(progress=progress, current_step=current_step)
-        )
-        db.commit()
-        logger.info("progress_updated", job_id=job_id_str, progress=progress, step=current_step)
-    except Exception as e:
-        logger.warning("progress_update_failed", job_id=str(job_id), error=str(e))
-        db.rollback()
-
-
 def process_mri_direct(job_id: str):
     """
     Process MRI scan through the analysis pipeline (desktop version).
@@ -55,12 +30,10 @@ def process_mri_direct(job_id: str):
     This function is the same as the Celery task but without Celery decorators.
     It runs in a background thread for desktop mode.
 
-    Progress updates in 5% increments:
+    Progress stages (writes are coalesced by a ProgressReporter):
     - 0-5%: Starting
     - 5-10%: File preparation
     - 10-15%: Initialization
-    """
-    print(f"DEBUG: process_mri_direct called with job_id={job_id}")
     - 15-85%: Brain segmentation and processing (with granular updates)
     - 85-95%: Saving metrics
     - 95-100%: Finalizing
@@ -72,6 +45,7 @@ def process_mri_direct(job_id: str):
         Dictionary with processing results
     """
     db: Session = SessionLocal()
+    progress = None
 
     # Track processing start time for timeout monitoring
     start_time = time.time()
@@ -133,8 +107,9 @@ def process_mri_direct(job_id: str):
                 "message": f"Processing timeout after {timeout_seconds} seconds"
             }
 
-        # Update progress: Job started (5%)
-        update_job_progress(db, job_uuid_canonical, 5, "Job started - preparing file...")
+        # Progress writes are throttled and coalesced by the reporter
+        progress = ProgressReporter(job_uuid_canonical)
+        progress.report(5, "Job started - preparing file...")
         
         # Get file path from storage
         storage_service = StorageService()
@@ -143,32 +118,14 @@ def process_mri_direct(job_id: str):
         logger.info("processing_started", job_id=job_id, file_path=file_path)
         
         # Update progress: File retrieved (10%)
-        update_job_progress(db, job_uuid_canonical, 10, "File retrieved - initializing processor...")
+        progress.report(10, "File retrieved - initializing processor...")
         
-        # Define progress callback for detailed tracking (5% increments)
-        last_reported_progress = 10
-        
-        def progress_callback(progress: int, step: str):
-            """Callback for processor to update job progress in 5% increments."""
-            nonlocal last_reported_progress
-            
-            # Only update if progress increased by at least 5%
-            if progress >= last_reported_progress + 5 or progress >= 100:
-                update_job_progress(db, job_uuid_canonical, progress, step)
-                last_reported_progress = progress
-                logger.info(
-                    "processing_progress",
-                    job_id=job_id,
-                    progress=progress,
-                    step=step
-                )
-        
-        # Initialize processor with progress callback (needs UUID object)
-        processor = MRIProcessor(job_uuid_obj, progress_callback=progress_callback)
+        # The processor reports absolute progress (17-85%) straight to the
+        # reporter (needs UUID object)
+        processor = MRIProcessor(job_uuid_obj, progress_callback=progress.report)
         
         # Update progress: Starting brain segmentation (15%)
-        update_job_progress(db, job_uuid_canonical, 15, "Starting brain segmentation (FastSurfer)...")
-        last_reported_progress = 15
+        progress.report(15, "Starting brain segmentation (FastSurfer)...")
         
         # Run processing pipeline
         try:
@@ -203,7 +160,19 @@ def process_mri_direct(job_id: str):
                     "message": f"Processing timeout after {timeout_seconds} seconds"
                 }
 
-            results = processor.process(file_path)
+            if settings.postprocess_in_subprocess:
+                # Post-segmentation stages hold the GIL for seconds; run them
+                # in a child process so the API stays responsive
+                nifti_path, fastsurfer_output = processor.segment(file_path)
+                results = run_postprocess(
+                    job_uuid_canonical,
+                    nifti_path,
+                    fastsurfer_output,
+                    progress_callback=progress.report,
+                    timeout=settings.postprocess_timeout,
+                )
+            else:
+                results = processor.process(file_path)
 
             # Check timeout after processing completes
             if check_timeout():
@@ -221,7 +190,7 @@ def process_mri_direct(job_id: str):
                 }
             
             # Update progress: Processing complete, saving results (85%)
-            update_job_progress(db, job_uuid_canonical, 85, "Processing complete - saving metrics...")
+            progress.report(85, "Processing complete - saving metrics...")
             
             logger.info(
                 "processing_completed",
@@ -259,13 +228,13 @@ def process_mri_direct(job_id: str):
             MetricService.create_metrics_bulk(db, metrics_data)
             
             # Update progress: Finalizing (95%)
-            update_job_progress(db, job_uuid_canonical, 95, "Finalizing results...")
+            progress.report(95, "Finalizing results...")
             
             # Mark job as completed (this will set progress to 100)
             JobService.complete_job(db, job_uuid_canonical, results["output_dir"])
             
-            # Update progress: Complete (100%)
-            update_job_progress(db, job_uuid_canonical, 100, "Complete")
+            # Update progress: Complete (100%), written when the reporter closes
+            progress.report(100, "Complete")
             
             logger.info("desktop_task_completed", job_id=job_id)
             
@@ -277,6 +246,9 @@ def process_mri_direct(job_id: str):
             }
         
         except Exception as e:
+            # Write held progress now, so it cannot land after the failure
+            progress.close()
+
             # Mark job as failed
             error_message = f"Processing failed: {str(e)}"
             JobService.fail_job(db, job_uuid_canonical, error_message)
@@ -300,5 +272,7 @@ def process_mri_direct(job_id: str):
         raise
     
     finally:
+        if progress is not None:
+            progress.close()
         db.close()
 
@@ -0,0 +1,143 @@
+"""
+Classified processing errors.
+
+Failures of the pipeline fall into two groups:
+
+- deterministic: the input is unusable (``InputInvalidError``) or
+  FastSurfer ran and rejected the scan (``SegmentationFailedError``).
+  Running the stage again gives the same result, so the job fails at once.
+- transient: the Docker daemon, database or broker was briefly
+  unavailable (``InfrastructureTransientError``), or the upload could not
+  be read from storage yet (``StorageTransientError``). These are retried
+  with exponential backoff, up to a limit per class.
+
+Exceptions raised by libraries are mapped onto these classes by
+``classify()``; anything it does not recognise is treated as
+deterministic.
+"""
+
+import subprocess
+from dataclasses import dataclass
+from typing import Optional
+
+import kombu.exceptions
+import redis.exceptions
+import sqlalchemy.exc
+from nibabel.filebasedimages import ImageFileError
+
+from backend.core.config import get_settings
+
+settings = get_settings()
+
+# Exit status of `docker run` when the daemon itself failed
+DOCKER_DAEMON_ERROR = 125
+
+
+class PipelineError(RuntimeError):
+    """Base class of classified processing failures."""
+
+    kind = "unclassified"
+    retryable = False
+
+
+class InputInvalidError(PipelineError):
+    """The uploaded scan is corrupt, unsupported or not a usable T1."""
+
+    kind = "input_invalid"
+
+
+class SegmentationFailedError(PipelineError):
+    """FastSurfer ran but rejected the scan or did not finish in time."""
+
+    kind = "segmentation_failed"
+
+
+class TransientError(PipelineError):
+    """A failure expected to go away when the stage is run again later."""
+
+    retryable = True
+
+
+class InfrastructureTransientError(TransientError):
+    """Docker daemon, database or message broker temporarily unavailable."""
+
+    kind = "infrastructure_transient"
+
+
+class StorageTransientError(TransientError):
+    """The upload could not be read from storage (e.g. S3 propagation delay)."""
+
+    kind = "storage_transient"
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry limit and exponential backoff of one transient error class."""
+
+    max_retries: int
+    backoff_seconds: float
+    backoff_max_seconds: float
+
+    def countdown(self, retries: int) -> float:
+        """Delay before the next attempt, given the retries made so far."""
+        return min(self.backoff_max_seconds, self.backoff_seconds * 2 ** retries)
+
+
+def retry_policy(error: PipelineError) -> Optional[RetryPolicy]:
+    """
+    Get the retry policy of an error.
+
+    Args:
+        error: Classified error
+
+    Returns:
+        RetryPolicy, or None if the error must not be retried
+    """
+    if isinstance(error, StorageTransientError):
+        return RetryPolicy(
+            max_retries=settings.retry_storage_max_retries,
+            backoff_seconds=settings.retry_storage_backoff_seconds,
+            backoff_max_seconds=settings.retry_backoff_max_seconds,
+        )
+    if isinstance(error, InfrastructureTransientError):
+        return RetryPolicy(
+            max_retries=settings.retry_infrastructure_max_retries,
+            backoff_seconds=settings.retry_infrastructure_backoff_seconds,
+            backoff_max_seconds=settings.retry_backoff_max_seconds,
+        )
+    return None
+
+
+def classify(exc: BaseException) -> PipelineError:
+    """
+    Map an exception onto the error classes.
+
+    Args:
+        exc: Exception raised by a stage
+
+    Returns:
+        The exception itself if already classified, otherwise a
+        PipelineError subclass instance wrapping it
+    """
+    if isinstance(exc, PipelineError):
+        return exc
+
+    if isinstance(exc, (
+        ConnectionError,
+        TimeoutError,
+        sqlalchemy.exc.OperationalError,
+        sqlalchemy.exc.DisconnectionError,
+        redis.exceptions.ConnectionError,
+        redis.exceptions.TimeoutError,
+        kombu.exceptions.OperationalError,
+    )):
+        error = InfrastructureTransientError(str(exc))
+    elif isinstance(exc, subprocess.CalledProcessError) and exc.returncode == DOCKER_DAEMON_ERROR:
+        error = InfrastructureTransientError(f"Docker daemon error: {exc}")
+    elif isinstance(exc, ImageFileError):
+        error = InputInvalidError(str(exc))
+    else:
+        error = PipelineError(str(exc))
+
+    error.__cause__ = exc
+    return error
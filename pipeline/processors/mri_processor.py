@@ -6,6 +6,7 @@ from DICOM conversion through hippocampal asymmetry calculation.
 """
 
 import json
+import shutil
 import subprocess as subprocess_module
 from pathlib import Path
 from typing import Dict, List
@@ -17,11 +18,22 @@ import pandas as pd
 
 from backend.core.config import get_settings
 from backend.core.logging import get_logger
-from pipeline.utils import asymmetry, file_utils, segmentation, visualization
+from backend.services.job_registry import CONTAINER_LABEL, container_name, job_registry
+from pipeline.errors import (
+    DOCKER_DAEMON_ERROR,
+    InfrastructureTransientError,
+    InputInvalidError,
+    SegmentationFailedError,
+)
+from pipeline.utils import asymmetry, file_utils, segmentation, series_discovery, visualization
 
 logger = get_logger(__name__)
 settings = get_settings()
 
+# Markers of completed stages in the job's output directory
+PREPARED_MARKER = ".prepared"
+SEGMENTED_MARKER = ".segmented"
+
 
 class MRIProcessor:
     """
@@ -35,19 +47,21 @@ class MRIProcessor:
     5. Asymmetry index calculation
     """
     
-    def __init__(self, job_id: UUID, progress_callback=None):
+    def __init__(self, job_id: UUID, progress=None):
         """
         Initialize MRI processor.
         
         Args:
             job_id: Unique job identifier
-            progress_callback: Optional callback function(progress: int, step: str) for progress updates
+            progress: Optional ProgressReporter (or a span of one) receiving
+                the processor's own 0-100 progress
         """
         self.job_id = job_id
         self.output_dir = Path(settings.output_dir) / str(job_id)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.process_pid = None  # Track subprocess PID for cleanup
-        self.progress_callback = progress_callback
+        self.progress = progress
+        self.series_selection = None  # Chosen series when input is a study archive
         
         # Detect GPU availability
         self.has_gpu = self._detect_gpu()
@@ -96,38 +110,31 @@ class MRIProcessor:
         logger.info("processing_pipeline_started", job_id=str(self.job_id))
         
         # Step 1: Convert to NIfTI if needed (5% - quick)
-        if self.progress_callback:
-            self.progress_callback(5, "Preparing input file...")
-        nifti_path = self._prepare_input(input_path)
+        self._report(5, "Preparing input file...")
+        nifti_path = self.prepare(input_path)
 
         # Step 2: Run FastSurfer segmentation (whole brain) - LONGEST STEP (10% to 85%)
-        if self.progress_callback:
-            self.progress_callback(10, "Running FastSurfer brain segmentation (this may take a while)...")
-        fastsurfer_output = self._run_fastsurfer(nifti_path)
+        self._report(10, "Running FastSurfer brain segmentation (this may take a while)...")
+        fastsurfer_output = self.segment(nifti_path)
 
         # Step 3: Extract hippocampal volumes (from FastSurfer outputs only) (85% to 90%)
-        if self.progress_callback:
-            self.progress_callback(85, "Extracting hippocampal volumes...")
+        self._report(85, "Extracting hippocampal volumes...")
         hippocampal_stats = self._extract_hippocampal_data(fastsurfer_output)
 
         # Step 4: Calculate asymmetry indices (90% to 95%)
-        if self.progress_callback:
-            self.progress_callback(90, "Calculating asymmetry indices...")
+        self._report(90, "Calculating asymmetry indices...")
         metrics = self._calculate_asymmetry(hippocampal_stats)
 
         # Step 5: Generate segmentation visualizations (95% to 98%)
-        if self.progress_callback:
-            self.progress_callback(95, "Generating visualizations...")
+        self._report(95, "Generating visualizations...")
         visualization_paths = self._generate_visualizations(nifti_path, fastsurfer_output)
 
         # Step 6: Save results (98% to 100%)
-        if self.progress_callback:
-            self.progress_callback(98, "Saving results...")
+        self._report(98, "Saving results...")
         self._save_results(metrics)
         
         # Final completion
-        if self.progress_callback:
-            self.progress_callback(100, "Processing complete!")
+        self._report(100, "Processing complete!")
 
         logger.info(
             "processing_pipeline_completed",
@@ -140,8 +147,100 @@ class MRIProcessor:
             "output_dir": str(self.output_dir),
             "metrics": metrics,
             "visualizations": visualization_paths,
+            "series_selection": self.series_selection,
         }
     
+    # Pipeline stages. Each is idempotent so a stage can be retried, or run
+    # in a separate Celery task, without redoing completed work.
+    
+    def prepare(self, input_path: str) -> Path:
+        """
+        Stage 1: produce the NIfTI input for segmentation.
+        
+        Reuses the NIfTI converted by an earlier attempt (and its series
+        selection) instead of converting again.
+        
+        Args:
+            input_path: Path to input MRI file (DICOM, NIfTI or study archive)
+        
+        Returns:
+            Path to NIfTI file
+        """
+        marker = self.output_dir / PREPARED_MARKER
+        converted = self.output_dir / "input.nii"
+        if marker.exists() and converted.exists():
+            selection_file = self.output_dir / "series_selection.json"
+            if selection_file.exists():
+                with open(selection_file) as f:
+                    self.series_selection = json.load(f)
+            logger.info("input_already_prepared", job_id=str(self.job_id))
+            return converted
+        
+        nifti_path = self._prepare_input(input_path)
+        if nifti_path == converted:
+            marker.touch()
+        return nifti_path
+    
+    def segment(self, nifti_path: Path) -> Path:
+        """
+        Stage 2: run FastSurfer, unless an earlier attempt finished it.
+        
+        Args:
+            nifti_path: Path to input NIfTI file
+        
+        Returns:
+            Path to FastSurfer output directory
+        """
+        fastsurfer_dir = self.output_dir / "fastsurfer"
+        marker = fastsurfer_dir / SEGMENTED_MARKER
+        if marker.exists():
+            logger.info("segmentation_already_done", job_id=str(self.job_id))
+            return fastsurfer_dir
+        
+        fastsurfer_dir = self._run_fastsurfer(Path(nifti_path))
+        (fastsurfer_dir / SEGMENTED_MARKER).touch()
+        return fastsurfer_dir
+    
+    def analyze(self, fastsurfer_dir: Path) -> List[Dict]:
+        """
+        Stage 3: extract hippocampal volumes and their asymmetry indices.
+        
+        Args:
+            fastsurfer_dir: FastSurfer output directory
+        
+        Returns:
+            List of metric dictionaries
+        """
+        return self._calculate_asymmetry(self._extract_hippocampal_data(Path(fastsurfer_dir)))
+    
+    def visualize(self, nifti_path: Path, fastsurfer_dir: Path) -> Dict:
+        """
+        Stage 4: render viewer volumes and overlays (overwritten on rerun).
+        
+        Args:
+            nifti_path: Path to original T1 NIfTI
+            fastsurfer_dir: FastSurfer output directory
+        
+        Returns:
+            Dictionary with visualization file paths
+        """
+        return self._generate_visualizations(Path(nifti_path), Path(fastsurfer_dir))
+    
+    def save_results(self, metrics: List[Dict]) -> None:
+        """Stage 5 (files): write metrics.json and metrics.csv."""
+        self._save_results(metrics)
+    
+    def _report(self, progress: int, step: str) -> None:
+        """
+        Start a stage: stop if the job was cancelled, then report progress.
+        
+        Raises:
+            JobCancelled: If the job's cancel flag is set
+        """
+        job_registry.raise_if_cancelled(self.job_id)
+        if self.progress is not None:
+            self.progress.report(progress, step)
+    
     def _prepare_input(self, input_path: str) -> Path:
         """
         Prepare input file for processing.
@@ -149,28 +248,93 @@ class MRIProcessor:
         Converts DICOM to NIfTI if needed, validates format.
         
         Args:
-            input_path: Path to input file
+            input_path: Path to input file (NIfTI, DICOM file, or DICOM series directory)
         
         Returns:
             Path to NIfTI file
+        
+        Raises:
+            InputInvalidError: If the file is unsupported, corrupt or cannot be converted
         """
         input_file = Path(input_path)
         
+        # Mixed-study archive: pick the T1 series before converting
+        if series_discovery.is_archive(input_file):
+            return self._prepare_archive(input_file)
+        
         # If already NIfTI, validate and return
         if input_file.suffix in [".nii", ".gz"]:
-            if file_utils.validate_nifti(input_file):
-                logger.info("input_validated", format="NIfTI")
-                return input_file
+            if not file_utils.validate_nifti(input_file):
+                raise InputInvalidError(f"Invalid or corrupt NIfTI file: {input_file.name}")
+            logger.info("input_validated", format="NIfTI")
+            return input_file
         
-        # Convert DICOM to NIfTI
-        elif input_file.suffix in [".dcm", ".dicom"]:
+        # Convert DICOM (single file or series directory) to NIfTI
+        elif input_file.is_dir() or input_file.suffix in [".dcm", ".dicom"]:
             logger.info("converting_dicom_to_nifti")
-            output_path = self.output_dir / "input.nii.gz"
+            # Uncompressed output: FastSurfer would otherwise decompress it again
+            output_path = self.output_dir / "input.nii"
             file_utils.convert_dicom_to_nifti(input_file, output_path)
             return output_path
         
         else:
-            raise ValueError(f"Unsupported file format: {input_file.suffix}")
+            raise InputInvalidError(f"Unsupported file format: {input_file.suffix}")
+    
+    def _prepare_archive(self, archive_path: Path) -> Path:
+        """
+        Extract a DICOM study archive and convert its T1-weighted series.
+        
+        All headers are read in parallel, series are ranked by sequence
+        parameters, and only the best T1 candidate is handed to conversion.
+        The choice is kept in ``self.series_selection`` and written to
+        ``series_selection.json`` in the output directory.
+        
+        Args:
+            archive_path: Path to .zip/.tar(.gz) archive
+        
+        Returns:
+            Path to NIfTI file of the selected series
+        """
+        extract_dir = self.output_dir / "dicom_archive"
+        try:
+            files = series_discovery.extract_archive(
+                archive_path,
+                extract_dir,
+                max_bytes=settings.max_archive_extracted_size,
+            )
+            
+            candidates = series_discovery.discover_t1_series(
+                files,
+                max_workers=settings.dicom_decode_workers or None,
+            )
+            selected = candidates[0]
+            
+            self.series_selection = {
+                "selected": selected.summary(),
+                "candidates": [c.summary() for c in candidates],
+            }
+            with open(self.output_dir / "series_selection.json", "w") as f:
+                json.dump(self.series_selection, f, indent=2)
+            
+            logger.info(
+                "t1_series_selected",
+                job_id=str(self.job_id),
+                series_uid=selected.series_uid,
+                description=selected.description,
+                slices=selected.slice_count,
+                score=round(selected.score, 2),
+                series_count=len(candidates),
+            )
+            
+            series_dir = series_discovery.stage_series(selected, self.output_dir / "dicom_series")
+            output_path = self.output_dir / "input.nii"
+            file_utils.convert_dicom_to_nifti(series_dir, output_path)
+        finally:
+            # The extracted study is not needed once the series is staged,
+            # nor kept when extraction, discovery or conversion fails
+            shutil.rmtree(extract_dir, ignore_errors=True)
+        
+        return output_path
     
     def _run_fastsurfer(self, nifti_path: Path) -> Path:
         """
@@ -183,6 +347,10 @@ class MRIProcessor:
         
         Returns:
             Path to FastSurfer output directory
+        
+        Raises:
+            SegmentationFailedError: If FastSurfer rejects the scan or times out
+            InfrastructureTransientError: If the Docker daemon fails
         """
         logger.info("running_fastsurfer_docker", input=str(nifti_path))
         
@@ -260,8 +428,10 @@ class MRIProcessor:
             input_host_path = host_upload_dir
             output_host_path = f"{host_output_dir}/{self.job_id}/fastsurfer"
             
-            # Build Docker command
-            cmd = ["docker", "run", "--rm"]
+            # Build Docker command; the deterministic name lets a
+            # cancellation kill exactly this job's container
+            name = container_name(self.job_id)
+            cmd = ["docker", "run", "--rm", "--name", name, "--label", f"{CONTAINER_LABEL}={self.job_id}"]
             
             # Add GPU support if available
             if runtime_arg:
@@ -296,13 +466,20 @@ class MRIProcessor:
                 note="Running FastSurfer with Docker"
             )
             
-            result = subprocess_module.run(
-                cmd,
-                check=True,
-                capture_output=True,
-                text=True,
-                timeout=settings.processing_timeout,
-            )
+            # Remove a container left behind by an interrupted attempt
+            subprocess_module.run(["docker", "rm", "-f", name], capture_output=True, timeout=30)
+            
+            job_registry.register(self.job_id, owned=True, container=name)
+            try:
+                result = subprocess_module.run(
+                    cmd,
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                    timeout=settings.processing_timeout,
+                )
+            finally:
+                job_registry.release(self.job_id, "container")
             
             logger.info(
                 "fastsurfer_completed",
@@ -311,14 +488,14 @@ class MRIProcessor:
             )
             
         except subprocess_module.TimeoutExpired:
-            logger.error("fastsurfer_timeout")
-            logger.warning(
-                "using_mock_data",
-                reason="Processing timeout - using mock data"
+            logger.error("fastsurfer_timeout", timeout=settings.processing_timeout)
+            raise SegmentationFailedError(
+                f"FastSurfer did not finish within {settings.processing_timeout} seconds"
             )
-            self._create_mock_fastsurfer_output(fastsurfer_dir)
         
         except subprocess_module.CalledProcessError as e:
+            # Killed by a cancellation rather than failed
+            job_registry.raise_if_cancelled(self.job_id)
             logger.error(
                 "fastsurfer_execution_failed",
                 error=str(e),
@@ -326,8 +503,10 @@ class MRIProcessor:
                 stdout=e.stdout if hasattr(e, 'stdout') and e.stdout else "No stdout",
                 returncode=e.returncode,
             )
-            logger.warning("using_mock_data", reason="FastSurfer execution failed")
-            self._create_mock_fastsurfer_output(fastsurfer_dir)
+            if e.returncode == DOCKER_DAEMON_ERROR:
+                raise InfrastructureTransientError(f"Docker daemon error: {e.stderr or e}")
+            # FastSurfer itself rejected the scan; a rerun would fail the same way
+            raise SegmentationFailedError(f"FastSurfer failed with exit code {e.returncode}")
         
         except FileNotFoundError:
             logger.warning(
@@ -337,7 +516,11 @@ class MRIProcessor:
             # Try Singularity/Apptainer as fallback
             try:
                 return self._run_fastsurfer_singularity(nifti_path, fastsurfer_dir)
+            except SegmentationFailedError:
+                job_registry.raise_if_cancelled(self.job_id)
+                raise
             except Exception as sing_error:
+                job_registry.raise_if_cancelled(self.job_id)
                 logger.warning(
                     "singularity_fallback_failed",
                     error=str(sing_error),
@@ -482,22 +665,24 @@ class MRIProcessor:
             )
             
             # Store the process PID for cleanup tracking
-            self._store_process_pid(process.pid)
+            self._store_process_pid(process.pid, os.getpgid(process.pid))
             logger.info("process_started", pid=process.pid, pgid=os.getpgid(process.pid))
             
             # Wait for process with timeout
             try:
-                stdout, stderr = process.communicate(timeout=7200)
+                stdout, stderr = process.communicate(timeout=settings.processing_timeout)
                 returncode = process.returncode
             except subprocess_module.TimeoutExpired:
-                logger.warning("process_timeout_killing_group", pid=process.pid)
+                logger.warning("process_timeout_killing_group", pid=process.pid, timeout=settings.processing_timeout)
                 # Kill entire process group
                 try:
                     os.killpg(os.getpgid(process.pid), signal.SIGTERM)
                     process.wait(timeout=10)
                 except:
                     os.killpg(os.getpgid(process.pid), signal.SIGKILL)
-                raise
+                raise SegmentationFailedError(
+                    f"FastSurfer did not finish within {settings.processing_timeout} seconds"
+                )
             finally:
                 self._clear_process_pid()
             
@@ -508,7 +693,7 @@ class MRIProcessor:
                     stderr=stderr[:500] if stderr else "No stderr",
                     stdout=stdout[:500] if stdout else "No stdout"
                 )
-                raise RuntimeError(f"FastSurfer Singularity failed: {stderr}")
+                raise SegmentationFailedError(f"FastSurfer Singularity failed: {stderr}")
             
             logger.info("fastsurfer_singularity_completed", output_dir=str(fastsurfer_dir))
             return fastsurfer_dir
@@ -758,16 +943,19 @@ class MRIProcessor:
         
         return viz_paths
     
-    def _store_process_pid(self, pid: int) -> None:
+    def _store_process_pid(self, pid: int, pgid: int) -> None:
         """
         Store the process PID for tracking and cleanup.
         
-        Writes PID to a file so we can kill zombie processes later.
+        Writes PID to a file so we can kill zombie processes later, and
+        registers the process group so a cancellation can kill it.
         
         Args:
             pid: Process ID to store
+            pgid: Process group of the process
         """
         self.process_pid = pid
+        job_registry.register(self.job_id, owned=True, pid=pid, pgid=pgid)
         pid_file = self.output_dir / ".process_pid"
         with open(pid_file, "w") as f:
             f.write(str(pid))
@@ -776,6 +964,7 @@ class MRIProcessor:
     def _clear_process_pid(self) -> None:
         """Clear stored process PID after completion."""
         self.process_pid = None
+        job_registry.release(self.job_id, "pid", "pgid")
         pid_file = self.output_dir / ".process_pid"
         if pid_file.exists():
             pid_file.unlink()
@@ -1,6 +1,6 @@
 """Utility functions for MRI processing pipeline."""
 
-from . import asymmetry, file_utils, segmentation
+from . import asymmetry, dicom_series, file_utils, segmentation
 
-__all__ = ["asymmetry", "file_utils", "segmentation"]
+__all__ = ["asymmetry", "dicom_series", "file_utils", "segmentation"]
 
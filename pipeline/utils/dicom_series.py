@@ -0,0 +1,308 @@
+"""
+Native DICOM series assembly for MRI processing.
+
+Converts a single-frame DICOM series into a NIfTI volume in-process:
+headers are read first (without pixel data) to sort slices, pixel data
+is decoded in a thread pool, and the volume is assembled with NumPy.
+This avoids the dcm2niix subprocess and the gzip round-trip for
+FastSurfer.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Union
+
+import nibabel as nib
+import numpy as np
+
+from backend.core.logging import get_logger
+from pipeline.errors import InputInvalidError
+
+logger = get_logger(__name__)
+
+# DICOM files are often extension-less; these suffixes are never DICOM
+NON_DICOM_SUFFIXES = {".nii", ".gz", ".json", ".txt", ".xml", ".png", ".jpg", ".zip", ".tar"}
+
+# Tolerance for slice orientation/spacing consistency checks
+ORIENTATION_TOLERANCE = 1e-4
+SPACING_TOLERANCE = 0.05  # 5% deviation in slice spacing
+
+
+class DicomConversionError(InputInvalidError):
+    """Raised when a DICOM series cannot be assembled natively."""
+
+
+@dataclass
+class SliceHeader:
+    """Geometry and identity of one DICOM slice, read without pixel data."""
+
+    path: Path
+    series_uid: str
+    rows: int
+    columns: int
+    position: np.ndarray
+    orientation: np.ndarray
+    pixel_spacing: np.ndarray
+    slope: float
+    intercept: float
+    instance_number: int
+
+
+def default_workers() -> int:
+    """Thread count for header reads and pixel decoding (I/O bound)."""
+    return min(32, (os.cpu_count() or 4) + 4)
+
+
+def collect_dicom_files(source: Union[Path, Sequence[Path]]) -> List[Path]:
+    """
+    Collect candidate DICOM files from a file, directory, or list of paths.
+
+    Args:
+        source: Single file, directory (searched recursively), or list of files
+
+    Returns:
+        Sorted list of candidate DICOM file paths
+    """
+    if isinstance(source, (str, Path)):
+        source = Path(source)
+        if source.is_dir():
+            candidates: Iterable[Path] = (p for p in source.rglob("*") if p.is_file())
+        else:
+            candidates = [source]
+    else:
+        candidates = [Path(p) for p in source]
+
+    return sorted(
+        p for p in candidates
+        if p.suffix.lower() not in NON_DICOM_SUFFIXES and not p.name.startswith(".")
+    )
+
+
+def read_slice_header(path: Path) -> Optional[SliceHeader]:
+    """
+    Read slice geometry from a DICOM file without decoding pixel data.
+
+    Args:
+        path: DICOM file path
+
+    Returns:
+        SliceHeader, or None if the file is not a usable image slice
+    """
+    import pydicom
+
+    try:
+        ds = pydicom.dcmread(str(path), stop_before_pixels=True, force=True)
+    except Exception as e:
+        logger.debug("dicom_header_read_failed", file=str(path), error=str(e))
+        return None
+
+    required = ("ImagePositionPatient", "ImageOrientationPatient", "PixelSpacing", "Rows", "Columns")
+    if not all(hasattr(ds, tag) for tag in required):
+        return None
+
+    return SliceHeader(
+        path=path,
+        series_uid=str(getattr(ds, "SeriesInstanceUID", "")),
+        rows=int(ds.Rows),
+        columns=int(ds.Columns),
+        position=np.array([float(v) for v in ds.ImagePositionPatient]),
+        orientation=np.array([float(v) for v in ds.ImageOrientationPatient]),
+        pixel_spacing=np.array([float(v) for v in ds.PixelSpacing]),
+        slope=float(getattr(ds, "RescaleSlope", 1.0) or 1.0),
+        intercept=float(getattr(ds, "RescaleIntercept", 0.0) or 0.0),
+        instance_number=int(getattr(ds, "InstanceNumber", 0) or 0),
+    )
+
+
+def read_headers(paths: Sequence[Path], max_workers: Optional[int] = None) -> List[SliceHeader]:
+    """
+    Read slice headers in parallel, skipping non-image files.
+
+    Args:
+        paths: Candidate DICOM files
+        max_workers: Thread pool size (defaults to default_workers())
+
+    Returns:
+        List of slice headers for readable image slices
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or default_workers()) as pool:
+        headers = list(pool.map(read_slice_header, paths))
+    return [h for h in headers if h is not None]
+
+
+def _select_series(headers: List[SliceHeader]) -> List[SliceHeader]:
+    """Keep the largest series when more than one is present."""
+    by_series = {}
+    for header in headers:
+        by_series.setdefault(header.series_uid, []).append(header)
+
+    if len(by_series) > 1:
+        logger.warning(
+            "multiple_dicom_series_found",
+            series_count=len(by_series),
+            note="Using the series with the most slices",
+        )
+
+    return max(by_series.values(), key=len)
+
+
+def sort_slices(headers: List[SliceHeader]) -> List[SliceHeader]:
+    """
+    Sort slices along the slice normal and validate series geometry.
+
+    Args:
+        headers: Slice headers of a single series
+
+    Returns:
+        Headers ordered by position along the slice normal
+
+    Raises:
+        DicomConversionError: If slices are inconsistent or duplicated
+    """
+    first = headers[0]
+    for header in headers[1:]:
+        if (header.rows, header.columns) != (first.rows, first.columns):
+            raise DicomConversionError("Slices have differing matrix sizes")
+        if not np.allclose(header.orientation, first.orientation, atol=ORIENTATION_TOLERANCE):
+            raise DicomConversionError("Slices have differing orientations")
+
+    normal = np.cross(first.orientation[:3], first.orientation[3:])
+    ordered = sorted(headers, key=lambda h: float(np.dot(h.position, normal)))
+
+    if len(ordered) > 1:
+        distances = np.array([float(np.dot(h.position, normal)) for h in ordered])
+        gaps = np.diff(distances)
+        if np.any(np.isclose(gaps, 0.0)):
+            raise DicomConversionError("Duplicate slice positions (multi-echo or 4D series?)")
+        if np.ptp(gaps) > SPACING_TOLERANCE * abs(float(np.median(gaps))):
+            raise DicomConversionError("Non-uniform slice spacing")
+
+    return ordered
+
+
+def compute_affine(ordered: List[SliceHeader]) -> np.ndarray:
+    """
+    Compute the NIfTI (RAS) affine for a sorted series.
+
+    Voxel axis 0 runs along DICOM rows (column index), axis 1 along
+    columns (row index) and axis 2 along the sorted slices.
+
+    Args:
+        ordered: Slice headers sorted along the slice normal
+
+    Returns:
+        4x4 affine mapping voxel indices to RAS millimetres
+    """
+    first = ordered[0]
+    row_cosine = first.orientation[:3]
+    col_cosine = first.orientation[3:]
+    row_spacing, col_spacing = first.pixel_spacing
+
+    if len(ordered) > 1:
+        slice_step = (ordered[-1].position - first.position) / (len(ordered) - 1)
+    else:
+        slice_step = np.cross(row_cosine, col_cosine)
+
+    affine = np.eye(4)
+    affine[:3, 0] = row_cosine * col_spacing
+    affine[:3, 1] = col_cosine * row_spacing
+    affine[:3, 2] = slice_step
+    affine[:3, 3] = first.position
+
+    # DICOM patient space is LPS; NIfTI is RAS
+    affine[:2, :] *= -1
+    return affine
+
+
+def _decode_pixels(header: SliceHeader) -> np.ndarray:
+    """Decode pixel data for one slice."""
+    import pydicom
+
+    ds = pydicom.dcmread(str(header.path), force=True)
+    pixels = ds.pixel_array
+    if pixels.ndim != 2:
+        raise DicomConversionError("Multi-frame DICOM is not supported by the native backend")
+    return pixels
+
+
+def assemble_volume(ordered: List[SliceHeader], max_workers: Optional[int] = None) -> np.ndarray:
+    """
+    Decode slices in parallel and stack them into a volume.
+
+    Args:
+        ordered: Slice headers sorted along the slice normal
+        max_workers: Thread pool size (defaults to default_workers())
+
+    Returns:
+        Volume array with shape (columns, rows, slices)
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or default_workers()) as pool:
+        slices = list(pool.map(_decode_pixels, ordered))
+
+    needs_rescale = any(h.slope != 1.0 or h.intercept != 0.0 for h in ordered)
+    dtype = np.float32 if needs_rescale else slices[0].dtype
+
+    volume = np.empty((ordered[0].columns, ordered[0].rows, len(ordered)), dtype=dtype)
+    for k, (header, pixels) in enumerate(zip(ordered, slices)):
+        if needs_rescale:
+            pixels = pixels.astype(np.float32) * header.slope + header.intercept
+        volume[:, :, k] = pixels.T
+
+    return volume
+
+
+def convert_series_to_nifti(
+    source: Union[Path, Sequence[Path]],
+    output_path: Path,
+    max_workers: Optional[int] = None,
+) -> Path:
+    """
+    Convert a DICOM series to NIfTI without spawning dcm2niix.
+
+    Args:
+        source: DICOM file, directory, or list of files of one series
+        output_path: Output NIfTI path (``.nii`` is written uncompressed)
+        max_workers: Thread pool size for header reads and pixel decoding
+
+    Returns:
+        Path to created NIfTI file
+
+    Raises:
+        DicomConversionError: If the series cannot be assembled natively
+    """
+    try:
+        import pydicom  # noqa: F401
+    except ImportError:
+        raise DicomConversionError("pydicom is not installed")
+
+    paths = collect_dicom_files(source)
+    if not paths:
+        raise DicomConversionError(f"No DICOM files found in {source}")
+
+    headers = read_headers(paths, max_workers=max_workers)
+    if not headers:
+        raise DicomConversionError("No DICOM image slices with geometry information found")
+
+    ordered = sort_slices(_select_series(headers))
+    affine = compute_affine(ordered)
+    volume = assemble_volume(ordered, max_workers=max_workers)
+
+    img = nib.Nifti1Image(volume, affine)
+    img.set_qform(affine, code=1)
+    img.set_sform(affine, code=1)
+    img.header.set_xyzt_units("mm", "sec")
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    nib.save(img, str(output_path))
+
+    logger.info(
+        "dicom_series_assembled",
+        output=str(output_path),
+        slices=len(ordered),
+        shape=volume.shape,
+        dtype=str(volume.dtype),
+    )
+
+    return output_path
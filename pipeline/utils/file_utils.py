@@ -6,12 +6,17 @@ Handles file format validation, conversion, and manipulation.
 
 import subprocess
 from pathlib import Path
+from typing import Optional
 
 import nibabel as nib
 
+from backend.core.config import get_settings
 from backend.core.logging import get_logger
+from pipeline.errors import InputInvalidError
+from pipeline.utils import dicom_series
 
 logger = get_logger(__name__)
+settings = get_settings()
 
 
 def validate_nifti(file_path: Path) -> bool:
@@ -43,53 +48,79 @@ def validate_nifti(file_path: Path) -> bool:
         return False
 
 
-def convert_dicom_to_nifti(dicom_path: Path, output_path: Path) -> Path:
+def convert_dicom_to_nifti(dicom_path: Path, output_path: Path, backend: Optional[str] = None) -> Path:
     """
     Convert DICOM file/directory to NIfTI format.
     
-    Uses dcm2niix for conversion.
+    The native backend assembles the series in-process (pydicom + NumPy)
+    and writes an uncompressed NIfTI when ``output_path`` ends in ``.nii``.
+    dcm2niix is used as a fallback when the native backend is unavailable
+    or cannot handle the series (e.g. multi-frame/enhanced DICOM).
     
     Args:
         dicom_path: Path to DICOM file or directory
         output_path: Output NIfTI file path
+        backend: "auto", "native" or "dcm2niix" (defaults to settings)
     
     Returns:
         Path to created NIfTI file
     
     Raises:
-        RuntimeError: If conversion fails
+        InputInvalidError: If the series cannot be converted
+        RuntimeError: If dcm2niix is needed but not installed
     """
+    backend = backend or settings.dicom_conversion_backend
+    
+    if backend in ("auto", "native"):
+        try:
+            return dicom_series.convert_series_to_nifti(
+                dicom_path,
+                output_path,
+                max_workers=settings.dicom_decode_workers or None,
+            )
+        except dicom_series.DicomConversionError as e:
+            if backend == "native":
+                logger.error("native_dicom_conversion_failed", error=str(e))
+                raise InputInvalidError(f"DICOM conversion failed: {e}")
+            logger.warning(
+                "native_dicom_conversion_unavailable",
+                error=str(e),
+                note="Falling back to dcm2niix",
+            )
+    
+    return _convert_with_dcm2niix(Path(dicom_path), output_path)
+
+
+def _convert_with_dcm2niix(dicom_path: Path, output_path: Path) -> Path:
+    """Convert DICOM to NIfTI by running dcm2niix."""
+    compress = output_path.name.endswith(".nii.gz")
+    base_name = output_path.name[: -len(".nii.gz")] if compress else output_path.stem
+    
+    cmd = [
+        "dcm2niix",
+        "-f", base_name,  # Output filename (dcm2niix adds the extension)
+        "-o", str(output_path.parent),  # Output directory
+        "-z", "y" if compress else "n",
+        "-b", "n",  # Don't create BIDS sidecar
+    ]
+    if dicom_path.is_file():
+        cmd.extend(["-s", "y"])  # Single file mode
+    cmd.append(str(dicom_path))
+    
     try:
-        # Ensure dcm2niix is available
         subprocess.run(
-            ["dcm2niix", "-h"],
-            check=True,
-            capture_output=True,
-        )
-        
-        # Run dcm2niix
-        cmd = [
-            "dcm2niix",
-            "-f", output_path.stem,  # Output filename
-            "-o", str(output_path.parent),  # Output directory
-            "-z", "y",  # Compress output
-            "-b", "n",  # Don't create BIDS sidecar
-            str(dicom_path),
-        ]
-        
-        result = subprocess.run(
             cmd,
             check=True,
             capture_output=True,
             text=True,
         )
         
-        logger.info("dicom_converted", output=str(output_path))
+        logger.info("dicom_converted", output=str(output_path), backend="dcm2niix")
         return output_path
     
     except subprocess.CalledProcessError as e:
         logger.error("dicom_conversion_failed", error=e.stderr)
-        raise RuntimeError(f"DICOM conversion failed: {e.stderr}")
+        raise InputInvalidError(f"DICOM conversion failed: {e.stderr}")
     
     except FileNotFoundError:
         logger.error("dcm2niix_not_found")
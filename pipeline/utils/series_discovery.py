@@ -0,0 +1,460 @@
+"""
+T1 series discovery for mixed-study DICOM archives.
+
+Whole-study exports contain localizers, T2, FLAIR, DWI and T1 series
+together. This module extracts the archive, reads only the DICOM headers
+(in parallel), groups files by SeriesInstanceUID and ranks the series by
+how closely their sequence parameters match a T1-weighted 3D acquisition.
+"""
+
+import os
+import shutil
+import tarfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Sequence
+
+from backend.core.logging import get_logger
+from pipeline.errors import InputInvalidError
+from pipeline.utils.dicom_series import default_workers
+
+logger = get_logger(__name__)
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2")
+
+# Header tags needed for grouping and ranking (pixel data is never read)
+HEADER_TAGS = [
+    "SeriesInstanceUID",
+    "SeriesNumber",
+    "SeriesDescription",
+    "ProtocolName",
+    "SequenceName",
+    "ImageType",
+    "ScanningSequence",
+    "SequenceVariant",
+    "MRAcquisitionType",
+    "RepetitionTime",
+    "EchoTime",
+    "InversionTime",
+    "SliceThickness",
+    "NumberOfFrames",
+    "Modality",
+]
+
+T1_KEYWORDS = ("t1", "mprage", "mp-rage", "spgr", "bravo", "tfl", "tfe", "mp2rage", "fspgr")
+NON_T1_KEYWORDS = ("t2", "flair", "dwi", "dti", "diff", "localizer", "scout", "survey", "swi", "bold", "fmri", "adc")
+
+# Series with fewer slices than this cannot be a usable 3D T1
+MIN_T1_SLICES = 60
+
+# Minimum score for a series to be accepted as T1-weighted
+MIN_T1_SCORE = 2.0
+
+
+class SeriesDiscoveryError(InputInvalidError):
+    """Raised when no suitable T1-weighted series can be found."""
+
+
+@dataclass
+class DicomHeader:
+    """Subset of DICOM header fields used for series discovery."""
+
+    path: Path
+    series_uid: str
+    series_number: Optional[int]
+    description: str
+    image_type: str
+    scanning_sequence: str
+    acquisition_type: str
+    repetition_time: Optional[float]
+    echo_time: Optional[float]
+    inversion_time: Optional[float]
+    slice_thickness: Optional[float]
+    frames: int
+
+
+@dataclass
+class SeriesCandidate:
+    """A DICOM series with its ranking score."""
+
+    series_uid: str
+    series_number: Optional[int]
+    description: str
+    files: List[Path] = field(default_factory=list)
+    header: Optional[DicomHeader] = None
+    score: float = 0.0
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def slice_count(self) -> int:
+        """Number of slices (frames for multi-frame objects)."""
+        if self.header and self.header.frames > 1:
+            return self.header.frames * len(self.files)
+        return len(self.files)
+
+    def summary(self) -> Dict:
+        """JSON-serializable summary for logging and job records."""
+        header = self.header
+        return {
+            "series_uid": self.series_uid,
+            "series_number": self.series_number,
+            "description": self.description,
+            "slices": self.slice_count,
+            "score": round(self.score, 2),
+            "reasons": self.reasons,
+            "repetition_time": header.repetition_time if header else None,
+            "echo_time": header.echo_time if header else None,
+            "inversion_time": header.inversion_time if header else None,
+            "acquisition_type": header.acquisition_type if header else None,
+            "scanning_sequence": header.scanning_sequence if header else None,
+        }
+
+
+def is_archive(path: Path) -> bool:
+    """Check whether a path looks like a zip/tar archive."""
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _member_parts(name: str) -> List[str]:
+    """Split an archive member name into traversal-free path components."""
+    return [p for p in PurePosixPath(name.replace("\\", "/")).parts if p not in ("", ".", "..", "/")]
+
+
+def is_ignored_member(name: str) -> bool:
+    """Check whether an archive member is a dotfile or macOS resource fork metadata."""
+    parts = _member_parts(name)
+    return not parts or parts[-1].startswith(".") or "__MACOSX" in parts
+
+
+def _safe_member_name(name: str) -> Optional[str]:
+    """Return a flattened, traversal-free file name for an archive member."""
+    if is_ignored_member(name):
+        return None
+    return "_".join(_member_parts(name))[-200:]
+
+
+def extract_archive(archive_path: Path, dest_dir: Path, max_bytes: Optional[int] = None) -> List[Path]:
+    """
+    Stream-extract a zip or tar archive into a flat directory.
+
+    Members are copied one at a time without loading the archive into
+    memory. Paths are flattened so archive entries cannot escape
+    ``dest_dir``.
+
+    Args:
+        archive_path: Path to .zip/.tar/.tar.gz/.tgz archive
+        dest_dir: Destination directory
+        max_bytes: Optional limit on total extracted size (zip bomb guard)
+
+    Returns:
+        List of extracted file paths
+
+    Raises:
+        SeriesDiscoveryError: If the archive is invalid or too large
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    extracted: List[Path] = []
+    total_bytes = 0
+
+    def _copy(src, name: str) -> None:
+        nonlocal total_bytes
+        target = dest_dir / f"{len(extracted):06d}_{name}"
+        with open(target, "wb") as dst:
+            while True:
+                chunk = src.read(1024 * 1024)
+                if not chunk:
+                    break
+                total_bytes += len(chunk)
+                if max_bytes and total_bytes > max_bytes:
+                    raise SeriesDiscoveryError(f"Archive expands beyond {max_bytes} bytes")
+                dst.write(chunk)
+        extracted.append(target)
+
+    try:
+        if archive_path.name.lower().endswith(".zip"):
+            with zipfile.ZipFile(archive_path) as zf:
+                for info in zf.infolist():
+                    name = _safe_member_name(info.filename)
+                    if info.is_dir() or not name:
+                        continue
+                    with zf.open(info) as src:
+                        _copy(src, name)
+        else:
+            # "r|*" reads the tar as a stream (no seeking, any compression)
+            with tarfile.open(archive_path, mode="r|*") as tf:
+                for member in tf:
+                    name = _safe_member_name(member.name)
+                    if not member.isfile() or not name:
+                        continue
+                    src = tf.extractfile(member)
+                    if src is not None:
+                        _copy(src, name)
+    except (zipfile.BadZipFile, tarfile.TarError) as e:
+        raise SeriesDiscoveryError(f"Invalid archive: {e}")
+
+    logger.info(
+        "archive_extracted",
+        archive=str(archive_path),
+        files=len(extracted),
+        size_bytes=total_bytes,
+    )
+
+    return extracted
+
+
+def _to_float(value) -> Optional[float]:
+    """Convert a DICOM numeric value (possibly multi-valued) to float."""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (list, tuple)) or hasattr(value, "__iter__") and not isinstance(value, str):
+            value = list(value)[0]
+        return float(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _to_text(value) -> str:
+    """Join multi-valued DICOM strings with a backslash."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    try:
+        return "\\".join(str(v) for v in value)
+    except TypeError:
+        return str(value)
+
+
+def read_discovery_header(path: Path) -> Optional[DicomHeader]:
+    """
+    Read the header tags needed for discovery, skipping pixel data.
+
+    Files without the DICOM preamble (common in older PACS exports) are
+    read too; files that are not DICOM at all have no series UID.
+
+    Args:
+        path: Candidate DICOM file
+
+    Returns:
+        DicomHeader, or None if the file is not a DICOM image
+    """
+    import pydicom
+
+    try:
+        ds = pydicom.dcmread(str(path), stop_before_pixels=True, specific_tags=HEADER_TAGS, force=True)
+    except Exception:
+        return None
+
+    series_uid = str(getattr(ds, "SeriesInstanceUID", "") or "")
+    if not series_uid:
+        return None
+
+    description = " ".join(
+        str(getattr(ds, tag, "") or "") for tag in ("SeriesDescription", "ProtocolName", "SequenceName")
+    ).strip()
+    series_number = getattr(ds, "SeriesNumber", None)
+
+    return DicomHeader(
+        path=path,
+        series_uid=series_uid,
+        series_number=int(series_number) if series_number not in (None, "") else None,
+        description=description,
+        image_type=_to_text(getattr(ds, "ImageType", "")).upper(),
+        scanning_sequence=_to_text(getattr(ds, "ScanningSequence", "")).upper(),
+        acquisition_type=str(getattr(ds, "MRAcquisitionType", "") or "").upper(),
+        repetition_time=_to_float(getattr(ds, "RepetitionTime", None)),
+        echo_time=_to_float(getattr(ds, "EchoTime", None)),
+        inversion_time=_to_float(getattr(ds, "InversionTime", None)),
+        slice_thickness=_to_float(getattr(ds, "SliceThickness", None)),
+        frames=int(_to_float(getattr(ds, "NumberOfFrames", None)) or 1),
+    )
+
+
+def group_series(headers: Sequence[DicomHeader]) -> Dict[str, SeriesCandidate]:
+    """
+    Group DICOM headers by SeriesInstanceUID.
+
+    Args:
+        headers: Headers of all DICOM files in the study
+
+    Returns:
+        Mapping of series UID to SeriesCandidate
+    """
+    series: Dict[str, SeriesCandidate] = {}
+    for header in headers:
+        candidate = series.get(header.series_uid)
+        if candidate is None:
+            candidate = SeriesCandidate(
+                series_uid=header.series_uid,
+                series_number=header.series_number,
+                description=header.description,
+                header=header,
+            )
+            series[header.series_uid] = candidate
+        candidate.files.append(header.path)
+    return series
+
+
+def score_t1_candidate(candidate: SeriesCandidate) -> float:
+    """
+    Score how likely a series is a 3D T1-weighted structural scan.
+
+    Typical T1 protocols (MPRAGE, SPGR/BRAVO, TFE) are 3D gradient-echo
+    acquisitions with short TE, TR below ~3 s (MPRAGE) or ~15 ms (SPGR),
+    an inversion time of ~600-1300 ms when inversion-prepared, and
+    ~150-200+ thin slices.
+
+    Args:
+        candidate: Series to score (reasons are appended in place)
+
+    Returns:
+        Score (higher is more T1-like)
+    """
+    header = candidate.header
+    reasons = candidate.reasons
+    score = 0.0
+    text = candidate.description.lower()
+
+    if any(k in text for k in T1_KEYWORDS):
+        score += 2.0
+        reasons.append("t1_keyword")
+    if any(k in text for k in NON_T1_KEYWORDS):
+        score -= 3.0
+        reasons.append("non_t1_keyword")
+
+    if "DERIVED" in header.image_type or "LOCALIZER" in header.image_type:
+        score -= 3.0
+        reasons.append("derived_or_localizer")
+
+    if header.acquisition_type == "3D":
+        score += 3.0
+        reasons.append("3d_acquisition")
+    elif header.acquisition_type == "2D":
+        score -= 1.0
+        reasons.append("2d_acquisition")
+
+    sequence = header.scanning_sequence
+    if "EP" in sequence.split("\\"):
+        score -= 3.0
+        reasons.append("echo_planar")
+    elif "GR" in sequence:
+        score += 1.0
+        reasons.append("gradient_echo")
+
+    te = header.echo_time
+    if te is not None:
+        if te <= 10.0:
+            score += 2.0
+            reasons.append("short_te")
+        elif te >= 60.0:
+            score -= 3.0
+            reasons.append("long_te")
+
+    tr = header.repetition_time
+    if tr is not None:
+        if tr <= 3000.0:
+            score += 1.0
+            reasons.append("t1_tr")
+        elif tr >= 4000.0:
+            score -= 2.0
+            reasons.append("long_tr")
+
+    ti = header.inversion_time
+    if ti:
+        if 500.0 <= ti <= 1400.0:
+            score += 2.0
+            reasons.append("t1_inversion_time")
+        elif ti >= 1500.0:
+            score -= 3.0
+            reasons.append("flair_inversion_time")
+
+    slices = candidate.slice_count
+    if slices < MIN_T1_SLICES:
+        score -= 4.0
+        reasons.append("too_few_slices")
+    else:
+        score += min(slices / 100.0, 2.0)
+        reasons.append("slice_coverage")
+
+    if header.slice_thickness is not None and header.slice_thickness <= 1.5:
+        score += 1.0
+        reasons.append("thin_slices")
+
+    candidate.score = score
+    return score
+
+
+def discover_t1_series(
+    files: Sequence[Path],
+    max_workers: Optional[int] = None,
+) -> List[SeriesCandidate]:
+    """
+    Rank all series in a study by T1 likelihood.
+
+    Args:
+        files: All files extracted from the study archive
+        max_workers: Thread pool size for header reads
+
+    Returns:
+        Series candidates sorted best-first
+
+    Raises:
+        SeriesDiscoveryError: If no DICOM series are found or none look T1-weighted
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or default_workers()) as pool:
+        headers = [h for h in pool.map(read_discovery_header, files) if h is not None]
+
+    if not headers:
+        raise SeriesDiscoveryError("No DICOM files found in archive")
+
+    candidates = list(group_series(headers).values())
+    for candidate in candidates:
+        score_t1_candidate(candidate)
+
+    # Ties go to the series with more slices, then the later series number
+    candidates.sort(
+        key=lambda c: (c.score, c.slice_count, c.series_number or 0),
+        reverse=True,
+    )
+
+    logger.info(
+        "dicom_series_ranked",
+        files=len(files),
+        dicom_files=len(headers),
+        series=[c.summary() for c in candidates[:5]],
+    )
+
+    if candidates[0].score < MIN_T1_SCORE:
+        raise SeriesDiscoveryError(
+            "No T1-weighted series found. Candidates: "
+            + ", ".join(f"{c.description or c.series_uid} ({c.score:.1f})" for c in candidates[:5])
+        )
+
+    return candidates
+
+
+def stage_series(candidate: SeriesCandidate, dest_dir: Path) -> Path:
+    """
+    Place the files of one series in their own directory for conversion.
+
+    Files are hard-linked (copied if linking is unsupported) so the
+    conversion backends only ever see the selected series.
+
+    Args:
+        candidate: Selected series
+        dest_dir: Directory to populate
+
+    Returns:
+        Directory containing only the selected series
+    """
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for path in candidate.files:
+        target = dest_dir / path.name
+        try:
+            os.link(path, target)
+        except OSError:
+            shutil.copyfile(path, target)
+    return dest_dir
@@ -69,7 +69,7 @@ if command -v celery >/dev/null 2>&1; then
   GPU_COUNT=$( (command -v nvidia-smi >/dev/null 2>&1 && nvidia-smi --query-gpu=name --format=csv,noheader | wc -l) || echo 0 )
   echo "[RESTART] Detected GPUs: ${GPU_COUNT}"
   nohup env PYTHONPATH="$PYTHONPATH" REDIS_HOST="$REDIS_HOST" REDIS_PORT="$REDIS_PORT" \
-    celery -A workers.celery_app:celery_app worker -l info \
+    celery -A workers.celery_app:celery_app worker -l info -Q segmentation,postprocess,celery \
     > "$LOG_DIR/worker.out" 2>&1 &
 else
   echo "[RESTART] ERROR: celery not found in PATH. Install with: pip install celery"
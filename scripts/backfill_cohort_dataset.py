@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Backfill the Parquet Cohort Dataset
+
+Workers add each newly completed job to the cohort dataset. This script
+adds jobs that completed before the dataset existed, reading metrics
+from the database, and then compacts the dataset.
+
+Usage:
+    python scripts/backfill_cohort_dataset.py [--batch-size 500] [--no-compact]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy.orm import selectinload
+
+from backend.core.database import SessionLocal
+from backend.models import Job
+from backend.models.job import JobStatus
+from backend.services import CohortDatasetService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the cohort dataset from the database")
+    parser.add_argument("--batch-size", type=int, default=500, help="Jobs loaded per query")
+    parser.add_argument("--no-compact", action="store_true", help="Skip compaction after the backfill")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        query = (
+            db.query(Job)
+            .options(selectinload(Job.metrics))
+            .filter(Job.status == JobStatus.COMPLETED)
+            .order_by(Job.created_at, Job.id)
+        )
+
+        appended = 0
+        offset = 0
+        while True:
+            jobs = query.offset(offset).limit(args.batch_size).all()
+            if not jobs:
+                break
+            for job in jobs:
+                if job.metrics:
+                    CohortDatasetService.append_job(job, job.metrics)
+                    appended += 1
+            offset += len(jobs)
+            db.expunge_all()
+            print(f"  {offset} jobs scanned, {appended} appended")
+
+        print(f"\nAppended {appended} jobs to {CohortDatasetService.root()}")
+
+        if not args.no_compact:
+            summary = CohortDatasetService.compact(db)
+            print(f"Compacted {summary['partitions']} partitions ({summary['rows']} rows)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Benchmark Repeat Viewer Loads of Visualization Artifacts
+
+This script creates a completed job with a full set of overlay PNGs and
+measures a viewer load (one request per slice x orientation x layer)
+with a cold cache versus a repeat load that revalidates with
+If-None-Match. The database is a temporary SQLite file.
+
+Usage:
+    python scripts/benchmark_artifact_caching.py [--slices 10] [--png-kb 60] [--loads 5]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.api import visualizations
+from backend.core.database import Base, get_db
+from backend.models import Batch, Blob, Job
+from backend.models.job import JobStatus
+
+ORIENTATIONS = ["axial", "coronal", "sagittal"]
+LAYERS = [("anatomical", "anatomical_{}.png"), ("overlay", "hippocampus_overlay_{}.png")]
+
+
+def build_client(workdir: Path, slices: int, png_kb: int):
+    """Create the job, its artifacts and a test client; return (client, urls)."""
+    visualizations.settings.output_dir = str(workdir / "outputs")
+    visualizations.settings.x_accel_redirect_prefix = None
+
+    engine = create_engine(f"sqlite:///{workdir / 'bench.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__])
+    SessionLocal = sessionmaker(bind=engine)
+
+    job_id = uuid.uuid4()
+    with SessionLocal() as session:
+        session.add(Job(id=job_id, filename="bench_T1.nii.gz", status=JobStatus.COMPLETED, created_at=datetime.utcnow()))
+        session.commit()
+
+    urls = []
+    payload = os.urandom(png_kb * 1024)
+    for orientation in ORIENTATIONS:
+        viz_dir = workdir / "outputs" / str(job_id) / "visualizations" / "overlays" / orientation
+        viz_dir.mkdir(parents=True)
+        for k in range(slices):
+            slice_id = f"slice_{k:02d}"
+            for layer, pattern in LAYERS:
+                (viz_dir / pattern.format(slice_id)).write_bytes(payload)
+                urls.append(f"/visualizations/{job_id}/overlay/{slice_id}?orientation={orientation}&layer={layer}")
+
+    app = FastAPI()
+    app.include_router(visualizations.router)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    return TestClient(app), urls
+
+
+def viewer_load(client: TestClient, urls, etags=None):
+    """Fetch every artifact once; return (total seconds, per-request latencies, etags)."""
+    latencies = []
+    new_etags = {}
+    start = time.perf_counter()
+    for url in urls:
+        headers = {"If-None-Match": etags[url]} if etags else None
+        t0 = time.perf_counter()
+        response = client.get(url, headers=headers)
+        latencies.append(time.perf_counter() - t0)
+        new_etags[url] = response.headers.get("etag")
+    return time.perf_counter() - start, latencies, new_etags
+
+
+def summarize(name: str, totals, latencies) -> None:
+    """Print load time and latency percentiles."""
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(
+        f"  {name:<24} load {statistics.median(totals) * 1000:8.1f} ms   "
+        f"p50 {statistics.median(latencies) * 1000:6.2f} ms   p95 {p95 * 1000:6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached viewer loads")
+    parser.add_argument("--slices", type=int, default=10, help="Slices per orientation")
+    parser.add_argument("--png-kb", type=int, default=60, help="Size of each PNG in KB")
+    parser.add_argument("--loads", type=int, default=5, help="Viewer loads per scenario")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="cache_bench_"))
+    try:
+        client, urls = build_client(workdir, args.slices, args.png_kb)
+        print(f"Viewer load: {len(urls)} overlay requests of {args.png_kb} KB\n")
+
+        cold_totals, cold_latencies = [], []
+        etags = None
+        for _ in range(args.loads):
+            total, latencies, etags = viewer_load(client, urls)
+            cold_totals.append(total)
+            cold_latencies.extend(latencies)
+
+        warm_totals, warm_latencies = [], []
+        for _ in range(args.loads):
+            total, latencies, _ = viewer_load(client, urls, etags)
+            warm_totals.append(total)
+            warm_latencies.extend(latencies)
+
+        summarize("cold (200, full body)", cold_totals, cold_latencies)
+        summarize("repeat (304, no DB)", warm_totals, warm_latencies)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Benchmark Poll Latency Under Mixed Upload Load
+
+This script starts a uvicorn server (in its own process) with the
+upload, jobs and metrics routers on a temporary SQLite database (local disk storage, no
+Celery broker) and measures status-poll latency while uploads are in
+flight. Polls go either to the async ``/jobs/{id}/status`` route or to
+an equivalent sync ``def`` route that uses the threadpool and the sync
+session, so both paths can be compared under the same upload load.
+
+Usage:
+    python scripts/benchmark_async_api.py [--pollers 64] [--uploaders 4] [--upload-mb 64] [--seconds 10]
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import uvicorn
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from backend.api import jobs, metrics, upload
+from backend.core.database import Base, get_async_db, get_db
+from backend.core.logging import setup_logging
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services import JobService, StorageService
+from backend.services.job_cache import job_cache
+
+
+class LocalStorageService(StorageService):
+    """Storage service that never talks to MinIO."""
+
+    def __init__(self):
+        self.use_s3 = False
+        Path(upload.settings.upload_dir).mkdir(parents=True, exist_ok=True)
+
+
+def build_app(workdir: Path, job_ids) -> FastAPI:
+    """Create the app and its database with jobs to poll."""
+    upload.settings.upload_dir = str(workdir / "uploads")
+    upload.settings.output_dir = str(workdir / "outputs")
+    upload.StorageService = LocalStorageService
+
+    # No broker in the benchmark; enqueueing is not what is measured
+    from workers.tasks import processing
+    processing.enqueue_processing = lambda *args, **kwargs: None
+
+    db_path = workdir / "bench.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", connect_args={"timeout": 30})
+    SessionLocal = sessionmaker(bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    with SessionLocal() as session:
+        for k, job_id in enumerate(job_ids):
+            status = JobStatus.RUNNING if k % 2 else JobStatus.COMPLETED
+            session.add(Job(id=job_id, filename=f"sub{k:03d}_T1w.nii.gz", status=status, created_at=datetime.utcnow()))
+        session.commit()
+
+    app = FastAPI()
+    app.include_router(upload.router)
+    app.include_router(jobs.router)
+    app.include_router(metrics.router)
+
+    @app.get("/sync/jobs/{job_id}/status")
+    def sync_job_status(job_id: UUID, db: Session = Depends(get_db)):
+        """Pre-async status route: threadpool slot plus sync session."""
+        job = JobService.get_job(db, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"job_id": str(job.id), "status": job.status.value}
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return app
+
+
+def serve(workdir: Path, job_ids, port: int, use_cache: bool) -> None:
+    """Run the benchmark server (child process entry point)."""
+    setup_logging("WARNING", "production")
+    job_cache.enabled = use_cache
+    app = build_app(workdir, job_ids)
+    uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def wait_for_server(base: str, timeout: float = 30.0) -> None:
+    """Block until the server accepts requests."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            httpx.get(f"{base}/jobs/{uuid.uuid4()}/status")
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError("benchmark server did not start")
+
+
+def free_port() -> int:
+    """Find an unused local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_mixed_load(base: str, status_path: str, job_ids, args) -> tuple:
+    """Run pollers and uploaders concurrently; return (poll latencies, uploads)."""
+    payload = os.urandom(args.upload_mb * 1024 * 1024)
+    deadline = time.perf_counter() + args.seconds
+    latencies = []
+    uploads = 0
+
+    limits = httpx.Limits(max_connections=args.pollers + args.uploaders)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=300) as client:
+        async def poller(k: int):
+            job_id = job_ids[k % len(job_ids)]
+            while time.perf_counter() < deadline:
+                t0 = time.perf_counter()
+                response = await client.get(status_path.format(job_id=job_id))
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - t0)
+
+        async def uploader(k: int):
+            nonlocal uploads
+            while time.perf_counter() < deadline:
+                # Unique content per upload so every request hashes and stores a new blob
+                data = uuid.uuid4().bytes + payload
+                response = await client.post(
+                    "/upload/",
+                    files={"file": (f"bench_{k}_T1w.nii.gz", data, "application/octet-stream")},
+                )
+                response.raise_for_status()
+                uploads += 1
+
+        await asyncio.gather(
+            *(poller(k) for k in range(args.pollers)),
+            *(uploader(k) for k in range(args.uploaders)),
+        )
+
+    return latencies, uploads
+
+
+def report(name: str, latencies, uploads: int, seconds: float) -> None:
+    """Print poll throughput and latency percentiles."""
+    latencies = sorted(latencies)
+
+    def pct(p):
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000
+
+    print(
+        f"  {name:<26} {len(latencies) / seconds:8.1f} polls/s   p50 {pct(0.50):7.1f} ms   "
+        f"p99 {pct(0.99):8.1f} ms   uploads {uploads}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark poll latency under upload load")
+    parser.add_argument("--pollers", type=int, default=64, help="Concurrent status pollers")
+    parser.add_argument("--uploaders", type=int, default=4, help="Concurrent uploaders")
+    parser.add_argument("--upload-mb", type=int, default=64, help="Size of each upload in MB")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each scenario")
+    parser.add_argument("--jobs", type=int, default=200, help="Jobs to poll")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the terminal job cache")
+    args = parser.parse_args()
+
+    use_cache = not args.no_cache
+    job_ids = [uuid.uuid4() for _ in range(args.jobs)]
+
+    workdir = Path(tempfile.mkdtemp(prefix="async_api_bench_"))
+    port = free_port()
+    server = multiprocessing.Process(target=serve, args=(workdir, job_ids, port, use_cache), daemon=True)
+    server.start()
+    try:
+        base = f"http://127.0.0.1:{port}"
+        wait_for_server(base)
+        print(
+            f"{args.pollers} pollers, {args.uploaders} uploaders x {args.upload_mb} MB, "
+            f"{args.seconds:.0f} s per scenario, job cache {'on' if use_cache else 'off'}\n"
+        )
+
+        for name, path in [
+            ("sync route (threadpool)", "/sync/jobs/{job_id}/status"),
+            ("async route", "/jobs/{job_id}/status"),
+        ]:
+            latencies, uploads = asyncio.run(run_mixed_load(base, path, job_ids, args))
+            report(name, latencies, uploads, args.seconds)
+    finally:
+        server.terminate()
+        server.join(timeout=5)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
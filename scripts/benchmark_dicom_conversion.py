@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark DICOM to NIfTI Conversion
+
+This script writes a synthetic T1-like DICOM series (176 sagittal slices by
+default) and times the native in-process backend against dcm2niix.
+
+Usage:
+    python scripts/benchmark_dicom_conversion.py [--slices 176] [--matrix 256] [--repeat 3]
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from pipeline.utils import file_utils
+
+
+def write_synthetic_series(directory: Path, slices: int, matrix: int) -> None:
+    """
+    Write a synthetic single-frame DICOM series.
+
+    Args:
+        directory: Output directory
+        slices: Number of slices
+        matrix: In-plane matrix size (rows = columns)
+    """
+    from pydicom.dataset import Dataset, FileMetaDataset
+    from pydicom.uid import ExplicitVRLittleEndian, MRImageStorage, generate_uid
+
+    series_uid = generate_uid()
+    study_uid = generate_uid()
+    rng = np.random.default_rng(0)
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for k in range(slices):
+        meta = FileMetaDataset()
+        meta.MediaStorageSOPClassUID = MRImageStorage
+        meta.MediaStorageSOPInstanceUID = generate_uid()
+        meta.TransferSyntaxUID = ExplicitVRLittleEndian
+
+        ds = Dataset()
+        ds.file_meta = meta
+        ds.SOPClassUID = MRImageStorage
+        ds.SOPInstanceUID = meta.MediaStorageSOPInstanceUID
+        ds.StudyInstanceUID = study_uid
+        ds.SeriesInstanceUID = series_uid
+        ds.Modality = "MR"
+        ds.SeriesDescription = "T1_MPRAGE_SAG"
+        ds.InstanceNumber = k + 1
+        ds.ImagePositionPatient = [float(k), -128.0, 128.0]
+        ds.ImageOrientationPatient = [0.0, 1.0, 0.0, 0.0, 0.0, -1.0]
+        ds.PixelSpacing = [1.0, 1.0]
+        ds.SliceThickness = 1.0
+        ds.Rows = matrix
+        ds.Columns = matrix
+        ds.SamplesPerPixel = 1
+        ds.PhotometricInterpretation = "MONOCHROME2"
+        ds.BitsAllocated = 16
+        ds.BitsStored = 16
+        ds.HighBit = 15
+        ds.PixelRepresentation = 0
+        ds.PixelData = rng.integers(0, 4096, (matrix, matrix), dtype=np.uint16).tobytes()
+
+        # Shuffle file names so sorting by name is not enough
+        ds.save_as(str(directory / f"IM{(k * 7919) % 100000:05d}"), enforce_file_format=True)
+
+
+def time_backend(backend: str, source: Path, output: Path, repeat: int) -> float:
+    """Return the best-of-N conversion time for a backend, or NaN if unavailable."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            file_utils.convert_dicom_to_nifti(source, output, backend=backend)
+        except RuntimeError as e:
+            print(f"  {backend}: unavailable ({e})")
+            return float("nan")
+        best = min(best, time.perf_counter() - start)
+        output.unlink(missing_ok=True)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DICOM to NIfTI conversion backends")
+    parser.add_argument("--slices", type=int, default=176, help="Number of slices in the series")
+    parser.add_argument("--matrix", type=int, default=256, help="In-plane matrix size")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per backend (best time reported)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="dicom_bench_"))
+    try:
+        series_dir = workdir / "series"
+        print(f"Writing synthetic series: {args.slices} slices, {args.matrix}x{args.matrix}")
+        write_synthetic_series(series_dir, args.slices, args.matrix)
+
+        results = {
+            "native (.nii)": time_backend("native", series_dir, workdir / "native.nii", args.repeat),
+            "dcm2niix (.nii.gz)": time_backend("dcm2niix", series_dir, workdir / "dcm2niix.nii.gz", args.repeat),
+            "dcm2niix (.nii)": time_backend("dcm2niix", series_dir, workdir / "dcm2niix.nii", args.repeat),
+        }
+
+        print("\nBest conversion time:")
+        for name, seconds in results.items():
+            print(f"  {name:<20} {seconds:8.3f} s")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
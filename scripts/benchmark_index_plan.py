@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Job and Metric Index Plan
+
+This script fills a database (a temporary SQLite file by default) with
+synthetic jobs and metrics, then runs every read query of JobService,
+MetricService and CleanupService (plus the admission queue) twice: with
+the index set before the review (single-column status/created_at
+indexes, no region index) and with the reviewed set of migration
+20261019_150000. For each query it records the SQL the service emits,
+its query plan under both index sets and the median wall time.
+
+Write paths are not run (they commit), but their lookups are the
+primary-key query measured as ``JobService.get_job``.
+
+Usage:
+    python scripts/benchmark_index_plan.py [--jobs 100000] [--metrics-per-job 5] [--repeat 5]
+                                           [--database-url URL] [--output plans.json]
+"""
+
+import argparse
+import json
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event, insert, select, text
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.core.logging import setup_logging
+from backend.models import Batch, Blob, Job, Metric, RegionStats
+from backend.models.job import JobStatus
+from backend.services import AdmissionService, CleanupService, JobService, MetricService
+from backend.services.job_cache import job_cache
+
+# Share of jobs per status (steady state: most jobs finished)
+STATUSES = [JobStatus.COMPLETED] * 16 + [JobStatus.FAILED] * 2 + [JobStatus.RUNNING, JobStatus.PENDING]
+
+# Hippocampal subfields; each job has a sample of them
+REGIONS = [
+    f"{side}-{name}"
+    for side in ("Left", "Right")
+    for name in (
+        "Hippocampus", "CA1", "CA3", "CA4", "subiculum", "presubiculum", "parasubiculum",
+        "molecular_layer_HP", "GC-ML-DG", "HATA", "fimbria", "hippocampal-fissure",
+        "HP-tail", "hippocampal_head", "hippocampal_body", "whole_hippocampus",
+        "CA1-head", "CA1-body", "CA3-head", "CA3-body",
+    )
+]
+
+# Jobs are created evenly over this many days before "now"
+HISTORY_DAYS = 365
+
+# Indexes of the models before the review, and the reviewed composites
+BEFORE_INDEXES = [
+    ("ix_jobs_id", "jobs", ["id"]),
+    ("ix_jobs_status", "jobs", ["status"]),
+    ("ix_jobs_created_at", "jobs", ["created_at"]),
+    ("ix_metrics_id", "metrics", ["id"]),
+]
+AFTER_INDEXES = [
+    ("ix_jobs_status_created_at_id", "jobs", ["status", "created_at", "id"]),
+    ("ix_jobs_status_completed_at", "jobs", ["status", "completed_at"]),
+    ("ix_metrics_region_job_id", "metrics", ["region", "job_id"]),
+]
+
+
+def new_uuid() -> uuid.UUID:
+    """
+    Random UUID whose hex form SQLite keeps as text.
+
+    The UUID columns have NUMERIC affinity on SQLite, so a hex string of
+    digits and a single "e" would be stored as a REAL.
+    """
+    while True:
+        value = uuid.uuid4()
+        if any(c in "abcdf" for c in value.hex):
+            return value
+
+
+def populate(engine, job_count: int, metrics_per_job: int, now: datetime) -> None:
+    """Insert synthetic jobs and metrics in chunks."""
+    rng = random.Random(0)
+    chunk = 10000
+    span = HISTORY_DAYS * 86400
+    with engine.begin() as conn:
+        for start in range(0, job_count, chunk):
+            jobs, metrics = [], []
+            for k in range(start, min(start + chunk, job_count)):
+                job_id = new_uuid()
+                status = STATUSES[k % len(STATUSES)]
+                created_at = now - timedelta(seconds=span * (1 - k / job_count))
+                finished = status in (JobStatus.COMPLETED, JobStatus.FAILED)
+                jobs.append({
+                    "id": job_id,
+                    "filename": f"sub{k:06d}_T1w.nii.gz",
+                    "file_path": f"/data/uploads/{job_id}_sub{k:06d}_T1w.nii.gz",
+                    "status": status,
+                    "progress": 100 if finished else 50,
+                    "created_at": created_at,
+                    "started_at": created_at if status != JobStatus.PENDING else None,
+                    "completed_at": created_at + timedelta(minutes=35) if finished else None,
+                })
+                if status != JobStatus.COMPLETED:
+                    continue
+                for region in rng.sample(REGIONS, metrics_per_job):
+                    left, right = rng.gauss(3500, 300), rng.gauss(3400, 300)
+                    metrics.append({
+                        "id": new_uuid(),
+                        "job_id": job_id,
+                        "region": region,
+                        "left_volume": left,
+                        "right_volume": right,
+                        "asymmetry_index": (left - right) / (left + right),
+                        "created_at": created_at,
+                    })
+            conn.execute(insert(Job), jobs)
+            if metrics:
+                conn.execute(insert(Metric), metrics)
+
+
+def use_indexes(engine, create, drop) -> None:
+    """Switch the index set and refresh the planner statistics."""
+    with engine.begin() as conn:
+        for name, _, _ in drop:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        for name, table, columns in create:
+            ddl = f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"
+            if name == "ix_metrics_region_job_id" and engine.dialect.name == "postgresql":
+                ddl += " INCLUDE (asymmetry_index)"
+            conn.execute(text(ddl))
+        conn.execute(text("ANALYZE"))
+
+
+def workload(session_factory, cleanup: CleanupService) -> list:
+    """(label, function(db)) for every service read query."""
+    with session_factory() as db:
+        job_id = db.execute(select(Job.id).where(Job.status == JobStatus.COMPLETED).limit(1)).scalar_one()
+        metric_id = db.execute(select(Metric.id).limit(1)).scalar_one()
+
+    # About 1% of finished jobs age out per daily cleanup run
+    retention_days = HISTORY_DAYS - HISTORY_DAYS // 100
+
+    def delete_job_metrics(db):
+        MetricService.delete_job_metrics(db, job_id)
+        db.rollback()
+
+    return [
+        ("JobService.get_job (and write-path lookups)", lambda db: JobService.get_job(db, job_id)),
+        ("JobService.get_jobs", lambda db: JobService.get_jobs(db, limit=100)),
+        ("JobService.get_jobs status=completed", lambda db: JobService.get_jobs(db, limit=100, status=JobStatus.COMPLETED)),
+        ("JobService.get_jobs status=failed", lambda db: JobService.get_jobs(db, limit=100, status=JobStatus.FAILED)),
+        ("JobService.get_jobs status=running", lambda db: JobService.get_jobs(db, limit=100, status=JobStatus.RUNNING)),
+        ("MetricService.get_metric", lambda db: MetricService.get_metric(db, metric_id)),
+        ("MetricService.get_metrics_by_job", lambda db: MetricService.get_metrics_by_job(db, job_id)),
+        ("MetricService.get_metrics_by_region", lambda db: MetricService.get_metrics_by_region(db, "Left-CA1")),
+        ("MetricService.delete_job_metrics", delete_job_metrics),
+        ("CleanupService.cleanup_old_completed_jobs", lambda db: cleanup.cleanup_old_completed_jobs(db, days_old=retention_days, dry_run=True)),
+        ("CleanupService.cleanup_failed_jobs", lambda db: cleanup.cleanup_failed_jobs(db, days_old=retention_days, dry_run=True)),
+        ("CleanupService.cleanup_orphaned_files", lambda db: cleanup.cleanup_orphaned_files(db, dry_run=True)),
+        ("AdmissionService queue", lambda db: AdmissionService._queue(db)),
+    ]
+
+
+def measure(engine, session_factory, queries, repeat: int) -> dict:
+    """Capture the SQL of each query, its plans and the median time in ms."""
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    explain = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    results = {}
+    for label, fn in queries:
+        captured.clear()
+        with session_factory() as db:
+            fn(db)
+        statements = [
+            (statement, parameters) for statement, parameters in captured
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+        ]
+
+        plans = []
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                rows = conn.exec_driver_sql(explain + statement, parameters).all()
+                plans.append({"sql": " ".join(statement.split()), "plan": [str(row[-1]) for row in rows]})
+
+        samples = []
+        for _ in range(repeat):
+            with session_factory() as db:
+                start = time.perf_counter()
+                fn(db)
+                samples.append(time.perf_counter() - start)
+        results[label] = {"ms": statistics.median(samples) * 1000, "statements": plans}
+
+    event.remove(engine, "before_cursor_execute", capture)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the job and metric index plan")
+    parser.add_argument("--jobs", type=int, default=100000, help="Synthetic jobs to create")
+    parser.add_argument("--metrics-per-job", type=int, default=5, help="Metrics per completed job (total about 500k)")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement")
+    parser.add_argument("--database-url", help="Empty database to fill (default: temporary SQLite file)")
+    parser.add_argument("--output", help="Write plans and timings as JSON to this file")
+    args = parser.parse_args()
+
+    setup_logging("WARNING", "production")
+    job_cache.enabled = False
+
+    workdir = Path(tempfile.mkdtemp(prefix="index_bench_"))
+    # Metrics come only from completed jobs; scale so the total stays near jobs * metrics_per_job
+    completed_share = STATUSES.count(JobStatus.COMPLETED) / len(STATUSES)
+    metrics_per_job = max(1, min(len(REGIONS), round(args.metrics_per_job / completed_share)))
+
+    try:
+        engine = create_engine(args.database_url or f"sqlite:///{workdir / 'bench.db'}")
+        tables = [Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__, RegionStats.__table__]
+        Base.metadata.create_all(bind=engine, tables=tables)
+        now = datetime.utcnow()
+        start = time.perf_counter()
+        populate(engine, args.jobs, metrics_per_job, now)
+        SessionLocal = sessionmaker(bind=engine)
+        with SessionLocal() as db:
+            metric_count = db.query(Metric).count()
+        print(f"Created {args.jobs} jobs and {metric_count} metrics in {time.perf_counter() - start:.1f} s ({engine.dialect.name})\n")
+
+        # Dry runs only query the database; skip the storage client setup
+        cleanup = CleanupService.__new__(CleanupService)
+        cleanup.uploads_dir = workdir / "uploads"
+        cleanup.outputs_dir = workdir / "outputs"
+        queries = workload(SessionLocal, cleanup)
+        use_indexes(engine, create=BEFORE_INDEXES, drop=AFTER_INDEXES)
+        before = measure(engine, SessionLocal, queries, args.repeat)
+        use_indexes(engine, create=AFTER_INDEXES, drop=BEFORE_INDEXES)
+        after = measure(engine, SessionLocal, queries, args.repeat)
+
+        print(f"{'query':<46} {'before':>10} {'after':>10}")
+        for label, _ in queries:
+            print(f"{label:<46} {before[label]['ms']:8.2f} ms {after[label]['ms']:8.2f} ms")
+            for old, new in zip(before[label]["statements"], after[label]["statements"]):
+                if old["plan"] != new["plan"]:
+                    print(f"    before: {' | '.join(old['plan'])}")
+                    print(f"    after:  {' | '.join(new['plan'])}")
+
+        if args.output:
+            report = {
+                "database": engine.dialect.name,
+                "jobs": args.jobs,
+                "metrics": metric_count,
+                "queries": {label: {"before": before[label], "after": after[label]} for label, _ in queries},
+            }
+            Path(args.output).write_text(json.dumps(report, indent=2))
+            print(f"\nPlans written to {args.output}")
+        engine.dispose()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
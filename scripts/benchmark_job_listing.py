@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark Job Listing on a Large Jobs Table
+
+This script fills a temporary SQLite database with synthetic jobs (two
+metrics each) and compares:
+  - offset pagination versus keyset (cursor) pagination at increasing depth
+  - per-job lazy loading of metrics versus selectinload for one page
+  - an exact COUNT(*) per request versus the cached total
+
+Usage:
+    python scripts/benchmark_job_listing.py [--jobs 100000] [--page 100] [--repeat 5]
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.models import Batch, Blob, Job, Metric
+from backend.models.job import JobStatus
+from backend.services.async_job_service import AsyncJobService, encode_cursor
+
+STATUSES = [JobStatus.COMPLETED] * 8 + [JobStatus.FAILED, JobStatus.RUNNING]
+
+
+def populate(engine, job_count: int) -> None:
+    """Insert synthetic jobs and metrics in chunks."""
+    base = datetime(2025, 1, 1)
+    chunk = 10000
+    with engine.begin() as conn:
+        for start in range(0, job_count, chunk):
+            jobs, metrics = [], []
+            for k in range(start, min(start + chunk, job_count)):
+                job_id = uuid.uuid4()
+                jobs.append({
+                    "id": job_id,
+                    "filename": f"sub{k:06d}_T1w.nii.gz",
+                    "status": STATUSES[k % len(STATUSES)],
+                    "progress": 100,
+                    "created_at": base + timedelta(seconds=k),
+                })
+                for region in ("Left-Hippocampus", "Right-Hippocampus"):
+                    metrics.append({
+                        "id": uuid.uuid4(),
+                        "job_id": job_id,
+                        "region": region,
+                        "left_volume": 3500.0,
+                        "right_volume": 3400.0,
+                        "asymmetry_index": 0.029,
+                        "created_at": base,
+                    })
+            conn.execute(insert(Job), jobs)
+            conn.execute(insert(Metric), metrics)
+
+
+def timed(fn, repeat: int) -> float:
+    """Median wall time of fn() in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark job listing strategies")
+    parser.add_argument("--jobs", type=int, default=100000, help="Synthetic jobs to create")
+    parser.add_argument("--page", type=int, default=100, help="Page size")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions per measurement")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="listing_bench_"))
+    try:
+        db_path = workdir / "bench.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=engine, tables=[Blob.__table__, Batch.__table__, Job.__table__, Metric.__table__])
+        start = time.perf_counter()
+        populate(engine, args.jobs)
+        print(f"Created {args.jobs} jobs in {time.perf_counter() - start:.1f} s\n")
+
+        SessionLocal = sessionmaker(bind=engine)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+        loop = asyncio.new_event_loop()
+
+        def run(coro_fn):
+            async def wrapper():
+                async with AsyncSessionLocal() as db:
+                    return await coro_fn(db)
+            return loop.run_until_complete(wrapper())
+
+        print(f"Page of {args.page} (with metrics) at depth:")
+        for depth in (0, args.jobs // 10, args.jobs // 2, args.jobs - args.page):
+            with SessionLocal() as session:
+                anchor = session.execute(
+                    select(Job).order_by(Job.created_at.desc(), Job.id.desc()).offset(depth - 1).limit(1)
+                ).scalar_one() if depth else None
+                cursor = encode_cursor(anchor) if anchor else None
+
+            offset_ms = timed(lambda: run(lambda db: AsyncJobService.get_jobs(db, skip=depth, limit=args.page)), args.repeat)
+            keyset_ms = timed(lambda: run(lambda db: AsyncJobService.get_jobs_page(db, limit=args.page, cursor=cursor)), args.repeat)
+            print(f"  {depth:>8}   offset {offset_ms:8.1f} ms   keyset {keyset_ms:8.1f} ms")
+
+        def lazy_page():
+            with SessionLocal() as session:
+                jobs = session.execute(
+                    select(Job).order_by(Job.created_at.desc(), Job.id.desc()).limit(1000)
+                ).scalars().all()
+                return sum(len(job.metrics) for job in jobs)
+
+        print("\nPage of 1000 jobs with metrics:")
+        print(f"  lazy load (N+1)   {timed(lazy_page, args.repeat):8.1f} ms")
+        print(f"  selectinload      {timed(lambda: run(lambda db: AsyncJobService.get_jobs_page(db, limit=1000)), args.repeat):8.1f} ms")
+        print(f"  without metrics   {timed(lambda: run(lambda db: AsyncJobService.get_jobs_page(db, limit=1000, include_metrics=False)), args.repeat):8.1f} ms")
+
+        def exact_count():
+            with SessionLocal() as session:
+                return session.execute(select(func.count()).select_from(Job)).scalar_one()
+
+        print("\nTotal count per request:")
+        print(f"  COUNT(*)          {timed(exact_count, args.repeat):8.2f} ms")
+        run(lambda db: AsyncJobService.count_jobs(db))
+        print(f"  cached            {timed(lambda: run(lambda db: AsyncJobService.count_jobs(db)), args.repeat):8.2f} ms")
+
+        loop.run_until_complete(async_engine.dispose())
+        loop.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
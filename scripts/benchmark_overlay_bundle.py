@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark Overlay Bundle vs Per-Slice Requests
+
+This script opens a completed job the way the viewer does: once with one
+request per slice x orientation x layer, and once with the manifest plus
+a single packed overlay bundle. It reports request counts, in-process
+time, and a modelled time-to-interactive for a browser limited to six
+parallel connections at a given round-trip time.
+
+Usage:
+    python scripts/benchmark_overlay_bundle.py [--slices 10] [--png-kb 60] [--rtt-ms 20] [--bandwidth-mbps 100]
+"""
+
+import argparse
+import math
+import shutil
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmark_artifact_caching import build_client  # noqa: E402
+
+BROWSER_CONNECTIONS = 6
+
+
+def modelled_tti(requests: int, total_bytes: int, rtt_ms: float, bandwidth_mbps: float) -> float:
+    """Round trips in waves of six connections plus transfer time, in ms."""
+    waves = math.ceil(requests / BROWSER_CONNECTIONS)
+    transfer_ms = total_bytes * 8 / (bandwidth_mbps * 1e6) * 1000
+    return waves * rtt_ms + transfer_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark overlay bundle loading")
+    parser.add_argument("--slices", type=int, default=10, help="Slices per orientation")
+    parser.add_argument("--png-kb", type=int, default=60, help="Size of each PNG in KB")
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="Round-trip time for the model")
+    parser.add_argument("--bandwidth-mbps", type=float, default=100.0, help="Bandwidth for the model")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time reported)")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bundle_bench_"))
+    try:
+        client, urls = build_client(workdir, args.slices, args.png_kb)
+        job_id = urls[0].split("/")[2]
+
+        per_slice_best = float("inf")
+        per_slice_bytes = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            per_slice_bytes = sum(len(client.get(url).content) for url in urls)
+            per_slice_best = min(per_slice_best, time.perf_counter() - start)
+
+        bundle_best = float("inf")
+        bundle_bytes = 0
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            manifest = client.get(f"/visualizations/{job_id}/manifest").content
+            body = client.get(f"/visualizations/{job_id}/overlays/bundle").content
+            (index_length,) = struct.unpack(">I", body[:4])
+            bundle_best = min(bundle_best, time.perf_counter() - start)
+            bundle_bytes = len(manifest) + len(body)
+
+        print(f"Viewer open: {len(urls)} overlays of {args.png_kb} KB\n")
+        print(f"  {'':<12} {'requests':>8} {'bytes':>12} {'in-process':>12} {'modelled TTI':>14}")
+        for name, requests, total_bytes, seconds in [
+            ("per-slice", len(urls), per_slice_bytes, per_slice_best),
+            ("bundle", 2, bundle_bytes, bundle_best),
+        ]:
+            tti = modelled_tti(requests, total_bytes, args.rtt_ms, args.bandwidth_mbps)
+            print(f"  {name:<12} {requests:>8} {total_bytes:>12} {seconds * 1000:>9.1f} ms {tti:>11.1f} ms")
+
+        print(f"\nRequest reduction: {len(urls)} -> 2 ({(1 - 2 / len(urls)) * 100:.0f}% fewer)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
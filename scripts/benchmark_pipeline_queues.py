@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Compare Pipeline Throughput: One Task per Job vs. Staged Chain
+
+This script simulates draining a backlog of jobs (discrete-event
+simulation, no Celery or FastSurfer needed) under two layouts:
+  - monolithic: every job runs all stages in one task on the shared
+    queue, whose slots also serve the periodic cleanup
+  - chain: FastSurfer on the segmentation queue, every other stage and
+    cleanup on the postprocess queue
+
+Stage durations default to a CPU-only FastSurfer run; pass measured
+values to match a deployment.
+
+Usage:
+    python scripts/benchmark_pipeline_queues.py [--jobs 20] [--segmentation-workers 2]
+        [--postprocess-workers 8] [--segment 1800] [--visualize 240]
+"""
+
+import argparse
+import heapq
+import statistics
+from typing import Dict, List, Tuple
+
+STAGES = ["prepare", "segment", "analyze", "visualize", "persist"]
+
+
+class Pool:
+    """FIFO queue served by a fixed number of worker slots."""
+
+    def __init__(self, slots: int):
+        self.free_at = [0.0] * slots
+
+    def run(self, ready: float, duration: float) -> float:
+        """Start a task no earlier than ``ready`` on the first free slot; return its end."""
+        start = max(ready, heapq.heappop(self.free_at))
+        heapq.heappush(self.free_at, start + duration)
+        return start + duration
+
+
+def simulate_monolithic(jobs: int, slots: int, durations: Dict[str, float], cleanup: float) -> List[float]:
+    """Finish times of each job when one task runs the whole pipeline."""
+    pool = Pool(slots)
+    if cleanup:
+        pool.run(0.0, cleanup)
+    total = sum(durations.values())
+    return [pool.run(0.0, total) for _ in range(jobs)]
+
+
+def simulate_chain(
+    jobs: int,
+    segmentation_workers: int,
+    postprocess_workers: int,
+    durations: Dict[str, float],
+    cleanup: float,
+) -> List[float]:
+    """Finish times of each job when stages are chained across two queues."""
+    segmentation = Pool(segmentation_workers)
+    postprocess = Pool(postprocess_workers)
+    if cleanup:
+        postprocess.run(0.0, cleanup)
+
+    # Tasks are taken in the order they become ready, like a FIFO queue
+    events: List[Tuple[float, int, int]] = [(0.0, job, 0) for job in range(jobs)]
+    heapq.heapify(events)
+    finished = [0.0] * jobs
+    while events:
+        ready, job, stage = heapq.heappop(events)
+        pool = segmentation if STAGES[stage] == "segment" else postprocess
+        end = pool.run(ready, durations[STAGES[stage]])
+        if stage + 1 < len(STAGES):
+            heapq.heappush(events, (end, job, stage + 1))
+        else:
+            finished[job] = end
+    return finished
+
+
+def report(name: str, finished: List[float]) -> float:
+    makespan = max(finished)
+    print(
+        f"  {name:<11} makespan {makespan / 3600:6.2f} h   "
+        f"mean job latency {statistics.mean(finished) / 3600:6.2f} h   "
+        f"throughput {len(finished) / (makespan / 3600):5.2f} jobs/h"
+    )
+    return makespan
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate draining a job backlog with and without the staged chain")
+    parser.add_argument("--jobs", type=int, default=20, help="Jobs in the backlog")
+    parser.add_argument("--segmentation-workers", type=int, default=2, help="FastSurfer slots (MAX_CONCURRENT_JOBS)")
+    parser.add_argument("--postprocess-workers", type=int, default=8, help="Postprocess slots (POSTPROCESS_CONCURRENCY)")
+    parser.add_argument("--prepare", type=float, default=60.0, help="Seconds to fetch and convert the input")
+    parser.add_argument("--segment", type=float, default=1800.0, help="Seconds of FastSurfer")
+    parser.add_argument("--analyze", type=float, default=5.0, help="Seconds of volume extraction and asymmetry")
+    parser.add_argument("--visualize", type=float, default=240.0, help="Seconds of visualization rendering")
+    parser.add_argument("--persist", type=float, default=10.0, help="Seconds to save results")
+    parser.add_argument("--cleanup", type=float, default=300.0, help="Seconds of one retention cleanup run")
+    args = parser.parse_args()
+
+    durations = {stage: getattr(args, stage) for stage in STAGES}
+    print(f"{args.jobs} jobs, stage seconds {durations}, cleanup {args.cleanup:.0f} s")
+    print(f"  monolithic: {args.segmentation_workers} slots for everything")
+    print(f"  chain:      {args.segmentation_workers} segmentation + {args.postprocess_workers} postprocess slots")
+    print()
+
+    before = report("monolithic", simulate_monolithic(args.jobs, args.segmentation_workers, durations, args.cleanup))
+    after = report("chain", simulate_chain(
+        args.jobs, args.segmentation_workers, args.postprocess_workers, durations, args.cleanup
+    ))
+    print()
+    print(f"  backlog drained {100 * (1 - after / before):.1f}% sooner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark Volume Artifact Serving
+
+This script starts a local uvicorn server with a synthetic NIfTI-sized
+artifact and simulates many concurrent viewers. It compares full-file
+downloads through Starlette's FileResponse with RangeFileResponse, and
+the typical viewer pattern of fetching only the header plus a slab.
+
+Usage:
+    python scripts/benchmark_volume_serving.py [--size-mb 32] [--viewers 32] [--requests 4]
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import FileResponse
+
+from backend.core.file_serving import RangeFileResponse
+
+
+def build_app(path: Path) -> FastAPI:
+    """Create an app exposing the artifact through both response classes."""
+    app = FastAPI()
+
+    @app.get("/file-response")
+    def file_response():
+        return FileResponse(path, media_type="application/octet-stream")
+
+    @app.get("/range-response")
+    def range_response(request: Request):
+        return RangeFileResponse(path, media_type="application/octet-stream")
+
+    return app
+
+
+def free_port() -> int:
+    """Find an unused local TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def run_viewers(url: str, viewers: int, requests: int, headers=None) -> tuple:
+    """Run concurrent viewers; return (seconds, bytes transferred, request count)."""
+    limits = httpx.Limits(max_connections=viewers)
+    async with httpx.AsyncClient(limits=limits, timeout=120) as client:
+        async def viewer():
+            received = 0
+            for _ in range(requests):
+                response = await client.get(url, headers=headers)
+                response.raise_for_status()
+                received += len(response.content)
+            return received
+
+        start = time.perf_counter()
+        totals = await asyncio.gather(*(viewer() for _ in range(viewers)))
+        return time.perf_counter() - start, sum(totals), viewers * requests
+
+
+def report(name: str, seconds: float, received: int, count: int) -> None:
+    """Print throughput for one scenario."""
+    print(
+        f"  {name:<34} {count / seconds:8.1f} req/s  "
+        f"{received / seconds / 1e6:9.1f} MB/s  {seconds:7.2f} s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent artifact serving")
+    parser.add_argument("--size-mb", type=int, default=32, help="Artifact size in MB")
+    parser.add_argument("--viewers", type=int, default=32, help="Concurrent viewers")
+    parser.add_argument("--requests", type=int, default=4, help="Requests per viewer")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="serving_bench_"))
+    artifact = workdir / "segmentation.nii.gz"
+    artifact.write_bytes(os.urandom(args.size_mb * 1024 * 1024))
+
+    port = free_port()
+    config = uvicorn.Config(build_app(artifact), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base = f"http://127.0.0.1:{port}"
+    print(f"Artifact: {args.size_mb} MB, {args.viewers} viewers x {args.requests} requests\n")
+
+    try:
+        scenarios = [
+            ("FileResponse, full file", f"{base}/file-response", None),
+            ("RangeFileResponse, full file", f"{base}/range-response", None),
+            ("RangeFileResponse, header only", f"{base}/range-response", {"Range": "bytes=0-351"}),
+            ("RangeFileResponse, header + slab", f"{base}/range-response",
+             {"Range": f"bytes=0-351,{1024 * 1024}-{2 * 1024 * 1024 - 1}"}),
+        ]
+        for name, url, headers in scenarios:
+            seconds, received, count = asyncio.run(run_viewers(url, args.viewers, args.requests, headers))
+            report(name, seconds, received, count)
+    finally:
+        server.should_exit = True
+        thread.join(timeout=5)
+        artifact.unlink(missing_ok=True)
+        workdir.rmdir()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Check Materialized Region Statistics
+
+Recomputes count, mean, standard deviation and histogram of the
+asymmetry index per region from the metrics table and compares them
+with the incrementally maintained region_stats rows.
+
+Usage:
+    python scripts/check_region_stats.py [--tolerance 1e-9] [--repair]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.core.database import SessionLocal
+from backend.services import RegionStatsService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify region_stats against an exact recomputation")
+    parser.add_argument("--tolerance", type=float, default=1e-9, help="Relative tolerance for mean and std")
+    parser.add_argument("--repair", action="store_true", help="Rebuild region_stats if it is inconsistent")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        mismatches = RegionStatsService.verify(db, tolerance=args.tolerance)
+        if not mismatches:
+            print("region_stats is consistent with the metrics table")
+            return 0
+
+        for mismatch in mismatches:
+            stored, exact = mismatch["stored"], mismatch["exact"]
+            if mismatch["field"] == "histogram":
+                stored, exact = f"{sum((stored or {}).values())} values", f"{sum(exact.values())} values"
+            print(f"  {mismatch['region']:<30} {mismatch['field']:<10} stored={stored}  exact={exact}")
+
+        if args.repair:
+            regions = RegionStatsService.rebuild(db)
+            print(f"\nRebuilt statistics for {regions} regions")
+            return 0
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
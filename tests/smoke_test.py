@@ -328,7 +328,7 @@ def main() -> None:
         celery_env = env.copy()
         celery_env["PYTHONPATH"] = str(backend_path.parent.parent)  # Add project root to path
         celery_proc = subprocess.Popen(
-            ["celery", "-A", "workers.celery_app", "worker", "--loglevel=info", "--concurrency=1"],
+            ["celery", "-A", "workers.celery_app", "worker", "--loglevel=info", "-Q", "segmentation,postprocess,celery", "--concurrency=1"],
             cwd=str(backend_path.parent.parent),  # Run from project root
             env=celery_env,
             stdout=subprocess.PIPE,
@@ -6,6 +6,7 @@ for distributed task processing.
 """
 
 from celery import Celery
+from celery.signals import worker_process_init
 
 from backend.core.config import get_settings
 
@@ -17,7 +18,7 @@ celery_app = Celery(
     "neuroinsight",
     broker=settings.celery_broker_url,
     backend=settings.celery_result_backend,
-    include=["workers.tasks.processing", "workers.tasks.cleanup"],
+    include=["workers.tasks.processing", "workers.tasks.cleanup", "workers.tasks.admission"],
 )
 
 # Configure Celery
@@ -41,13 +42,47 @@ celery_app.conf.update(
             "schedule": settings.cleanup_interval_hours * 3600.0,  # Convert hours to seconds
             "options": {"expires": 3600},  # Task expires after 1 hour if not executed
         },
+        "compact-cohort-dataset": {
+            "task": "workers.tasks.cleanup.compact_cohort_dataset",
+            "schedule": settings.cohort_dataset_compact_interval_hours * 3600.0,
+            "options": {"expires": 3600},
+        },
+        "release-deferred-jobs": {
+            "task": "workers.tasks.admission.release_deferred_jobs",
+            "schedule": settings.admission_release_interval_seconds,
+            "options": {"expires": settings.admission_release_interval_seconds},
+        },
     },
 )
 
-# Task routes - using default 'celery' queue for simplicity
-# celery_app.conf.task_routes = {
-#     "workers.tasks.processing.*": {"queue": "processing"},
-# }
+# Task routes: FastSurfer gets its own queue served by a few heavy workers,
+# so segmentation slots never wait on post-processing or maintenance
+SEGMENTATION_QUEUE = "segmentation"
+POSTPROCESS_QUEUE = "postprocess"
+
+celery_app.conf.task_routes = {
+    "workers.tasks.processing.segment_scan": {"queue": SEGMENTATION_QUEUE},
+    "workers.tasks.processing.*": {"queue": POSTPROCESS_QUEUE},
+    "workers.tasks.cleanup.*": {"queue": POSTPROCESS_QUEUE},
+    "workers.tasks.admission.*": {"queue": POSTPROCESS_QUEUE},
+}
+
+
+@worker_process_init.connect
+def _start_job_cache_listener(**kwargs):
+    """Keep each worker process's job cache in sync with API-side changes."""
+    from backend.services.job_cache import job_cache
+    
+    job_cache.start_invalidation_listener()
+
+
+@worker_process_init.connect
+def _start_job_cancel_listener(**kwargs):
+    """Let each worker process stop the FastSurfer runs it launched when their job is cancelled."""
+    from backend.services.job_registry import job_registry
+    
+    job_registry.start_listener()
+
 
 if __name__ == "__main__":
     celery_app.start()
@@ -1,6 +1,5 @@
 """Celery task definitions."""
 
-from .processing import process_mri_task
-
-__all__ = ["process_mri_task"]
+from .processing import enqueue_processing, process_mri_task, processing_chain
 
+__all__ = ["enqueue_processing", "process_mri_task", "processing_chain"]
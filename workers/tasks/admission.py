@@ -0,0 +1,33 @@
+"""
+Scheduled release of deferred jobs.
+
+With ``ADMISSION_BACKPRESSURE=defer`` uploads past the projected wait
+threshold are accepted but not enqueued; this task enqueues them,
+oldest first, as the queue drains.
+"""
+
+from backend.core.database import SessionLocal
+from backend.core.logging import get_logger
+from backend.services import AdmissionService
+from workers.celery_app import celery_app
+
+logger = get_logger(__name__)
+
+
+@celery_app.task(name="workers.tasks.admission.release_deferred_jobs")
+def release_deferred_jobs():
+    """
+    Enqueue deferred jobs while the projected wait is below the threshold.
+    
+    Returns:
+        Dictionary with the number of jobs released
+    """
+    from workers.tasks.processing import enqueue_processing
+    
+    db = SessionLocal()
+    try:
+        released = AdmissionService.release_deferred(db, enqueue_processing)
+    finally:
+        db.close()
+    
+    return {"released": released}
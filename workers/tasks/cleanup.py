@@ -60,7 +60,7 @@ def run_cleanup():
         )
         
         # Get final storage stats
-        stats = cleanup_service.get_storage_stats()
+        stats = cleanup_service.get_storage_stats(db)
         
         logger.info(
             "cleanup_completed",
@@ -89,3 +89,27 @@ def run_cleanup():
 
 
 
+
+
+@celery_app.task(name="workers.tasks.cleanup.compact_cohort_dataset")
+def compact_cohort_dataset():
+    """
+    Scheduled compaction of the Parquet cohort dataset.
+    
+    Folds the per-job part files of each month into one sorted file and
+    drops rows of jobs that have since been deleted.
+    """
+    from backend.core.config import get_settings
+    from backend.services import CohortDatasetService
+    
+    if not get_settings().cohort_dataset_enabled:
+        return
+    
+    db = SessionLocal()
+    try:
+        return CohortDatasetService.compact(db)
+    except Exception as e:
+        logger.error("cohort_dataset_compaction_failed", error=str(e), exc_info=True)
+        raise
+    finally:
+        db.close()
@@ -1,253 +1,397 @@
 """
 MRI processing task definitions.
 
-This module contains Celery tasks for orchestrating the
-MRI processing pipeline.
+The pipeline runs as a Celery chain, one task per stage:
+
+    prepare_scan -> segment_scan -> analyze_scan -> visualize_scan -> persist_results
+
+FastSurfer (``segment_scan``) is routed to the ``segmentation`` queue,
+served by a few heavy workers; every other stage runs on the
+``postprocess`` queue. A segmentation worker takes the next scan as soon
+as FastSurfer exits, while another job's visualizations render and its
+results are saved elsewhere.
+
+Stages pass a JSON state dictionary along the chain. Each stage is
+idempotent (completed work is detected from the job's output directory,
+metrics are replaced rather than appended), so Celery retries rerun a
+single stage, and a duplicate chain of a job that already started or
+finished stops at ``prepare_scan``. Errors are classified (see ``pipeline.errors``): only
+transient ones are retried, with exponential backoff; invalid input or
+a scan rejected by FastSurfer fails the job at once.
 """
 
+import time
 from uuid import UUID
 
-from sqlalchemy import update
-from sqlalchemy.orm import Session
+from celery import chain
+from celery.exceptions import Retry
 
 from backend.core.database import SessionLocal
 from backend.core.logging import get_logger
-from backend.models.job import Job
-from backend.services import JobService, MetricService, StorageService
+from backend.models.job import JobStatus
+from backend.services import CohortDatasetService, JobService, StorageService
+from backend.services.job_registry import JobCancelled, job_registry
+from backend.services.pipeline_error_stats import pipeline_error_stats
+from backend.services.progress_reporter import ProgressReporter
+from pipeline.errors import StorageTransientError, classify, retry_policy
 from pipeline.processors import MRIProcessor
 from workers.celery_app import celery_app
 
 logger = get_logger(__name__)
 
+# Retry limits and delays come from the error's class (retry_policy)
+STAGE_OPTIONS = {"bind": True}
 
-def update_job_progress(db: Session, job_id: UUID, progress: int, current_step: str):
+
+def processing_chain(job_id: str):
     """
-    Update job progress and current step description.
-    
+    Build the processing chain of a job.
+
+    Args:
+        job_id: Job identifier (UUID as string)
+
+    Returns:
+        Celery chain signature
+    """
+    return chain(
+        prepare_scan.s(job_id),
+        segment_scan.s(),
+        analyze_scan.s(),
+        visualize_scan.s(),
+        persist_results.s(),
+    )
+
+
+def first_task_id(result) -> str:
+    """Id of the first task of an enqueued chain (given its last result)."""
+    while result.parent is not None:
+        result = result.parent
+    return result.id
+
+
+def enqueue_processing(job_id) -> str:
+    """
+    Start processing a job and record its task id for cancellation.
+
     Args:
-        db: Database session
         job_id: Job identifier
-        progress: Progress percentage (0-100)
-        current_step: Description of current processing step
+
+    Returns:
+        Celery task id of the first stage
     """
+    task_id = first_task_id(processing_chain(str(job_id)).apply_async())
+    job_registry.register(job_id, task_id=task_id)
+    return task_id
+
+
+def _run_stage(task, state: dict, run):
+    """
+    Run one stage with the handling shared by all stages.
+
+    Stops the chain if the job was cancelled, retries the stage on
+    transient errors and fails the job on any other error or once the
+    retries of the error's class are exhausted.
+
+    Args:
+        task: Bound Celery task
+        state: Chain state (contains at least ``job_id``)
+        run: Function(state, progress) returning the new state
+
+    Returns:
+        New chain state
+    """
+    if state.get("status") in ("cancelled", "skipped"):
+        # Chain of a cancelled job or a duplicate that was not stopped in time
+        return state
+
+    job_id = state["job_id"]
+    job_uuid = UUID(job_id)
+    job_registry.register(job_uuid, task_id=task.request.id)
+    progress = ProgressReporter(job_uuid)
+    started = time.monotonic()
+
     try:
-        db.execute(
-            update(Job)
-            .where(Job.id == job_id)
-            .values(progress=progress, current_step=current_step)
-        )
-        db.commit()
-        logger.info("progress_updated", job_id=str(job_id), progress=progress, step=current_step)
+        job_registry.raise_if_cancelled(job_uuid)
+        return run(state, progress)
+
+    except Retry:
+        raise
+
+    except JobCancelled:
+        logger.info("processing_aborted_cancelled", job_id=job_id, stage=task.name)
+        progress.close()
+        job_registry.forget(job_uuid)
+        task.request.chain = None  # Skip the remaining stages
+        return {**state, "status": "cancelled", "message": "Job was cancelled during processing"}
+
     except Exception as e:
-        logger.warning("progress_update_failed", job_id=str(job_id), error=str(e))
-        db.rollback()
+        progress.close()
+        error = classify(e)
+        policy = retry_policy(error)
+        retries = task.request.retries
 
+        # Stages are idempotent, so the failed one alone is retried; the
+        # job stays RUNNING meanwhile
+        if policy is not None and retries < policy.max_retries:
+            countdown = policy.countdown(retries)
+            logger.warning(
+                "stage_retrying",
+                job_id=job_id,
+                stage=task.name,
+                error_class=error.kind,
+                retry=retries + 1,
+                countdown=countdown,
+                error=str(e),
+            )
+            pipeline_error_stats.record_retry(error.kind)
+            raise task.retry(exc=e, countdown=countdown, max_retries=policy.max_retries)
 
-@celery_app.task(
-    name="workers.tasks.processing.process_mri_task",
-    bind=True,
-    max_retries=5,
-    default_retry_delay=2,  # seconds; per-call retry can override countdown
-)
-def process_mri_task(self, job_id: str):
+        pipeline_error_stats.record_failure(error.kind, retries, time.monotonic() - started)
+
+        error_message = f"Processing failed: {str(e)}"
+        db = SessionLocal()
+        try:
+            JobService.fail_job(db, job_uuid, error_message)
+        finally:
+            db.close()
+        job_registry.forget(job_uuid)
+
+        logger.error(
+            "processing_failed",
+            job_id=job_id,
+            stage=task.name,
+            error_class=error.kind,
+            retries=retries,
+            error=error_message,
+            exc_info=True,
+        )
+        raise
+
+    finally:
+        progress.close()
+
+
+@celery_app.task(name="workers.tasks.processing.prepare_scan", **STAGE_OPTIONS)
+def prepare_scan(self, job_id: str):
     """
-    Process MRI scan through the analysis pipeline.
-    
-    This task orchestrates the complete processing workflow:
-    1. Convert DICOM to NIfTI (if needed)
-    2. Run FastSurfer segmentation
-    3. Extract hippocampal subfields
-    4. Calculate asymmetry indices
-    5. Store results in database
-    
+    Stage 1: start the job and produce the NIfTI input.
+
     Args:
         self: Task instance (bound task)
         job_id: Job identifier (UUID as string)
-    
+
     Returns:
-        Dictionary with processing results
+        Chain state with the NIfTI path and series selection
     """
-    db: Session = SessionLocal()
-    
-    try:
-        logger.info("task_started", job_id=job_id, task_id=self.request.id)
-        
-        # Parse job ID
+    logger.info("task_started", job_id=job_id, task_id=self.request.id)
+
+    def run(state, progress):
         job_uuid = UUID(job_id)
-        
-        # Check if job exists and is not cancelled
-        job = JobService.get_job(db, job_uuid)
-        if not job:
-            logger.error("job_not_found", job_id=job_id)
-            raise ValueError(f"Job {job_id} not found")
-        
-        # Check if job was cancelled
-        from backend.models.job import JobStatus
-        if job.status == JobStatus.CANCELLED:
-            logger.info("job_cancelled_aborting", job_id=job_id)
-            return {
-                "status": "cancelled",
-                "job_id": job_id,
-                "message": "Job was cancelled before processing started"
-            }
-        
-        # Mark job as started
-        job = JobService.start_job(db, job_uuid)
-        if not job:
-            logger.error("job_not_found_after_check", job_id=job_id)
-            raise ValueError(f"Job {job_id} not found")
-        
-        # Update progress: Job started
-        update_job_progress(db, job_uuid, 5, "Job started - preparing file...")
-        
-        # Get file path from storage (with Celery auto-retry on transient S3 delays)
-        storage_service = StorageService()
+        db = SessionLocal()
+        try:
+            # Check if job exists and is not cancelled
+            job = JobService.get_job(db, job_uuid)
+            if not job:
+                logger.error("job_not_found", job_id=job_id)
+                raise ValueError(f"Job {job_id} not found")
+            if job.status == JobStatus.CANCELLED:
+                raise JobCancelled(f"Job {job_id} was cancelled before processing started")
+
+            # A duplicate delivery must not restart a finished job or start a
+            # second chain beside a running one. A RUNNING job is resumed only
+            # by a retry of this stage or a redelivery of its message (the
+            # worker was lost after starting the job).
+            resumed = self.request.retries > 0 or (self.request.delivery_info or {}).get("redelivered", False)
+            if job.status in (JobStatus.COMPLETED, JobStatus.FAILED) or (
+                job.status == JobStatus.RUNNING and not resumed
+            ):
+                logger.info("duplicate_prepare_skipped", job_id=job_id, status=job.status.value)
+                if job.status != JobStatus.RUNNING:
+                    job_registry.forget(job_uuid)
+                self.request.chain = None  # Skip the remaining stages
+                return {**state, "status": "skipped"}
+
+            # Mark job as started
+            job = JobService.start_job(db, job_uuid)
+            file_ref = job.file_path
+        finally:
+            db.close()
+
+        progress.report(2, "Job started - preparing file...")
+
+        # Get file path from storage; read errors are retried with backoff
+        # to allow object propagation
         try:
-            file_path = storage_service.get_file_path(job.file_path)
+            file_path = StorageService().get_file_path(file_ref)
         except Exception as e:
-            logger.warning(
-                "file_fetch_retry",
-                job_id=job_id,
-                error=str(e),
-                note="Retrying shortly due to transient storage read error",
-            )
-            # Requeue the task briefly to allow object propagation
-            raise self.retry(exc=e, countdown=2, max_retries=5)
-        
+            raise StorageTransientError(f"Could not read upload from storage: {e}") from e
+
         logger.info("processing_started", job_id=job_id, file_path=file_path)
-        
-        # Update progress: File retrieved
-        update_job_progress(db, job_uuid, 10, "File retrieved - initializing processor...")
-        
-        # Define progress callback for detailed tracking inside processor
-        def progress_callback(progress: int, step: str):
-            """Callback for processor to update job progress."""
-            update_job_progress(db, job_uuid, progress, step)
-        
-        # Initialize processor with progress callback
-        processor = MRIProcessor(job_uuid, progress_callback=progress_callback)
-        
-        # Update progress: Starting brain segmentation
-        update_job_progress(db, job_uuid, 15, "Starting brain segmentation (FastSurfer)...")
-        
-        # Run processing pipeline
-        try:
-            # Periodic check for cancellation during long-running operations
-            # This allows graceful cancellation even during FastSurfer execution
-            def check_cancellation():
-                """Check if job was cancelled during processing."""
-                db_check = SessionLocal()
-                try:
-                    current_job = JobService.get_job(db_check, job_uuid)
-                    if current_job and current_job.status == JobStatus.CANCELLED:
-                        logger.info("job_cancelled_during_processing", job_id=job_id)
-                        return True
-                    return False
-                finally:
-                    db_check.close()
-            
-            # Note: FastSurfer doesn't support cancellation mid-execution,
-            # but we check before and after the processing step
-            if check_cancellation():
-                logger.info("processing_aborted_cancelled", job_id=job_id)
-                return {
-                    "status": "cancelled",
-                    "job_id": job_id,
-                    "message": "Job was cancelled during processing"
-                }
-            
-            results = processor.process(file_path)
-            
-            # Check again after processing completes
-            if check_cancellation():
-                logger.info("processing_completed_but_cancelled", job_id=job_id)
-                # Don't save results if job was cancelled
-                return {
-                    "status": "cancelled",
-                    "job_id": job_id,
-                    "message": "Job was cancelled after processing completed"
-                }
-            
-            # Update progress: Processing complete, saving results
-            update_job_progress(db, job_uuid, 85, "Processing complete - saving metrics...")
-            
-            logger.info(
-                "processing_completed",
-                job_id=job_id,
-                metrics_count=len(results["metrics"]),
+        progress.report(5, "Preparing input file...")
+
+        processor = MRIProcessor(job_uuid)
+        nifti_path = processor.prepare(file_path)
+        return {
+            **state,
+            "nifti_path": str(nifti_path),
+            "output_dir": str(processor.output_dir),
+            "series_selection": processor.series_selection,
+        }
+
+    return _run_stage(self, {"job_id": job_id}, run)
+
+
+@celery_app.task(name="workers.tasks.processing.segment_scan", **STAGE_OPTIONS)
+def segment_scan(self, state: dict):
+    """
+    Stage 2: run FastSurfer (``segmentation`` queue).
+
+    Args:
+        self: Task instance (bound task)
+        state: Chain state from prepare_scan
+
+    Returns:
+        Chain state with the FastSurfer output directory
+    """
+    def run(state, progress):
+        progress.report(10, "Running FastSurfer brain segmentation (this may take a while)...")
+        fastsurfer_dir = MRIProcessor(UUID(state["job_id"])).segment(state["nifti_path"])
+        return {**state, "fastsurfer_dir": str(fastsurfer_dir)}
+
+    return _run_stage(self, state, run)
+
+
+@celery_app.task(name="workers.tasks.processing.analyze_scan", **STAGE_OPTIONS)
+def analyze_scan(self, state: dict):
+    """
+    Stage 3: extract hippocampal volumes and asymmetry indices.
+
+    Args:
+        self: Task instance (bound task)
+        state: Chain state from segment_scan
+
+    Returns:
+        Chain state with the metrics
+    """
+    def run(state, progress):
+        progress.report(85, "Extracting hippocampal volumes...")
+        metrics = MRIProcessor(UUID(state["job_id"])).analyze(state["fastsurfer_dir"])
+        return {**state, "metrics": metrics}
+
+    return _run_stage(self, state, run)
+
+
+@celery_app.task(name="workers.tasks.processing.visualize_scan", **STAGE_OPTIONS)
+def visualize_scan(self, state: dict):
+    """
+    Stage 4: render viewer volumes and overlays.
+
+    Args:
+        self: Task instance (bound task)
+        state: Chain state from analyze_scan
+
+    Returns:
+        Chain state, unchanged
+    """
+    def run(state, progress):
+        progress.report(90, "Generating visualizations...")
+        MRIProcessor(UUID(state["job_id"])).visualize(state["nifti_path"], state["fastsurfer_dir"])
+        return state
+
+    return _run_stage(self, state, run)
+
+
+@celery_app.task(name="workers.tasks.processing.persist_results", **STAGE_OPTIONS)
+def persist_results(self, state: dict):
+    """
+    Stage 5: save metrics (files and database) and complete the job.
+
+    Args:
+        self: Task instance (bound task)
+        state: Chain state from visualize_scan
+
+    Returns:
+        Dictionary with processing results
+    """
+    def run(state, progress):
+        job_id = state["job_id"]
+        job_uuid = UUID(job_id)
+        metrics = state["metrics"]
+
+        progress.report(95, "Saving results...")
+        MRIProcessor(job_uuid).save_results(metrics)
+
+        logger.info("processing_completed", job_id=job_id, metrics_count=len(metrics))
+
+        from backend.schemas import MetricCreate
+
+        metrics_data = [
+            MetricCreate(
+                job_id=job_uuid,
+                region=metric["region"],
+                left_volume=metric["left_volume"],
+                right_volume=metric["right_volume"],
+                asymmetry_index=metric["asymmetry_index"],
             )
-            
-            # Store metrics in database
-            from backend.schemas import MetricCreate
-            from backend.models.metric import Metric
-            
-            # Delete existing metrics for this job (in case of reprocessing)
-            # This prevents duplicate metrics if a job is rerun
-            existing_metrics_count = db.query(Metric).filter(Metric.job_id == job_uuid).count()
-            if existing_metrics_count > 0:
-                logger.info(
-                    "clearing_existing_metrics",
-                    job_id=job_id,
-                    count=existing_metrics_count,
-                    reason="Job is being reprocessed"
-                )
-                db.query(Metric).filter(Metric.job_id == job_uuid).delete()
-                db.commit()
-            
-            metrics_data = [
-                MetricCreate(
-                    job_id=job_uuid,
-                    region=metric["region"],
-                    left_volume=metric["left_volume"],
-                    right_volume=metric["right_volume"],
-                    asymmetry_index=metric["asymmetry_index"],
-                )
-                for metric in results["metrics"]
-            ]
-            
-            MetricService.create_metrics_bulk(db, metrics_data)
-            
-            # Update progress: Finalizing
-            update_job_progress(db, job_uuid, 95, "Finalizing results...")
-            
-            # Mark job as completed (this will set progress to 100)
-            JobService.complete_job(db, job_uuid, results["output_dir"])
-            
-            # Update progress: Complete
-            update_job_progress(db, job_uuid, 100, "Complete")
-            
-            logger.info("task_completed", job_id=job_id)
-            
-            return {
-                "status": "completed",
-                "job_id": job_id,
-                "metrics_count": len(results["metrics"]),
-                "output_dir": results["output_dir"],
-            }
-        
-        except Exception as e:
-            # Mark job as failed
-            error_message = f"Processing failed: {str(e)}"
-            JobService.fail_job(db, job_uuid, error_message)
-            
-            logger.error(
-                "processing_failed",
-                job_id=job_id,
-                error=error_message,
-                exc_info=True,
+            for metric in metrics
+        ]
+
+        # Write held progress now, so it cannot land after the final 100%
+        progress.close()
+
+        # Don't complete a job that was cancelled meanwhile
+        job_registry.raise_if_cancelled(job_uuid)
+
+        db = SessionLocal()
+        try:
+            # Metrics, series selection and completion in one transaction;
+            # a repeated delivery finds the job completed and changes nothing
+            selection = state.get("series_selection")
+            job = JobService.finalize_job(
+                db,
+                job_uuid,
+                state["output_dir"],
+                metrics_data,
+                series_selection=selection["selected"] if selection else None,
             )
-            
-            # Retry task if not at max retries
-            if self.request.retries < self.max_retries:
-                logger.info(
-                    "task_retrying",
-                    job_id=job_id,
-                    retry=self.request.retries + 1,
-                )
-                raise self.retry(exc=e)
-            
-            raise
-    
-    finally:
-        db.close()
+            if job is None:
+                raise JobCancelled(f"Job {job_id} is no longer running")
+
+            # Add to the cohort dataset; it is derived data, so a failure
+            # here must not fail the job
+            try:
+                CohortDatasetService.append_job(job, metrics_data)
+            except Exception as e:
+                logger.warning("cohort_dataset_append_failed", job_id=job_id, error=str(e))
+        finally:
+            db.close()
+
+        job_registry.forget(job_uuid)
+        logger.info("task_completed", job_id=job_id)
+
+        return {
+            "status": "completed",
+            "job_id": job_id,
+            "metrics_count": len(metrics),
+            "output_dir": state["output_dir"],
+        }
+
+    return _run_stage(self, state, run)
+
+
+@celery_app.task(name="workers.tasks.processing.process_mri_task", bind=True)
+def process_mri_task(self, job_id: str):
+    """
+    Start the processing chain of a job.
+
+    Kept so messages enqueued before the pipeline was split into stages
+    are still processed; new jobs are enqueued with enqueue_processing().
+
+    Args:
+        self: Task instance (bound task)
+        job_id: Job identifier (UUID as string)
 
+    Returns:
+        Celery task id of the first stage
+    """
+    return enqueue_processing(job_id)
@@ -7,41 +7,20 @@ in desktop mode (no Celery).
 
 from uuid import UUID
 
-from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from backend.core.database import SessionLocal
 from backend.core.logging import get_logger
-from backend.models.job import Job
-from backend.services import JobService, MetricService, StorageService
+from backend.services import CohortDatasetService, JobService, StorageService
+from backend.services.job_registry import JobCancelled, job_registry
+from backend.services.pipeline_error_stats import pipeline_error_stats
+from backend.services.progress_reporter import ProgressReporter
+from pipeline.errors import classify
 from pipeline.processors import MRIProcessor
 
 logger = get_logger(__name__)
 
 
-def update_job_progress(db: Session, job_id: UUID, progress: int, current_step: str):
-    """
-    Update job progress and current step description.
-
-    Args:
-        db: Database session
-        job_id: Job identifier
-        progress: Progress percentage (0-100)
-        current_step: Description of current processing step
-    """
-    try:
-        db.execute(
-            update(Job)
-            .where(Job.id == job_id)
-            .values(progress=progress, current_step=current_step)
-        )
-        db.commit()
-        logger.info("progress_updated", job_id=str(job_id), progress=progress, step=current_step)
-    except Exception as e:
-        logger.warning("progress_update_failed", job_id=str(job_id), error=str(e))
-        db.rollback()
-
-
 def process_mri_direct(job_id: str):
     """
     Process MRI scan directly through the analysis pipeline (desktop mode).
@@ -61,6 +40,7 @@ def process_mri_direct(job_id: str):
     """
     logger.info("DESKTOP_PROCESSING_STARTED", job_id=job_id, function="process_mri_direct")
     db: Session = SessionLocal()
+    progress = None
     logger.info("Database session created", job_id=job_id)
 
     try:
@@ -77,7 +57,7 @@ def process_mri_direct(job_id: str):
 
         # Check if job was cancelled
         from backend.models.job import JobStatus
-        if job.status == JobStatus.CANCELLED:
+        if job.status == JobStatus.CANCELLED or job_registry.is_cancelled(job_uuid):
             logger.info("job_cancelled_aborting", job_id=job_id)
             return {
                 "status": "cancelled",
@@ -91,8 +71,9 @@ def process_mri_direct(job_id: str):
             logger.error("job_not_found_after_check", job_id=job_id)
             raise ValueError(f"Job {job_id} not found")
 
-        # Update progress: Job started
-        update_job_progress(db, job_uuid, 5, "Job started - preparing file...")
+        # Progress writes are throttled and coalesced by the reporter
+        progress = ProgressReporter(job_uuid)
+        progress.report(2, "Job started - preparing file...")
 
         # Get file path from storage
         storage_service = StorageService()
@@ -101,57 +82,22 @@ def process_mri_direct(job_id: str):
         logger.info("processing_started", job_id=job_id, file_path=file_path)
 
         # Update progress: File retrieved
-        update_job_progress(db, job_uuid, 10, "File retrieved - initializing processor...")
-
-        # Define progress callback for detailed tracking inside processor
-        def progress_callback(progress: int, step: str):
-            """Callback for processor to update job progress."""
-            update_job_progress(db, job_uuid, progress, step)
+        progress.report(4, "File retrieved - initializing processor...")
 
-        # Initialize processor with progress callback
-        processor = MRIProcessor(job_uuid, progress_callback=progress_callback)
-
-        # Update progress: Starting brain segmentation
-        update_job_progress(db, job_uuid, 15, "Starting brain segmentation (FastSurfer)...")
+        # The processor reports its own stages within 5-90%
+        processor = MRIProcessor(job_uuid, progress=progress.span(5, 90))
 
         # Run processing pipeline
         try:
-            # Periodic check for cancellation during long-running operations
-            def check_cancellation():
-                """Check if job was cancelled during processing."""
-                db_check = SessionLocal()
-                try:
-                    current_job = JobService.get_job(db_check, job_uuid)
-                    if current_job and current_job.status == JobStatus.CANCELLED:
-                        logger.info("job_cancelled_during_processing", job_id=job_id)
-                        return True
-                    return False
-                finally:
-                    db_check.close()
-
-            # Check cancellation before starting
-            if check_cancellation():
-                logger.info("processing_aborted_cancelled", job_id=job_id)
-                return {
-                    "status": "cancelled",
-                    "job_id": job_id,
-                    "message": "Job was cancelled during processing"
-                }
-
+            # The processor checks the job's cancel flag at every stage, and a
+            # cancellation kills its FastSurfer container or process group
             results = processor.process(file_path)
 
-            # Check again after processing completes
-            if check_cancellation():
-                logger.info("processing_completed_but_cancelled", job_id=job_id)
-                # Don't save results if job was cancelled
-                return {
-                    "status": "cancelled",
-                    "job_id": job_id,
-                    "message": "Job was cancelled after processing completed"
-                }
+            # Don't save results if the job was cancelled meanwhile
+            job_registry.raise_if_cancelled(job_uuid)
 
             # Update progress: Processing complete, saving results
-            update_job_progress(db, job_uuid, 85, "Processing complete - saving metrics...")
+            progress.report(92, "Processing complete - saving metrics...")
 
             logger.info(
                 "processing_completed",
@@ -161,19 +107,6 @@ def process_mri_direct(job_id: str):
 
             # Store metrics in database
             from backend.schemas import MetricCreate
-            from backend.models.metric import Metric
-
-            # Delete existing metrics for this job (in case of reprocessing)
-            existing_metrics_count = db.query(Metric).filter(Metric.job_id == job_uuid).count()
-            if existing_metrics_count > 0:
-                logger.info(
-                    "clearing_existing_metrics",
-                    job_id=job_id,
-                    count=existing_metrics_count,
-                    reason="Job is being reprocessed"
-                )
-                db.query(Metric).filter(Metric.job_id == job_uuid).delete()
-                db.commit()
 
             metrics_data = [
                 MetricCreate(
@@ -186,16 +119,28 @@ def process_mri_direct(job_id: str):
                 for metric in results["metrics"]
             ]
 
-            MetricService.create_metrics_bulk(db, metrics_data)
-
-            # Update progress: Finalizing
-            update_job_progress(db, job_uuid, 95, "Finalizing results...")
-
-            # Mark job as completed (this will set progress to 100)
-            JobService.complete_job(db, job_uuid, results["output_dir"])
+            # Write held progress now, so it cannot land after the final 100%
+            progress.close()
+
+            # Metrics (replacing those of a reprocessed job), series selection
+            # and completion in one transaction
+            selection = results.get("series_selection")
+            job = JobService.finalize_job(
+                db,
+                job_uuid,
+                results["output_dir"],
+                metrics_data,
+                series_selection=selection["selected"] if selection else None,
+            )
+            if job is None:
+                raise JobCancelled(f"Job {job_id} is no longer running")
 
-            # Update progress: Complete
-            update_job_progress(db, job_uuid, 100, "Complete")
+            # Add to the cohort dataset; it is derived data, so a failure
+            # here must not fail the job
+            try:
+                CohortDatasetService.append_job(job, metrics_data)
+            except Exception as e:
+                logger.warning("cohort_dataset_append_failed", job_id=job_id, error=str(e))
 
             logger.info("desktop_processing_completed", job_id=job_id)
 
@@ -206,7 +151,19 @@ def process_mri_direct(job_id: str):
                 "output_dir": results["output_dir"],
             }
 
+        except JobCancelled:
+            logger.info("processing_aborted_cancelled", job_id=job_id)
+            return {
+                "status": "cancelled",
+                "job_id": job_id,
+                "message": "Job was cancelled during processing"
+            }
+
         except Exception as e:
+            progress.close()
+            error = classify(e)
+            pipeline_error_stats.record_failure(error.kind)
+
             # Mark job as failed
             error_message = f"Processing failed: {str(e)}"
             JobService.fail_job(db, job_uuid, error_message)
@@ -215,10 +172,14 @@ def process_mri_direct(job_id: str):
                 "DESKTOP_PROCESSING_FAILED",
                 job_id=job_id,
                 error=error_message,
+                error_class=error.kind,
                 error_type=type(e).__name__,
                 exc_info=True,
             )
 
             raise  # Re-raise so the task fails
     finally:
+        if progress is not None:
+            progress.close()
+        job_registry.forget(job_id)
         db.close()